@@ -0,0 +1,116 @@
+"""
+Latency and response-size benchmark for the calculator engines up to the horizon limit
+
+Usage:
+    python -m api.benchmark [--years 300] [--repeat 20]
+"""
+import argparse
+import statistics
+import sys
+import time
+from typing import Callable, Dict, List, Tuple
+
+from api.models.limits import MAX_HORIZON_YEARS
+from api.models.money_journey import MoneyJourneyRequest
+from api.models.sip import SIPCalculationRequest
+from api.services.money_journey import calculate_money_journey
+from api.services.sip_calculator import calculate_sip_with_annual_compounding
+
+# Single-request latency budget (best of `repeat` runs, including response
+# construction) for the worst-case plan at MAX_HORIZON_YEARS. The Money
+# Journey plan uses the maximum horizon for both phases.
+LATENCY_BUDGET_MS = {
+    "sip": 10.0,
+    "money_journey": 25.0,
+}
+
+
+def worst_case_plans(years: int) -> Dict[str, Tuple[Callable, object]]:
+    """Most expensive plan shapes: monthly resolution everywhere and step-ups enabled"""
+    return {
+        "sip": (
+            calculate_sip_with_annual_compounding,
+            SIPCalculationRequest(
+                monthly_investment=5000,
+                time_period_years=years,
+                annual_return_rate=12.0,
+                initial_investment=100000,
+                annual_step_up_rate=5,
+                step_up_cap=1_000_000,
+                compounding_frequency="monthly",
+            ),
+        ),
+        "money_journey": (
+            calculate_money_journey,
+            MoneyJourneyRequest(
+                monthly_investment=5000,
+                accumulation_years=years,
+                accumulation_return_rate=12.0,
+                annual_step_up_rate=5,
+                monthly_withdrawal=50000,
+                withdrawal_years=years,
+                withdrawal_return_rate=8.0,
+                withdrawal_step_up_rate=3,
+                withdrawal_frequency="monthly",
+                withdrawal_compounding_frequency="monthly",
+            ),
+        ),
+    }
+
+
+def run_benchmark(years: int, repeat: int = 20) -> List[dict]:
+    """
+    Time each engine on its worst-case plan at the given horizon.
+
+    Args:
+        years: Horizon for every phase of the benchmark plans
+        repeat: Timed runs per engine
+
+    Returns:
+        One dict per engine with best/median latency, response size and budget check
+    """
+    rows = []
+    for name, (function, request) in worst_case_plans(years).items():
+        timings = []
+        response = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            response = function(request)
+            timings.append((time.perf_counter() - start) * 1000)
+
+        best = min(timings)
+        budget = LATENCY_BUDGET_MS[name] * years / MAX_HORIZON_YEARS
+        rows.append({
+            "engine": name,
+            "years": years,
+            "best_ms": best,
+            "median_ms": statistics.median(timings),
+            "response_bytes": len(response.model_dump_json()),
+            "budget_ms": budget,
+            "within_budget": best <= budget,
+        })
+    return rows
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--years", type=int, default=MAX_HORIZON_YEARS, help="Largest horizon to benchmark")
+    parser.add_argument("--repeat", type=int, default=20, help="Timed runs per engine and horizon")
+    args = parser.parse_args(argv)
+
+    within_budget = True
+    print(f"{'engine':<15}{'years':>6}{'best ms':>10}{'median ms':>11}{'bytes':>10}{'budget ms':>11}")
+    for years in sorted({max(1, args.years // 4), max(1, args.years // 2), args.years}):
+        for row in run_benchmark(years, args.repeat):
+            within_budget &= row["within_budget"]
+            print(
+                f"{row['engine']:<15}{row['years']:>6}{row['best_ms']:>10.3f}{row['median_ms']:>11.3f}"
+                f"{row['response_bytes']:>10}{row['budget_ms']:>11.2f}"
+                f"{'' if row['within_budget'] else '  OVER BUDGET'}"
+            )
+
+    return 0 if within_budget else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
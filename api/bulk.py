@@ -0,0 +1,312 @@
+"""
+Score a CSV or Parquet file of SIP or Money Journey plans through the vectorized engine
+
+Usage:
+    python -m api.bulk plans.csv results.csv [--kind money_journey] [--workers 8] [--chunk-size 20000]
+
+Columns named like SIPCalculationRequest / MoneyJourneyRequest fields are
+request inputs; list and object fields (rate schedules, events, withdrawal
+policies) are given as JSON text in CSV cells. Every other column (e.g. a
+plan id) is copied to the output next to the result columns. Rows that fail
+validation or calculation get an `error` message instead of results.
+Parquet needs the optional `pyarrow` package.
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+import typing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Dict, Iterator, List, Optional
+
+from pydantic import ValidationError
+
+from api.models.money_journey import MoneyJourneyRequest, MoneyJourneyResults
+from api.models.sip import SIPCalculationRequest, SIPCalculationResults
+from api.services.money_journey import calculate_money_journey_summaries
+from api.services.sip_calculator import calculate_sip_summaries
+from api.services.summaries import summary_outcomes
+
+# kind -> (request model, columnar summary function, result model)
+KINDS = {
+    "sip": (SIPCalculationRequest, calculate_sip_summaries, SIPCalculationResults),
+    "money_journey": (MoneyJourneyRequest, calculate_money_journey_summaries, MoneyJourneyResults),
+}
+
+DEFAULT_CHUNK_SIZE = 20_000
+
+
+def detect_kind(columns: List[str]) -> str:
+    """Infer the plan kind from the input columns"""
+    if "accumulation_years" in columns:
+        return "money_journey"
+    if "time_period_years" in columns:
+        return "sip"
+    raise ValueError("cannot tell the plan kind from the columns; pass --kind")
+
+
+def output_columns(kind: str, columns: List[str]) -> List[str]:
+    """Passed-through input columns, then result columns, then `error`"""
+    request_model, _, result_model = KINDS[kind]
+    passthrough = [c for c in columns if c not in request_model.model_fields]
+    return passthrough + list(result_model.model_fields) + ["error"]
+
+
+def _parse_value(value):
+    """CSV cells are text: empty means unset, JSON text holds lists and objects"""
+    if isinstance(value, str):
+        value = value.strip()
+        if value == "":
+            return None
+        if value[0] in "[{":
+            return json.loads(value)
+    return value
+
+
+def score_rows(kind: str, rows: List[dict]) -> List[dict]:
+    """
+    Validate and calculate one chunk of rows.
+
+    Runs in worker processes, so it takes and returns plain dicts.
+
+    Returns:
+        One output row per input row, in order
+    """
+    request_model, summarize, result_model = KINDS[kind]
+    fields = request_model.model_fields
+    result_fields = list(result_model.model_fields)
+
+    requests = []
+    valid = []
+    output = []
+    for row in rows:
+        out = {key: value for key, value in row.items() if key not in fields}
+        try:
+            inputs = {}
+            for key, value in row.items():
+                if key in fields:
+                    value = _parse_value(value)
+                    if value is not None:
+                        inputs[key] = value
+            requests.append(request_model(**inputs))
+            valid.append(out)
+            out["error"] = None
+        except ValidationError as e:
+            error = e.errors()[0]
+            location = ".".join(str(x) for x in error["loc"])
+            out.update({name: None for name in result_fields})
+            out["error"] = f"{location}: {error['msg']}" if location else error["msg"]
+        except ValueError as e:
+            out.update({name: None for name in result_fields})
+            out["error"] = f"invalid JSON cell: {e}"
+        output.append(out)
+
+    if requests:
+        for out, (results, error) in zip(valid, summary_outcomes(summarize, requests)):
+            if results is None:
+                out.update({name: None for name in result_fields})
+                out["error"] = error
+            else:
+                out.update({name: results[name] for name in result_fields})
+    return output
+
+
+def _chunks(iterator: Iterator[dict], size: int) -> Iterator[List[dict]]:
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def read_rows(path: str, chunk_size: int):
+    """
+    Open an input file for streaming.
+
+    Returns:
+        Tuple of (column names, iterator over chunks of row dicts)
+    """
+    if path.endswith(".parquet"):
+        import pyarrow.parquet as pq
+
+        parquet = pq.ParquetFile(path)
+        batches = parquet.iter_batches(batch_size=chunk_size)
+        return parquet.schema_arrow.names, (batch.to_pylist() for batch in batches)
+
+    handle = open(path, newline="", encoding="utf-8")
+    reader = csv.DictReader(handle)
+    columns = list(reader.fieldnames or [])
+
+    def chunks():
+        with handle:
+            yield from _chunks(iter(reader), chunk_size)
+
+    return columns, chunks()
+
+
+def result_types(kind: str) -> Dict[str, type]:
+    """Python type of every result column, for typed Parquet output"""
+    _, _, result_model = KINDS[kind]
+    types = {}
+    for name, field in result_model.model_fields.items():
+        options = [t for t in typing.get_args(field.annotation) if t is not type(None)]
+        types[name] = options[0] if options else field.annotation
+    types["error"] = str
+    return types
+
+
+class RowWriter:
+    """
+    Append chunks of output rows to a CSV or Parquet file.
+
+    The Parquet schema is fixed by the first chunk, with result columns typed
+    from `types` so columns that happen to be empty in that chunk (such as
+    `error`) are not inferred as null.
+    """
+
+    def __init__(self, path: str, columns: List[str], types: Optional[Dict[str, type]] = None):
+        self.columns = columns
+        self._parquet = path.endswith(".parquet")
+        if self._parquet:
+            import pyarrow.parquet as pq
+
+            self._pq = pq
+            self._path = path
+            self._types = types or {}
+            self._schema = None
+            self._writer = None
+        else:
+            self._handle = open(path, "w", newline="", encoding="utf-8")
+            self._writer = csv.DictWriter(self._handle, fieldnames=columns, extrasaction="ignore")
+            self._writer.writeheader()
+
+    def _arrow_schema(self, rows: List[dict]):
+        import pyarrow as pa
+
+        arrow_types = {float: pa.float64(), int: pa.int64(), bool: pa.bool_(), str: pa.string()}
+        inferred = pa.Table.from_pylist(rows).schema
+        fields = []
+        for name in self.columns:
+            if name in self._types:
+                arrow_type = arrow_types.get(self._types[name], pa.string())
+            else:
+                arrow_type = inferred.field(name).type
+                if pa.types.is_null(arrow_type):
+                    arrow_type = pa.string()
+            fields.append(pa.field(name, arrow_type))
+        return pa.schema(fields)
+
+    def write(self, rows: List[dict]):
+        if self._parquet:
+            import pyarrow as pa
+
+            if self._schema is None:
+                self._schema = self._arrow_schema(rows)
+                self._writer = self._pq.ParquetWriter(self._path, self._schema)
+            self._writer.write_table(pa.Table.from_pylist(rows, schema=self._schema))
+        else:
+            self._writer.writerows(rows)
+
+    def close(self):
+        if self._parquet:
+            if self._writer is not None:
+                self._writer.close()
+        else:
+            self._handle.close()
+
+
+def score_file(
+    input_path: str,
+    output_path: str,
+    kind: Optional[str] = None,
+    workers: int = 1,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    progress=None,
+) -> Dict[str, int]:
+    """
+    Score every row of a plan file and write the results in input order.
+
+    Chunks are read lazily and at most two per worker are in flight, so
+    memory stays bounded however large the file is. With workers > 1 the
+    chunks are scored on a process pool.
+
+    Args:
+        input_path: CSV or Parquet file of plans
+        output_path: CSV or Parquet file to write
+        kind: "sip" or "money_journey"; inferred from the columns if None
+        workers: Worker processes; 1 scores in this process
+        chunk_size: Rows per chunk
+        progress: Optional callback given the running totals after each chunk
+
+    Returns:
+        Dict with the number of rows scored and of rows with errors
+    """
+    columns, chunks = read_rows(input_path, chunk_size)
+    kind = kind or detect_kind(columns)
+    writer = RowWriter(output_path, output_columns(kind, columns), result_types(kind))
+    totals = {"rows": 0, "errors": 0}
+
+    def record(rows: List[dict]):
+        writer.write(rows)
+        totals["rows"] += len(rows)
+        totals["errors"] += sum(1 for row in rows if row["error"] is not None)
+        if progress is not None:
+            progress(dict(totals))
+
+    try:
+        if workers <= 1:
+            for chunk in chunks:
+                record(score_rows(kind, chunk))
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                pending = deque()
+                for chunk in chunks:
+                    pending.append(pool.submit(score_rows, kind, chunk))
+                    if len(pending) >= 2 * workers:
+                        record(pending.popleft().result())
+                while pending:
+                    record(pending.popleft().result())
+    finally:
+        writer.close()
+    return totals
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("input", help="CSV or Parquet file of plans")
+    parser.add_argument("output", help="CSV or Parquet file to write (format from the extension)")
+    parser.add_argument("--kind", choices=sorted(KINDS), help="Plan kind (default: inferred from the columns)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Worker processes (default: all cores)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Rows per chunk")
+    parser.add_argument("--quiet", action="store_true", help="Do not report progress")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+
+    def report(totals):
+        elapsed = time.perf_counter() - start
+        print(
+            f"{totals['rows']:,} rows, {totals['errors']:,} errors, "
+            f"{totals['rows'] / elapsed:,.0f} rows/s",
+            file=sys.stderr,
+        )
+
+    totals = score_file(
+        args.input,
+        args.output,
+        kind=args.kind,
+        workers=args.workers,
+        chunk_size=args.chunk_size,
+        progress=None if args.quiet else report,
+    )
+    elapsed = time.perf_counter() - start
+    print(f"Scored {totals['rows']:,} rows ({totals['errors']:,} errors) in {elapsed:.1f} s", file=sys.stderr)
+    return 1 if totals["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,11 +5,13 @@ from http.server import BaseHTTPRequestHandler
 import json
 import sys
 import os
+from urllib.parse import parse_qsl, urlsplit
 
 # Add the parent directory to path so we can import our modules
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from models.money_journey import MoneyJourneyRequest
+from services.caching import cached_get, parse_query
 from services.money_journey import calculate_money_journey
 
 
@@ -20,10 +22,37 @@ class handler(BaseHTTPRequestHandler):
         """Handle CORS preflight requests"""
         self.send_response(200)
         self.send_header('Access-Control-Allow-Origin', '*')
-        self.send_header('Access-Control-Allow-Methods', 'POST, OPTIONS')
-        self.send_header('Access-Control-Allow-Headers', 'Content-Type')
+        self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
+        self.send_header('Access-Control-Allow-Headers', 'Content-Type, If-None-Match')
         self.end_headers()
 
+    def do_GET(self):
+        """Handle cacheable GET requests for Money Journey calculation from query parameters"""
+        try:
+            query = urlsplit(self.path).query
+            request = MoneyJourneyRequest(**parse_query(parse_qsl(query, keep_blank_values=True)))
+            status_code, headers, body = cached_get(
+                '/api/calculate-money-journey', request, self.headers.get('If-None-Match'), calculate_money_journey
+            )
+
+            self.send_response(status_code)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.send_header('Access-Control-Allow-Origin', '*')
+            self.send_header('Access-Control-Expose-Headers', 'ETag')
+            if body is None:
+                self.end_headers()
+                return
+            self.send_header('Content-Type', 'application/json')
+            self.end_headers()
+            self.wfile.write(body)
+
+        except ValueError as e:
+            self.send_error_response(400, f"Validation error: {str(e)}")
+
+        except Exception as e:
+            self.send_error_response(500, f"Internal server error: {str(e)}")
+
     def do_POST(self):
         """Handle POST requests for Money Journey calculation"""
         try:
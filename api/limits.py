@@ -0,0 +1,32 @@
+"""
+Vercel Serverless Function for the deployment limits the UI validates against
+"""
+from http.server import BaseHTTPRequestHandler
+import json
+import sys
+import os
+
+# Add the parent directory to path so we can import our modules
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from models.limits import MAX_HORIZON_YEARS
+
+
+class handler(BaseHTTPRequestHandler):
+    """Handler for Vercel serverless function"""
+
+    def do_OPTIONS(self):
+        """Handle CORS preflight requests"""
+        self.send_response(200)
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Access-Control-Allow-Methods', 'GET, OPTIONS')
+        self.send_header('Access-Control-Allow-Headers', 'Content-Type')
+        self.end_headers()
+
+    def do_GET(self):
+        """Handle GET requests for the limits"""
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.end_headers()
+        self.wfile.write(json.dumps({"max_horizon_years": MAX_HORIZON_YEARS}).encode('utf-8'))
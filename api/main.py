@@ -1,21 +1,59 @@
 """
 FastAPI application for SIP Calculator (Local Development)
 """
-from fastapi import FastAPI, HTTPException
+import asyncio
+import json
+import os
+import time
+from itertools import chain
+from typing import Optional
+
+from fastapi import FastAPI, HTTPException, Request, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response, StreamingResponse
 from pydantic import ValidationError
 
 from api.models.sip import (
     SIPCalculationRequest,
     SIPCalculationResponse,
+    SIPBatchRequest,
+    SIPBatchResponse,
     ErrorResponse
 )
 from api.models.money_journey import (
     MoneyJourneyRequest,
     MoneyJourneyResponse,
+    MoneyJourneyBatchRequest,
+    MoneyJourneyBatchResponse,
+)
+from api.models.backtest import BacktestRequest, BacktestResponse
+from api.models.comparison import ScenarioComparisonRequest, ScenarioComparisonResponse
+from api.models.jobs import JobStatus, JobSubmission
+from api.models.limits import MAX_HORIZON_YEARS
+from api.models.planner import PlannerRequest, PlannerResponse
+from api.models.plans import HouseAssumptions, ReprojectionRequest, SavedPlan, SavedPlanList, SavePlanRequest
+from api.models.simulation import SimulationRequest, SimulationResponse
+from api.models.xirr import XIRRBatchRequest, XIRRBatchResponse
+from api.services.sip_calculator import calculate_sip_batch, calculate_sip_with_annual_compounding
+from api.services.money_journey import (
+    calculate_money_journey as compute_money_journey,
+    calculate_money_journey_batch,
 )
-from api.services.sip_calculator import calculate_sip_with_annual_compounding
-from api.services.money_journey import calculate_money_journey as compute_money_journey
+from api.services.caching import cached_get, parse_query, request_hash
+from api.services.coalescing import SingleFlight
+from api.services.capture import RequestCaptureMiddleware
+from api.services.backtest import run_backtest
+from api.services.comparison import compare_scenarios, comparison_horizon, scenario_results
+from api.services.historical import DATASETS, load_returns
+from api.services.jobs import JobManager, JobQueueFull, run_in_chunks
+from api.services.live import LIVE_KINDS, LiveMetrics, LiveSession, serve_live_session
+from api.services.planner import calculate_plan
+from api.services.plans import PlanStore
+from api.services.simulation import run_simulation
+from api.services.streaming import NDJSON_MEDIA_TYPE, batch_chunks, ndjson_response
+from api.services.xirr import calculate_xirr_batch
+from api.services.engine_diff import MONEY_JOURNEY_ENDPOINT, SIP_ENDPOINT, load_engine
+from api.services.shadow import ShadowRunner
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -40,6 +78,50 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Optional sampled request capture for offline replay (see api/replay.py)
+if os.environ.get("FINCAL_CAPTURE_DIR"):
+    app.add_middleware(
+        RequestCaptureMiddleware,
+        directory=os.environ["FINCAL_CAPTURE_DIR"],
+        sample_rate=float(os.environ.get("FINCAL_CAPTURE_SAMPLE_RATE", "0.01")),
+        max_bytes=int(os.environ.get("FINCAL_CAPTURE_MAX_BYTES", "10000000")),
+        backup_count=int(os.environ.get("FINCAL_CAPTURE_BACKUPS", "5")),
+    )
+
+# Optional shadow execution of a candidate engine on sampled live requests
+shadow_runner = None
+if os.environ.get("FINCAL_SHADOW_ENGINE"):
+    shadow_runner = ShadowRunner(
+        load_engine(os.environ["FINCAL_SHADOW_ENGINE"]),
+        sample_rate=float(os.environ.get("FINCAL_SHADOW_SAMPLE_RATE", "0.05")),
+        max_workers=int(os.environ.get("FINCAL_SHADOW_WORKERS", "1")),
+        max_pending=int(os.environ.get("FINCAL_SHADOW_MAX_PENDING", "16")),
+        tolerance=float(os.environ.get("FINCAL_SHADOW_TOLERANCE", "0.01")),
+    )
+
+# Background jobs for long-running calculations, on a bounded in-process pool
+job_manager = JobManager(
+    max_workers=int(os.environ.get("FINCAL_JOB_WORKERS", "2")),
+    max_pending=int(os.environ.get("FINCAL_JOB_MAX_PENDING", "32")),
+    ttl_seconds=float(os.environ.get("FINCAL_JOB_TTL_SECONDS", "3600")),
+)
+
+# Identical concurrent calculations run once and share the serialized response
+coalescer = SingleFlight()
+
+# Counters for live recalculation sessions
+live_metrics = LiveMetrics()
+
+# Saved plans and house assumptions (FINCAL_PLAN_DB), created on first use
+plan_store = PlanStore()
+
+# Seconds between checks for job updates or a disconnected client on event streams
+JOB_EVENT_POLL_SECONDS = 0.25
+
+# Memory-map the bundled historical returns datasets once
+for dataset_name in DATASETS:
+    load_returns(dataset_name)
+
 
 @app.get("/")
 def read_root():
@@ -49,7 +131,18 @@ def read_root():
         "version": "1.0.0",
         "endpoints": {
             "calculate_sip": "/api/calculate-sip",
-            "calculate_money_journey": "/api/calculate-money-journey"
+            "calculate_money_journey": "/api/calculate-money-journey",
+            "calculate_sip_batch": "/api/calculate-sip/batch",
+            "calculate_money_journey_batch": "/api/calculate-money-journey/batch",
+            "calculate_xirr": "/api/calculate-xirr",
+            "calculate_goals": "/api/calculate-goals",
+            "compare_money_journeys": "/api/compare-money-journeys",
+            "backtest_money_journey": "/api/backtest-money-journey",
+            "simulate_portfolio": "/api/simulate-portfolio",
+            "jobs": "/api/jobs/{kind}",
+            "plans": "/api/plans",
+            "live": "/api/live/{kind}",
+            "limits": "/api/limits"
         }
     }
 
@@ -60,6 +153,98 @@ def health_check():
     return {"status": "healthy"}
 
 
+@app.get("/api/limits")
+def limits():
+    """Deployment limits the UI validates its inputs against"""
+    return {"max_horizon_years": MAX_HORIZON_YEARS}
+
+
+@app.get("/api/metrics")
+def metrics():
+    """Operational metrics for optional subsystems"""
+    return {
+        "shadow": shadow_runner.metrics.snapshot() if shadow_runner is not None else None,
+        "jobs": job_manager.snapshot(),
+        "coalescing": coalescer.snapshot(),
+        "live": live_metrics.snapshot(),
+    }
+
+
+def _validation_error(e: ValidationError) -> HTTPException:
+    return HTTPException(
+        status_code=400,
+        detail={
+            "status": "error",
+            "message": "Validation error",
+            "errors": [
+                {"field": ".".join(str(x) for x in error["loc"]), "message": error["msg"]}
+                for error in e.errors()
+            ]
+        }
+    )
+
+
+def _calculate_once(endpoint: str, request, calculate) -> bytes:
+    """
+    Run a calculation, or join the identical one already in flight.
+
+    Concurrent requests with the same canonical hash share one computation
+    and its JSON encoding, so a burst of identical requests costs one run.
+
+    Returns:
+        The response model encoded as JSON
+    """
+    def compute() -> bytes:
+        start = time.perf_counter()
+        result = calculate(request)
+        if shadow_runner is not None and endpoint in (SIP_ENDPOINT, MONEY_JOURNEY_ENDPOINT):
+            shadow_runner.submit(endpoint, request, result, (time.perf_counter() - start) * 1000)
+        return result.model_dump_json().encode("utf-8")
+
+    body, _ = coalescer.run(request_hash(endpoint, request), compute)
+    return body
+
+
+def _json_response(body: bytes) -> Response:
+    return Response(content=body, media_type="application/json")
+
+
+def _cacheable_calculation(endpoint: str, model, calculate, http_request: Request) -> Response:
+    """
+    Serve a calculation from query parameters with an ETag and long-lived Cache-Control.
+
+    The ETag is derived from the canonical inputs and the engine version, so a
+    matching If-None-Match is answered with 304 without calculating anything.
+    """
+    try:
+        request = model(**parse_query(http_request.query_params.multi_items()))
+        status_code, headers, body = cached_get(
+            endpoint,
+            request,
+            http_request.headers.get("if-none-match"),
+            lambda request: _calculate_once(endpoint, request, calculate),
+        )
+    except ValidationError as e:
+        raise _validation_error(e)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=400,
+            detail={"status": "error", "message": str(e), "errors": []}
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail={
+                "status": "error",
+                "message": f"Internal server error: {str(e)}",
+                "errors": []
+            }
+        )
+    if body is None:
+        return Response(status_code=status_code, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
 @app.post(
     "/api/calculate-sip",
     response_model=SIPCalculationResponse,
@@ -95,9 +280,8 @@ def calculate_sip(request: SIPCalculationRequest):
         HTTPException: For validation errors or calculation failures
     """
     try:
-        # Perform calculation
-        result = calculate_sip_with_annual_compounding(request)
-        return result
+        # Perform calculation, shared with identical requests in flight
+        return _json_response(_calculate_once(SIP_ENDPOINT, request, calculate_sip_with_annual_compounding))
 
     except ValidationError as e:
         # Handle Pydantic validation errors
@@ -117,6 +301,17 @@ def calculate_sip(request: SIPCalculationRequest):
             }
         )
 
+    except ValueError as e:
+        # E.g. a plan too large for exact arithmetic
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "status": "error",
+                "message": str(e),
+                "errors": []
+            }
+        )
+
     except Exception as e:
         # Handle unexpected errors
         raise HTTPException(
@@ -129,6 +324,37 @@ def calculate_sip(request: SIPCalculationRequest):
         )
 
 
+@app.get(
+    "/api/calculate-sip",
+    response_model=SIPCalculationResponse,
+    responses={
+        200: {
+            "description": "Successful calculation, with ETag and Cache-Control headers",
+            "model": SIPCalculationResponse
+        },
+        304: {"description": "Not modified: If-None-Match matched the ETag"},
+        400: {
+            "description": "Validation error",
+            "model": ErrorResponse
+        },
+        500: {
+            "description": "Internal server error",
+            "model": ErrorResponse
+        }
+    }
+)
+def calculate_sip_get(http_request: Request):
+    """
+    Cacheable SIP calculation from query parameters.
+
+    Takes the same fields as the POST endpoint as query parameters, with list
+    and object fields as JSON text. The response carries a strong ETag of the
+    canonical inputs and engine version, long-lived Cache-Control and the
+    canonical URL in Content-Location; If-None-Match is answered with 304.
+    """
+    return _cacheable_calculation("/api/calculate-sip", SIPCalculationRequest, calculate_sip_with_annual_compounding, http_request)
+
+
 @app.post(
     "/api/calculate-money-journey",
     response_model=MoneyJourneyResponse,
@@ -152,8 +378,176 @@ def calculate_money_journey(request: MoneyJourneyRequest):
     Calculate Money Journey — accumulation phase followed by withdrawal phase.
     """
     try:
-        result = compute_money_journey(request)
-        return result
+        return _json_response(_calculate_once(MONEY_JOURNEY_ENDPOINT, request, compute_money_journey))
+
+    except ValidationError as e:
+        error_details = []
+        for error in e.errors():
+            error_details.append({
+                "field": ".".join(str(x) for x in error["loc"]),
+                "message": error["msg"]
+            })
+
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "status": "error",
+                "message": "Validation error",
+                "errors": error_details
+            }
+        )
+
+    except ValueError as e:
+        # E.g. a plan too large for exact arithmetic
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "status": "error",
+                "message": str(e),
+                "errors": []
+            }
+        )
+
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail={
+                "status": "error",
+                "message": f"Internal server error: {str(e)}",
+                "errors": []
+            }
+        )
+
+
+@app.get(
+    "/api/calculate-money-journey",
+    response_model=MoneyJourneyResponse,
+    responses={
+        200: {
+            "description": "Successful calculation, with ETag and Cache-Control headers",
+            "model": MoneyJourneyResponse
+        },
+        304: {"description": "Not modified: If-None-Match matched the ETag"},
+        400: {
+            "description": "Validation error",
+            "model": ErrorResponse
+        },
+        500: {
+            "description": "Internal server error",
+            "model": ErrorResponse
+        }
+    }
+)
+def calculate_money_journey_get(http_request: Request):
+    """
+    Cacheable Money Journey calculation from query parameters.
+
+    Takes the same fields as the POST endpoint as query parameters, with list
+    and object fields as JSON text. The response carries a strong ETag of the
+    canonical inputs and engine version, long-lived Cache-Control and the
+    canonical URL in Content-Location; If-None-Match is answered with 304.
+    """
+    return _cacheable_calculation("/api/calculate-money-journey", MoneyJourneyRequest, compute_money_journey, http_request)
+
+
+@app.post(
+    "/api/calculate-sip/batch",
+    response_model=SIPBatchResponse,
+    responses={
+        200: {
+            "description": "Successful calculation (NDJSON when stream=true)",
+            "model": SIPBatchResponse,
+            "content": {NDJSON_MEDIA_TYPE: {}}
+        },
+        400: {
+            "description": "Validation error",
+            "model": ErrorResponse
+        },
+        500: {
+            "description": "Internal server error",
+            "model": ErrorResponse
+        }
+    }
+)
+def calculate_sip_batch_endpoint(request: SIPBatchRequest, stream: bool = False):
+    """
+    Calculate many SIP plans in one call, vectorized across plans.
+
+    With stream=true the results are streamed as NDJSON, one plan per line in request order.
+    """
+    try:
+        if stream:
+            return ndjson_response(batch_chunks(request.requests, calculate_sip_batch))
+        return SIPBatchResponse(results=calculate_sip_batch(request.requests))
+
+    except ValidationError as e:
+        error_details = []
+        for error in e.errors():
+            error_details.append({
+                "field": ".".join(str(x) for x in error["loc"]),
+                "message": error["msg"]
+            })
+
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "status": "error",
+                "message": "Validation error",
+                "errors": error_details
+            }
+        )
+
+    except ValueError as e:
+        # E.g. a plan too large for exact arithmetic
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "status": "error",
+                "message": str(e),
+                "errors": []
+            }
+        )
+
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail={
+                "status": "error",
+                "message": f"Internal server error: {str(e)}",
+                "errors": []
+            }
+        )
+
+
+@app.post(
+    "/api/calculate-money-journey/batch",
+    response_model=MoneyJourneyBatchResponse,
+    responses={
+        200: {
+            "description": "Successful calculation (NDJSON when stream=true)",
+            "model": MoneyJourneyBatchResponse,
+            "content": {NDJSON_MEDIA_TYPE: {}}
+        },
+        400: {
+            "description": "Validation error",
+            "model": ErrorResponse
+        },
+        500: {
+            "description": "Internal server error",
+            "model": ErrorResponse
+        }
+    }
+)
+def calculate_money_journey_batch_endpoint(request: MoneyJourneyBatchRequest, stream: bool = False):
+    """
+    Calculate many Money Journey plans in one call, vectorized across plans.
+
+    With stream=true the results are streamed as NDJSON, one plan per line in request order.
+    """
+    try:
+        if stream:
+            return ndjson_response(batch_chunks(request.requests, calculate_money_journey_batch))
+        return MoneyJourneyBatchResponse(results=calculate_money_journey_batch(request.requests))
 
     except ValidationError as e:
         error_details = []
@@ -172,6 +566,17 @@ def calculate_money_journey(request: MoneyJourneyRequest):
             }
         )
 
+    except ValueError as e:
+        # E.g. a plan too large for exact arithmetic
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "status": "error",
+                "message": str(e),
+                "errors": []
+            }
+        )
+
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -183,6 +588,536 @@ def calculate_money_journey(request: MoneyJourneyRequest):
         )
 
 
+@app.post(
+    "/api/calculate-xirr",
+    response_model=XIRRBatchResponse,
+    responses={
+        200: {
+            "description": "Successful calculation",
+            "model": XIRRBatchResponse
+        },
+        400: {
+            "description": "Validation error",
+            "model": ErrorResponse
+        },
+        500: {
+            "description": "Internal server error",
+            "model": ErrorResponse
+        }
+    }
+)
+def calculate_xirr_endpoint(request: XIRRBatchRequest):
+    """
+    Calculate XIRR and CAGR for many dated cash-flow series, vectorized across series.
+    """
+    try:
+        return XIRRBatchResponse(results=calculate_xirr_batch(request.series))
+
+    except ValidationError as e:
+        error_details = []
+        for error in e.errors():
+            error_details.append({
+                "field": ".".join(str(x) for x in error["loc"]),
+                "message": error["msg"]
+            })
+
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "status": "error",
+                "message": "Validation error",
+                "errors": error_details
+            }
+        )
+
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail={
+                "status": "error",
+                "message": f"Internal server error: {str(e)}",
+                "errors": []
+            }
+        )
+
+
+@app.post(
+    "/api/calculate-goals",
+    response_model=PlannerResponse,
+    responses={
+        200: {
+            "description": "Successful calculation",
+            "model": PlannerResponse
+        },
+        400: {
+            "description": "Validation error",
+            "model": ErrorResponse
+        },
+        500: {
+            "description": "Internal server error",
+            "model": ErrorResponse
+        }
+    }
+)
+def calculate_goals_endpoint(request: PlannerRequest):
+    """
+    Plan several SIP and Money Journey goals together on one aligned timeline.
+    """
+    try:
+        return calculate_plan(request)
+
+    except ValidationError as e:
+        error_details = []
+        for error in e.errors():
+            error_details.append({
+                "field": ".".join(str(x) for x in error["loc"]),
+                "message": error["msg"]
+            })
+
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "status": "error",
+                "message": "Validation error",
+                "errors": error_details
+            }
+        )
+
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail={
+                "status": "error",
+                "message": f"Internal server error: {str(e)}",
+                "errors": []
+            }
+        )
+
+
+@app.post(
+    "/api/compare-money-journeys",
+    response_model=ScenarioComparisonResponse,
+    responses={
+        200: {
+            "description": "Successful calculation (NDJSON when stream=true)",
+            "model": ScenarioComparisonResponse,
+            "content": {NDJSON_MEDIA_TYPE: {}}
+        },
+        400: {
+            "description": "Validation error",
+            "model": ErrorResponse
+        },
+        500: {
+            "description": "Internal server error",
+            "model": ErrorResponse
+        }
+    }
+)
+def compare_money_journeys_endpoint(request: ScenarioComparisonRequest, stream: bool = False):
+    """
+    Compare Money Journey scenarios, calculating the phase they share only once.
+
+    With stream=true the comparison is streamed as NDJSON: a header line with the
+    status, shared phase and timeline, then one line per scenario, base plan first.
+    """
+    try:
+        if stream:
+            header = {
+                "status": "success",
+                "shared_phase": request.shared_phase,
+                "years": list(range(1, comparison_horizon(request) + 1)),
+            }
+            return ndjson_response(chain([[header]], ([result] for result in scenario_results(request))))
+        return compare_scenarios(request)
+
+    except ValidationError as e:
+        error_details = []
+        for error in e.errors():
+            error_details.append({
+                "field": ".".join(str(x) for x in error["loc"]),
+                "message": error["msg"]
+            })
+
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "status": "error",
+                "message": "Validation error",
+                "errors": error_details
+            }
+        )
+
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail={
+                "status": "error",
+                "message": f"Internal server error: {str(e)}",
+                "errors": []
+            }
+        )
+
+
+@app.post(
+    "/api/backtest-money-journey",
+    response_model=BacktestResponse,
+    responses={
+        200: {
+            "description": "Successful calculation",
+            "model": BacktestResponse
+        },
+        400: {
+            "description": "Validation error",
+            "model": ErrorResponse
+        },
+        500: {
+            "description": "Internal server error",
+            "model": ErrorResponse
+        }
+    }
+)
+def backtest_money_journey_endpoint(request: BacktestRequest):
+    """
+    Run a Money Journey plan over every rolling window of historical returns.
+    """
+    try:
+        return _json_response(_calculate_once("/api/backtest-money-journey", request, run_backtest))
+
+    except ValueError as e:
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "status": "error",
+                "message": str(e),
+                "errors": []
+            }
+        )
+
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail={
+                "status": "error",
+                "message": f"Internal server error: {str(e)}",
+                "errors": []
+            }
+        )
+
+
+@app.post(
+    "/api/simulate-portfolio",
+    response_model=SimulationResponse,
+    responses={
+        200: {
+            "description": "Successful calculation",
+            "model": SimulationResponse
+        },
+        400: {
+            "description": "Validation error",
+            "model": ErrorResponse
+        },
+        500: {
+            "description": "Internal server error",
+            "model": ErrorResponse
+        }
+    }
+)
+def simulate_portfolio_endpoint(request: SimulationRequest):
+    """
+    Simulate a SIP or Money Journey plan invested in a correlated multi-asset portfolio.
+    """
+    try:
+        # Unseeded requests draw fresh paths each time, so only seeded ones are shared
+        if request.seed is None:
+            return run_simulation(request)
+        return _json_response(_calculate_once("/api/simulate-portfolio", request, run_simulation))
+
+    except ValueError as e:
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "status": "error",
+                "message": str(e),
+                "errors": []
+            }
+        )
+
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail={
+                "status": "error",
+                "message": f"Internal server error: {str(e)}",
+                "errors": []
+            }
+        )
+
+
+# Calculations that can also run as background jobs: kind -> (request model, calculation)
+JOB_KINDS = {
+    "simulate-portfolio": (
+        SimulationRequest,
+        lambda request, job: run_simulation(request, progress=job.report),
+    ),
+    "backtest-money-journey": (
+        BacktestRequest,
+        lambda request, job: run_backtest(request, progress=job.report),
+    ),
+    "calculate-sip/batch": (
+        SIPBatchRequest,
+        lambda request, job: SIPBatchResponse(results=run_in_chunks(request.requests, calculate_sip_batch, job)),
+    ),
+    "calculate-money-journey/batch": (
+        MoneyJourneyBatchRequest,
+        lambda request, job: MoneyJourneyBatchResponse(
+            results=run_in_chunks(request.requests, calculate_money_journey_batch, job)
+        ),
+    ),
+    # Job only: re-projecting every stored plan is too long for one request
+    "plans/reproject": (
+        ReprojectionRequest,
+        lambda request, job: plan_store.update_assumptions(
+            request.assumptions, request.chunk_size, progress=job.report
+        ),
+    ),
+}
+
+
+def _job_not_found(job_id: str) -> HTTPException:
+    return HTTPException(
+        status_code=404,
+        detail={
+            "status": "error",
+            "message": f"Unknown or expired job '{job_id}'",
+            "errors": []
+        }
+    )
+
+
+def _register_job_kind(kind: str, request_model, calculate):
+    def submit_job(request: request_model):
+        try:
+            job = job_manager.submit(kind, lambda job: calculate(request, job))
+        except JobQueueFull:
+            raise HTTPException(
+                status_code=429,
+                detail={
+                    "status": "error",
+                    "message": "Too many jobs are queued; try again later",
+                    "errors": []
+                }
+            )
+        return JobSubmission(
+            job_id=job.id,
+            status=job.status,
+            status_url=f"/api/jobs/{job.id}",
+            events_url=f"/api/jobs/{job.id}/events",
+        )
+
+    submit_job.__doc__ = f"Queue /api/{kind} as a background job."
+    app.post(
+        f"/api/jobs/{kind}",
+        status_code=202,
+        response_model=JobSubmission,
+        name=f"submit_{kind.replace('-', '_').replace('/', '_')}_job",
+        responses={
+            202: {
+                "description": "Job queued",
+                "model": JobSubmission
+            },
+            429: {
+                "description": "Job queue full",
+                "model": ErrorResponse
+            }
+        }
+    )(submit_job)
+
+
+for job_kind, (job_request_model, job_calculation) in JOB_KINDS.items():
+    _register_job_kind(job_kind, job_request_model, job_calculation)
+
+
+@app.get(
+    "/api/jobs/{job_id}",
+    response_model=JobStatus,
+    responses={404: {"description": "Unknown or expired job", "model": ErrorResponse}}
+)
+def get_job(job_id: str):
+    """
+    Status, progress and, once finished, the result of a background job.
+    """
+    job = job_manager.get(job_id)
+    if job is None:
+        raise _job_not_found(job_id)
+    return job.snapshot()
+
+
+@app.delete(
+    "/api/jobs/{job_id}",
+    response_model=JobStatus,
+    responses={404: {"description": "Unknown or expired job", "model": ErrorResponse}}
+)
+def cancel_job(job_id: str):
+    """
+    Cancel a queued or running job; a running calculation stops at its next progress report.
+    """
+    job = job_manager.get(job_id)
+    if job is None:
+        raise _job_not_found(job_id)
+    job.cancel()
+    return job.snapshot(include_result=False)
+
+
+@app.get(
+    "/api/jobs/{job_id}/events",
+    responses={404: {"description": "Unknown or expired job", "model": ErrorResponse}}
+)
+async def job_events(job_id: str, request: Request, cancel_on_disconnect: bool = True):
+    """
+    Server-Sent Events stream of a job: `progress` events with interim results,
+    then one `succeeded`, `failed` or `cancelled` event carrying the final state.
+    The job is cancelled if the client disconnects first, unless cancel_on_disconnect=false.
+    """
+    job = job_manager.get(job_id)
+    if job is None:
+        raise _job_not_found(job_id)
+
+    async def stream():
+        sent_version = -1
+        while True:
+            if await request.is_disconnected():
+                if cancel_on_disconnect:
+                    job.cancel()
+                return
+            version = job.version
+            if version != sent_version:
+                sent_version = version
+                finished = job.finished
+                snapshot = job.snapshot(include_result=finished)
+                event = snapshot["status"] if finished else "progress"
+                yield f"event: {event}\ndata: {json.dumps(snapshot)}\n\n"
+                if finished:
+                    return
+            await asyncio.sleep(JOB_EVENT_POLL_SECONDS)
+
+    return StreamingResponse(stream(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+
+def _plan_not_found(plan_id: str) -> HTTPException:
+    return HTTPException(
+        status_code=404,
+        detail={
+            "status": "error",
+            "message": f"Unknown plan '{plan_id}'",
+            "errors": []
+        }
+    )
+
+
+@app.post(
+    "/api/plans",
+    status_code=201,
+    response_model=SavedPlan,
+    responses={
+        201: {
+            "description": "Plan saved and projected",
+            "model": SavedPlan
+        },
+        400: {
+            "description": "Validation error",
+            "model": ErrorResponse
+        },
+        500: {
+            "description": "Internal server error",
+            "model": ErrorResponse
+        }
+    }
+)
+def save_plan(request: SavePlanRequest):
+    """
+    Save a plan to the plan store (replacing one with the same plan_id) and project its summary results.
+
+    Fields listed in `assumptions` take the current value of the named house assumption.
+    """
+    try:
+        return plan_store.save(request)
+
+    except ValidationError as e:
+        raise _validation_error(e)
+
+    except ValueError as e:
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "status": "error",
+                "message": str(e),
+                "errors": []
+            }
+        )
+
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail={
+                "status": "error",
+                "message": f"Internal server error: {str(e)}",
+                "errors": []
+            }
+        )
+
+
+@app.get("/api/plans", response_model=SavedPlanList)
+def list_plans(limit: int = 100, offset: int = 0, assumption: Optional[str] = None, stale: Optional[bool] = None):
+    """
+    Stored plans, oldest first; filter by a house assumption they use or by staleness.
+    """
+    total, plans = plan_store.list(min(max(limit, 1), 1000), max(offset, 0), assumption, stale)
+    return SavedPlanList(total=total, plans=plans)
+
+
+@app.get(
+    "/api/plans/{plan_id}",
+    response_model=SavedPlan,
+    responses={404: {"description": "Unknown plan", "model": ErrorResponse}}
+)
+def get_plan(plan_id: str):
+    """
+    A stored plan with its latest summary results.
+    """
+    plan = plan_store.get(plan_id)
+    if plan is None:
+        raise _plan_not_found(plan_id)
+    return plan
+
+
+@app.get("/api/assumptions", response_model=HouseAssumptions)
+def get_assumptions():
+    """
+    Current house assumptions; change them with POST /api/jobs/plans/reproject.
+    """
+    return HouseAssumptions(assumptions=plan_store.assumptions())
+
+
+@app.websocket("/api/live/{kind}")
+async def live_recalculation(websocket: WebSocket, kind: str):
+    """
+    Live recalculation session for slider-driven UIs; kind is `sip` or `money_journey`.
+
+    The client sends parameter deltas as {"params": {...}} (null resets a
+    field; "replace": true starts over) and receives {"type": "result",
+    "version": n, "response": {...}} for the latest parameters only, or
+    {"type": "error", ...} when they are not a valid plan yet.
+    """
+    if kind not in LIVE_KINDS:
+        await websocket.close(code=1008, reason=f"unknown kind '{kind}'; use one of {sorted(LIVE_KINDS)}")
+        return
+    await websocket.accept()
+    try:
+        await serve_live_session(LiveSession(kind, live_metrics), websocket.receive_text, websocket.send_json)
+    except WebSocketDisconnect:
+        pass
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000, reload=True)
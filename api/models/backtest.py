@@ -0,0 +1,60 @@
+"""
+Pydantic models for historical backtests of Money Journey plans
+"""
+from typing import List, Optional
+from pydantic import BaseModel, Field
+
+from api.models.money_journey import MoneyJourneyRequest
+
+
+class BacktestRequest(BaseModel):
+    """Request model for running a plan over every historical window"""
+    plan: MoneyJourneyRequest = Field(
+        description="Plan to backtest; its return rates are replaced by historical returns"
+    )
+    dataset: str = Field(default="sp500", description="Bundled annual-returns dataset")
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "plan": {
+                    "monthly_investment": 20000,
+                    "accumulation_years": 20,
+                    "accumulation_return_rate": 12.0,
+                    "monthly_withdrawal": 100000,
+                    "withdrawal_years": 30,
+                    "withdrawal_return_rate": 8.0
+                },
+                "dataset": "sp500"
+            }
+        }
+
+
+class BacktestWindow(BaseModel):
+    """Outcome of the plan started in one historical year"""
+    start_year: int = Field(description="Calendar year of the plan's first year")
+    end_year: int = Field(description="Calendar year of the plan's last year")
+    corpus_at_retirement: float = Field(description="Balance at the end of accumulation")
+    total_withdrawals: float = Field(description="Total amount withdrawn")
+    final_balance: float = Field(description="Balance at the end of the plan")
+    depleted: bool = Field(description="Whether the corpus ran out")
+    depletion_year: Optional[int] = Field(default=None, description="Plan year of depletion")
+    depletion_month: Optional[int] = Field(default=None, description="Month within the depletion year (1-12)")
+
+
+class BacktestResults(BaseModel):
+    """Summary across all historical windows"""
+    windows_tested: int = Field(description="Number of rolling start years")
+    successful_windows: int = Field(description="Windows in which the corpus lasted")
+    success_rate: float = Field(description="Percentage of windows in which the corpus lasted")
+    median_final_balance: float = Field(description="Median final balance across windows")
+    worst_window: BacktestWindow = Field(description="Earliest depletion, or lowest final balance if none deplete")
+    best_window: BacktestWindow = Field(description="Highest final balance")
+
+
+class BacktestResponse(BaseModel):
+    """Response model for a historical backtest"""
+    status: str = Field(default="success", description="Response status")
+    inputs: dict = Field(description="Plan and dataset used")
+    results: BacktestResults = Field(description="Summary across windows")
+    windows: List[BacktestWindow] = Field(description="Every window, by start year")
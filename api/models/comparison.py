@@ -0,0 +1,147 @@
+"""
+Pydantic models for comparing Money Journey scenarios
+"""
+from typing import List, Literal, Optional
+from pydantic import BaseModel, Field, PrivateAttr, ValidationError, model_validator
+
+from api.models.limits import MAX_SCENARIOS
+from api.models.money_journey import MoneyJourneyRequest, MoneyJourneyResults
+
+# Scenario overrides may touch only one phase, so the other can be shared
+ACCUMULATION_FIELDS = frozenset({
+    "monthly_investment",
+    "accumulation_years",
+    "accumulation_return_rate",
+    "initial_investment",
+    "annual_step_up_rate",
+    "step_up_cap",
+    "accumulation_return_rates",
+})
+
+WITHDRAWAL_FIELDS = frozenset({
+    "monthly_withdrawal",
+    "withdrawal_years",
+    "withdrawal_return_rate",
+    "withdrawal_step_up_rate",
+    "withdrawal_step_up_cap",
+    "withdrawal_frequency",
+    "withdrawal_compounding_frequency",
+    "withdrawal_return_rates",
+    "withdrawal_policy",
+})
+
+
+class Scenario(BaseModel):
+    """A named variant of the base plan"""
+    label: str = Field(min_length=1, description="Scenario label for charts")
+    overrides: dict = Field(
+        default={},
+        description="Money Journey fields that differ from the base plan, "
+                    "all from the withdrawal phase or all from the accumulation phase"
+    )
+
+
+class ScenarioComparisonRequest(BaseModel):
+    """Request model for comparing scenarios that share one phase of a base plan"""
+    base: MoneyJourneyRequest = Field(description="Plan every scenario starts from")
+    base_label: str = Field(default="Base", min_length=1, description="Label of the base plan")
+    scenarios: List[Scenario] = Field(
+        min_length=1,
+        max_length=MAX_SCENARIOS,
+        description=f"Variants to compare with the base plan (1-{MAX_SCENARIOS})"
+    )
+
+    _requests: List[MoneyJourneyRequest] = PrivateAttr(default=[])
+    _shared_phase: str = PrivateAttr(default="accumulation")
+
+    @model_validator(mode="after")
+    def check_scenarios(self):
+        changed = set().union(*(scenario.overrides.keys() for scenario in self.scenarios))
+        unknown = changed - ACCUMULATION_FIELDS - WITHDRAWAL_FIELDS
+        if unknown:
+            raise ValueError(f"scenarios can only override plan phase fields, not {sorted(unknown)}")
+        if changed & ACCUMULATION_FIELDS and changed & WITHDRAWAL_FIELDS:
+            raise ValueError("scenarios must all vary the withdrawal phase or all vary the accumulation phase")
+
+        labels = [self.base_label] + [scenario.label for scenario in self.scenarios]
+        if len(set(labels)) != len(labels):
+            raise ValueError("scenario labels must be unique")
+
+        requests = [self.base]
+        base = self.base.model_dump()
+        for scenario in self.scenarios:
+            try:
+                requests.append(MoneyJourneyRequest(**{**base, **scenario.overrides}))
+            except ValidationError as e:
+                raise ValueError(f"scenario '{scenario.label}': {e.errors()[0]['msg']}")
+
+        self._requests = requests
+        self._shared_phase = "withdrawal" if changed & ACCUMULATION_FIELDS else "accumulation"
+        return self
+
+    @property
+    def requests(self) -> List[MoneyJourneyRequest]:
+        """Full plan of every scenario, base plan first"""
+        return self._requests
+
+    @property
+    def shared_phase(self) -> str:
+        """Phase whose inputs are identical across all scenarios"""
+        return self._shared_phase
+
+    @property
+    def labels(self) -> List[str]:
+        """Label of every scenario, base plan first"""
+        return [self.base_label] + [scenario.label for scenario in self.scenarios]
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "base": {
+                    "monthly_investment": 20000,
+                    "accumulation_years": 25,
+                    "accumulation_return_rate": 12.0,
+                    "monthly_withdrawal": 150000,
+                    "withdrawal_years": 30,
+                    "withdrawal_return_rate": 8.0
+                },
+                "scenarios": [
+                    {"label": "Spend less", "overrides": {"monthly_withdrawal": 120000}},
+                    {"label": "Inflation-linked", "overrides": {"withdrawal_step_up_rate": 5}}
+                ]
+            }
+        }
+
+
+class ScenarioDeltas(BaseModel):
+    """Scenario results minus base plan results"""
+    corpus_at_retirement: float = Field(description="Difference in corpus at retirement")
+    total_contributions: float = Field(description="Difference in total contributions")
+    total_withdrawals: float = Field(description="Difference in total withdrawals")
+    final_balance: float = Field(description="Difference in final balance")
+    balances: List[Optional[float]] = Field(
+        description="Year-end balance difference on the shared timeline, None where either plan has ended"
+    )
+
+
+class ScenarioResult(BaseModel):
+    """One scenario's results and chart series"""
+    label: str = Field(description="Scenario label")
+    overrides: dict = Field(description="Fields that differ from the base plan")
+    results: MoneyJourneyResults = Field(description="Money Journey results for the scenario")
+    phases: List[Optional[str]] = Field(description="Phase per timeline year, None after the plan ends")
+    balances: List[Optional[float]] = Field(description="Year-end balance per timeline year")
+    annual_amounts: List[Optional[float]] = Field(
+        description="Contribution or withdrawal per timeline year"
+    )
+    deltas: ScenarioDeltas = Field(description="Differences from the base plan")
+
+
+class ScenarioComparisonResponse(BaseModel):
+    """Response model for a scenario comparison, base plan first"""
+    status: str = Field(default="success", description="Response status")
+    shared_phase: Literal["accumulation", "withdrawal"] = Field(
+        description="Phase calculated once and shared by every scenario"
+    )
+    years: List[int] = Field(description="Shared timeline for every series")
+    scenarios: List[ScenarioResult] = Field(description="Base plan followed by each scenario")
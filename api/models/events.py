@@ -0,0 +1,54 @@
+"""
+Pydantic models for irregular cash-flow events
+"""
+from typing import List, Literal, Optional
+from pydantic import BaseModel, Field, model_validator
+
+
+class CashFlowEvent(BaseModel):
+    """A dated adjustment applied on top of a plan's regular monthly cash flows"""
+    type: Literal["lump_sum", "withdrawal", "pause"] = Field(
+        description="'lump_sum' adds money, 'withdrawal' takes money out once, "
+                    "'pause' suspends the regular contribution or withdrawal"
+    )
+    year: int = Field(
+        gt=0,
+        description="Plan year of the event (1-based, continuous across Money Journey phases)"
+    )
+    month: int = Field(
+        ge=1,
+        le=12,
+        default=1,
+        description="Month within the year (1-12)"
+    )
+    amount: Optional[float] = Field(
+        gt=0,
+        default=None,
+        description="Amount for 'lump_sum' and 'withdrawal' events"
+    )
+    months: Optional[int] = Field(
+        gt=0,
+        default=None,
+        description="Length of a 'pause' in months, starting at year/month"
+    )
+
+    @model_validator(mode="after")
+    def check_type_fields(self):
+        if self.type == "pause":
+            if self.months is None:
+                raise ValueError("pause events require 'months'")
+        elif self.amount is None:
+            raise ValueError(f"{self.type} events require 'amount'")
+        return self
+
+    @property
+    def month_index(self) -> int:
+        """Zero-based month offset of the event from the start of the plan"""
+        return (self.year - 1) * 12 + (self.month - 1)
+
+
+def check_events_within(events: Optional[List[CashFlowEvent]], years: int):
+    """Raise if any event starts after the last year of the plan"""
+    for event in events or []:
+        if event.year > years:
+            raise ValueError(f"{event.type} event in year {event.year} is beyond the {years}-year plan")
@@ -0,0 +1,51 @@
+"""
+Pydantic models for exact fixed-point money arithmetic
+"""
+from typing import Dict, Literal, Optional
+from pydantic import BaseModel, Field
+
+# Largest amount, in minor units, exact arithmetic accepts. Keeps every
+# intermediate product of the int64 kernels below 2**63.
+MAX_UNITS = 10 ** 15
+
+# Rounding rules, named after their decimal module equivalents; all are symmetric around zero
+RoundingMode = Literal["half_even", "half_up", "half_down", "up", "down"]
+
+
+class ExactArithmetic(BaseModel):
+    """
+    Opt-in exact arithmetic in integer minor units (e.g. cents).
+
+    Every amount is held as a whole number of minor units and every step that
+    could produce a fraction of one is rounded by an explicit rule, so results
+    and their totals match a ledger kept to the same rules to the last unit.
+    Periodic interest rates are fixed to nine decimal places.
+    """
+    minor_units: int = Field(
+        ge=0,
+        le=3,
+        default=2,
+        description="Decimal places of the currency's minor unit (2 for cents, 0 for whole units)"
+    )
+    amount_rounding: RoundingMode = Field(
+        default="half_up",
+        description="Rounding of input amounts to minor units and of stepped-up contributions and withdrawals"
+    )
+    interest_rounding: RoundingMode = Field(
+        default="half_even",
+        description="Rounding of the interest credited each period"
+    )
+
+    def check_amounts(self, amounts: Dict[str, Optional[float]]):
+        """
+        Raise if an input amount is beyond MAX_UNITS minor units.
+
+        Balances that outgrow the range can only be found by projecting the
+        plan; calculations raise a ValueError for those.
+        """
+        for name, amount in amounts.items():
+            if amount is not None and abs(amount) * 10 ** self.minor_units > MAX_UNITS:
+                raise ValueError(f"{name} {amount} is too large for exact arithmetic")
+
+    class Config:
+        frozen = True
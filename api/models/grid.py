@@ -0,0 +1,19 @@
+"""
+Pydantic models for approximate answers from the precomputed scenario grid
+"""
+from typing import Literal
+from pydantic import BaseModel, Field
+
+
+class Approximation(BaseModel):
+    """How far an interpolated result may be from the full calculation"""
+    method: Literal["grid_interpolation"] = Field(
+        default="grid_interpolation",
+        description="How the result was obtained"
+    )
+    error_bound: float = Field(
+        description="Bound on the absolute error of the headline amounts"
+    )
+    relative_error_bound: float = Field(
+        description="Bound on the relative error of the interpolated growth and withdrawal tables"
+    )
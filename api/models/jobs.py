@@ -0,0 +1,26 @@
+"""
+Pydantic models for background calculation jobs
+"""
+from typing import Literal, Optional
+from pydantic import BaseModel, Field
+
+
+class JobSubmission(BaseModel):
+    """Response model for a queued job"""
+    job_id: str = Field(description="Job identifier")
+    status: str = Field(default="queued", description="Job status")
+    status_url: str = Field(description="GET for status and, once finished, the result")
+    events_url: str = Field(description="Server-Sent Events stream of progress")
+
+
+class JobStatus(BaseModel):
+    """Response model for a job's state"""
+    job_id: str = Field(description="Job identifier")
+    kind: str = Field(description="Calculation the job runs")
+    status: Literal["queued", "running", "succeeded", "failed", "cancelled"] = Field(description="Job status")
+    progress: float = Field(description="Share of the work done, 0 to 1")
+    partial: Optional[dict] = Field(default=None, description="Interim results reported so far")
+    result: Optional[dict] = Field(default=None, description="Response of the calculation, once succeeded")
+    error: Optional[str] = Field(default=None, description="Error message, if failed")
+    created_at: float = Field(description="Submission time (Unix seconds)")
+    finished_at: Optional[float] = Field(default=None, description="Completion time (Unix seconds)")
@@ -0,0 +1,26 @@
+"""
+Request limits shared by the calculator models
+"""
+import os
+
+# Longest horizon, in years, accepted for any single phase of a plan.
+# Engine cost and response size grow linearly with the horizon; see
+# api/benchmark.py for the latency budget enforced at this limit.
+MAX_HORIZON_YEARS = int(os.environ.get("FINCAL_MAX_HORIZON_YEARS", "300"))
+
+# Maximum number of plans accepted by a single batch request
+MAX_BATCH_SIZE = 10_000
+
+# Maximum number of cash-flow series accepted by one XIRR request
+MAX_XIRR_SERIES = 100_000
+
+# Maximum number of goals in one planner request
+MAX_PLANNER_GOALS = 100
+
+# Maximum number of scenarios compared against one base plan
+MAX_SCENARIOS = 100
+
+# Monte Carlo simulation limits
+MAX_SIMULATION_PATHS = 100_000
+MAX_SIMULATION_ASSETS = 10
+MAX_SIMULATION_SCENARIOS = 10
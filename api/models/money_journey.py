@@ -1,8 +1,15 @@
 """
 Pydantic models for Money Journey API
 """
-from typing import List, Optional
-from pydantic import BaseModel, Field
+from typing import List, Literal, Optional
+from pydantic import BaseModel, Field, model_validator
+
+from api.models.events import CashFlowEvent, check_events_within
+from api.models.exact import ExactArithmetic
+from api.models.grid import Approximation
+from api.models.limits import MAX_BATCH_SIZE, MAX_HORIZON_YEARS
+from api.models.policies import WithdrawalPolicy
+from api.models.sip import ReturnRate, check_schedule_length
 
 
 class MoneyJourneyRequest(BaseModel):
@@ -14,8 +21,8 @@ class MoneyJourneyRequest(BaseModel):
     )
     accumulation_years: int = Field(
         gt=0,
-        le=50,
-        description="Accumulation period in years (1-50)"
+        le=MAX_HORIZON_YEARS,
+        description=f"Accumulation period in years (1-{MAX_HORIZON_YEARS})"
     )
     accumulation_return_rate: float = Field(
         ge=0,
@@ -45,8 +52,8 @@ class MoneyJourneyRequest(BaseModel):
     )
     withdrawal_years: int = Field(
         gt=0,
-        le=50,
-        description="Withdrawal period in years (1-50)"
+        le=MAX_HORIZON_YEARS,
+        description=f"Withdrawal period in years (1-{MAX_HORIZON_YEARS})"
     )
     withdrawal_return_rate: float = Field(
         ge=0,
@@ -64,6 +71,80 @@ class MoneyJourneyRequest(BaseModel):
         default=None,
         description="Maximum monthly withdrawal cap when using step-up (optional)"
     )
+    withdrawal_frequency: Literal["annually", "monthly"] = Field(
+        default="annually",
+        description="'annually' takes the full year's withdrawal at the start of each year; "
+                    "'monthly' withdraws at the start of every month"
+    )
+    withdrawal_compounding_frequency: Literal["monthly", "quarterly", "annually"] = Field(
+        default="annually",
+        description="How often returns are credited on the remaining balance during withdrawal"
+    )
+    accumulation_return_rates: Optional[List[ReturnRate]] = Field(
+        default=None,
+        description="Optional per-year accumulation return rates (%), one per accumulation year; "
+                    "overrides accumulation_return_rate"
+    )
+    withdrawal_return_rates: Optional[List[ReturnRate]] = Field(
+        default=None,
+        description="Optional per-year withdrawal return rates (%), one per withdrawal year; "
+                    "overrides withdrawal_return_rate"
+    )
+    withdrawal_policy: Optional[WithdrawalPolicy] = Field(
+        default=None,
+        description="Optional balance-dependent withdrawal rule; without one the withdrawal "
+                    "follows monthly_withdrawal and its step-up"
+    )
+
+    events: Optional[List[CashFlowEvent]] = Field(
+        default=None,
+        description="Optional dated lump sums, one-off withdrawals and pauses; years run "
+                    "continuously across both phases, and a pause in the withdrawal phase "
+                    "suspends the regular withdrawal"
+    )
+    exact: Optional[ExactArithmetic] = Field(
+        default=None,
+        description="Calculate in integer minor units with explicit rounding rules instead of binary floats; "
+                    "not available with a withdrawal_policy"
+    )
+    approximate: bool = Field(
+        default=False,
+        description="Answer by interpolating the precomputed scenario grid, with an error bound, when the "
+                    "plan lies on it; the plan is calculated in full otherwise"
+    )
+    sensitivities: bool = Field(
+        default=False,
+        description="Also return partial derivatives of the final balance and depletion year with respect "
+                    "to the main inputs; not available with a withdrawal_policy"
+    )
+
+    @model_validator(mode="after")
+    def check_rate_schedules(self):
+        check_schedule_length(self.accumulation_return_rates, self.accumulation_years, "accumulation_return_rates")
+        check_schedule_length(self.withdrawal_return_rates, self.withdrawal_years, "withdrawal_return_rates")
+        check_events_within(self.events, self.accumulation_years + self.withdrawal_years)
+        if self.exact is not None and self.withdrawal_policy is not None:
+            raise ValueError("exact arithmetic is not available with a withdrawal_policy")
+        if self.exact is not None:
+            self.exact.check_amounts({
+                "monthly_investment": self.monthly_investment,
+                "initial_investment": self.initial_investment,
+                "step_up_cap": self.step_up_cap,
+                "monthly_withdrawal": self.monthly_withdrawal,
+                "withdrawal_step_up_cap": self.withdrawal_step_up_cap,
+                **{f"events[{i}].amount": event.amount for i, event in enumerate(self.events or [])},
+            })
+        if self.exact is not None and self.approximate:
+            raise ValueError("approximate answers are not available with exact arithmetic")
+        if self.sensitivities and (self.exact is not None or self.withdrawal_policy is not None):
+            raise ValueError("sensitivities are not available with exact arithmetic or a withdrawal_policy")
+        return self
+
+    def withdrawal_rates(self) -> tuple:
+        """Withdrawal-phase return rate (%) for each withdrawal year"""
+        if self.withdrawal_return_rates is not None:
+            return tuple(self.withdrawal_return_rates)
+        return (self.withdrawal_return_rate,) * self.withdrawal_years
 
     class Config:
         json_schema_extra = {
@@ -95,6 +176,37 @@ class MoneyJourneyResults(BaseModel):
     final_balance: float = Field(description="Balance at end of withdrawal phase")
     depleted: bool = Field(description="Whether the corpus was fully depleted")
     depletion_year: Optional[int] = Field(default=None, description="Year when corpus was depleted (if applicable)")
+    depletion_month: Optional[int] = Field(
+        default=None,
+        description="Month (1-12) within the depletion year when the last withdrawal was paid (if applicable)"
+    )
+
+
+class MoneyJourneyInputSensitivities(BaseModel):
+    """Partial derivatives of one Money Journey result with respect to each main input"""
+    monthly_investment: float = Field(description="Per unit of monthly investment")
+    accumulation_return_rate: float = Field(description="Per percentage point of accumulation return (every year)")
+    annual_step_up_rate: float = Field(description="Per percentage point of contribution step-up")
+    accumulation_years: float = Field(description="For one more year of accumulation at the last year's rate")
+    monthly_withdrawal: float = Field(description="Per unit of monthly withdrawal")
+    withdrawal_return_rate: float = Field(description="Per percentage point of withdrawal-phase return (every year)")
+    withdrawal_step_up_rate: float = Field(description="Per percentage point of withdrawal step-up")
+    withdrawal_years: float = Field(description="For one more year of withdrawals at the last year's rate")
+
+
+class MoneyJourneySensitivities(BaseModel):
+    """
+    Partial derivatives of the final balance and depletion year, for extrapolating nearby plans.
+
+    Computed analytically alongside the projection. The depletion year is
+    treated as a continuous time, found by interpolating the balance
+    between the last covered withdrawal and the one that runs it dry.
+    """
+    final_balance: MoneyJourneyInputSensitivities = Field(description="Derivatives of the final balance")
+    depletion_year: Optional[MoneyJourneyInputSensitivities] = Field(
+        default=None,
+        description="Derivatives of the depletion time in years; null if the money lasts"
+    )
 
 
 class MoneyJourneyResponse(BaseModel):
@@ -103,3 +215,26 @@ class MoneyJourneyResponse(BaseModel):
     inputs: dict = Field(description="Input parameters used for calculation")
     results: MoneyJourneyResults = Field(description="Calculation results")
     yearly_breakdown: List[MoneyJourneyYearBreakdown] = Field(description="Year-by-year breakdown")
+    approximation: Optional[Approximation] = Field(
+        default=None,
+        description="Set when the result was interpolated from the scenario grid"
+    )
+    sensitivities: Optional[MoneyJourneySensitivities] = Field(
+        default=None,
+        description="Partial derivatives of the final balance and depletion year, when requested"
+    )
+
+
+class MoneyJourneyBatchRequest(BaseModel):
+    """Request model for calculating many Money Journey plans in one call"""
+    requests: List[MoneyJourneyRequest] = Field(
+        min_length=1,
+        max_length=MAX_BATCH_SIZE,
+        description=f"Plans to calculate (1-{MAX_BATCH_SIZE})"
+    )
+
+
+class MoneyJourneyBatchResponse(BaseModel):
+    """Response model for a Money Journey batch, in request order"""
+    status: str = Field(default="success", description="Response status")
+    results: List[MoneyJourneyResponse] = Field(description="One response per requested plan")
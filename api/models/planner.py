@@ -0,0 +1,128 @@
+"""
+Pydantic models for the multi-goal portfolio planner
+"""
+from typing import List, Optional
+from pydantic import BaseModel, Field, model_validator
+
+from api.models.limits import MAX_HORIZON_YEARS, MAX_PLANNER_GOALS
+from api.models.money_journey import MoneyJourneyRequest, MoneyJourneyResponse
+from api.models.sip import SIPCalculationRequest, SIPCalculationResponse
+
+
+class Goal(BaseModel):
+    """One goal of a plan, given as either a SIP or a Money Journey"""
+    name: str = Field(min_length=1, description="Goal label, e.g. 'Retirement'")
+    start_year: int = Field(
+        ge=1,
+        le=MAX_HORIZON_YEARS,
+        default=1,
+        description="Plan year in which the goal's first year falls"
+    )
+    sip: Optional[SIPCalculationRequest] = Field(default=None, description="Goal funded by a SIP")
+    money_journey: Optional[MoneyJourneyRequest] = Field(
+        default=None,
+        description="Goal with an accumulation and a withdrawal phase"
+    )
+
+    @model_validator(mode="after")
+    def check_exactly_one(self):
+        if (self.sip is None) == (self.money_journey is None):
+            raise ValueError("each goal needs exactly one of 'sip' or 'money_journey'")
+        return self
+
+    @property
+    def years(self) -> int:
+        """Length of the goal's own timeline in years"""
+        if self.sip is not None:
+            return self.sip.time_period_years
+        return self.money_journey.accumulation_years + self.money_journey.withdrawal_years
+
+
+class PlannerRequest(BaseModel):
+    """Request model for evaluating several goals together"""
+    goals: List[Goal] = Field(
+        min_length=1,
+        max_length=MAX_PLANNER_GOALS,
+        description=f"Goals to plan (1-{MAX_PLANNER_GOALS})"
+    )
+
+    @model_validator(mode="after")
+    def check_unique_names(self):
+        names = [goal.name for goal in self.goals]
+        if len(set(names)) != len(names):
+            raise ValueError("goal names must be unique")
+        return self
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "goals": [
+                    {
+                        "name": "Retirement",
+                        "money_journey": {
+                            "monthly_investment": 20000,
+                            "accumulation_years": 25,
+                            "accumulation_return_rate": 12.0,
+                            "monthly_withdrawal": 150000,
+                            "withdrawal_years": 25,
+                            "withdrawal_return_rate": 8.0
+                        }
+                    },
+                    {
+                        "name": "Education",
+                        "sip": {
+                            "monthly_investment": 10000,
+                            "time_period_years": 12,
+                            "annual_return_rate": 11.0
+                        }
+                    },
+                    {
+                        "name": "House",
+                        "start_year": 3,
+                        "sip": {
+                            "monthly_investment": 15000,
+                            "time_period_years": 7,
+                            "annual_return_rate": 9.0
+                        }
+                    }
+                ]
+            }
+        }
+
+
+class GoalResult(BaseModel):
+    """A goal's own calculation, as returned by its single-plan endpoint"""
+    name: str = Field(description="Goal label")
+    start_year: int = Field(description="Plan year in which the goal's first year falls")
+    end_year: int = Field(description="Plan year in which the goal's last year falls")
+    sip: Optional[SIPCalculationResponse] = Field(default=None, description="SIP goal result")
+    money_journey: Optional[MoneyJourneyResponse] = Field(default=None, description="Money Journey goal result")
+
+
+class PlannerYearBreakdown(BaseModel):
+    """Combined cash flows and balances of all goals for one plan year"""
+    year: int = Field(description="Plan year")
+    monthly_outlay: float = Field(description="Total monthly contribution across goals")
+    contributions: float = Field(description="Total contributed across goals this year")
+    withdrawals: float = Field(description="Total withdrawn across goals this year")
+    balance: float = Field(description="Combined end-of-year balance of goals still running")
+    active_goals: int = Field(description="Number of goals running this year")
+
+
+class PlannerResults(BaseModel):
+    """Aggregate results across goals"""
+    total_monthly_outlay: float = Field(description="Monthly contribution needed across goals in year 1")
+    peak_monthly_outlay: float = Field(description="Highest total monthly contribution in any year")
+    peak_outlay_year: int = Field(description="Plan year of the peak monthly contribution")
+    total_contributions: float = Field(description="Total contributed across goals")
+    total_withdrawals: float = Field(description="Total withdrawn across goals")
+    final_value: float = Field(description="Sum of each goal's balance at the end of its own timeline")
+    horizon_years: int = Field(description="Plan year in which the last goal ends")
+
+
+class PlannerResponse(BaseModel):
+    """Response model for the multi-goal planner"""
+    status: str = Field(default="success", description="Response status")
+    results: PlannerResults = Field(description="Aggregate results")
+    goals: List[GoalResult] = Field(description="Per-goal results, in request order")
+    yearly_breakdown: List[PlannerYearBreakdown] = Field(description="Combined year-by-year view")
@@ -0,0 +1,112 @@
+"""
+Pydantic models for the saved-plan store and bulk re-projection
+"""
+from typing import Dict, List, Literal, Optional
+from pydantic import BaseModel, Field, model_validator
+
+from api.models.money_journey import MoneyJourneyRequest
+from api.models.sip import SIPCalculationRequest
+
+# Plan kind -> request model of its inputs
+PLAN_MODELS = {
+    "sip": SIPCalculationRequest,
+    "money_journey": MoneyJourneyRequest,
+}
+
+# Plans read, projected and written back per transaction during re-projection
+DEFAULT_PLAN_CHUNK = 5000
+
+
+class SavePlanRequest(BaseModel):
+    """Request model for saving a plan to the plan store"""
+    plan_id: Optional[str] = Field(
+        default=None,
+        min_length=1,
+        max_length=100,
+        description="Identifier to save under; generated if omitted. Saving under an existing id replaces that plan"
+    )
+    name: Optional[str] = Field(default=None, max_length=200, description="Optional label for the plan")
+    kind: Literal["sip", "money_journey"] = Field(description="Which calculator the plan runs through")
+    inputs: dict = Field(
+        description="Request fields of the plan, as for /api/calculate-sip or /api/calculate-money-journey"
+    )
+    assumptions: Dict[str, str] = Field(
+        default={},
+        description="Request field -> house assumption that supplies its value, "
+                    "e.g. {\"accumulation_return_rate\": \"equity_return\"}"
+    )
+
+    @model_validator(mode="after")
+    def check_assumption_fields(self):
+        unknown = set(self.assumptions) - set(PLAN_MODELS[self.kind].model_fields)
+        if unknown:
+            raise ValueError(f"assumptions name unknown {self.kind} fields: {sorted(unknown)}")
+        return self
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "plan_id": "client-42",
+                "kind": "money_journey",
+                "inputs": {
+                    "monthly_investment": 10000,
+                    "accumulation_years": 20,
+                    "monthly_withdrawal": 50000,
+                    "withdrawal_years": 25
+                },
+                "assumptions": {
+                    "accumulation_return_rate": "equity_return",
+                    "withdrawal_return_rate": "balanced_return"
+                }
+            }
+        }
+
+
+class SavedPlan(BaseModel):
+    """A stored plan with its latest summary results"""
+    plan_id: str = Field(description="Plan identifier")
+    name: Optional[str] = Field(default=None, description="Label of the plan")
+    kind: Literal["sip", "money_journey"] = Field(description="Which calculator the plan runs through")
+    inputs: dict = Field(description="Request fields as saved; fields taken from assumptions are overridden")
+    assumptions: Dict[str, str] = Field(description="Request field -> house assumption supplying its value")
+    results: Optional[dict] = Field(
+        default=None,
+        description="Headline results (the `results` of the calculator response) from the latest projection"
+    )
+    error: Optional[str] = Field(default=None, description="Why the latest projection failed, if it did")
+    stale: bool = Field(description="Whether an assumption the plan uses changed after its latest projection")
+    created_at: float = Field(description="Time the plan was first saved (Unix seconds)")
+    projected_at: Optional[float] = Field(default=None, description="Time of the latest projection (Unix seconds)")
+
+
+class SavedPlanList(BaseModel):
+    """Response model for a page of stored plans, oldest first"""
+    total: int = Field(description="Number of plans matching the filter")
+    plans: List[SavedPlan] = Field(description="Plans on this page")
+
+
+class HouseAssumptions(BaseModel):
+    """Current house assumptions"""
+    assumptions: Dict[str, float] = Field(description="Assumption name -> value")
+
+
+class ReprojectionRequest(BaseModel):
+    """Request model for changing house assumptions and re-projecting the plans that use them"""
+    assumptions: Dict[str, float] = Field(
+        default={},
+        description="House assumptions to set first; new names are created. Plans using one whose "
+                    "value changes become stale"
+    )
+    chunk_size: int = Field(
+        default=DEFAULT_PLAN_CHUNK,
+        ge=1,
+        le=100_000,
+        description="Plans projected and written back per transaction"
+    )
+
+
+class ReprojectionResult(BaseModel):
+    """Outcome of a re-projection"""
+    changed_assumptions: List[str] = Field(description="Assumptions whose value changed")
+    reprojected: int = Field(description="Stale plans projected, including failed ones")
+    failed: int = Field(description="Plans whose inputs are no longer valid under the new assumptions")
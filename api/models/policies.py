@@ -0,0 +1,63 @@
+"""
+Pydantic models for state-dependent withdrawal policies
+"""
+from typing import Literal, Optional
+from pydantic import BaseModel, Field, model_validator
+
+
+class WithdrawalPolicy(BaseModel):
+    """
+    Rule that sets each year's withdrawal from the balance at the start of that year.
+
+    - percent_of_portfolio: withdraw `rate`% of the balance each year
+    - floor_ceiling: withdraw `rate`% of the balance, kept between the monthly
+      `floor` and `ceiling`
+    - guardrails: Guyton-Klinger decision rules starting from monthly_withdrawal.
+      The withdrawal grows by withdrawal_step_up_rate except after a losing year
+      in which the withdrawal rate is above its initial level. If the current
+      withdrawal rate rises more than `band`% above the initial rate, the
+      withdrawal is cut by `adjustment`%. If it falls more than `band`% below,
+      the withdrawal is raised by `adjustment`%.
+    """
+    type: Literal["percent_of_portfolio", "floor_ceiling", "guardrails"] = Field(
+        description="Withdrawal rule"
+    )
+    rate: Optional[float] = Field(
+        gt=0,
+        le=100,
+        default=None,
+        description="Annual withdrawal as a percentage of the balance (percent_of_portfolio, floor_ceiling)"
+    )
+    floor: Optional[float] = Field(
+        ge=0,
+        default=None,
+        description="Minimum monthly withdrawal (floor_ceiling)"
+    )
+    ceiling: Optional[float] = Field(
+        gt=0,
+        default=None,
+        description="Maximum monthly withdrawal (floor_ceiling)"
+    )
+    band: float = Field(
+        gt=0,
+        lt=100,
+        default=20,
+        description="Guardrail width, in percent of the initial withdrawal rate (guardrails)"
+    )
+    adjustment: float = Field(
+        gt=0,
+        lt=100,
+        default=10,
+        description="Percentage cut or raise when a guardrail is crossed (guardrails)"
+    )
+
+    @model_validator(mode="after")
+    def check_parameters(self):
+        if self.type in ("percent_of_portfolio", "floor_ceiling") and self.rate is None:
+            raise ValueError(f"{self.type} policies require 'rate'")
+        if self.type == "floor_ceiling":
+            if self.floor is None or self.ceiling is None:
+                raise ValueError("floor_ceiling policies require 'floor' and 'ceiling'")
+            if self.floor > self.ceiling:
+                raise ValueError("'floor' must not exceed 'ceiling'")
+        return self
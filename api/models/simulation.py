@@ -0,0 +1,225 @@
+"""
+Pydantic models for Monte Carlo simulation of multi-asset portfolios
+"""
+from typing import List, Literal, Optional
+from pydantic import BaseModel, Field, PrivateAttr, ValidationError, model_validator
+
+from api.models.comparison import Scenario
+from api.models.limits import MAX_SIMULATION_ASSETS, MAX_SIMULATION_PATHS, MAX_SIMULATION_SCENARIOS
+from api.models.money_journey import MoneyJourneyRequest
+from api.models.sip import SIPCalculationRequest
+
+
+class Asset(BaseModel):
+    """One asset class of the portfolio"""
+    name: str = Field(min_length=1, description="Asset label, e.g. 'equity'")
+    expected_return: float = Field(ge=-50, le=100, description="Expected annual return (%)")
+    volatility: float = Field(ge=0, le=100, description="Annual volatility, standard deviation (%)")
+    weight: float = Field(ge=0, le=100, description="Target allocation at the start of the plan (%)")
+    end_weight: Optional[float] = Field(
+        ge=0,
+        le=100,
+        default=None,
+        description="Target allocation in the plan's last year (%); weights glide linearly in between"
+    )
+
+
+class Allocation(BaseModel):
+    """Assets, their correlations and the target weights, rebalanced annually"""
+    assets: List[Asset] = Field(
+        min_length=1,
+        max_length=MAX_SIMULATION_ASSETS,
+        description=f"Asset classes (1-{MAX_SIMULATION_ASSETS})"
+    )
+    correlation: Optional[List[List[float]]] = Field(
+        default=None,
+        description="Correlation matrix of annual returns, in asset order (identity if omitted)"
+    )
+
+    @model_validator(mode="after")
+    def check_allocation(self):
+        count = len(self.assets)
+        if abs(sum(a.weight for a in self.assets) - 100) > 1e-6:
+            raise ValueError("asset weights must sum to 100")
+        end_weights = [a.end_weight for a in self.assets]
+        if any(w is not None for w in end_weights):
+            if any(w is None for w in end_weights):
+                raise ValueError("give end_weight for every asset or for none")
+            if abs(sum(end_weights) - 100) > 1e-6:
+                raise ValueError("asset end weights must sum to 100")
+
+        if self.correlation is not None:
+            if len(self.correlation) != count or any(len(row) != count for row in self.correlation):
+                raise ValueError(f"correlation must be a {count}x{count} matrix")
+            for i in range(count):
+                if self.correlation[i][i] != 1:
+                    raise ValueError("correlation diagonal must be 1")
+                for j in range(i):
+                    if self.correlation[i][j] != self.correlation[j][i]:
+                        raise ValueError("correlation must be symmetric")
+                    if abs(self.correlation[i][j]) > 1:
+                        raise ValueError("correlations must be between -1 and 1")
+        return self
+
+
+def _plan_years(plan) -> int:
+    if isinstance(plan, SIPCalculationRequest):
+        return plan.time_period_years
+    return plan.accumulation_years + plan.withdrawal_years
+
+
+class SimulationRequest(BaseModel):
+    """Request model for simulating a plan over random multi-asset return paths"""
+    sip: Optional[SIPCalculationRequest] = Field(default=None, description="SIP plan to simulate")
+    money_journey: Optional[MoneyJourneyRequest] = Field(
+        default=None,
+        description="Money Journey plan to simulate"
+    )
+    allocation: Allocation = Field(description="Portfolio the plan is invested in")
+    paths: int = Field(
+        ge=1,
+        le=MAX_SIMULATION_PATHS,
+        default=1000,
+        description=f"Number of simulated paths (1-{MAX_SIMULATION_PATHS})"
+    )
+    seed: Optional[int] = Field(ge=0, default=None, description="Random seed for reproducible results")
+    chunk_size: int = Field(
+        ge=1,
+        le=MAX_SIMULATION_PATHS,
+        default=10_000,
+        description="Most paths generated at a time; long horizons and many assets use fewer "
+                    "so that memory stays bounded"
+    )
+    sampling: Literal["pseudo_random", "antithetic", "sobol"] = Field(
+        default="pseudo_random",
+        description="Path sampling: independent draws, antithetic pairs, or scrambled Sobol points"
+    )
+    scenarios: List[Scenario] = Field(
+        default=[],
+        max_length=MAX_SIMULATION_SCENARIOS,
+        description="Variants of the plan simulated on the same paths as the plan itself "
+                    "(common random numbers); overrides must keep the plan's length"
+    )
+
+    _scenario_plans: list = PrivateAttr(default=[])
+
+    @model_validator(mode="after")
+    def check_request(self):
+        if (self.sip is None) == (self.money_journey is None):
+            raise ValueError("give exactly one of 'sip' or 'money_journey'")
+        if self.sampling == "antithetic" and self.paths % 2:
+            raise ValueError("antithetic sampling needs an even number of paths")
+
+        plan = self.plan
+        base = plan.model_dump()
+        labels = set()
+        plans = []
+        for scenario in self.scenarios:
+            if scenario.label in labels:
+                raise ValueError("scenario labels must be unique")
+            labels.add(scenario.label)
+            try:
+                variant = type(plan)(**{**base, **scenario.overrides})
+            except ValidationError as e:
+                raise ValueError(f"scenario '{scenario.label}': {e.errors()[0]['msg']}")
+            if _plan_years(variant) != _plan_years(plan):
+                raise ValueError(f"scenario '{scenario.label}' must keep the plan's total length")
+            plans.append(variant)
+        self._scenario_plans = plans
+        return self
+
+    @property
+    def plan(self):
+        return self.sip if self.sip is not None else self.money_journey
+
+    @property
+    def scenario_plans(self) -> list:
+        """Full plan of every scenario, in request order"""
+        return self._scenario_plans
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "money_journey": {
+                    "monthly_investment": 20000,
+                    "accumulation_years": 25,
+                    "accumulation_return_rate": 10.0,
+                    "monthly_withdrawal": 100000,
+                    "withdrawal_years": 30,
+                    "withdrawal_return_rate": 7.0
+                },
+                "allocation": {
+                    "assets": [
+                        {"name": "equity", "expected_return": 11, "volatility": 18, "weight": 70, "end_weight": 40},
+                        {"name": "debt", "expected_return": 7, "volatility": 5, "weight": 25, "end_weight": 50},
+                        {"name": "cash", "expected_return": 4, "volatility": 1, "weight": 5, "end_weight": 10}
+                    ],
+                    "correlation": [[1, 0.1, 0], [0.1, 1, 0.2], [0, 0.2, 1]]
+                },
+                "paths": 4096,
+                "seed": 42,
+                "sampling": "antithetic",
+                "scenarios": [{"label": "Spend less", "overrides": {"monthly_withdrawal": 80000}}]
+            }
+        }
+
+
+class Percentiles(BaseModel):
+    """Distribution of a value across simulated paths"""
+    p5: float = Field(description="5th percentile")
+    p25: float = Field(description="25th percentile")
+    p50: float = Field(description="Median")
+    p75: float = Field(description="75th percentile")
+    p95: float = Field(description="95th percentile")
+
+
+class SimulationYear(BaseModel):
+    """Balance distribution at the end of one plan year"""
+    year: int = Field(description="Plan year")
+    balance: Percentiles = Field(description="Year-end balance across paths")
+
+
+class SimulationResults(BaseModel):
+    """Summary across simulated paths"""
+    paths: int = Field(description="Number of simulated paths")
+    success_rate: float = Field(description="Percentage of paths in which the money lasted")
+    success_rate_standard_error: Optional[float] = Field(
+        default=None,
+        description="Standard error of the success rate, in percentage points"
+    )
+    mean_final_balance: float = Field(description="Mean balance at the end of the plan")
+    mean_final_balance_standard_error: Optional[float] = Field(
+        default=None,
+        description="Standard error of the mean final balance"
+    )
+    corpus_at_retirement: Percentiles = Field(description="Balance at the end of accumulation")
+    final_balance: Percentiles = Field(description="Balance at the end of the plan")
+    median_depletion_year: Optional[float] = Field(
+        default=None,
+        description="Median plan year of depletion among depleted paths"
+    )
+
+
+class SimulationScenarioResult(BaseModel):
+    """Outcome of a scenario simulated on the same paths as the plan"""
+    label: str = Field(description="Scenario label")
+    results: SimulationResults = Field(description="Summary across paths")
+    success_rate_difference: float = Field(description="Scenario success rate minus the plan's, in percentage points")
+    success_rate_difference_standard_error: Optional[float] = Field(
+        default=None,
+        description="Standard error of the paired difference in success rate"
+    )
+    mean_final_balance_difference: float = Field(description="Scenario mean final balance minus the plan's")
+    mean_final_balance_difference_standard_error: Optional[float] = Field(
+        default=None,
+        description="Standard error of the paired difference in mean final balance"
+    )
+
+
+class SimulationResponse(BaseModel):
+    """Response model for a Monte Carlo simulation"""
+    status: str = Field(default="success", description="Response status")
+    inputs: dict = Field(description="Plan, allocation and simulation settings used")
+    results: SimulationResults = Field(description="Summary across paths")
+    yearly_percentiles: List[SimulationYear] = Field(description="Year-end balance bands for fan charts")
+    scenarios: List[SimulationScenarioResult] = Field(default=[], description="Scenario outcomes, in request order")
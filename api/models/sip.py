@@ -1,8 +1,22 @@
 """
 Pydantic models for SIP calculator API
 """
-from typing import List, Optional
-from pydantic import BaseModel, Field
+from typing import Annotated, List, Literal, Optional
+from pydantic import BaseModel, Field, model_validator
+
+from api.models.events import CashFlowEvent, check_events_within
+from api.models.exact import ExactArithmetic
+from api.models.grid import Approximation
+from api.models.limits import MAX_BATCH_SIZE, MAX_HORIZON_YEARS
+
+# A single annual return rate in percent, as accepted in per-year rate schedules
+ReturnRate = Annotated[float, Field(ge=0, le=100)]
+
+
+def check_schedule_length(rates: Optional[List[float]], years: int, field: str):
+    """Raise if a per-year rate schedule does not have exactly one entry per year"""
+    if rates is not None and len(rates) != years:
+        raise ValueError(f"{field} must have one entry per year ({years}), got {len(rates)}")
 
 
 class SIPCalculationRequest(BaseModel):
@@ -13,8 +27,8 @@ class SIPCalculationRequest(BaseModel):
     )
     time_period_years: int = Field(
         gt=0,
-        le=50,
-        description="Investment period in years (1-50)"
+        le=MAX_HORIZON_YEARS,
+        description=f"Investment period in years (1-{MAX_HORIZON_YEARS})"
     )
     annual_return_rate: float = Field(
         ge=0,
@@ -37,6 +51,62 @@ class SIPCalculationRequest(BaseModel):
         default=None,
         description="Maximum monthly contribution cap when using step-up (optional)"
     )
+    compounding_frequency: Literal["monthly", "quarterly", "annually"] = Field(
+        default="annually",
+        description="How often interest is credited; contributions are made monthly"
+    )
+    annual_return_rates: Optional[List[ReturnRate]] = Field(
+        default=None,
+        description="Optional per-year return rates (%), one per year; overrides annual_return_rate "
+                    "to model a glide path"
+    )
+
+    events: Optional[List[CashFlowEvent]] = Field(
+        default=None,
+        description="Optional dated lump sums, one-off withdrawals and contribution pauses"
+    )
+    exact: Optional[ExactArithmetic] = Field(
+        default=None,
+        description="Calculate in integer minor units with explicit rounding rules instead of binary floats"
+    )
+    approximate: bool = Field(
+        default=False,
+        description="Answer by interpolating the precomputed scenario grid, with an error bound, when the "
+                    "plan lies on it; the plan is calculated in full otherwise"
+    )
+    sensitivities: bool = Field(
+        default=False,
+        description="Also return partial derivatives of the future value with respect to the main inputs"
+    )
+    vintages: bool = Field(
+        default=False,
+        description="Also return what each year's contributions are worth at the end of every later year"
+    )
+
+    @model_validator(mode="after")
+    def check_rate_schedule(self):
+        check_schedule_length(self.annual_return_rates, self.time_period_years, "annual_return_rates")
+        check_events_within(self.events, self.time_period_years)
+        if self.exact is not None:
+            self.exact.check_amounts({
+                "monthly_investment": self.monthly_investment,
+                "initial_investment": self.initial_investment,
+                "step_up_cap": self.step_up_cap,
+                **{f"events[{i}].amount": event.amount for i, event in enumerate(self.events or [])},
+            })
+        if self.exact is not None and self.approximate:
+            raise ValueError("approximate answers are not available with exact arithmetic")
+        if self.exact is not None and self.sensitivities:
+            raise ValueError("sensitivities are not available with exact arithmetic")
+        if self.vintages and (self.exact is not None or any(e.type == "withdrawal" for e in self.events or [])):
+            raise ValueError("vintages are not available with exact arithmetic or withdrawal events")
+        return self
+
+    def return_rates(self) -> tuple:
+        """Annual return rate (%) for each year of the plan"""
+        if self.annual_return_rates is not None:
+            return tuple(self.annual_return_rates)
+        return (self.annual_return_rate,) * self.time_period_years
 
     class Config:
         json_schema_extra = {
@@ -64,16 +134,69 @@ class SIPCalculationResults(BaseModel):
     """Calculation results"""
     future_value: float = Field(description="Total future value of investment")
     total_invested: float = Field(description="Total amount invested")
+    total_withdrawn: float = Field(default=0, description="Total taken out by withdrawal events")
     total_returns: float = Field(description="Total returns earned")
     returns_percentage: float = Field(description="Returns as percentage of invested amount")
 
 
+class SIPSensitivities(BaseModel):
+    """
+    Partial derivatives of the future value, for extrapolating nearby plans.
+
+    Computed analytically alongside the projection. At a step-up cap or an
+    overdrawn withdrawal event the derivative of the branch in effect is used.
+    """
+    annual_return_rate: float = Field(description="Change in future value per percentage point of return (every year)")
+    annual_step_up_rate: float = Field(description="Change in future value per percentage point of step-up")
+    monthly_investment: float = Field(description="Change in future value per unit of monthly investment")
+    time_period_years: float = Field(
+        description="Change in future value from investing one more year at the last year's rate"
+    )
+
+
+class ContributionVintages(BaseModel):
+    """
+    What each year's contributions are worth at the end of that year and every later year.
+
+    The contribution year x valuation year matrix is upper triangular, so only
+    its upper triangle is sent, row by row: contribution year 1 valued at
+    years 1..n, then year 2 at years 2..n, and so on, n(n+1)/2 values in all.
+    Year 1 includes the initial investment, and each valuation year's values
+    sum to that year's future value.
+    """
+    encoding: Literal["upper_triangular_rows"] = Field(
+        default="upper_triangular_rows",
+        description="Packing of the matrix into values"
+    )
+    years: int = Field(description="Number of contribution (and valuation) years, n")
+    values: List[float] = Field(description="Upper triangle of the matrix, row by row")
+
+    def value(self, contribution_year: int, valuation_year: int) -> float:
+        """Value at the end of valuation_year of contribution_year's contributions (0 before they are made)"""
+        if valuation_year < contribution_year:
+            return 0.0
+        row = contribution_year - 1
+        return self.values[row * self.years - row * (row - 1) // 2 + valuation_year - contribution_year]
+
+
 class SIPCalculationResponse(BaseModel):
     """Response model for SIP calculation"""
     status: str = Field(default="success", description="Response status")
     inputs: dict = Field(description="Input parameters used for calculation")
     results: SIPCalculationResults = Field(description="Calculation results")
     yearly_breakdown: List[YearlyBreakdown] = Field(description="Year-by-year breakdown")
+    approximation: Optional[Approximation] = Field(
+        default=None,
+        description="Set when the result was interpolated from the scenario grid"
+    )
+    sensitivities: Optional[SIPSensitivities] = Field(
+        default=None,
+        description="Partial derivatives of the future value, when requested"
+    )
+    vintages: Optional[ContributionVintages] = Field(
+        default=None,
+        description="Value of each year's contributions at every later year, when requested"
+    )
 
     class Config:
         json_schema_extra = {
@@ -104,6 +227,21 @@ class SIPCalculationResponse(BaseModel):
         }
 
 
+class SIPBatchRequest(BaseModel):
+    """Request model for calculating many SIP plans in one call"""
+    requests: List[SIPCalculationRequest] = Field(
+        min_length=1,
+        max_length=MAX_BATCH_SIZE,
+        description=f"Plans to calculate (1-{MAX_BATCH_SIZE})"
+    )
+
+
+class SIPBatchResponse(BaseModel):
+    """Response model for a SIP batch, in request order"""
+    status: str = Field(default="success", description="Response status")
+    results: List[SIPCalculationResponse] = Field(description="One response per requested plan")
+
+
 class ErrorResponse(BaseModel):
     """Error response model"""
     status: str = Field(default="error", description="Response status")
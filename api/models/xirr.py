@@ -0,0 +1,74 @@
+"""
+Pydantic models for XIRR / CAGR on realized cash-flow histories
+"""
+import datetime
+from typing import List, Optional
+from pydantic import BaseModel, Field, model_validator
+
+from api.models.limits import MAX_XIRR_SERIES
+
+
+class CashFlowSeries(BaseModel):
+    """
+    A portfolio's dated cash flows, in any order, from the investor's point of view.
+
+    Flows are given as parallel lists rather than one object per flow, which
+    keeps validation of very large batches fast.
+    """
+    id: Optional[str] = Field(default=None, description="Caller's identifier, echoed in the result")
+    dates: List[datetime.date] = Field(min_length=2, description="Transaction dates (YYYY-MM-DD)")
+    amounts: List[float] = Field(
+        min_length=2,
+        description="Amount for each date: negative for money invested, positive for "
+                    "money received or the current value of the holding"
+    )
+
+    @model_validator(mode="after")
+    def check_flows(self):
+        if len(self.dates) != len(self.amounts):
+            raise ValueError("dates and amounts must have the same length")
+        if min(self.amounts) >= 0 or max(self.amounts) <= 0:
+            raise ValueError("amounts need at least one negative and one positive value")
+        if min(self.dates) == max(self.dates):
+            raise ValueError("dates must span more than one day")
+        return self
+
+
+class XIRRBatchRequest(BaseModel):
+    """Request model for XIRR and CAGR across many cash-flow series"""
+    series: List[CashFlowSeries] = Field(
+        min_length=1,
+        max_length=MAX_XIRR_SERIES,
+        description=f"Cash-flow series to evaluate (1-{MAX_XIRR_SERIES})"
+    )
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "series": [
+                    {
+                        "id": "portfolio-1",
+                        "dates": ["2020-01-01", "2021-01-01", "2023-01-01"],
+                        "amounts": [-10000, -10000, 25000]
+                    }
+                ]
+            }
+        }
+
+
+class XIRRResult(BaseModel):
+    """XIRR and CAGR for one series"""
+    id: Optional[str] = Field(default=None, description="Identifier from the request")
+    xirr: Optional[float] = Field(description="Annualized internal rate of return in percent, None if not found")
+    cagr: Optional[float] = Field(
+        description="Annualized growth of total received over total invested, in percent; "
+                    "None if it overflows, as for a large gain over a few days"
+    )
+    converged: bool = Field(description="Whether the XIRR solver converged for this series")
+    iterations: int = Field(description="Solver iterations used for this series")
+
+
+class XIRRBatchResponse(BaseModel):
+    """Response model for an XIRR batch, in request order"""
+    status: str = Field(default="success", description="Response status")
+    results: List[XIRRResult] = Field(description="One result per requested series")
@@ -0,0 +1,160 @@
+"""
+Replay captured calculator requests through two engines and report latency and numeric diffs
+
+Usage:
+    python -m api.replay captures/requests.jsonl* --candidate my_package.engine
+"""
+import argparse
+import json
+import sys
+import time
+from typing import Callable, Dict, Iterable, List
+
+from pydantic import ValidationError
+
+from api.services.engine_diff import CURRENT_ENGINE, ENDPOINTS, diff_responses, load_engine
+
+
+def read_captures(paths: Iterable[str]) -> List[dict]:
+    """Read capture records from JSONL files, in file order then line order"""
+    records = []
+    for path in paths:
+        with open(path, encoding="utf-8") as capture_file:
+            for line in capture_file:
+                line = line.strip()
+                if line:
+                    records.append(json.loads(line))
+    return records
+
+
+def _timed(function: Callable, request, repeat: int):
+    """Run a calculation `repeat` times and return (best latency in ms, last response)"""
+    best = None
+    response = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        response = function(request)
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best, response
+
+
+def replay(
+    records: List[dict],
+    baseline: Dict[str, Callable],
+    candidate: Dict[str, Callable],
+    tolerance: float = 0.01,
+    repeat: int = 1,
+) -> List[dict]:
+    """
+    Run every captured request through both engines.
+
+    Args:
+        records: Capture records with "endpoint" and "body" keys
+        baseline: Engine mapping from load_engine()
+        candidate: Engine mapping from load_engine()
+        tolerance: Absolute tolerance for numeric result differences
+        repeat: Runs per engine per request; the fastest run is reported
+
+    Returns:
+        One report dict per record, in input order
+    """
+    reports = []
+    for index, record in enumerate(records):
+        endpoint = record.get("endpoint")
+        report = {"index": index, "endpoint": endpoint}
+
+        if endpoint not in ENDPOINTS:
+            report["error"] = f"Unknown endpoint: {endpoint}"
+            reports.append(report)
+            continue
+
+        request_model, _ = ENDPOINTS[endpoint]
+        try:
+            request = request_model(**record.get("body", {}))
+        except ValidationError as e:
+            report["error"] = f"Validation error: {e.error_count()} field(s)"
+            reports.append(report)
+            continue
+
+        baseline_ms, baseline_response = _timed(baseline[endpoint], request, repeat)
+        candidate_ms, candidate_response = _timed(candidate[endpoint], request, repeat)
+
+        report.update({
+            "baseline_ms": baseline_ms,
+            "candidate_ms": candidate_ms,
+            "delta_ms": candidate_ms - baseline_ms,
+            "diffs": diff_responses(
+                baseline_response.model_dump(),
+                candidate_response.model_dump(),
+                tolerance,
+            ),
+        })
+        reports.append(report)
+
+    return reports
+
+
+def summarize(reports: List[dict]) -> dict:
+    """Aggregate per-request reports into totals for the replay run"""
+    compared = [r for r in reports if "error" not in r]
+    return {
+        "requests": len(reports),
+        "compared": len(compared),
+        "errors": len(reports) - len(compared),
+        "mismatched": sum(1 for r in compared if r["diffs"]),
+        "baseline_ms_total": sum(r["baseline_ms"] for r in compared),
+        "candidate_ms_total": sum(r["candidate_ms"] for r in compared),
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("captures", nargs="+", help="Capture JSONL files to replay")
+    parser.add_argument("--baseline", default=CURRENT_ENGINE, help="Baseline engine (default: current)")
+    parser.add_argument("--candidate", default=CURRENT_ENGINE, help="Candidate engine module path")
+    parser.add_argument("--tolerance", type=float, default=0.01, help="Absolute numeric tolerance")
+    parser.add_argument("--repeat", type=int, default=1, help="Timed runs per engine per request")
+    parser.add_argument("--json", action="store_true", help="Emit one JSON report per line")
+    args = parser.parse_args(argv)
+
+    reports = replay(
+        read_captures(args.captures),
+        load_engine(args.baseline),
+        load_engine(args.candidate),
+        tolerance=args.tolerance,
+        repeat=args.repeat,
+    )
+
+    for report in reports:
+        if args.json:
+            print(json.dumps(report))
+        elif "error" in report:
+            print(f"#{report['index']:<6} {report['endpoint']}  ERROR {report['error']}")
+        else:
+            print(
+                f"#{report['index']:<6} {report['endpoint']}  "
+                f"baseline {report['baseline_ms']:.3f} ms  "
+                f"candidate {report['candidate_ms']:.3f} ms  "
+                f"delta {report['delta_ms']:+.3f} ms  "
+                f"diffs {len(report['diffs'])}"
+            )
+            for diff in report["diffs"]:
+                print(f"        {diff['path']}: {diff['baseline']} -> {diff['candidate']}")
+
+    summary = summarize(reports)
+    if args.json:
+        print(json.dumps({"summary": summary}))
+    else:
+        print(
+            f"{summary['compared']}/{summary['requests']} compared, "
+            f"{summary['mismatched']} mismatched, {summary['errors']} errors; "
+            f"baseline {summary['baseline_ms_total']:.1f} ms, "
+            f"candidate {summary['candidate_ms_total']:.1f} ms"
+        )
+
+    return 1 if summary["mismatched"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
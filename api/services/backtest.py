@@ -0,0 +1,120 @@
+"""
+Historical backtests: a Money Journey plan over every rolling window of past returns
+"""
+from typing import Callable, Optional
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from api.models.backtest import BacktestRequest, BacktestResponse, BacktestResults, BacktestWindow
+from api.services.historical import load_returns
+from api.services.paths import project_paths
+
+# Windows projected together between progress reports
+BACKTEST_CHUNK = 16
+
+
+def run_backtest(
+    request: BacktestRequest,
+    progress: Optional[Callable[[float, dict], None]] = None,
+) -> BacktestResponse:
+    """
+    Run a plan over every rolling start year of a historical returns dataset.
+
+    A window is the plan's accumulation and withdrawal years laid over
+    consecutive calendar years. sliding_window_view turns the dataset into
+    a (windows, years) view without copying, and the windows are evaluated
+    BACKTEST_CHUNK at a time by project_paths, with the plan's return rates
+    replaced by each window's realized returns. A realized annual return is spread evenly
+    over its compounding or withdrawal periods, so compounding frequencies
+    do not change the yearly growth.
+
+    Args:
+        request: BacktestRequest with the plan and dataset name
+        progress: Optional callback given the share of windows done and the
+            windows and successful windows so far after every chunk
+
+    Returns:
+        BacktestResponse with every window and a summary
+
+    Raises:
+        ValueError: If the dataset is unknown or shorter than the plan
+    """
+    plan = request.plan
+    dataset = load_returns(request.dataset)
+    accumulation_years = plan.accumulation_years
+    length = accumulation_years + plan.withdrawal_years
+    if length > len(dataset.returns):
+        raise ValueError(
+            f"The plan spans {length} years but the '{request.dataset}' dataset "
+            f"covers only {len(dataset.returns)} ({dataset.first_year}-{dataset.last_year})"
+        )
+
+    windows = sliding_window_view(np.asarray(dataset.returns, dtype=float), length)
+    count = len(windows)
+
+    # Chunks of windows through the regular projection kernels
+    chunks = []
+    successful = 0
+    for start in range(0, count, BACKTEST_CHUNK):
+        outcomes = project_paths(plan, 1 + windows[start:start + BACKTEST_CHUNK])
+        chunks.append(outcomes)
+        successful += int((outcomes.depletion_period < 0).sum())
+        if progress is not None:
+            done = start + len(outcomes.corpus)
+            progress(done / count, {"windows_done": done, "successful_windows": successful})
+
+    corpus = np.concatenate([outcomes.corpus for outcomes in chunks])
+    total_withdrawals = np.concatenate([outcomes.total_withdrawals for outcomes in chunks])
+    final_balance = np.concatenate([outcomes.final_balance for outcomes in chunks])
+    depletion_period = np.concatenate([outcomes.depletion_period for outcomes in chunks])
+    depleted = depletion_period >= 0
+    depletion_index, depletion_month = np.divmod(depletion_period, chunks[0].periods_per_year)
+
+    # Worst: earliest depletion, then lowest final balance; best: the reverse
+    lasted = np.where(depleted, depletion_period, np.iinfo(np.int64).max)
+    worst = int(np.lexsort((final_balance, lasted))[0])
+    best = int(np.lexsort((-final_balance, -lasted))[0])
+
+    corpus_list = corpus.tolist()
+    withdrawals_list = total_withdrawals.tolist()
+    final_list = final_balance.tolist()
+    depleted_list = depleted.tolist()
+    depletion_year_list = (accumulation_years + depletion_index + 1).tolist()
+    depletion_month_list = (depletion_month + 1).tolist()
+
+    window_results = []
+    for row in range(count):
+        start_year = dataset.first_year + row
+        window_results.append(BacktestWindow(
+            start_year=start_year,
+            end_year=start_year + length - 1,
+            corpus_at_retirement=round(corpus_list[row], 2),
+            total_withdrawals=round(withdrawals_list[row], 2),
+            final_balance=round(final_list[row], 2),
+            depleted=depleted_list[row],
+            depletion_year=depletion_year_list[row] if depleted_list[row] else None,
+            depletion_month=depletion_month_list[row] if depleted_list[row] else None,
+        ))
+
+    results = BacktestResults(
+        windows_tested=count,
+        successful_windows=successful,
+        success_rate=round(successful / count * 100, 2),
+        median_final_balance=round(float(np.median(final_balance)), 2),
+        worst_window=window_results[worst],
+        best_window=window_results[best],
+    )
+
+    inputs_dict = {
+        "plan": plan.model_dump(),
+        "dataset": request.dataset,
+        "dataset_years": [dataset.first_year, dataset.last_year],
+    }
+
+    return BacktestResponse(
+        status="success",
+        inputs=inputs_dict,
+        results=results,
+        windows=window_results,
+    )
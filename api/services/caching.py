@@ -0,0 +1,124 @@
+"""
+HTTP caching of calculations: canonical query strings, ETags and Cache-Control
+"""
+import hashlib
+import json
+from typing import Callable, Iterable, Optional, Tuple
+from urllib.parse import urlencode
+
+from api.services.grid import grid_digest
+
+# Bump whenever a change to the calculation engine changes any result, so
+# ETags (and therefore cached responses) from older engines stop matching
+ENGINE_VERSION = "2026.10.5"
+
+# Results never change for a given URL within one engine version. Browsers
+# revalidate daily (a cheap 304 against the ETag); shared caches such as the
+# Vercel edge keep responses for a year and are purged on every deployment.
+CACHE_CONTROL = "public, max-age=86400, s-maxage=31536000, stale-while-revalidate=86400"
+
+
+def _encode(value) -> str:
+    if isinstance(value, str):
+        return value
+    return json.dumps(value, sort_keys=True, separators=(",", ":"))
+
+
+def canonical_query(request) -> str:
+    """
+    Canonical query string of a validated request model.
+
+    Fields left at their defaults are dropped, the rest are sorted by name,
+    numbers take their validated type's JSON form (5000 -> 5000.0 for float
+    fields) and lists or objects are compact JSON with sorted keys, so every
+    spelling of the same inputs maps to one string.
+    """
+    values = request.model_dump(mode="json", exclude_defaults=True)
+    return urlencode([(name, _encode(values[name])) for name in sorted(values)])
+
+
+def parse_query(pairs: Iterable[Tuple[str, str]]) -> dict:
+    """
+    Turn query parameters into request model keyword arguments.
+
+    List and object fields (rate schedules, events, withdrawal policies) are
+    given as JSON text; scalars are left for the model to coerce.
+
+    Raises:
+        ValueError: If a parameter is repeated or holds invalid JSON
+    """
+    inputs = {}
+    for name, value in pairs:
+        if name in inputs:
+            raise ValueError(f"query parameter '{name}' is given more than once")
+        value = value.strip()
+        if value[:1] in ("[", "{"):
+            try:
+                value = json.loads(value)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"query parameter '{name}' is not valid JSON: {e}")
+        inputs[name] = value
+    return inputs
+
+
+def request_hash(endpoint: str, request) -> str:
+    """
+    SHA-256 of the engine version, endpoint and canonical inputs.
+
+    Approximate answers also depend on the scenario grid being served (or
+    on there being none, when they are calculated in full), so the grid's
+    digest is part of their key.
+    """
+    key = f"{ENGINE_VERSION}\n{endpoint}\n{canonical_query(request)}"
+    if getattr(request, "approximate", False):
+        key += f"\n{grid_digest()}"
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+def etag_for(endpoint: str, request) -> str:
+    """Strong ETag for the response to a request"""
+    return f'"{request_hash(endpoint, request)[:32]}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header matches the ETag (weak comparison, per RFC 9110)"""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+def cached_get(
+    endpoint: str,
+    request,
+    if_none_match: Optional[str],
+    calculate: Callable[[object], object],
+) -> Tuple[int, dict, Optional[bytes]]:
+    """
+    Answer a GET for a calculation, skipping the calculation on a conditional hit.
+
+    Args:
+        endpoint: Endpoint path, part of the ETag
+        request: Validated request model
+        if_none_match: If-None-Match request header, if any
+        calculate: Calculation function returning the response model, or its
+            JSON encoding as bytes
+
+    Returns:
+        Tuple of (status code, caching headers, JSON response body or None for 304)
+    """
+    etag = etag_for(endpoint, request)
+    headers = {
+        "ETag": etag,
+        "Cache-Control": CACHE_CONTROL,
+        "Content-Location": f"{endpoint}?{canonical_query(request)}",
+    }
+    if etag_matches(if_none_match, etag):
+        return 304, headers, None
+    body = calculate(request)
+    if not isinstance(body, bytes):
+        body = body.model_dump_json().encode("utf-8")
+    return 200, headers, body
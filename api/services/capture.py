@@ -0,0 +1,167 @@
+"""
+Sampled, anonymized capture of calculator request bodies for offline replay
+"""
+import json
+import logging
+import math
+import os
+import random
+from datetime import datetime, timezone
+from logging.handlers import RotatingFileHandler
+from typing import Optional, Tuple
+
+from api.models.money_journey import MoneyJourneyRequest
+from api.models.sip import SIPCalculationRequest
+from api.services.engine_diff import ENDPOINTS
+
+# Monetary fields of each request model, coarsened so captured plans cannot be matched
+# back to a client. A path is a sequence of keys; "[]" stands for every item of a list
+_PLAN_MONEY_PATHS = {
+    ("monthly_investment",),
+    ("initial_investment",),
+    ("step_up_cap",),
+    ("events", "[]", "amount"),
+}
+MONEY_PATHS = {
+    SIPCalculationRequest: _PLAN_MONEY_PATHS,
+    MoneyJourneyRequest: _PLAN_MONEY_PATHS | {
+        ("monthly_withdrawal",),
+        ("withdrawal_step_up_cap",),
+        ("withdrawal_policy", "floor"),
+        ("withdrawal_policy", "ceiling"),
+    },
+}
+
+MONEY_SIGNIFICANT_DIGITS = 3
+
+
+def _round_significant(value: float, digits: int) -> float:
+    """Round a number to a fixed count of significant digits"""
+    if value == 0:
+        return 0.0
+    magnitude = math.floor(math.log10(abs(value)))
+    return round(value, digits - 1 - magnitude)
+
+
+def _coarsen(value, path: Tuple[str, ...]):
+    """Copy of value with the amounts at path rounded; values of other shapes are left alone"""
+    if not path:
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return _round_significant(value, MONEY_SIGNIFICANT_DIGITS)
+        return value
+    key, rest = path[0], path[1:]
+    if key == "[]":
+        return [_coarsen(item, rest) for item in value] if isinstance(value, list) else value
+    if isinstance(value, dict) and key in value:
+        return {**value, key: _coarsen(value[key], rest)}
+    return value
+
+
+def anonymize_payload(endpoint: str, payload: dict) -> dict:
+    """
+    Reduce a request body to the fields the endpoint's request model defines.
+
+    Unknown keys are dropped and monetary amounts, including those nested
+    in events and withdrawal policies, are rounded to MONEY_SIGNIFICANT_DIGITS significant digits.
+    Rates, horizons and flags are kept as-is so the captured request stays
+    replayable.
+
+    Args:
+        endpoint: Calculator endpoint path the body was posted to
+        payload: Parsed JSON request body
+
+    Returns:
+        Anonymized copy of the payload
+    """
+    request_model, _ = ENDPOINTS[endpoint]
+    anonymized = {field: payload[field] for field in request_model.model_fields if field in payload}
+    for path in MONEY_PATHS[request_model]:
+        anonymized = _coarsen(anonymized, path)
+    return anonymized
+
+
+class CaptureWriter:
+    """Append capture records to size-rotated JSONL files"""
+
+    def __init__(self, directory: str, max_bytes: int = 10_000_000, backup_count: int = 5):
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, "requests.jsonl")
+        # A dedicated, non-propagating logger gives thread-safe writes and rotation for free
+        self._logger = logging.getLogger(f"fincal.capture.{os.path.abspath(directory)}")
+        self._logger.setLevel(logging.INFO)
+        self._logger.propagate = False
+        if not self._logger.handlers:
+            handler = RotatingFileHandler(self.path, maxBytes=max_bytes, backupCount=backup_count)
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            self._logger.addHandler(handler)
+
+    def record(self, endpoint: str, body: bytes, status_code: Optional[int]):
+        """Anonymize and write one request body; bodies that are not JSON objects are skipped"""
+        try:
+            payload = json.loads(body.decode("utf-8"))
+        except (UnicodeDecodeError, ValueError):
+            return
+        if not isinstance(payload, dict):
+            return
+
+        entry = {
+            "captured_at": datetime.now(timezone.utc).isoformat(),
+            "endpoint": endpoint,
+            "status": status_code,
+            "body": anonymize_payload(endpoint, payload),
+        }
+        self._logger.info(json.dumps(entry, sort_keys=True))
+
+    def close(self):
+        """Flush and detach the file handlers"""
+        for handler in list(self._logger.handlers):
+            handler.close()
+            self._logger.removeHandler(handler)
+
+
+class RequestCaptureMiddleware:
+    """
+    ASGI middleware that samples calculator POST bodies into a CaptureWriter.
+
+    The body is teed while the application reads it and written only after
+    the response has been sent, so capture never delays the client.
+    """
+
+    def __init__(
+        self,
+        app,
+        directory: str,
+        sample_rate: float = 0.01,
+        max_bytes: int = 10_000_000,
+        backup_count: int = 5,
+    ):
+        self.app = app
+        self.sample_rate = sample_rate
+        self.writer = CaptureWriter(directory, max_bytes=max_bytes, backup_count=backup_count)
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or scope["method"] != "POST"
+            or scope["path"] not in ENDPOINTS
+            or random.random() >= self.sample_rate
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        chunks = []
+        status = {}
+
+        async def capturing_receive():
+            message = await receive()
+            if message["type"] == "http.request":
+                chunks.append(message.get("body", b""))
+            return message
+
+        async def capturing_send(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        await self.app(scope, capturing_receive, capturing_send)
+        self.writer.record(scope["path"], b"".join(chunks), status.get("code"))
@@ -0,0 +1,78 @@
+"""
+Single-flight coalescing of identical in-flight calculations
+"""
+import threading
+from concurrent.futures import Future
+from typing import Callable, Dict, Hashable, Tuple
+
+
+class SingleFlight:
+    """
+    Run one computation per key at a time and share its result with concurrent duplicates.
+
+    The first caller for a key computes; callers arriving with the same key
+    while it runs wait for that computation and get the same result (or the
+    same exception) instead of computing again. Nothing is kept once the
+    computation finishes, so this is not a cache: a later call computes afresh.
+    """
+
+    def __init__(self):
+        self._in_flight: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.computations = 0
+        self.coalesced = 0
+        self.peak_waiters = 0
+        self._waiters: Dict[Hashable, int] = {}
+
+    def run(self, key: Hashable, compute: Callable[[], object]) -> Tuple[object, bool]:
+        """
+        Compute the value for a key, or wait for the identical computation already running.
+
+        Args:
+            key: Identity of the computation, e.g. the canonical request hash
+            compute: Called with no arguments on the caller's thread, if it leads
+
+        Returns:
+            Tuple of (value, whether it was shared from another caller's computation)
+        """
+        with self._lock:
+            self.calls += 1
+            future = self._in_flight.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._in_flight[key] = future
+                self._waiters[key] = 0
+                self.computations += 1
+            else:
+                self.coalesced += 1
+                self._waiters[key] += 1
+                self.peak_waiters = max(self.peak_waiters, self._waiters[key])
+
+        if not leader:
+            return future.result(), True
+
+        try:
+            value = compute()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(value)
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+                del self._waiters[key]
+        return value, False
+
+    def snapshot(self) -> dict:
+        """Return call counts and the number of computations in flight"""
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "computations": self.computations,
+                "coalesced": self.coalesced,
+                "in_flight": len(self._in_flight),
+                "peak_waiters": self.peak_waiters,
+            }
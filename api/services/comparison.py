@@ -0,0 +1,101 @@
+"""
+Scenario comparison for Money Journey plans that share one phase
+"""
+from typing import Iterator, List
+
+import numpy as np
+
+from api.models.comparison import (
+    ScenarioComparisonRequest,
+    ScenarioComparisonResponse,
+    ScenarioDeltas,
+    ScenarioResult,
+)
+from api.services.money_journey import accumulation_request, calculate_withdrawal_phase
+from api.services.sip_calculator import calculate_sip_batch, calculate_sip_with_annual_compounding
+
+
+def _to_optional(values: np.ndarray) -> List:
+    """Round a padded series to cents, with NaN padding as None"""
+    return [None if value != value else round(value, 2) for value in values.tolist()]
+
+
+def comparison_horizon(request: ScenarioComparisonRequest) -> int:
+    """Length of the shared timeline: the longest scenario"""
+    return max(r.accumulation_years + r.withdrawal_years for r in request.requests)
+
+
+def scenario_results(request: ScenarioComparisonRequest) -> Iterator[ScenarioResult]:
+    """
+    Calculate the base plan and every scenario, sharing the common phase.
+
+    When scenarios only vary the withdrawal phase, the accumulation phase
+    is calculated once and its corpus feeds every scenario's withdrawal
+    phase in one vectorized batch. When they only vary the accumulation
+    phase, accumulation runs as a vectorized batch and the withdrawal phase
+    reuses the cached growth table of the shared withdrawal rates.
+
+    All series are aligned on one timeline of plan years and padded with
+    None after a plan ends; deltas are taken against the base plan.
+
+    Args:
+        request: ScenarioComparisonRequest
+
+    Yields:
+        ScenarioResult for the base plan, then for each scenario
+    """
+    requests = request.requests
+    if request.shared_phase == "accumulation":
+        shared = calculate_sip_with_annual_compounding(accumulation_request(request.base))
+        sip_responses = [shared] * len(requests)
+    else:
+        sip_responses = calculate_sip_batch([accumulation_request(r) for r in requests])
+    responses = calculate_withdrawal_phase(requests, sip_responses)
+
+    horizon = comparison_horizon(request)
+    balances = np.full((len(requests), horizon), np.nan)
+    annual_amounts = np.full((len(requests), horizon), np.nan)
+    for row, response in enumerate(responses):
+        years = len(response.yearly_breakdown)
+        balances[row, :years] = [entry.balance for entry in response.yearly_breakdown]
+        annual_amounts[row, :years] = [entry.annual_amount for entry in response.yearly_breakdown]
+    balance_deltas = balances - balances[0]
+
+    base = responses[0].results
+    overrides = [{}] + [scenario.overrides for scenario in request.scenarios]
+    for row, (label, response) in enumerate(zip(request.labels, responses)):
+        results = response.results
+        phases = [entry.phase for entry in response.yearly_breakdown]
+        yield ScenarioResult(
+            label=label,
+            overrides=overrides[row],
+            results=results,
+            phases=phases + [None] * (horizon - len(phases)),
+            balances=_to_optional(balances[row]),
+            annual_amounts=_to_optional(annual_amounts[row]),
+            deltas=ScenarioDeltas(
+                corpus_at_retirement=round(results.corpus_at_retirement - base.corpus_at_retirement, 2),
+                total_contributions=round(results.total_contributions - base.total_contributions, 2),
+                total_withdrawals=round(results.total_withdrawals - base.total_withdrawals, 2),
+                final_balance=round(results.final_balance - base.final_balance, 2),
+                balances=_to_optional(balance_deltas[row]),
+            ),
+        )
+
+
+def compare_scenarios(request: ScenarioComparisonRequest) -> ScenarioComparisonResponse:
+    """
+    Compare the base plan and every scenario on a shared timeline (see scenario_results).
+
+    Args:
+        request: ScenarioComparisonRequest
+
+    Returns:
+        ScenarioComparisonResponse with the base plan first
+    """
+    return ScenarioComparisonResponse(
+        status="success",
+        shared_phase=request.shared_phase,
+        years=list(range(1, comparison_horizon(request) + 1)),
+        scenarios=list(scenario_results(request)),
+    )
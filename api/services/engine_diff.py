@@ -0,0 +1,120 @@
+"""
+Engine loading and response diffing shared by request replay and shadow execution
+"""
+import importlib
+from typing import Any, Callable, Dict, List
+
+from api.models.sip import SIPCalculationRequest
+from api.models.money_journey import MoneyJourneyRequest
+
+SIP_ENDPOINT = "/api/calculate-sip"
+MONEY_JOURNEY_ENDPOINT = "/api/calculate-money-journey"
+
+# Endpoint path -> (request model, name of the service function that serves it)
+ENDPOINTS = {
+    SIP_ENDPOINT: (SIPCalculationRequest, "calculate_sip_with_annual_compounding"),
+    MONEY_JOURNEY_ENDPOINT: (MoneyJourneyRequest, "calculate_money_journey"),
+}
+
+CURRENT_ENGINE = "current"
+
+
+def load_engine(spec: str) -> Dict[str, Callable]:
+    """
+    Resolve an engine spec to a mapping of endpoint path -> calculation function.
+
+    "current" selects the live services in this package. Any other value is an
+    importable module path exposing functions with the same names as the live
+    services (calculate_sip_with_annual_compounding, calculate_money_journey).
+
+    Args:
+        spec: "current" or a dotted module path
+
+    Returns:
+        Dict mapping each endpoint path to its calculation function
+
+    Raises:
+        ValueError: If the module does not provide every service function
+    """
+    if spec == CURRENT_ENGINE:
+        from api.services.sip_calculator import calculate_sip_with_annual_compounding
+        from api.services.money_journey import calculate_money_journey
+        return {
+            SIP_ENDPOINT: calculate_sip_with_annual_compounding,
+            MONEY_JOURNEY_ENDPOINT: calculate_money_journey,
+        }
+
+    module = importlib.import_module(spec)
+    engine = {}
+    for endpoint, (_, function_name) in ENDPOINTS.items():
+        function = getattr(module, function_name, None)
+        if function is None:
+            raise ValueError(f"Engine '{spec}' does not define {function_name}")
+        engine[endpoint] = function
+    return engine
+
+
+def _diff_values(path: str, baseline: Any, candidate: Any, tolerance: float, diffs: List[dict]):
+    """Append a diff entry when two scalar values disagree beyond tolerance"""
+    numeric = (int, float)
+    if (
+        isinstance(baseline, numeric) and isinstance(candidate, numeric)
+        and not isinstance(baseline, bool) and not isinstance(candidate, bool)
+    ):
+        delta = candidate - baseline
+        if abs(delta) > tolerance:
+            diffs.append({"path": path, "baseline": baseline, "candidate": candidate, "delta": delta})
+    elif baseline != candidate:
+        diffs.append({"path": path, "baseline": baseline, "candidate": candidate, "delta": None})
+
+
+def diff_responses(baseline: dict, candidate: dict, tolerance: float = 0.01) -> List[dict]:
+    """
+    Compare the `results` and `yearly_breakdown` of two serialized responses.
+
+    Numeric fields are compared with an absolute tolerance; all other values
+    must match exactly. A breakdown length mismatch is reported once and the
+    common prefix is still compared row by row.
+
+    Args:
+        baseline: model_dump() of the reference response
+        candidate: model_dump() of the response under test
+        tolerance: Maximum allowed absolute difference for numeric fields
+
+    Returns:
+        List of {"path", "baseline", "candidate", "delta"} entries, empty when equal
+    """
+    diffs: List[dict] = []
+
+    baseline_results = baseline.get("results", {})
+    candidate_results = candidate.get("results", {})
+    for key in sorted(set(baseline_results) | set(candidate_results)):
+        _diff_values(
+            f"results.{key}",
+            baseline_results.get(key),
+            candidate_results.get(key),
+            tolerance,
+            diffs,
+        )
+
+    baseline_rows = baseline.get("yearly_breakdown", [])
+    candidate_rows = candidate.get("yearly_breakdown", [])
+    if len(baseline_rows) != len(candidate_rows):
+        diffs.append({
+            "path": "yearly_breakdown.length",
+            "baseline": len(baseline_rows),
+            "candidate": len(candidate_rows),
+            "delta": len(candidate_rows) - len(baseline_rows),
+        })
+
+    for index, (baseline_row, candidate_row) in enumerate(zip(baseline_rows, candidate_rows)):
+        for key in sorted(set(baseline_row) | set(candidate_row)):
+            _diff_values(
+                f"yearly_breakdown[{index}].{key}",
+                baseline_row.get(key),
+                candidate_row.get(key),
+                tolerance,
+                diffs,
+            )
+
+    return diffs
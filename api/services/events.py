@@ -0,0 +1,86 @@
+"""
+Sparse cash-flow events expanded into dense monthly arrays for the kernels
+"""
+from typing import Callable, NamedTuple, Optional, Sequence, Union
+
+import numpy as np
+
+from api.models.events import CashFlowEvent
+
+
+class EventArrays(NamedTuple):
+    """Monthly event arrays for N plans, each of shape (N, months)"""
+    lump_sums: np.ndarray
+    withdrawals: np.ndarray
+    active: np.ndarray
+
+
+def event_arrays(
+    event_lists: Sequence[Optional[Sequence[CashFlowEvent]]],
+    months: int,
+    offset: Union[int, Sequence[int]] = 0,
+    units: Optional[Callable[[float], int]] = None,
+) -> Optional[EventArrays]:
+    """
+    Expand each plan's events into monthly lump-sum, withdrawal and activity arrays.
+
+    Amounts are scattered with a single np.add.at and pauses are applied
+    through a difference array and one cumsum, so the cost is proportional
+    to plans x months plus the number of events, however long the pauses.
+
+    Args:
+        event_lists: Events per plan (None or empty for plans without events)
+        months: Number of months to cover
+        offset: Month index of the first covered month, shared or per plan;
+            events outside [offset, offset + months) are ignored and pauses
+            are clipped
+        units: Optional conversion of event amounts to integer minor units,
+            for exact arithmetic; all three arrays are then int64
+
+    Returns:
+        EventArrays, or None when no plan has an event in the window
+    """
+    rows, columns, amounts, signs = [], [], [], []
+    pause_rows, pause_starts, pause_ends = [], [], []
+
+    offsets = [offset] * len(event_lists) if isinstance(offset, int) else offset
+
+    for row, events in enumerate(event_lists):
+        for event in events or []:
+            start = event.month_index - offsets[row]
+            if event.type == "pause":
+                end = min(start + event.months, months)
+                start = max(start, 0)
+                if start < end:
+                    pause_rows.append(row)
+                    pause_starts.append(start)
+                    pause_ends.append(end)
+            elif 0 <= start < months:
+                rows.append(row)
+                columns.append(start)
+                amounts.append(event.amount if units is None else units(event.amount))
+                signs.append(event.type == "lump_sum")
+
+    if not rows and not pause_rows:
+        return None
+
+    dtype = float if units is None else np.int64
+    shape = (len(event_lists), months)
+    lump_sums = np.zeros(shape, dtype=dtype)
+    withdrawals = np.zeros(shape, dtype=dtype)
+    if rows:
+        rows = np.array(rows)
+        columns = np.array(columns)
+        amounts = np.array(amounts, dtype=dtype)
+        deposit = np.array(signs)
+        np.add.at(lump_sums, (rows[deposit], columns[deposit]), amounts[deposit])
+        np.add.at(withdrawals, (rows[~deposit], columns[~deposit]), amounts[~deposit])
+
+    # +1 where a pause starts, -1 where it ends; a positive running sum means paused
+    pauses = np.zeros((shape[0], months + 1), dtype=np.int64)
+    if pause_rows:
+        np.add.at(pauses, (pause_rows, pause_starts), 1)
+        np.add.at(pauses, (pause_rows, pause_ends), -1)
+    active = (np.cumsum(pauses[:, :months], axis=-1) == 0).astype(dtype)
+
+    return EventArrays(lump_sums, withdrawals, active)
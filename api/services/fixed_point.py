@@ -0,0 +1,297 @@
+"""
+Integer fixed-point kernels for exact money arithmetic
+
+Amounts are whole numbers of minor units and periodic rates are integers
+scaled by RATE_SCALE, so every step is exact except the explicitly rounded
+ones. Each kernel is written with plain arithmetic operators only, so the
+same code runs on Python ints (one plan at a time, where per-call numpy
+overhead would dominate) and on int64 numpy arrays holding one value per
+plan (a batch advanced one period at a time); `run_rows` picks the cheaper
+of the two and both give identical results.
+"""
+from decimal import ROUND_DOWN, ROUND_HALF_DOWN, ROUND_HALF_EVEN, ROUND_HALF_UP, ROUND_UP, Decimal, localcontext
+from functools import lru_cache
+from typing import Callable, Optional, Sequence, Tuple
+
+import numpy as np
+
+from api.models.exact import MAX_UNITS
+from api.services.kernels import MONTHS_PER_YEAR, PERIODS_PER_YEAR
+
+# Periodic rates are fixed to nine decimal places
+RATE_SCALE = 10 ** 9
+
+# Stand-in for "no cap" in step-up schedules
+NO_CAP = 2 ** 62
+
+# Batches of up to this many plans run on Python ints row by row
+SCALAR_ROWS = 8
+
+DECIMAL_ROUNDING = {
+    "half_even": ROUND_HALF_EVEN,
+    "half_up": ROUND_HALF_UP,
+    "half_down": ROUND_HALF_DOWN,
+    "up": ROUND_UP,
+    "down": ROUND_DOWN,
+}
+
+
+def to_units(amount: float, minor_units: int, rounding: str) -> int:
+    """
+    Convert an amount to whole minor units.
+
+    The float is read as the shortest decimal that round-trips (0.1 is 0.1,
+    not 0.1000000000000000055...), then rounded by `rounding`.
+
+    Raises:
+        ValueError: If the amount exceeds MAX_UNITS minor units
+    """
+    units = int((Decimal(repr(amount)) * 10 ** minor_units).quantize(Decimal(1), DECIMAL_ROUNDING[rounding]))
+    if abs(units) > MAX_UNITS:
+        raise ValueError(f"amount {amount} is too large for exact arithmetic")
+    return units
+
+
+def from_units(units, minor_units: int):
+    """Amount of a number (or array) of minor units, as the float nearest the exact decimal"""
+    return units / 10 ** minor_units
+
+
+@lru_cache(maxsize=1024)
+def fixed_rate(annual_rate: float, compounding_frequency: str, months: int) -> int:
+    """
+    Growth rate over `months` months as an integer multiple of 1 / RATE_SCALE.
+
+    Uses the same compounding convention as kernels.growth_over_months,
+    evaluated in 40-digit decimal arithmetic and fixed to nine decimals
+    (half-even), e.g. 12% credited monthly over one month is 10_000_000.
+    """
+    periods_per_year = PERIODS_PER_YEAR[compounding_frequency]
+    with localcontext() as context:
+        context.prec = 40
+        periodic = Decimal(repr(annual_rate)) / 100 / periods_per_year
+        periods = Decimal(periods_per_year * months) / MONTHS_PER_YEAR
+        if periods == periods.to_integral_value():
+            growth = (1 + periodic) ** int(periods)
+        else:
+            growth = (1 + periodic) ** periods
+        return int(((growth - 1) * RATE_SCALE).quantize(Decimal(1), ROUND_HALF_EVEN))
+
+
+def fixed_step(rate_percent: float) -> int:
+    """Annual step-up in percent as an integer multiple of 1 / RATE_SCALE (may be negative)"""
+    return int((Decimal(repr(rate_percent)) / 100 * RATE_SCALE).quantize(Decimal(1), ROUND_HALF_EVEN))
+
+
+def scale(values, rate, rounding: str):
+    """
+    round(values * rate / RATE_SCALE) for non-negative values and rates.
+
+    On int64 arrays the product is split as (q * RATE_SCALE + r) * rate so
+    that no intermediate exceeds 2**63 for values up to MAX_UNITS; Python
+    ints need no split.
+    """
+    if isinstance(values, int):
+        scaled, fraction = divmod(values * rate, RATE_SCALE)
+    else:
+        whole, part = divmod(values, RATE_SCALE)
+        scaled, fraction = divmod(part * rate, RATE_SCALE)
+        scaled = scaled + whole * rate
+    if rounding == "half_even":
+        twice = 2 * fraction
+        return scaled + (twice > RATE_SCALE) + (twice == RATE_SCALE) * (scaled % 2)
+    if rounding == "half_up":
+        return scaled + (2 * fraction >= RATE_SCALE)
+    if rounding == "half_down":
+        return scaled + (2 * fraction > RATE_SCALE)
+    if rounding == "up":
+        return scaled + (fraction > 0)
+    return scaled
+
+
+def divide(value: int, divisor: int, rounding: str) -> int:
+    """round(value / divisor) for non-negative ints"""
+    quotient, remainder = divmod(value, divisor)
+    if rounding == "down" or remainder == 0:
+        return quotient
+    if rounding == "up":
+        return quotient + 1
+    twice = 2 * remainder
+    if twice != divisor:
+        return quotient + (twice > divisor)
+    return quotient + (rounding == "half_up" or (rounding == "half_even" and quotient % 2 == 1))
+
+
+def _check(values, what: str):
+    if values > MAX_UNITS if isinstance(values, int) else (values > MAX_UNITS).any():
+        raise ValueError(f"{what} exceeds {MAX_UNITS} minor units, too large for exact arithmetic")
+
+
+def step_up_units(start, sign, rate, cap, years: int, rounding: str):
+    """
+    Per-year amounts: amount_y = min(amount_{y-1} + round(amount_{y-1} * rate), cap) for y >= 2.
+
+    The same rule as kernels.step_up_schedule with each year's amount rounded
+    to minor units; the year-1 amount is never capped.
+
+    Args:
+        start: Year-1 amount in minor units
+        sign: +1 or -1, the sign of the step-up
+        rate: Magnitude of the annual step-up, scaled by RATE_SCALE
+        cap: Maximum amount in minor units (NO_CAP for none)
+
+    Returns:
+        Tuple of (list of per-year amounts,)
+    """
+    amount = start
+    amounts = [amount]
+    for _ in range(1, years):
+        amount = amount + sign * scale(amount, rate, rounding)
+        amount = amount - (amount > cap) * (amount - cap)
+        _check(amount, "stepped-up amount")
+        amounts.append(amount)
+    return (amounts,)
+
+
+def accumulate_units(opening, deposits, withdrawals, rates, periods_per_year: int, rounding: str):
+    """
+    Balance path where interest is credited on the opening balance of each period.
+
+    B_t = B_{t-1} + round(B_{t-1} * rate_t) + deposits_t - paid_t, where
+    paid_t is the period's withdrawals cut back to what the balance can cover.
+    The exact counterpart of kernels.accumulate_factors plus the overdraft
+    cut-back in sip_calculator.project_sip.
+
+    Returns:
+        Tuple of (balance at the end of each year, amount withdrawn in each year)
+    """
+    balance = opening
+    year_paid = opening * 0
+    balances, paid = [], []
+    for period in range(len(rates)):
+        available = balance + scale(balance, rates[period], rounding) + deposits[period]
+        wanted = withdrawals[period]
+        taken = wanted - (wanted > available) * (wanted - available)
+        balance = available - taken
+        year_paid = year_paid + taken
+        if (period + 1) % periods_per_year == 0:
+            _check(balance, "balance")
+            balances.append(balance)
+            paid.append(year_paid)
+            year_paid = opening * 0
+    return balances, paid
+
+
+def drawdown_units(opening, periods, withdrawals, deposits, rates, periods_per_year: int, rounding: str):
+    """
+    Balance path with a withdrawal at the start of each period: B_t = R_t + round(R_t * rate_t),
+    R_t = B_{t-1} + deposits_t - withdrawals_t.
+
+    The exact counterpart of kernels.drawdown: the first of the plan's
+    `periods` periods whose opening balance (after deposits) cannot cover
+    its withdrawal, or is not positive, pays out what is left and every
+    later period is zero.
+
+    Returns:
+        Tuple of (balance at the end of each year, amount paid in each year,
+        depletion period index or -1)
+    """
+    balance = opening
+    alive = opening * 0 + 1
+    depletion = opening * 0 - 1
+    year_paid = opening * 0
+    balances, paid = [], []
+    for period in range(len(rates)):
+        wanted = withdrawals[period]
+        before = balance + deposits[period]
+        short = ((before < wanted) | (before <= 0)) * (period < periods)
+        depleting = alive * short
+        staying = alive - depleting
+        year_paid = year_paid + staying * wanted + depleting * before * (before > 0)
+        remaining = staying * (before - wanted)
+        balance = remaining + scale(remaining, rates[period], rounding)
+        depletion = depletion + depleting * (period + 1)
+        alive = staying
+        if (period + 1) % periods_per_year == 0:
+            _check(balance, "balance")
+            balances.append(balance)
+            paid.append(year_paid)
+            year_paid = opening * 0
+    return balances, paid, depletion
+
+
+def run_rows(
+    kernel: Callable,
+    per_row: Sequence[np.ndarray],
+    series: Sequence[np.ndarray],
+    **options,
+) -> Tuple[np.ndarray, ...]:
+    """
+    Run a kernel over a batch of plans.
+
+    Up to SCALAR_ROWS plans run one at a time on Python ints; larger batches
+    run once on int64 columns, one value per plan, advancing all plans a
+    period at a time.
+
+    Args:
+        kernel: One of the *_units kernels
+        per_row: Per-plan scalars, each of shape (N,)
+        series: Per-plan series over time, each of shape (N, T)
+        options: Passed through, e.g. periods_per_year and rounding
+
+    Returns:
+        The kernel's outputs as int64 arrays: series as (N, T), scalars as (N,)
+    """
+    count = len(per_row[0])
+    if count <= SCALAR_ROWS:
+        outputs = [
+            kernel(*[int(values[row]) for values in per_row], *[values[row].tolist() for values in series], **options)
+            for row in range(count)
+        ]
+        return tuple(np.array([output[k] for output in outputs], dtype=np.int64) for k in range(len(outputs[0])))
+
+    columns = [np.asarray(values, dtype=np.int64) for values in per_row]
+    outputs = kernel(*columns, *[np.asarray(values, dtype=np.int64).T for values in series], **options)
+    return tuple(
+        np.stack(output, axis=-1) if isinstance(output, list) else np.asarray(output, dtype=np.int64)
+        for output in outputs
+    )
+
+
+def step_up_columns(
+    start: Sequence[int],
+    rate_percent: Sequence[float],
+    cap: Sequence[Optional[int]],
+    years: int,
+    rounding: str,
+) -> np.ndarray:
+    """step_up_units for a batch, shape (N, years)"""
+    rates = [fixed_step(rate) for rate in rate_percent]
+    (amounts,) = run_rows(
+        step_up_units,
+        [
+            np.array(start, dtype=np.int64),
+            np.array([1 if rate >= 0 else -1 for rate in rates], dtype=np.int64),
+            np.array([abs(rate) for rate in rates], dtype=np.int64),
+            np.array([NO_CAP if c is None else c for c in cap], dtype=np.int64),
+        ],
+        [],
+        years=years,
+        rounding=rounding,
+    )
+    return amounts
+
+
+def rate_columns(
+    schedules: Sequence[Tuple[float, ...]],
+    compounding_frequencies: Sequence[str],
+    months_per_period: int,
+    length: int,
+) -> np.ndarray:
+    """Fixed periodic rates for per-year rate schedules, shape (N, length), padded with 0"""
+    periods_per_year = MONTHS_PER_YEAR // months_per_period
+    rates = np.zeros((len(schedules), length), dtype=np.int64)
+    for row, (schedule, frequency) in enumerate(zip(schedules, compounding_frequencies)):
+        yearly = [fixed_rate(rate, frequency, months_per_period) for rate in schedule]
+        rates[row, :len(yearly) * periods_per_year] = np.repeat(yearly, periods_per_year)
+    return rates
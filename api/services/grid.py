@@ -0,0 +1,324 @@
+"""
+Precomputed scenario grid for approximate answers, stored as a memory-mapped binary file
+
+The grid tabulates, over a lattice of annual return rates and step-ups and
+for every year up to a horizon:
+- SIP growth: the balance at each year end of a plan investing 1 a month
+  (stepped up yearly, no initial investment), per compounding frequency
+- Withdrawal cover: the corpus needed at retirement to fund each year of
+  withdrawals of 1 a month (stepped up yearly), per withdrawal and
+  compounding frequency. A plan runs dry in the first year whose cover
+  exceeds corpus / monthly_withdrawal.
+
+Both scale linearly with the plan's amounts, so one table serves every
+amount. Values are stored as logarithms, which are close to linear in the
+rate and step-up, and interpolated bilinearly between lattice points. At
+build time every cell is also evaluated at its centre and edge midpoints;
+the largest relative interpolation error found there, doubled, is stored as
+the cell's error bound.
+
+Binary layout (little-endian):
+    8 bytes     magic b"FINCALG1"
+    uint32      years
+    uint32      number of rates R
+    uint32      number of step-ups S
+    uint32      number of tables
+    float64 x4  first rate, rate spacing, first step-up, step-up spacing (percent)
+    float64[]   log values of each table in TABLES order, shape (R, S, years)
+    float32[]   error bounds of each table in TABLES order, shape (R - 1, S - 1, years)
+
+Files are memory-mapped read-only, so loading is instant and all workers
+share one copy of the data. Build a grid with:
+    python -m api.services.grid api/data/scenario_grid.bin --rates 0:20:0.25 --step-ups 0:15:0.5 --years 60
+"""
+import argparse
+import hashlib
+import os
+import struct
+import sys
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import NamedTuple, Optional, Sequence
+
+import numpy as np
+
+from api.services.kernels import (
+    MONTHS_PER_YEAR,
+    PERIODS_PER_YEAR,
+    accumulate_factors,
+    growth_over_months,
+    step_up_schedule,
+    to_periods,
+)
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+
+# Grid used by approximate requests; when the file is missing they are calculated in full
+GRID_PATH = Path(os.environ.get("FINCAL_GRID_PATH", DATA_DIR / "scenario_grid.bin"))
+
+MAGIC = b"FINCALG1"
+HEADER = struct.Struct("<8sIIIIdddd")
+
+COMPOUNDING_FREQUENCIES = ("annually", "quarterly", "monthly")
+WITHDRAWAL_FREQUENCIES = ("annually", "monthly")
+
+# Table names in file order
+TABLES = (
+    [f"sip/{frequency}" for frequency in COMPOUNDING_FREQUENCIES]
+    + [
+        f"withdrawal/{withdrawal}/{compounding}"
+        for withdrawal in WITHDRAWAL_FREQUENCIES
+        for compounding in COMPOUNDING_FREQUENCIES
+    ]
+)
+
+# Multiplier on the largest interpolation error measured in a cell
+ERROR_SAFETY_FACTOR = 2.0
+
+# Smallest relative error bound, covering float rounding where interpolation is exact
+MIN_RELATIVE_ERROR = 1e-12
+
+
+class Lattice(NamedTuple):
+    """Evenly spaced rate and step-up axes, in percent, and the horizon in years"""
+    rate_start: float
+    rate_step: float
+    rate_count: int
+    step_up_start: float
+    step_up_step: float
+    step_up_count: int
+    years: int
+
+    def rates(self, subdivisions: int = 1) -> np.ndarray:
+        count = (self.rate_count - 1) * subdivisions + 1
+        return self.rate_start + np.arange(count) * self.rate_step / subdivisions
+
+    def step_ups(self, subdivisions: int = 1) -> np.ndarray:
+        count = (self.step_up_count - 1) * subdivisions + 1
+        return self.step_up_start + np.arange(count) * self.step_up_step / subdivisions
+
+
+class GridLookup(NamedTuple):
+    """Interpolated values of one table for every year up to the grid horizon"""
+    values: np.ndarray
+    relative_error: np.ndarray
+
+
+def sip_growth(rates: np.ndarray, step_ups: np.ndarray, compounding_frequency: str, years: int) -> np.ndarray:
+    """
+    Year-end balances of plans investing 1 a month, as in sip_calculator.project_sip.
+
+    Args:
+        rates: Annual return rates in percent, shape (N,)
+        step_ups: Annual step-ups in percent, shape (N,)
+
+    Returns:
+        Array of shape (N, years)
+    """
+    periods_per_year = PERIODS_PER_YEAR[compounding_frequency]
+    months_per_period = MONTHS_PER_YEAR // periods_per_year
+    contributions = step_up_schedule(1.0, step_ups / 100, None, years)
+    flows = to_periods(np.repeat(contributions, MONTHS_PER_YEAR, axis=-1), periods_per_year)
+    growth = growth_over_months(rates / 100, compounding_frequency, months_per_period)
+    factors = np.cumprod(np.broadcast_to(growth[:, None], flows.shape), axis=-1)
+    balances = accumulate_factors(np.zeros(len(rates)), flows, factors)
+    return balances[:, periods_per_year - 1::periods_per_year]
+
+
+def withdrawal_cover(
+    rates: np.ndarray,
+    step_ups: np.ndarray,
+    withdrawal_frequency: str,
+    compounding_frequency: str,
+    years: int,
+) -> np.ndarray:
+    """
+    Corpus needed to fund each year of withdrawals of 1 a month, as in kernels.drawdown.
+
+    With withdrawals w_t at the start of each period and cumulative growth F,
+    a plan starting from corpus B_0 still covers period t's withdrawal iff
+    B_0 >= sum_{s<=t} w_s / F_{s-1}, and its balance at the end of period t
+    is F_t times B_0 minus that sum. This is the sum at each year end.
+
+    Returns:
+        Array of shape (N, years)
+    """
+    periods_per_year = MONTHS_PER_YEAR if withdrawal_frequency == "monthly" else 1
+    months_per_period = MONTHS_PER_YEAR // periods_per_year
+    scheduled = step_up_schedule(1.0, step_ups / 100, None, years)
+    withdrawals = np.repeat(scheduled * months_per_period, periods_per_year, axis=-1)
+    growth = growth_over_months(rates / 100, compounding_frequency, months_per_period)
+    exponents = np.arange(withdrawals.shape[-1])
+    cover = np.cumsum(withdrawals / growth[:, None] ** exponents, axis=-1)
+    return cover[:, periods_per_year - 1::periods_per_year]
+
+
+def _table(name: str, rates: np.ndarray, step_ups: np.ndarray, years: int) -> np.ndarray:
+    """Values of a named table at every (rate, step-up) pair, shape (len(rates), len(step_ups), years)"""
+    rate_grid, step_up_grid = (axis.ravel() for axis in np.meshgrid(rates, step_ups, indexing="ij"))
+    kind, *frequencies = name.split("/")
+    if kind == "sip":
+        values = sip_growth(rate_grid, step_up_grid, frequencies[0], years)
+    else:
+        values = withdrawal_cover(rate_grid, step_up_grid, *frequencies, years)
+    return values.reshape(len(rates), len(step_ups), years)
+
+
+def _cell_errors(log_fine: np.ndarray) -> np.ndarray:
+    """
+    Largest relative bilinear interpolation error per cell, from log values on a twice-as-fine lattice.
+
+    Checks each cell's centre and the midpoints of its four edges, where
+    interpolation is furthest from the lattice points.
+    """
+    corners = log_fine[::2, ::2]
+    low_low, high_low = corners[:-1, :-1], corners[1:, :-1]
+    low_high, high_high = corners[:-1, 1:], corners[1:, 1:]
+    checks = [
+        (log_fine[1::2, 1::2], (low_low + high_low + low_high + high_high) / 4),
+        (log_fine[1::2, :-1:2], (low_low + high_low) / 2),
+        (log_fine[1::2, 2::2], (low_high + high_high) / 2),
+        (log_fine[:-1:2, 1::2], (low_low + low_high) / 2),
+        (log_fine[2::2, 1::2], (high_low + high_high) / 2),
+    ]
+    error = np.zeros(low_low.shape)
+    for exact, interpolated in checks:
+        error = np.maximum(error, np.abs(np.expm1(interpolated - exact)))
+    return np.maximum(error * ERROR_SAFETY_FACTOR, MIN_RELATIVE_ERROR)
+
+
+def build_grid(path, lattice: Lattice) -> None:
+    """
+    Compute every table over a lattice and write the grid file.
+
+    Raises:
+        ValueError: If an axis has fewer than two points or the horizon is not positive
+    """
+    if lattice.rate_count < 2 or lattice.step_up_count < 2 or lattice.years < 1:
+        raise ValueError("a grid needs at least two rates, two step-ups and one year")
+
+    values, errors = [], []
+    for name in TABLES:
+        log_fine = np.log(_table(name, lattice.rates(2), lattice.step_ups(2), lattice.years))
+        values.append(log_fine[::2, ::2])
+        errors.append(_cell_errors(log_fine))
+
+    with open(path, "wb") as handle:
+        handle.write(HEADER.pack(
+            MAGIC, lattice.years, lattice.rate_count, lattice.step_up_count, len(TABLES),
+            lattice.rate_start, lattice.rate_step, lattice.step_up_start, lattice.step_up_step,
+        ))
+        for table in values:
+            handle.write(np.ascontiguousarray(table, dtype="<f8").tobytes())
+        for table in errors:
+            handle.write(np.ascontiguousarray(table, dtype="<f4").tobytes())
+
+
+class ScenarioGrid:
+    """A memory-mapped grid file; see the module docstring for its contents"""
+
+    def __init__(self, path):
+        with open(path, "rb") as handle:
+            magic, years, rate_count, step_up_count, table_count, *axes = HEADER.unpack(handle.read(HEADER.size))
+        if magic != MAGIC or table_count != len(TABLES):
+            raise ValueError(f"{path} is not a scenario grid")
+
+        rate_start, rate_step, step_up_start, step_up_step = axes
+        self.lattice = Lattice(rate_start, rate_step, rate_count, step_up_start, step_up_step, step_up_count, years)
+        value_shape = (rate_count, step_up_count, years)
+        error_shape = (rate_count - 1, step_up_count - 1, years)
+        values = np.memmap(path, dtype="<f8", mode="r", offset=HEADER.size, shape=(table_count,) + value_shape)
+        errors = np.memmap(
+            path, dtype="<f4", mode="r", offset=HEADER.size + values.nbytes, shape=(table_count,) + error_shape
+        )
+        # Plain ndarray views of the mappings skip np.memmap's per-slice bookkeeping
+        self._values = dict(zip(TABLES, values.view(np.ndarray)))
+        self._errors = dict(zip(TABLES, errors.view(np.ndarray)))
+
+        file_hash = hashlib.sha256()
+        with open(path, "rb") as handle:
+            for block in iter(lambda: handle.read(1 << 20), b""):
+                file_hash.update(block)
+        # Identifies the grid's contents, e.g. in cache keys of approximate answers
+        self.digest = f"{self.lattice}:{file_hash.hexdigest()}"
+
+    def lookup(self, table: str, rate: float, step_up: float, years: int) -> Optional[GridLookup]:
+        """
+        Interpolate a table at a rate and step-up, in percent, for the first `years` years.
+
+        Returns:
+            GridLookup of shape (years,) arrays, or None if the point is off the grid
+        """
+        lattice = self.lattice
+        if years > lattice.years:
+            return None
+        position = []
+        for value, start, step, count in (
+            (rate, lattice.rate_start, lattice.rate_step, lattice.rate_count),
+            (step_up, lattice.step_up_start, lattice.step_up_step, lattice.step_up_count),
+        ):
+            offset = (value - start) / step
+            if not -1e-9 <= offset <= count - 1 + 1e-9:
+                return None
+            cell = min(max(int(offset), 0), count - 2)
+            position.append((cell, min(max(offset - cell, 0.0), 1.0)))
+
+        (i, t), (j, u) = position
+        values = self._values[table][i:i + 2, j:j + 2, :years]
+        log_value = (
+            (1 - t) * (1 - u) * values[0, 0] + t * (1 - u) * values[1, 0]
+            + (1 - t) * u * values[0, 1] + t * u * values[1, 1]
+        )
+        return GridLookup(np.exp(log_value), self._errors[table][i, j, :years].astype(float))
+
+
+@lru_cache(maxsize=None)
+def load_grid(path=None) -> Optional[ScenarioGrid]:
+    """Memory-map a grid file (default GRID_PATH), or None if there is none"""
+    path = Path(path or GRID_PATH)
+    if not path.exists():
+        return None
+    return ScenarioGrid(path)
+
+
+def grid_digest() -> str:
+    """Digest of the grid approximate requests are answered from, or "none" if there is none"""
+    grid = load_grid()
+    return "none" if grid is None else grid.digest
+
+
+def _axis(text: str) -> Sequence[float]:
+    """Parse start:stop:step (inclusive) into (start, step, count)"""
+    try:
+        start, stop, step = (float(part) for part in text.split(":"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected start:stop:step, got '{text}'")
+    if step <= 0 or stop <= start:
+        raise argparse.ArgumentTypeError(f"'{text}' is not an increasing range")
+    return start, step, int(round((stop - start) / step)) + 1
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("output", nargs="?", default=str(GRID_PATH), help="Grid file to write")
+    parser.add_argument("--rates", type=_axis, default="0:20:0.25", help="Annual return rates, start:stop:step percent")
+    parser.add_argument("--step-ups", type=_axis, default="0:15:0.5", help="Annual step-ups, start:stop:step percent")
+    parser.add_argument("--years", type=int, default=60, help="Longest horizon tabulated")
+    args = parser.parse_args(argv)
+
+    lattice = Lattice(*args.rates, *args.step_ups, args.years)
+    started = time.perf_counter()
+    build_grid(args.output, lattice)
+    grid = ScenarioGrid(args.output)
+    worst = max(float(np.max(errors)) for errors in grid._errors.values())
+    print(
+        f"Wrote {lattice.rate_count} rates x {lattice.step_up_count} step-ups x {lattice.years} years "
+        f"to {args.output} ({os.path.getsize(args.output) / 1e6:.1f} MB) in {time.perf_counter() - started:.1f}s; "
+        f"largest error bound {worst:.2e}"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,99 @@
+"""
+Bundled historical annual-returns datasets, stored as compact binary files
+
+Binary layout (little-endian):
+    8 bytes   magic b"FINCALR1"
+    uint32    first calendar year
+    uint32    number of years
+    float32[] annual returns as decimals (0.1 is +10%)
+
+Files are memory-mapped read-only, so every request shares one copy of the
+data. Rebuild a binary file from its CSV source with:
+    python -m api.services.historical api/data/sp500_total_returns.csv api/data/sp500_total_returns.bin
+"""
+import csv
+import struct
+import sys
+from functools import lru_cache
+from pathlib import Path
+from typing import NamedTuple
+
+import numpy as np
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+
+MAGIC = b"FINCALR1"
+HEADER = struct.Struct("<8sII")
+
+# Dataset name -> binary file in DATA_DIR
+DATASETS = {
+    # S&P 500 annual total returns including dividends, 1928-2023,
+    # from Aswath Damodaran's historical returns tables (NYU Stern)
+    "sp500": "sp500_total_returns.bin",
+}
+
+
+class ReturnsDataset(NamedTuple):
+    """Annual returns for consecutive calendar years starting at first_year"""
+    first_year: int
+    returns: np.ndarray
+
+    @property
+    def last_year(self) -> int:
+        return self.first_year + len(self.returns) - 1
+
+
+@lru_cache(maxsize=None)
+def load_returns(name: str) -> ReturnsDataset:
+    """
+    Memory-map a bundled dataset by name.
+
+    Raises:
+        ValueError: If the dataset is unknown or the file is not a returns dataset
+    """
+    if name not in DATASETS:
+        raise ValueError(f"Unknown returns dataset '{name}'. Available: {sorted(DATASETS)}")
+
+    path = DATA_DIR / DATASETS[name]
+    with open(path, "rb") as handle:
+        magic, first_year, count = HEADER.unpack(handle.read(HEADER.size))
+    if magic != MAGIC:
+        raise ValueError(f"{path} is not a returns dataset")
+
+    returns = np.memmap(path, dtype="<f4", mode="r", offset=HEADER.size, shape=(count,))
+    return ReturnsDataset(first_year, returns)
+
+
+def write_returns(path, first_year: int, returns) -> None:
+    """Write annual returns (decimals) for consecutive years as a binary dataset"""
+    returns = np.asarray(returns, dtype="<f4")
+    with open(path, "wb") as handle:
+        handle.write(HEADER.pack(MAGIC, first_year, len(returns)))
+        handle.write(returns.tobytes())
+
+
+def read_csv_returns(path):
+    """Read a `year,return_percent` CSV into (first_year, decimal returns)"""
+    with open(path, newline="") as handle:
+        rows = [(int(row["year"]), float(row["return_percent"])) for row in csv.DictReader(handle)]
+
+    years = [year for year, _ in rows]
+    if years != list(range(years[0], years[0] + len(years))):
+        raise ValueError(f"{path} must list consecutive years")
+    return years[0], [percent / 100 for _, percent in rows]
+
+
+def main(argv=None) -> int:
+    args = sys.argv[1:] if argv is None else argv
+    if len(args) != 2:
+        print(__doc__.strip().splitlines()[-1].strip())
+        return 2
+
+    first_year, returns = read_csv_returns(args[0])
+    write_returns(args[1], first_year, returns)
+    print(f"Wrote {len(returns)} years ({first_year}-{first_year + len(returns) - 1}) to {args[1]}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,238 @@
+"""
+In-process background jobs for long-running calculations, with progress and cancellation
+"""
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Sequence
+
+# Plans per chunk when a batch runs as a job, so progress and cancellation stay responsive
+JOB_BATCH_CHUNK = 1000
+
+FINISHED = frozenset({"succeeded", "failed", "cancelled"})
+
+
+class JobCancelled(Exception):
+    """Raised inside a job's calculation when the job has been cancelled"""
+
+
+class JobQueueFull(Exception):
+    """Raised when `max_pending` jobs are already queued or running"""
+
+
+class Job:
+    """
+    State of one background calculation.
+
+    The calculation reports progress through report(), which is also its
+    cancellation point: once cancel() is called, the next report() raises
+    JobCancelled and the calculation unwinds. `version` increases on every
+    change so event streams can tell when there is something new to send.
+    """
+
+    def __init__(self, kind: str):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.status = "queued"
+        self.progress = 0.0
+        self.partial: Optional[dict] = None
+        self.result: Optional[dict] = None
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+        self.version = 0
+        self._cancelled = threading.Event()
+        self._lock = threading.Lock()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED
+
+    def report(self, fraction: float, partial: Optional[dict] = None):
+        """
+        Record progress from the calculation.
+
+        Args:
+            fraction: Share of the work done, 0 to 1
+            partial: Optional JSON-serializable interim results
+
+        Raises:
+            JobCancelled: If the job has been cancelled
+        """
+        if self.cancelled:
+            raise JobCancelled()
+        with self._lock:
+            self.progress = min(max(fraction, 0.0), 1.0)
+            if partial is not None:
+                self.partial = partial
+            self.version += 1
+
+    def cancel(self):
+        """Ask the job to stop; a queued job never starts, a running one stops at its next report()"""
+        self._cancelled.set()
+        with self._lock:
+            if self.status == "queued":
+                self._finish("cancelled")
+
+    def start(self) -> bool:
+        """Mark the job running, unless it was cancelled while queued"""
+        with self._lock:
+            if self.finished:
+                return False
+            self.status = "running"
+            self.version += 1
+            return True
+
+    def complete(self, status: str, result: Optional[dict] = None, error: Optional[str] = None):
+        with self._lock:
+            self.result = result
+            self.error = error
+            if status == "succeeded":
+                self.progress = 1.0
+            self._finish(status)
+
+    def _finish(self, status: str):
+        self.status = status
+        self.finished_at = time.time()
+        self.version += 1
+
+    def snapshot(self, include_result: bool = True) -> dict:
+        """Return a JSON-serializable copy of the job state"""
+        with self._lock:
+            return {
+                "job_id": self.id,
+                "kind": self.kind,
+                "status": self.status,
+                "progress": round(self.progress, 4),
+                "partial": self.partial,
+                "result": self.result if include_result else None,
+                "error": self.error,
+                "created_at": self.created_at,
+                "finished_at": self.finished_at,
+            }
+
+
+class JobManager:
+    """
+    Run calculations on a bounded local worker pool and keep their results for a while.
+
+    At most `max_pending` jobs may be queued or running at once; further
+    submissions raise JobQueueFull instead of growing the queue. Finished
+    jobs are kept for `ttl_seconds` and then dropped the next time the
+    manager is used.
+    """
+
+    def __init__(self, max_workers: int = 2, max_pending: int = 32, ttl_seconds: float = 3600):
+        self.ttl_seconds = ttl_seconds
+        self._jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+        self.rejected = 0
+
+    def submit(self, kind: str, calculate: Callable[[Job], object]) -> Job:
+        """
+        Queue a calculation.
+
+        Args:
+            kind: Job kind, e.g. the endpoint it mirrors
+            calculate: Called with the Job on a worker thread; returns a response
+                model or dict and may call job.report()
+
+        Returns:
+            The queued Job
+
+        Raises:
+            JobQueueFull: If max_pending jobs are already queued or running
+        """
+        self._purge()
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            raise JobQueueFull()
+
+        job = Job(kind)
+        with self._lock:
+            self._jobs[job.id] = job
+        future = self._executor.submit(self._run, job, calculate)
+        future.add_done_callback(lambda _: self._slots.release())
+        return job
+
+    def _run(self, job: Job, calculate: Callable[[Job], object]):
+        if not job.start():
+            return
+        try:
+            result = calculate(job)
+        except JobCancelled:
+            job.complete("cancelled")
+        except ValueError as e:
+            job.complete("failed", error=str(e))
+        except Exception as e:
+            job.complete("failed", error=f"Internal server error: {str(e)}")
+        else:
+            job.complete("succeeded", result=result.model_dump() if hasattr(result, "model_dump") else result)
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """Return a job that is queued, running or finished within the TTL"""
+        self._purge()
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _purge(self):
+        cutoff = time.time() - self.ttl_seconds
+        with self._lock:
+            expired = [
+                job_id for job_id, job in self._jobs.items()
+                if job.finished_at is not None and job.finished_at < cutoff
+            ]
+            for job_id in expired:
+                del self._jobs[job_id]
+
+    def snapshot(self) -> dict:
+        """Return job counts by status"""
+        self._purge()
+        with self._lock:
+            counts = {status: 0 for status in ("queued", "running", "succeeded", "failed", "cancelled")}
+            for job in self._jobs.values():
+                counts[job.status] += 1
+            return {"jobs": counts, "rejected": self.rejected}
+
+    def shutdown(self, wait: bool = True):
+        """Cancel outstanding jobs and stop the worker pool"""
+        with self._lock:
+            jobs = list(self._jobs.values())
+        for job in jobs:
+            job.cancel()
+        self._executor.shutdown(wait=wait)
+
+
+def run_in_chunks(
+    items: Sequence,
+    calculate: Callable[[Sequence], List],
+    job: Job,
+    chunk_size: int = JOB_BATCH_CHUNK,
+) -> List:
+    """
+    Calculate a batch chunk by chunk, reporting progress after each chunk.
+
+    Args:
+        items: Requests to calculate
+        calculate: Vectorized batch function, e.g. calculate_sip_batch
+        job: Job to report progress to
+
+    Returns:
+        Results in request order
+
+    Raises:
+        JobCancelled: If the job is cancelled between chunks
+    """
+    results = []
+    for start in range(0, len(items), chunk_size):
+        results.extend(calculate(items[start:start + chunk_size]))
+        job.report(len(results) / len(items), {"completed": len(results)})
+    return results
@@ -0,0 +1,342 @@
+"""
+Vectorized recurrence kernels shared by the calculator services
+
+All kernels operate on the last axis as time and broadcast over any leading
+axes, so the same code serves a single plan (shape (T,)) and a batch of
+plans or simulated paths (shape (N, T)).
+"""
+from functools import lru_cache
+from typing import Sequence, Tuple
+
+import numpy as np
+
+MONTHS_PER_YEAR = 12
+
+# Compounding frequency -> interest crediting periods per year
+PERIODS_PER_YEAR = {
+    "monthly": 12,
+    "quarterly": 4,
+    "annually": 1,
+}
+
+
+def step_up_schedule(start, rate, cap, years: int) -> np.ndarray:
+    """
+    Per-year amounts that start at `start` and grow by `rate` each year, capped at `cap`.
+
+    Equivalent to the iterative rule amount_y = min(amount_{y-1} * (1 + rate), cap)
+    for y >= 2, which also holds for negative rates. The year-1 amount is never
+    capped. Written in closed form as (1 + rate)^(y-1) times a running minimum of
+    cap / (1 + rate)^(y-1), so it needs no Python loop.
+
+    Args:
+        start: Year-1 amount, scalar or array of shape (...,)
+        rate: Annual step-up as a decimal (e.g. 0.10), scalar or (...,)
+        cap: Maximum amount, None or np.inf for no cap, scalar or (...,)
+        years: Number of years
+
+    Returns:
+        Array of shape (..., years)
+    """
+    start = np.asarray(start, dtype=float)[..., None]
+    growth = 1 + np.asarray(rate, dtype=float)[..., None]
+    cap = np.asarray(np.inf if cap is None else cap, dtype=float)[..., None]
+
+    exponents = np.arange(years)
+    powers = growth ** exponents
+    bounds = np.where(exponents == 0, start, cap / powers)
+    return powers * np.minimum.accumulate(bounds, axis=-1)
+
+
+def step_up_sensitivities(start, rate, cap, years: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Partial derivatives of step_up_schedule with respect to `start` and `rate`.
+
+    Each year's amount is (1 + rate)^(y-1-j) times `start` (j = 0) or `cap`
+    (j >= 1), where j is the year that set the running minimum, so both
+    derivatives are closed form; amounts held by the cap do not depend on
+    `start`.
+
+    Returns:
+        Tuple of (d_start, d_rate), each of shape (..., years); d_rate is per
+        unit of the decimal rate
+    """
+    start = np.asarray(start, dtype=float)[..., None]
+    growth = 1 + np.asarray(rate, dtype=float)[..., None]
+    cap = np.asarray(np.inf if cap is None else cap, dtype=float)[..., None]
+
+    exponents = np.arange(years)
+    powers = growth ** exponents
+    bounds = np.where(exponents == 0, start, cap / powers)
+    running = np.minimum.accumulate(bounds, axis=-1)
+    setter = np.maximum.accumulate(np.where(bounds <= running, exponents, 0), axis=-1)
+    d_start = np.where(setter == 0, powers, 0.0)
+    d_rate = (exponents - setter) * powers * running / growth
+    return d_start, d_rate
+
+
+def to_periods(monthly_flows: np.ndarray, periods_per_year: int) -> np.ndarray:
+    """Sum monthly cash flows into compounding periods along the last axis"""
+    months_per_period = MONTHS_PER_YEAR // periods_per_year
+    shape = monthly_flows.shape[:-1] + (-1, months_per_period)
+    return monthly_flows.reshape(shape).sum(axis=-1)
+
+
+def accumulate(opening, flows: np.ndarray, growth) -> np.ndarray:
+    """
+    Balance path of the linear recurrence B_t = B_{t-1} * growth_t + flows_t.
+
+    Solved as B_t = G_t * (B_0 + sum_{s<=t} flows_s / G_s) with G the cumulative
+    product of growth factors, i.e. one cumprod and one cumsum instead of
+    re-raising powers for every contribution.
+
+    Args:
+        opening: Balance before the first period, scalar or (...,)
+        flows: Cash flow credited at the end of each period, shape (..., T)
+        growth: Growth factor for each period, scalar or broadcastable to flows
+
+    Returns:
+        Balance at the end of every period, shape (..., T)
+    """
+    flows = np.asarray(flows, dtype=float)
+    factors = np.cumprod(np.broadcast_to(growth, flows.shape), axis=-1)
+    return accumulate_factors(opening, flows, factors)
+
+
+def accumulate_factors(opening, flows: np.ndarray, factors: np.ndarray) -> np.ndarray:
+    """accumulate() with precomputed cumulative growth factors, shape broadcastable to flows"""
+    opening = np.asarray(opening, dtype=float)[..., None]
+    return factors * (opening + np.cumsum(flows / factors, axis=-1))
+
+
+def growth_over_months(annual_rate, compounding_frequency: str, months: int):
+    """
+    Growth factor over `months` months for a nominal annual rate credited
+    `compounding_frequency`, treating fractional periods at the equivalent
+    compound rate (e.g. one month at annual compounding is (1 + r)^(1/12)).
+    """
+    periods_per_year = PERIODS_PER_YEAR[compounding_frequency]
+    annual_rate = np.asarray(annual_rate, dtype=float)
+    return (1 + annual_rate / periods_per_year) ** (periods_per_year * months / MONTHS_PER_YEAR)
+
+
+def growth_rate_derivative(annual_rate, compounding_frequency: str, months: int):
+    """Derivative of growth_over_months with respect to the (decimal) annual rate"""
+    periods_per_year = PERIODS_PER_YEAR[compounding_frequency]
+    annual_rate = np.asarray(annual_rate, dtype=float)
+    exponent = periods_per_year * months / MONTHS_PER_YEAR
+    return exponent / periods_per_year * (1 + annual_rate / periods_per_year) ** (exponent - 1)
+
+
+def spread_annual_growth(annual_growth, periods_per_year: int) -> np.ndarray:
+    """
+    Per-period growth factors that compound to the given annual growth factors.
+
+    Args:
+        annual_growth: Realized growth factor for each year (1 + return), shape (..., years)
+        periods_per_year: Periods to spread each year over
+
+    Returns:
+        Array of shape (..., years * periods_per_year)
+    """
+    annual_growth = np.asarray(annual_growth, dtype=float)
+    return np.repeat(annual_growth ** (1 / periods_per_year), periods_per_year, axis=-1)
+
+
+def drawdown(opening, withdrawals: np.ndarray, growth, periods=None, factors=None, deposits=None):
+    """
+    Balance path when a withdrawal is taken at the start of each period and
+    the remainder grows: B_t = (B_{t-1} - w_t) * growth_t.
+
+    The unconstrained path is solved in closed form by accumulate(); the
+    first period whose opening balance cannot cover its withdrawal is the
+    depletion period, where the remaining balance is paid out and every
+    later period is zero. Optional deposits are credited at the start of the
+    period, before that period's withdrawal; a depleted path stays depleted
+    and ignores later deposits.
+
+    Args:
+        opening: Balance before the first period, scalar or (...,)
+        withdrawals: Scheduled withdrawal per period, shape (..., T)
+        growth: Growth factor per period, scalar or broadcastable to withdrawals
+        periods: Optional count of active periods per path, scalar or (...,),
+            for batches padded to a common length; later periods are ignored
+        factors: Optional precomputed cumulative product of `growth`
+        deposits: Optional amount added at the start of each period, shape (..., T)
+
+    Returns:
+        Tuple of (balances, paid, depletion_index):
+        - balances: Balance at the end of each period, shape (..., T)
+        - paid: Amount actually withdrawn each period, shape (..., T)
+        - depletion_index: Index of the depletion period, -1 if never depleted, shape (...)
+    """
+    withdrawals = np.asarray(withdrawals, dtype=float)
+    growth = np.broadcast_to(growth, withdrawals.shape)
+    opening = np.asarray(opening, dtype=float)
+    length = withdrawals.shape[-1]
+
+    if factors is None:
+        factors = np.cumprod(growth, axis=-1)
+    net = -withdrawals if deposits is None else deposits - withdrawals
+    unconstrained = accumulate_factors(opening, net * growth, factors)
+    before = np.concatenate(
+        [np.broadcast_to(opening[..., None], unconstrained.shape[:-1] + (1,)), unconstrained[..., :-1]],
+        axis=-1,
+    )
+    if deposits is not None:
+        before = before + deposits
+
+    index = np.arange(length)
+    short = (before < withdrawals) | (before <= 0)
+    if periods is not None:
+        short &= index < np.asarray(periods)[..., None]
+
+    depleted = short.any(axis=-1)
+    depletion_index = np.where(depleted, short.argmax(axis=-1), length)
+    alive = index < depletion_index[..., None]
+    at_depletion = index == depletion_index[..., None]
+
+    balances = np.where(alive, unconstrained, 0.0)
+    paid = np.where(alive, withdrawals, np.where(at_depletion, np.maximum(before, 0.0), 0.0))
+    return balances, paid, np.where(depleted, depletion_index, -1)
+
+
+class GrowthTable:
+    """
+    Prefix products of per-period growth factors.
+
+    cumulative[k] is the growth over the first k periods, so the growth
+    between any two period boundaries, and hence the terminal value of any
+    cash flow, is a single division instead of a fresh power or product.
+    Arrays are read-only because tables are cached and shared.
+    """
+
+    __slots__ = ("growth", "cumulative")
+
+    def __init__(self, growth: np.ndarray):
+        self.growth = np.array(growth, dtype=float)
+        self.cumulative = np.concatenate([[1.0], np.cumprod(self.growth)])
+        self.growth.flags.writeable = False
+        self.cumulative.flags.writeable = False
+
+    def __len__(self) -> int:
+        return len(self.growth)
+
+    @property
+    def factors(self) -> np.ndarray:
+        """Growth from the start of the table to the end of each period, shape (T,)"""
+        return self.cumulative[1:]
+
+    def between(self, start, end):
+        """Growth from period boundary `start` to boundary `end` (0 is the opening)"""
+        return self.cumulative[end] / self.cumulative[start]
+
+    def terminal_value(self, amount, period, horizon=None):
+        """Value at boundary `horizon` (default: the end) of `amount` credited at the end of `period`"""
+        end = len(self) if horizon is None else horizon
+        return amount * self.between(np.asarray(period) + 1, end)
+
+
+@lru_cache(maxsize=1024)
+def schedule_growth_table(
+    annual_rates: Tuple[float, ...],
+    compounding_frequency: str,
+    months_per_period: int,
+) -> GrowthTable:
+    """
+    Cached growth table for a per-year rate schedule.
+
+    Args:
+        annual_rates: Annual return rate in percent for each year
+        compounding_frequency: How often returns are credited
+        months_per_period: Length of one simulation period in months
+
+    Returns:
+        GrowthTable with MONTHS_PER_YEAR // months_per_period periods per year
+    """
+    rates = np.array(annual_rates, dtype=float) / 100
+    per_period = growth_over_months(rates, compounding_frequency, months_per_period)
+    return GrowthTable(np.repeat(per_period, MONTHS_PER_YEAR // months_per_period))
+
+
+def stack_tables(tables: Sequence[GrowthTable], length: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Stack growth tables into (N, length) growth and cumulative-factor arrays.
+
+    Each distinct table is copied once and shared rows are gathered by
+    index, so a batch that reuses a schedule reuses its prefix products.
+    Shorter tables are padded with a growth of 1.
+
+    Returns:
+        Tuple of (growth, factors), each of shape (N, length)
+    """
+    slots = {}
+    rows = [slots.setdefault(id(table), len(slots)) for table in tables]
+    unique = {slot: table for table, slot in zip(tables, rows)}
+
+    growth = np.ones((len(unique), length))
+    factors = np.empty((len(unique), length))
+    for slot, table in unique.items():
+        size = len(table)
+        growth[slot, :size] = table.growth
+        factors[slot, :size] = table.factors
+        factors[slot, size:] = table.cumulative[-1]
+
+    index = np.array(rows)
+    return growth[index], factors[index]
+
+
+# Above this many distinct schedules in one batch, tables are built in one pass instead of cached
+CACHED_SCHEDULES_LIMIT = 256
+
+
+def schedule_growth(
+    schedules: Sequence[Tuple[float, ...]],
+    compounding_frequencies: Sequence[str],
+    months_per_period: int,
+    length: int,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Growth and cumulative factors for a batch of per-year rate schedules.
+
+    Batches with few distinct schedules, as in API traffic, reuse the cached
+    tables of schedule_growth_table. Batches of mostly distinct schedules,
+    such as bulk scoring of client plans, would fill the cache with tables
+    used once, so all their rows are built in one vectorized pass instead.
+    Both give bit-identical values.
+
+    Args:
+        schedules: Annual return rates in percent for each year, one tuple per row
+        compounding_frequencies: Compounding frequency of each row
+        months_per_period: Length of one simulation period in months
+        length: Periods per row; shorter schedules are padded with a growth of 1
+
+    Returns:
+        Tuple of (growth, factors), each of shape (N, length)
+    """
+    slots = {}
+    rows = [slots.setdefault(key, len(slots)) for key in zip(schedules, compounding_frequencies)]
+    if len(slots) <= CACHED_SCHEDULES_LIMIT:
+        tables = [schedule_growth_table(rates, frequency, months_per_period) for rates, frequency in slots]
+        growth, factors = stack_tables(tables, length)
+        index = np.array(rows)
+        return growth[index], factors[index]
+
+    unique = list(slots)
+    periods_per_year = MONTHS_PER_YEAR // months_per_period
+    growth = np.ones((len(unique), length))
+    for frequency in {frequency for _, frequency in unique}:
+        members = [slot for slot, (_, f) in enumerate(unique) if f == frequency]
+        years = max(len(unique[slot][0]) for slot in members)
+        rates = np.zeros((len(members), years))
+        padded = np.zeros((len(members), years), dtype=bool)
+        for row, slot in enumerate(members):
+            schedule = unique[slot][0]
+            rates[row, :len(schedule)] = schedule
+            padded[row, len(schedule):] = True
+        per_period = np.where(padded, 1.0, growth_over_months(rates / 100, frequency, months_per_period))
+        growth[members, :years * periods_per_year] = np.repeat(per_period, periods_per_year, axis=-1)
+
+    index = np.array(rows)
+    growth = growth[index]
+    return growth, np.cumprod(growth, axis=-1)
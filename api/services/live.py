@@ -0,0 +1,201 @@
+"""
+Live recalculation sessions for slider-driven UIs over a WebSocket
+"""
+import asyncio
+import json
+import threading
+from typing import Awaitable, Callable, Optional
+
+from pydantic import ValidationError
+
+from api.models.money_journey import MoneyJourneyRequest
+from api.models.sip import SIPCalculationRequest
+from api.services.money_journey import accumulation_request, calculate_withdrawal_phase
+from api.services.sip_calculator import calculate_sip_batch, calculate_sip_with_annual_compounding
+
+LIVE_KINDS = {
+    "sip": SIPCalculationRequest,
+    "money_journey": MoneyJourneyRequest,
+}
+
+# Quiet time after the last update before calculating, and the longest a
+# continuous burst (a slider being dragged) may hold back a result
+DEBOUNCE_SECONDS = 0.05
+MAX_WAIT_SECONDS = 0.25
+
+
+class LiveMetrics:
+    """Counters across all live sessions"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.sessions = 0
+        self.open_sessions = 0
+        self.updates = 0
+        self.computations = 0
+        self.superseded = 0
+        self.phase_reuse = 0
+
+    def add(self, **counts):
+        with self._lock:
+            for name, count in counts.items():
+                setattr(self, name, getattr(self, name) + count)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "sessions": self.sessions,
+                "open_sessions": self.open_sessions,
+                "updates": self.updates,
+                "computations": self.computations,
+                "superseded": self.superseded,
+                "phase_reuse": self.phase_reuse,
+            }
+
+
+class LiveSession:
+    """
+    Parameters of one client's plan and the results it can reuse.
+
+    Updates are deltas merged into the session's parameters (a null value
+    resets a field to its default). For Money Journey the accumulation phase
+    is cached by its inputs, so moving a withdrawal slider only recalculates
+    the withdrawal phase.
+    """
+
+    def __init__(self, kind: str, metrics: Optional[LiveMetrics] = None):
+        self.kind = kind
+        self.model = LIVE_KINDS[kind]
+        self.metrics = metrics or LiveMetrics()
+        self.params: dict = {}
+        self.version = 0
+        self._accumulation_key: Optional[str] = None
+        self._accumulation = None
+
+    def update(self, message: dict) -> int:
+        """
+        Apply a client message: {"params": {...}} merges, with "replace": true it replaces.
+
+        Returns:
+            The new parameter version
+
+        Raises:
+            ValueError: If the message is not of that shape
+        """
+        params = message.get("params") if isinstance(message, dict) else None
+        if not isinstance(params, dict):
+            raise ValueError("message must be an object with a 'params' object")
+        merged = {} if message.get("replace") else dict(self.params)
+        for name, value in params.items():
+            if value is None:
+                merged.pop(name, None)
+            else:
+                merged[name] = value
+        self.params = merged
+        self.version += 1
+        self.metrics.add(updates=1)
+        return self.version
+
+    def calculate(self, params: dict) -> dict:
+        """
+        Validate and calculate a parameter set.
+
+        Returns:
+            The response model as a JSON-ready dict
+
+        Raises:
+            ValidationError: If the parameters are not a valid plan
+        """
+        request = self.model(**params)
+        self.metrics.add(computations=1)
+        if self.kind == "sip":
+            return calculate_sip_with_annual_compounding(request).model_dump(mode="json")
+
+        accumulation = accumulation_request(request)
+        key = accumulation.model_dump_json()
+        if key == self._accumulation_key:
+            self.metrics.add(phase_reuse=1)
+        else:
+            self._accumulation = calculate_sip_batch([accumulation])[0]
+            self._accumulation_key = key
+        return calculate_withdrawal_phase([request], [self._accumulation])[0].model_dump(mode="json")
+
+
+def _error(version: Optional[int], message: str, errors: Optional[list] = None) -> dict:
+    return {"type": "error", "version": version, "message": message, "errors": errors or []}
+
+
+async def serve_live_session(
+    session: LiveSession,
+    receive: Callable[[], Awaitable[str]],
+    send: Callable[[dict], Awaitable[None]],
+    debounce_seconds: float = DEBOUNCE_SECONDS,
+    max_wait_seconds: float = MAX_WAIT_SECONDS,
+):
+    """
+    Apply client updates as they arrive and push the result of the latest parameters.
+
+    Updates are debounced: calculation starts once the client has been quiet
+    for `debounce_seconds`, or `max_wait_seconds` into a continuous burst. One
+    calculation runs at a time, on a worker thread; if newer parameters
+    arrived meanwhile its result is dropped and the latest parameters are
+    calculated instead. Each pushed message carries the parameter version it
+    answers.
+
+    Returns when the client disconnects (whatever `receive` raises propagates).
+    """
+    changed = asyncio.Event()
+    loop = asyncio.get_running_loop()
+
+    async def read():
+        while True:
+            text = await receive()
+            try:
+                session.update(json.loads(text))
+            except ValueError as e:
+                await send(_error(None, f"Invalid message: {e}"))
+                continue
+            changed.set()
+
+    async def calculate():
+        while True:
+            await changed.wait()
+            started = loop.time()
+            while True:
+                changed.clear()
+                await asyncio.sleep(debounce_seconds)
+                if not changed.is_set() or loop.time() - started >= max_wait_seconds:
+                    break
+
+            changed.clear()
+            version, params = session.version, session.params
+            try:
+                message = {
+                    "type": "result",
+                    "version": version,
+                    "response": await asyncio.to_thread(session.calculate, params),
+                }
+            except ValidationError as e:
+                message = _error(version, "Validation error", [
+                    {"field": ".".join(str(x) for x in error["loc"]), "message": error["msg"]}
+                    for error in e.errors()
+                ])
+            except ValueError as e:
+                message = _error(version, str(e))
+
+            if session.version != version:
+                # Newer parameters arrived (and set `changed`) while calculating
+                session.metrics.add(superseded=1)
+                continue
+            await send(message)
+
+    session.metrics.add(sessions=1, open_sessions=1)
+    tasks = [asyncio.create_task(read()), asyncio.create_task(calculate())]
+    try:
+        done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            task.result()
+    finally:
+        for task in tasks:
+            task.cancel()
+        session.metrics.add(open_sessions=-1)
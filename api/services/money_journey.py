@@ -1,34 +1,380 @@
 """
 Money Journey calculator service — accumulation + withdrawal lifecycle
 """
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
 from api.models.sip import SIPCalculationRequest
 from api.models.money_journey import (
+    MoneyJourneyInputSensitivities,
     MoneyJourneyRequest,
     MoneyJourneyResponse,
     MoneyJourneyResults,
+    MoneyJourneySensitivities,
     MoneyJourneyYearBreakdown,
 )
-from api.services.sip_calculator import calculate_sip_with_annual_compounding
+from api.services.events import event_arrays
+from api.services.fixed_point import (
+    divide,
+    drawdown_units,
+    from_units,
+    rate_columns,
+    run_rows,
+    step_up_columns,
+    to_units,
+)
+from api.services.grid import load_grid
+from api.services.kernels import (
+    MONTHS_PER_YEAR,
+    accumulate_factors,
+    drawdown,
+    growth_over_months,
+    growth_rate_derivative,
+    schedule_growth,
+    step_up_schedule,
+    step_up_sensitivities,
+    to_periods,
+)
+from api.services.policies import policy_arrays, policy_drawdown
+from api.services.sip_calculator import (
+    approximate_sip,
+    approximation,
+    calculate_sip_batch,
+    batch_groups,
+    calculate_sip_summaries,
+)
 
 
-def calculate_money_journey(request: MoneyJourneyRequest) -> MoneyJourneyResponse:
-    """
-    Calculate full money journey: accumulation phase then withdrawal phase.
-
-    Accumulation reuses the existing SIP calculator logic.
-    Withdrawal applies year-by-year: withdraw at start of year, compound remainder.
-    """
-    # --- Accumulation phase (reuse SIP logic) ---
-    sip_request = SIPCalculationRequest(
+def accumulation_request(request: MoneyJourneyRequest) -> SIPCalculationRequest:
+    """SIP request equivalent to a plan's accumulation phase"""
+    return SIPCalculationRequest(
         monthly_investment=request.monthly_investment,
         time_period_years=request.accumulation_years,
         annual_return_rate=request.accumulation_return_rate,
         initial_investment=request.initial_investment,
         annual_step_up_rate=request.annual_step_up_rate,
         step_up_cap=request.step_up_cap,
+        annual_return_rates=request.accumulation_return_rates,
+        events=[e for e in request.events or [] if e.year <= request.accumulation_years] or None,
+        exact=request.exact,
+        sensitivities=request.sensitivities,
+    )
+
+
+def project_withdrawals(
+    requests: Sequence[MoneyJourneyRequest],
+    corpus: np.ndarray,
+    growth: Optional[np.ndarray] = None,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Project the withdrawal phase for requests sharing a withdrawal frequency.
+
+    Withdrawals are taken at the start of each period (year or month) and the
+    remainder grows at that year's withdrawal return rate, read from a cached
+    prefix-product table of the rate schedule. Rows are
+    padded to the longest horizon and evaluated together by the drawdown kernel.
+
+    Withdrawal-phase events are summed into each period: pauses suspend the
+    scheduled withdrawal, one-off withdrawals are added to it and lump sums
+    are deposited before it is taken. Lump sums after depletion are ignored.
+
+    When any request has a withdrawal policy, the group is evaluated by
+    policy_drawdown instead, which sets each year's withdrawal from the
+    balance at the start of the year; scheduled_monthly then holds the
+    withdrawal each rule chose.
+
+    Args:
+        requests: Money Journey requests, all with the same withdrawal_frequency
+        corpus: Balance at the start of the withdrawal phase, shape (N,)
+        growth: Optional growth factor per withdrawal period, shape
+            (N, max_years * periods per year), used instead of the requests'
+            withdrawal rates, e.g. realized historical returns
+
+    Returns:
+        Tuple of (scheduled_monthly, paid_per_year, year_end_balances, depletion_period):
+        - scheduled_monthly: Scheduled (or policy-chosen) monthly withdrawal per year, (N, max_years)
+        - paid_per_year: Amount actually withdrawn per year, (N, max_years)
+        - year_end_balances: Balance at the end of each year, (N, max_years)
+        - depletion_period: Period index of depletion, -1 if never, (N,)
+    """
+    years = max(r.withdrawal_years for r in requests)
+    periods_per_year = MONTHS_PER_YEAR if requests[0].withdrawal_frequency == "monthly" else 1
+    months_per_period = MONTHS_PER_YEAR // periods_per_year
+
+    monthly_withdrawal = np.array([r.monthly_withdrawal for r in requests])
+    step_up_rate = np.array([r.withdrawal_step_up_rate for r in requests]) / 100
+    step_up_cap = np.array([
+        np.inf if r.withdrawal_step_up_cap is None else r.withdrawal_step_up_cap for r in requests
+    ])
+    if growth is None:
+        growth, factors = schedule_growth(
+            [r.withdrawal_rates() for r in requests],
+            [r.withdrawal_compounding_frequency for r in requests],
+            months_per_period,
+            years * periods_per_year,
+        )
+    else:
+        factors = np.cumprod(growth, axis=-1)
+    periods = np.array([r.withdrawal_years for r in requests]) * periods_per_year
+
+    scheduled_monthly = step_up_schedule(monthly_withdrawal, step_up_rate, step_up_cap, years)
+    withdrawals = np.repeat(scheduled_monthly * months_per_period, periods_per_year, axis=-1)
+    deposits = None
+
+    events = event_arrays(
+        [r.events for r in requests],
+        years * MONTHS_PER_YEAR,
+        offset=[r.accumulation_years * MONTHS_PER_YEAR for r in requests],
+    )
+    if events is not None:
+        monthly = np.repeat(scheduled_monthly, MONTHS_PER_YEAR, axis=-1) * events.active
+        withdrawals = to_periods(monthly + events.withdrawals, periods_per_year)
+        deposits = to_periods(events.lump_sums, periods_per_year)
+
+    if any(r.withdrawal_policy is not None for r in requests):
+        scheduled_monthly, balances, paid, depletion_period = policy_drawdown(
+            corpus, scheduled_monthly, policy_arrays(requests), step_up_rate, step_up_cap,
+            growth, periods_per_year, periods, events,
+        )
+    else:
+        balances, paid, depletion_period = drawdown(corpus, withdrawals, growth, periods, factors, deposits)
+
+    paid_per_year = paid.reshape(len(requests), years, periods_per_year).sum(axis=-1)
+    year_end_balances = balances[:, periods_per_year - 1::periods_per_year]
+    return scheduled_monthly, paid_per_year, year_end_balances, depletion_period
+
+
+def withdrawal_sensitivities(
+    requests: Sequence[MoneyJourneyRequest],
+    corpus: np.ndarray,
+    depletion_period: np.ndarray,
+) -> Tuple[Dict[str, np.ndarray], Dict[str, np.ndarray]]:
+    """
+    Derivatives of the withdrawal phase's final balance and depletion time, for requests sharing a withdrawal frequency.
+
+    The unconstrained drawdown U_t = (U_{t-1} + d_t - w_t) * g_t is
+    differentiated in forward mode, as sip_sensitivities does for
+    accumulation, so each derivative path is one accumulate_factors call
+    over the same growth factors. A depleted plan's final balance is locally
+    flat. Its depletion time is where the margin M_t = U_{t-1} + d_t - w_t
+    crosses zero, interpolated between the last covered period and the one
+    that runs dry; the margin before the first withdrawal is the corpus.
+
+    Args:
+        requests: Money Journey requests without withdrawal policies, all with the same withdrawal_frequency
+        corpus: Balance at the start of the withdrawal phase, shape (N,)
+        depletion_period: Depletion period from project_withdrawals, -1 if never, shape (N,)
+
+    Returns:
+        Tuple of (final balance, depletion time in years) derivatives, each a
+        dict of input name -> shape (N,): "corpus", "monthly_withdrawal" and,
+        per percentage point, "withdrawal_return_rate" and
+        "withdrawal_step_up_rate". The final balance also has
+        "withdrawal_years", the change from one more year of withdrawals.
+        Depletion times are NaN for plans that never run dry.
+    """
+    count = len(requests)
+    years = max(r.withdrawal_years for r in requests)
+    periods_per_year = MONTHS_PER_YEAR if requests[0].withdrawal_frequency == "monthly" else 1
+    months_per_period = MONTHS_PER_YEAR // periods_per_year
+    length = years * periods_per_year
+    rows = np.arange(count)
+    last = np.array([r.withdrawal_years for r in requests]) * periods_per_year - 1
+    corpus = np.asarray(corpus, dtype=float)
+
+    monthly_withdrawal = np.array([r.monthly_withdrawal for r in requests])
+    step_up_rate = np.array([r.withdrawal_step_up_rate for r in requests]) / 100
+    step_up_cap = np.array([
+        np.inf if r.withdrawal_step_up_cap is None else r.withdrawal_step_up_cap for r in requests
+    ])
+    scheduled_monthly = step_up_schedule(monthly_withdrawal, step_up_rate, step_up_cap, years)
+    d_start, d_step_up = step_up_sensitivities(monthly_withdrawal, step_up_rate, step_up_cap, years)
+    growth, factors = schedule_growth(
+        [r.withdrawal_rates() for r in requests],
+        [r.withdrawal_compounding_frequency for r in requests],
+        months_per_period,
+        length,
+    )
+    d_growth = np.zeros((count, length))
+    for row, request in enumerate(requests):
+        rates = np.repeat(np.array(request.withdrawal_rates()) / 100, periods_per_year)
+        d_growth[row, :len(rates)] = growth_rate_derivative(
+            rates, request.withdrawal_compounding_frequency, months_per_period
+        ) / 100
+
+    events = event_arrays(
+        [r.events for r in requests],
+        years * MONTHS_PER_YEAR,
+        offset=[r.accumulation_years * MONTHS_PER_YEAR for r in requests],
+    )
+    active = 1.0 if events is None else events.active
+
+    def per_period(monthly_per_year):
+        return to_periods(np.repeat(monthly_per_year, MONTHS_PER_YEAR, axis=-1) * active, periods_per_year)
+
+    net = -per_period(scheduled_monthly)
+    if events is not None:
+        net = net + to_periods(events.lump_sums - events.withdrawals, periods_per_year)
+    unconstrained = accumulate_factors(corpus, net * growth, factors)
+    margin = np.concatenate([corpus[:, None], unconstrained[:, :-1]], axis=-1) + net
+
+    # Derivatives of U (with dU_0) and of the net flow, per input
+    inputs = {
+        "corpus": (factors, 1.0, 0.0),
+        "withdrawal_return_rate": (accumulate_factors(0.0, margin * d_growth, factors), 0.0, 0.0),
+    }
+    for name, d_schedule in (("monthly_withdrawal", d_start), ("withdrawal_step_up_rate", d_step_up / 100)):
+        d_net = -per_period(d_schedule)
+        inputs[name] = (accumulate_factors(0.0, d_net * growth, factors), 0.0, d_net)
+
+    depleted = depletion_period >= 0
+    period = np.maximum(depletion_period, 0)
+    after = margin[rows, period]
+    before = np.where(period > 0, margin[rows, period - 1], corpus)
+    final_balance, depletion_years = {}, {}
+    for name, (d_unconstrained, d_opening, d_net) in inputs.items():
+        d_margin = np.concatenate(
+            [np.full((count, 1), d_opening), d_unconstrained[:, :-1]], axis=-1
+        ) + d_net
+        d_after = d_margin[rows, period]
+        d_before = np.where(period > 0, d_margin[rows, period - 1], d_opening)
+        final_balance[name] = np.where(depleted, 0.0, d_unconstrained[rows, last])
+        # Crossing at period - 1 + before / (before - after)
+        crossing = (before * d_after - after * d_before) / (before - after) ** 2
+        depletion_years[name] = np.where(depleted, crossing / periods_per_year, np.nan)
+
+    # One more year at the last rate, with the next stepped-up withdrawal
+    balance = unconstrained[rows, last]
+    next_withdrawal = np.minimum(scheduled_monthly[rows, last // periods_per_year] * (1 + step_up_rate), step_up_cap)
+    extra_balances, _, _ = drawdown(
+        balance,
+        np.repeat((next_withdrawal * months_per_period)[:, None], periods_per_year, axis=-1),
+        growth[rows, last][:, None],
     )
-    sip_response = calculate_sip_with_annual_compounding(sip_request)
+    final_balance["withdrawal_years"] = np.where(depleted, 0.0, extra_balances[:, -1] - balance)
+    return final_balance, depletion_years
+
+
+def project_withdrawals_exact(
+    requests: Sequence[MoneyJourneyRequest],
+    corpus: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    project_withdrawals in integer minor units, for requests sharing a withdrawal frequency and exact settings.
+
+    Withdrawals and their step-ups are rounded by the exact settings' amount
+    rounding and the returns of every withdrawal period by its interest
+    rounding (see api/services/fixed_point.py). Withdrawal policies are not
+    supported.
+
+    Args:
+        requests: Money Journey requests, all with the same withdrawal_frequency and exact settings
+        corpus: Balance at the start of the withdrawal phase in minor units, shape (N,)
+
+    Returns:
+        Tuple of int64 arrays in minor units, as for project_withdrawals
+    """
+    years = max(r.withdrawal_years for r in requests)
+    periods_per_year = MONTHS_PER_YEAR if requests[0].withdrawal_frequency == "monthly" else 1
+    months_per_period = MONTHS_PER_YEAR // periods_per_year
+    exact = requests[0].exact
+    minor_units, amount_rounding = exact.minor_units, exact.amount_rounding
+
+    def units(amount):
+        return to_units(amount, minor_units, amount_rounding)
+
+    scheduled_monthly = step_up_columns(
+        [units(r.monthly_withdrawal) for r in requests],
+        [r.withdrawal_step_up_rate for r in requests],
+        [None if r.withdrawal_step_up_cap is None else units(r.withdrawal_step_up_cap) for r in requests],
+        years,
+        amount_rounding,
+    )
+    rates = rate_columns(
+        [r.withdrawal_rates() for r in requests],
+        [r.withdrawal_compounding_frequency for r in requests],
+        months_per_period,
+        years * periods_per_year,
+    )
+    periods = np.array([r.withdrawal_years for r in requests], dtype=np.int64) * periods_per_year
+
+    withdrawals = np.repeat(scheduled_monthly * months_per_period, periods_per_year, axis=-1)
+    deposits = np.zeros_like(withdrawals)
+    events = event_arrays(
+        [r.events for r in requests],
+        years * MONTHS_PER_YEAR,
+        offset=[r.accumulation_years * MONTHS_PER_YEAR for r in requests],
+        units=units,
+    )
+    if events is not None:
+        monthly = np.repeat(scheduled_monthly, MONTHS_PER_YEAR, axis=-1) * events.active
+        withdrawals = to_periods(monthly + events.withdrawals, periods_per_year)
+        deposits = to_periods(events.lump_sums, periods_per_year)
+    # Nothing is due past a plan's own horizon in a padded batch
+    withdrawals = withdrawals * (np.arange(years * periods_per_year) < periods[:, None])
+
+    year_end_balances, paid_per_year, depletion_period = run_rows(
+        drawdown_units,
+        [np.asarray(corpus, dtype=np.int64), periods],
+        [withdrawals, deposits, rates],
+        periods_per_year=periods_per_year,
+        rounding=exact.interest_rounding,
+    )
+    return scheduled_monthly, paid_per_year, year_end_balances, depletion_period
+
+
+def _depletion_point(request: MoneyJourneyRequest, depletion_period: int) -> Tuple[int, Optional[int], Optional[int]]:
+    """
+    Locate a depletion period in the plan.
 
+    Returns:
+        Tuple of (withdrawal-year index, plan year, month); the index is
+        withdrawal_years and the others None if the money never ran out
+    """
+    if depletion_period < 0:
+        return request.withdrawal_years, None, None
+    if request.withdrawal_frequency == "monthly":
+        depletion_index, month_index = divmod(depletion_period, MONTHS_PER_YEAR)
+        depletion_month = month_index + 1
+    else:
+        depletion_index, depletion_month = depletion_period, 1
+    return depletion_index, request.accumulation_years + depletion_index + 1, depletion_month
+
+
+def _inputs(request: MoneyJourneyRequest) -> dict:
+    """Input parameters echoed in the response"""
+    return {
+        "monthly_investment": request.monthly_investment,
+        "accumulation_years": request.accumulation_years,
+        "accumulation_return_rate": request.accumulation_return_rate,
+        "initial_investment": request.initial_investment,
+        "annual_step_up_rate": request.annual_step_up_rate,
+        "step_up_cap": request.step_up_cap,
+        "monthly_withdrawal": request.monthly_withdrawal,
+        "withdrawal_years": request.withdrawal_years,
+        "withdrawal_return_rate": request.withdrawal_return_rate,
+        "withdrawal_step_up_rate": request.withdrawal_step_up_rate,
+        "withdrawal_step_up_cap": request.withdrawal_step_up_cap,
+        "withdrawal_frequency": request.withdrawal_frequency,
+        "withdrawal_compounding_frequency": request.withdrawal_compounding_frequency,
+        "accumulation_return_rates": request.accumulation_return_rates,
+        "withdrawal_return_rates": request.withdrawal_return_rates,
+        "withdrawal_policy": request.withdrawal_policy.model_dump() if request.withdrawal_policy else None,
+        "events": [e.model_dump() for e in request.events] if request.events else None,
+        "exact": request.exact.model_dump() if request.exact else None,
+    }
+
+
+def _build_response(
+    request: MoneyJourneyRequest,
+    sip_response,
+    scheduled_monthly: np.ndarray,
+    paid_per_year: np.ndarray,
+    year_end_balances: np.ndarray,
+    depletion_period: int,
+) -> MoneyJourneyResponse:
+    """Assemble the API response from one plan's accumulation response and withdrawal rows"""
     corpus_at_retirement = sip_response.results.future_value
     total_contributions = sip_response.results.total_invested
 
@@ -44,96 +390,370 @@ def calculate_money_journey(request: MoneyJourneyRequest) -> MoneyJourneyRespons
         ))
 
     # --- Withdrawal phase ---
-    balance = corpus_at_retirement
-    withdrawal_rate = request.withdrawal_return_rate / 100
-    step_up_rate = request.withdrawal_step_up_rate / 100
-    current_monthly_withdrawal = request.monthly_withdrawal
-    total_withdrawals = 0.0
-    depleted = False
-    depletion_year = None
-
-    for wy in range(1, request.withdrawal_years + 1):
-        year_number = request.accumulation_years + wy
-
-        # Step-up from year 2 onwards
-        if wy > 1:
-            current_monthly_withdrawal = current_monthly_withdrawal * (1 + step_up_rate)
-            if request.withdrawal_step_up_cap is not None:
-                current_monthly_withdrawal = min(current_monthly_withdrawal, request.withdrawal_step_up_cap)
-
-        annual_withdrawal = current_monthly_withdrawal * 12
-
-        # Withdraw at start of year
-        if balance <= 0:
-            # Already depleted
-            depleted = True
-            if depletion_year is None:
-                depletion_year = year_number
-            yearly_breakdown.append(MoneyJourneyYearBreakdown(
-                year=year_number,
-                phase="withdrawal",
-                monthly_amount=0,
-                annual_amount=0,
-                balance=0,
-            ))
-            continue
-
-        if balance < annual_withdrawal:
-            # Partial withdrawal — corpus depleted this year
-            total_withdrawals += balance
-            depleted = True
-            depletion_year = year_number
-            yearly_breakdown.append(MoneyJourneyYearBreakdown(
-                year=year_number,
-                phase="withdrawal",
-                monthly_amount=round(balance / 12, 2),
-                annual_amount=round(balance, 2),
-                balance=0,
-            ))
-            balance = 0
-            continue
-
-        # Full withdrawal, then compound remainder
-        balance -= annual_withdrawal
-        total_withdrawals += annual_withdrawal
-        balance = balance * (1 + withdrawal_rate)
+    depleted = depletion_period >= 0
+    depletion_index, depletion_year, depletion_month = _depletion_point(request, int(depletion_period))
+
+    paid = paid_per_year.tolist()
+    scheduled = scheduled_monthly.tolist()
+    balances = year_end_balances.tolist()
+    for wy in range(request.withdrawal_years):
+        annual_withdrawal = paid[wy]
+        if wy < depletion_index:
+            monthly_withdrawal = scheduled[wy]
+        else:
+            # Depletion year pays out what is left; later years pay nothing
+            monthly_withdrawal = annual_withdrawal / MONTHS_PER_YEAR
 
         yearly_breakdown.append(MoneyJourneyYearBreakdown(
-            year=year_number,
+            year=request.accumulation_years + wy + 1,
             phase="withdrawal",
-            monthly_amount=round(current_monthly_withdrawal, 2),
+            monthly_amount=round(monthly_withdrawal, 2),
             annual_amount=round(annual_withdrawal, 2),
-            balance=round(balance, 2),
+            balance=round(balances[wy], 2),
         ))
 
-    final_balance = round(balance, 2)
+    total_withdrawals = sum(paid[:request.withdrawal_years])
+    final_balance = round(balances[request.withdrawal_years - 1], 2)
 
     results = MoneyJourneyResults(
         corpus_at_retirement=round(corpus_at_retirement, 2),
         total_contributions=round(total_contributions, 2),
         total_withdrawals=round(total_withdrawals, 2),
         final_balance=final_balance,
-        depleted=depleted,
+        depleted=bool(depleted),
         depletion_year=depletion_year,
+        depletion_month=depletion_month,
     )
 
-    inputs_dict = {
-        "monthly_investment": request.monthly_investment,
-        "accumulation_years": request.accumulation_years,
-        "accumulation_return_rate": request.accumulation_return_rate,
-        "initial_investment": request.initial_investment,
-        "annual_step_up_rate": request.annual_step_up_rate,
-        "step_up_cap": request.step_up_cap,
-        "monthly_withdrawal": request.monthly_withdrawal,
-        "withdrawal_years": request.withdrawal_years,
-        "withdrawal_return_rate": request.withdrawal_return_rate,
-        "withdrawal_step_up_rate": request.withdrawal_step_up_rate,
-        "withdrawal_step_up_cap": request.withdrawal_step_up_cap,
-    }
+    return MoneyJourneyResponse(
+        status="success",
+        inputs=_inputs(request),
+        results=results,
+        yearly_breakdown=yearly_breakdown,
+    )
+
+
+def _sensitivities(
+    sip_response,
+    final_balance: Dict[str, np.ndarray],
+    depletion_years: Dict[str, np.ndarray],
+    row: int,
+) -> Optional[MoneyJourneySensitivities]:
+    """
+    One plan's sensitivities from its withdrawal-phase derivatives.
+
+    Accumulation inputs reach the withdrawal phase only through the corpus,
+    so their derivatives are the corpus derivative times the accumulation's
+    future-value sensitivities; one more accumulation year is carried through
+    the corpus the same way, to first order, and also moves the depletion
+    year one year later.
+    """
+    accumulation = sip_response.sensitivities
+    if accumulation is None:
+        return None
+
+    def inputs(values: Dict[str, np.ndarray], decimals: int, later: float) -> MoneyJourneyInputSensitivities:
+        per_corpus = float(values["corpus"][row])
+        return MoneyJourneyInputSensitivities(**{
+            name: round(value, decimals) for name, value in {
+                "monthly_investment": per_corpus * accumulation.monthly_investment,
+                "accumulation_return_rate": per_corpus * accumulation.annual_return_rate,
+                "annual_step_up_rate": per_corpus * accumulation.annual_step_up_rate,
+                "accumulation_years": later + per_corpus * accumulation.time_period_years,
+                "monthly_withdrawal": float(values["monthly_withdrawal"][row]),
+                "withdrawal_return_rate": float(values["withdrawal_return_rate"][row]),
+                "withdrawal_step_up_rate": float(values["withdrawal_step_up_rate"][row]),
+                "withdrawal_years": float(values["withdrawal_years"][row]) if "withdrawal_years" in values else 0.0,
+            }.items()
+        })
 
+    depleted = not np.isnan(depletion_years["corpus"][row])
+    return MoneyJourneySensitivities(
+        final_balance=inputs(final_balance, 2, 0.0),
+        depletion_year=inputs(depletion_years, 4, 1.0) if depleted else None,
+    )
+
+
+def _build_exact_response(
+    request: MoneyJourneyRequest,
+    sip_response,
+    scheduled_monthly: np.ndarray,
+    paid_per_year: np.ndarray,
+    year_end_balances: np.ndarray,
+    depletion_period: int,
+) -> MoneyJourneyResponse:
+    """Assemble the API response from exact withdrawal rows in minor units; amounts are exact to the minor unit"""
+    minor_units = request.exact.minor_units
+    yearly_breakdown = [
+        MoneyJourneyYearBreakdown(
+            year=entry.year,
+            phase="accumulation",
+            monthly_amount=entry.monthly_contribution,
+            annual_amount=entry.invested_this_year,
+            balance=entry.future_value,
+        )
+        for entry in sip_response.yearly_breakdown
+    ]
+
+    depletion_index, depletion_year, depletion_month = _depletion_point(request, int(depletion_period))
+    paid = paid_per_year[:request.withdrawal_years].tolist()
+    scheduled = scheduled_monthly.tolist()
+    balances = year_end_balances.tolist()
+    for wy in range(request.withdrawal_years):
+        if wy < depletion_index:
+            monthly_withdrawal = scheduled[wy]
+        else:
+            monthly_withdrawal = divide(paid[wy], MONTHS_PER_YEAR, request.exact.amount_rounding)
+        yearly_breakdown.append(MoneyJourneyYearBreakdown(
+            year=request.accumulation_years + wy + 1,
+            phase="withdrawal",
+            monthly_amount=from_units(monthly_withdrawal, minor_units),
+            annual_amount=from_units(paid[wy], minor_units),
+            balance=from_units(balances[wy], minor_units),
+        ))
+
+    results = MoneyJourneyResults(
+        corpus_at_retirement=sip_response.results.future_value,
+        total_contributions=sip_response.results.total_invested,
+        total_withdrawals=from_units(sum(paid), minor_units),
+        final_balance=from_units(balances[request.withdrawal_years - 1], minor_units),
+        depleted=depletion_period >= 0,
+        depletion_year=depletion_year,
+        depletion_month=depletion_month,
+    )
     return MoneyJourneyResponse(
         status="success",
-        inputs=inputs_dict,
+        inputs=_inputs(request),
         results=results,
         yearly_breakdown=yearly_breakdown,
     )
+
+
+def _corpus_units(corpus: np.ndarray, exact) -> np.ndarray:
+    """Exact accumulation results back in minor units; the floats hold whole units exactly"""
+    return np.array([to_units(value, exact.minor_units, "half_even") for value in corpus.tolist()], dtype=np.int64)
+
+
+def approximate_withdrawals(request: MoneyJourneyRequest, sip_response) -> Optional[MoneyJourneyResponse]:
+    """
+    Complete a money journey from the scenario grid, given its approximate accumulation.
+
+    With a constant rate and no step-up cap, events or policy, the plan runs
+    dry in the first year whose interpolated withdrawal cover, times
+    monthly_withdrawal, exceeds the corpus; until then the year-end balance
+    is the corpus less that cover, grown to the year end. Only the year of
+    depletion is simulated, by the drawdown kernel, to find the month and
+    the final payout.
+
+    Returns:
+        Response with `approximation` set, or None if the plan is not on the
+        grid or the error bounds leave its depletion month in doubt
+    """
+    grid = load_grid()
+    if (
+        grid is None or sip_response.approximation is None or request.withdrawal_return_rates is not None
+        or request.withdrawal_step_up_cap is not None or request.withdrawal_policy is not None or request.events
+    ):
+        return None
+    years = request.withdrawal_years
+    lookup = grid.lookup(
+        f"withdrawal/{request.withdrawal_frequency}/{request.withdrawal_compounding_frequency}",
+        request.withdrawal_return_rate,
+        request.withdrawal_step_up_rate,
+        years,
+    )
+    corpus = sip_response.results.future_value
+    if lookup is None or corpus <= 0:
+        return None
+
+    cover = request.monthly_withdrawal * lookup.values
+    margin = corpus - cover
+    uncertainty = sip_response.approximation.error_bound + cover * lookup.relative_error
+    depleting = margin < 0
+    depletion_index = int(depleting.argmax()) if depleting.any() else years
+    decided = depletion_index + 1
+    if np.any(np.abs(margin[:decided]) <= uncertainty[:decided]):
+        return None
+
+    rate = request.withdrawal_return_rate / 100
+    frequency = request.withdrawal_compounding_frequency
+    year_growth = growth_over_months(rate, frequency, MONTHS_PER_YEAR * np.arange(1, years + 1))
+    scheduled_monthly = step_up_schedule(request.monthly_withdrawal, request.withdrawal_step_up_rate / 100, None, years)
+    paid_per_year = scheduled_monthly * MONTHS_PER_YEAR
+    year_end_balances = year_growth * margin
+    error_bounds = year_growth * uncertainty
+    depletion_period = -1
+    error_bound = error_bounds[-1]
+
+    if depletion_index < years:
+        periods_per_year = MONTHS_PER_YEAR if request.withdrawal_frequency == "monthly" else 1
+        months_per_period = MONTHS_PER_YEAR // periods_per_year
+        opening = year_end_balances[depletion_index - 1] if depletion_index else corpus
+        opening_error = error_bounds[depletion_index - 1] if depletion_index else sip_response.approximation.error_bound
+        withdrawals = np.full(periods_per_year, scheduled_monthly[depletion_index] * months_per_period)
+        period_growth = growth_over_months(rate, frequency, months_per_period)
+        balances, paid, period = drawdown(opening, withdrawals, period_growth)
+        if period < 0:
+            return None
+        # Each period up to depletion must clear its withdrawal by more than the error, or the month is in doubt
+        checked = slice(0, int(period) + 1)
+        before = np.concatenate([[opening], balances[:-1]])[checked]
+        if np.any(np.abs(before - withdrawals[checked]) <= opening_error * period_growth ** np.arange(period + 1)):
+            return None
+        paid_per_year[depletion_index] = paid.sum()
+        paid_per_year[depletion_index + 1:] = 0.0
+        year_end_balances[depletion_index:] = 0.0
+        depletion_period = depletion_index * periods_per_year + int(period)
+        # The final payout is what was left at the start of the year
+        error_bound = opening_error
+
+    response = _build_response(
+        request, sip_response, scheduled_monthly, paid_per_year, year_end_balances, depletion_period
+    )
+    response.approximation = approximation(
+        max(float(error_bound), sip_response.approximation.error_bound),
+        max(float(lookup.relative_error[:decided].max()), sip_response.approximation.relative_error_bound),
+    )
+    return response
+
+
+def calculate_withdrawal_phase(
+    requests: Sequence[MoneyJourneyRequest],
+    sip_responses: Sequence,
+) -> List[MoneyJourneyResponse]:
+    """
+    Complete money journeys whose accumulation phase is already calculated.
+
+    The withdrawal phase is vectorized across plans that share a withdrawal
+    frequency (and exact settings, for plans in exact arithmetic). Callers
+    comparing scenarios with a common accumulation can pass the same SIP
+    response for every plan.
+
+    Args:
+        requests: Money Journey requests in any mix of horizons and frequencies
+        sip_responses: SIP response for each request's accumulation phase
+
+    Returns:
+        Responses in the same order as the requests
+    """
+    corpus = np.array([sip.results.future_value for sip in sip_responses])
+
+    responses: List[MoneyJourneyResponse] = [None] * len(requests)
+    groups = batch_groups(requests, lambda r: (r.withdrawal_frequency, r.exact), lambda r: r.withdrawal_years)
+    for (_, exact), indices in groups:
+        group = [requests[i] for i in indices]
+        if exact is not None:
+            projection = project_withdrawals_exact(group, _corpus_units(corpus[indices], exact))
+            build = _build_exact_response
+        else:
+            projection = project_withdrawals(group, corpus[indices])
+            build = _build_response
+        scheduled_monthly, paid_per_year, year_end_balances, depletion_period = projection
+        derivatives = None
+        if exact is None and any(r.sensitivities for r in group):
+            derivatives = withdrawal_sensitivities(group, corpus[indices], depletion_period)
+        for row, index in enumerate(indices):
+            responses[index] = build(
+                requests[index],
+                sip_responses[index],
+                scheduled_monthly[row],
+                paid_per_year[row],
+                year_end_balances[row],
+                depletion_period[row],
+            )
+            if derivatives is not None and requests[index].sensitivities:
+                responses[index].sensitivities = _sensitivities(sip_responses[index], *derivatives, row)
+    return responses
+
+
+def calculate_money_journey_batch(requests: Sequence[MoneyJourneyRequest]) -> List[MoneyJourneyResponse]:
+    """
+    Calculate many money journeys: accumulation phase then withdrawal phase.
+
+    Accumulation reuses the SIP projection; withdrawal is vectorized across
+    plans that share a withdrawal frequency.
+
+    Args:
+        requests: Money Journey requests in any mix of horizons and frequencies
+
+    Returns:
+        Responses in the same order as the requests
+    """
+    sip_responses = calculate_sip_batch([accumulation_request(r) for r in requests])
+    return calculate_withdrawal_phase(requests, sip_responses)
+
+
+def calculate_money_journey_summaries(requests: Sequence[MoneyJourneyRequest]) -> Dict[str, list]:
+    """
+    Headline results of many money journeys, without yearly breakdowns.
+
+    Returns the same rounded values as the `results` of
+    calculate_money_journey_batch, but as columns; see calculate_sip_summaries.
+
+    Args:
+        requests: Money Journey requests in any mix of horizons and frequencies
+
+    Returns:
+        Dict of MoneyJourneyResults field name -> list of values in request order
+    """
+    accumulation = calculate_sip_summaries([accumulation_request(r) for r in requests])
+    corpus = np.array(accumulation["future_value"])
+
+    total_withdrawals = np.empty(len(requests))
+    final_balance = np.empty(len(requests))
+    depletion_period = np.empty(len(requests), dtype=np.int64)
+    exact_rows = set()
+    groups = batch_groups(requests, lambda r: (r.withdrawal_frequency, r.exact), lambda r: r.withdrawal_years)
+    for (_, exact), indices in groups:
+        group = [requests[i] for i in indices]
+        rows = np.arange(len(group))
+        last = np.array([r.withdrawal_years for r in group]) - 1
+        if exact is not None:
+            _, paid_per_year, year_end_balances, group_depletion = project_withdrawals_exact(
+                group, _corpus_units(corpus[indices], exact)
+            )
+            # Totals in minor units, converted once
+            total_withdrawals[indices] = from_units(np.cumsum(paid_per_year, axis=-1)[rows, last], exact.minor_units)
+            final_balance[indices] = from_units(year_end_balances[rows, last], exact.minor_units)
+            exact_rows.update(indices)
+        else:
+            _, paid_per_year, year_end_balances, group_depletion = project_withdrawals(group, corpus[indices])
+            total_withdrawals[indices] = np.cumsum(paid_per_year, axis=-1)[rows, last]
+            final_balance[indices] = year_end_balances[rows, last]
+        depletion_period[indices] = group_depletion
+
+    columns = {name: [] for name in MoneyJourneyResults.model_fields}
+    for index, (request, withdrawn, balance, period) in enumerate(zip(
+        requests, total_withdrawals.tolist(), final_balance.tolist(), depletion_period.tolist()
+    )):
+        depleted = period >= 0
+        _, depletion_year, depletion_month = _depletion_point(request, period)
+        if index not in exact_rows:
+            withdrawn, balance = round(withdrawn, 2), round(balance, 2)
+        columns["total_withdrawals"].append(withdrawn)
+        columns["final_balance"].append(balance)
+        columns["depleted"].append(depleted)
+        columns["depletion_year"].append(depletion_year)
+        columns["depletion_month"].append(depletion_month)
+    columns["corpus_at_retirement"] = accumulation["future_value"]
+    columns["total_contributions"] = accumulation["total_invested"]
+    return columns
+
+
+def calculate_money_journey(request: MoneyJourneyRequest) -> MoneyJourneyResponse:
+    """
+    Calculate full money journey: accumulation phase then withdrawal phase.
+
+    Accumulation reuses the existing SIP calculator logic.
+    Withdrawal is taken at the start of each year (default) or each month
+    and the remainder compounds; depletion is resolved to the month.
+    Approximate requests are answered from the scenario grid when it covers
+    both phases and can decide the depletion year.
+    """
+    if request.approximate:
+        sip_response = approximate_sip(accumulation_request(request))
+        if sip_response is not None:
+            response = approximate_withdrawals(request, sip_response)
+            if response is not None:
+                return response
+    return calculate_money_journey_batch([request])[0]
@@ -0,0 +1,89 @@
+"""
+One plan projected over many annual-growth paths (historical windows or simulations)
+"""
+from typing import NamedTuple, Union
+
+import numpy as np
+
+from api.models.money_journey import MoneyJourneyRequest
+from api.models.sip import SIPCalculationRequest
+from api.services.kernels import MONTHS_PER_YEAR, PERIODS_PER_YEAR, spread_annual_growth
+from api.services.money_journey import accumulation_request, project_withdrawals
+from api.services.sip_calculator import project_sip
+
+
+class PathOutcomes(NamedTuple):
+    """Per-path outcomes of one plan, shapes (N,) unless noted"""
+    corpus: np.ndarray
+    total_withdrawals: np.ndarray
+    final_balance: np.ndarray
+    depletion_period: np.ndarray
+    periods_per_year: int
+    year_end_balances: np.ndarray  # (N, plan years)
+
+
+def plan_years(plan: Union[SIPCalculationRequest, MoneyJourneyRequest]) -> int:
+    """Total length of a SIP or Money Journey plan in years"""
+    if isinstance(plan, SIPCalculationRequest):
+        return plan.time_period_years
+    return plan.accumulation_years + plan.withdrawal_years
+
+
+def project_paths(
+    plan: Union[SIPCalculationRequest, MoneyJourneyRequest],
+    annual_growth: np.ndarray,
+) -> PathOutcomes:
+    """
+    Project one plan over many paths of realized annual growth.
+
+    Each path replaces the plan's return rates with its own growth factor
+    per year, spread evenly over the year's compounding or withdrawal
+    periods. All paths go through the regular projection kernels together,
+    so step-ups, events and withdrawal policies behave exactly as in a
+    single calculation.
+
+    Args:
+        plan: SIP plan (accumulation only) or Money Journey plan
+        annual_growth: Growth factor (1 + return) per path and plan year, shape (N, plan years)
+
+    Returns:
+        PathOutcomes; a SIP plan reports its final value as both corpus and
+        final balance and never depletes
+    """
+    count = len(annual_growth)
+    sip_request = plan if isinstance(plan, SIPCalculationRequest) else accumulation_request(plan)
+    accumulation_years = sip_request.time_period_years
+
+    projection = project_sip(
+        [sip_request] * count,
+        growth=spread_annual_growth(
+            annual_growth[:, :accumulation_years], PERIODS_PER_YEAR[sip_request.compounding_frequency]
+        ),
+    )
+    accumulation_balances = projection.year_end_balances
+    corpus = accumulation_balances[:, -1]
+
+    if isinstance(plan, SIPCalculationRequest):
+        return PathOutcomes(
+            corpus=corpus,
+            total_withdrawals=projection.withdrawn_per_year.sum(axis=-1),
+            final_balance=corpus,
+            depletion_period=np.full(count, -1),
+            periods_per_year=1,
+            year_end_balances=accumulation_balances,
+        )
+
+    periods_per_year = MONTHS_PER_YEAR if plan.withdrawal_frequency == "monthly" else 1
+    _, paid_per_year, withdrawal_balances, depletion_period = project_withdrawals(
+        [plan] * count,
+        corpus,
+        growth=spread_annual_growth(annual_growth[:, accumulation_years:], periods_per_year),
+    )
+    return PathOutcomes(
+        corpus=corpus,
+        total_withdrawals=paid_per_year.sum(axis=-1),
+        final_balance=withdrawal_balances[:, -1],
+        depletion_period=depletion_period,
+        periods_per_year=periods_per_year,
+        year_end_balances=np.concatenate([accumulation_balances, withdrawal_balances], axis=-1),
+    )
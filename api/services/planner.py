@@ -0,0 +1,121 @@
+"""
+Multi-goal planner: several SIP and Money Journey goals on one aligned timeline
+"""
+import numpy as np
+
+from api.models.planner import (
+    GoalResult,
+    PlannerRequest,
+    PlannerResponse,
+    PlannerResults,
+    PlannerYearBreakdown,
+)
+from api.services.money_journey import calculate_money_journey_batch
+from api.services.sip_calculator import calculate_sip_batch
+
+
+def calculate_plan(request: PlannerRequest) -> PlannerResponse:
+    """
+    Evaluate every goal of a plan and combine them year by year.
+
+    SIP goals and Money Journey goals are each calculated in one vectorized
+    batch. Their yearly rows are then placed on a shared plan timeline, one
+    row per goal shifted by its start_year, and summed across goals in a
+    single array pass. A goal contributes nothing outside its own years, so
+    its balance leaves the combined view once the goal ends.
+
+    Aggregates are sums of the rounded per-goal figures, so they match the
+    goal results exactly. Withdrawal events inside a SIP goal affect its
+    balances but are only itemized in that goal's own results.
+
+    Args:
+        request: PlannerRequest with one or more goals
+
+    Returns:
+        PlannerResponse with per-goal results and the combined breakdown
+    """
+    goals = request.goals
+    sip_index = [i for i, goal in enumerate(goals) if goal.sip is not None]
+    journey_index = [i for i, goal in enumerate(goals) if goal.money_journey is not None]
+
+    responses = [None] * len(goals)
+    sip_responses = calculate_sip_batch([goals[i].sip for i in sip_index])
+    journey_responses = calculate_money_journey_batch([goals[i].money_journey for i in journey_index])
+    for i, response in zip(sip_index + journey_index, sip_responses + journey_responses):
+        responses[i] = response
+
+    horizon = max(goal.start_year + goal.years - 1 for goal in goals)
+    shape = (len(goals), horizon)
+    outlay = np.zeros(shape)
+    contributions = np.zeros(shape)
+    withdrawals = np.zeros(shape)
+    balances = np.zeros(shape)
+    active = np.zeros(shape, dtype=bool)
+
+    final_value = 0.0
+    for row, (goal, response) in enumerate(zip(goals, responses)):
+        columns = slice(goal.start_year - 1, goal.start_year - 1 + goal.years)
+        breakdown = response.yearly_breakdown
+        active[row, columns] = True
+        balances[row, columns] = [entry.balance if goal.money_journey else entry.future_value for entry in breakdown]
+
+        if goal.sip is not None:
+            outlay[row, columns] = [entry.monthly_contribution for entry in breakdown]
+            contributions[row, columns] = [entry.invested_this_year for entry in breakdown]
+            final_value += response.results.future_value
+        else:
+            accumulating = np.array([entry.phase == "accumulation" for entry in breakdown])
+            monthly = np.array([entry.monthly_amount for entry in breakdown])
+            annual = np.array([entry.annual_amount for entry in breakdown])
+            outlay[row, columns] = np.where(accumulating, monthly, 0.0)
+            contributions[row, columns] = np.where(accumulating, annual, 0.0)
+            withdrawals[row, columns] = np.where(accumulating, 0.0, annual)
+            final_value += response.results.final_balance
+
+    # Combine all goals in one pass over the aligned timeline
+    total_outlay = outlay.sum(axis=0).tolist()
+    total_contributions = contributions.sum(axis=0).tolist()
+    total_withdrawals = withdrawals.sum(axis=0).tolist()
+    total_balance = balances.sum(axis=0).tolist()
+    active_goals = active.sum(axis=0).tolist()
+
+    yearly_breakdown = [
+        PlannerYearBreakdown(
+            year=year + 1,
+            monthly_outlay=round(total_outlay[year], 2),
+            contributions=round(total_contributions[year], 2),
+            withdrawals=round(total_withdrawals[year], 2),
+            balance=round(total_balance[year], 2),
+            active_goals=active_goals[year],
+        )
+        for year in range(horizon)
+    ]
+
+    peak_year = int(np.argmax(total_outlay))
+    results = PlannerResults(
+        total_monthly_outlay=round(total_outlay[0], 2),
+        peak_monthly_outlay=round(total_outlay[peak_year], 2),
+        peak_outlay_year=peak_year + 1,
+        total_contributions=round(sum(total_contributions), 2),
+        total_withdrawals=round(sum(total_withdrawals), 2),
+        final_value=round(final_value, 2),
+        horizon_years=horizon,
+    )
+
+    goal_results = [
+        GoalResult(
+            name=goal.name,
+            start_year=goal.start_year,
+            end_year=goal.start_year + goal.years - 1,
+            sip=response if goal.sip is not None else None,
+            money_journey=response if goal.money_journey is not None else None,
+        )
+        for goal, response in zip(goals, responses)
+    ]
+
+    return PlannerResponse(
+        status="success",
+        results=results,
+        goals=goal_results,
+        yearly_breakdown=yearly_breakdown,
+    )
@@ -0,0 +1,373 @@
+"""
+Local SQLite store of client plans, re-projected in bulk when house assumptions change
+
+A plan is saved with its request inputs and, optionally, a mapping of some
+request fields to named house assumptions (e.g. accumulation_return_rate ->
+"equity_return"). Its summary results are projected on save. Changing an
+assumption marks every plan that uses it stale; re-projection then streams
+only the stale plans through the vectorized summary engine, chunk by chunk,
+writing each chunk's results back in one transaction.
+
+Staleness is tracked with revisions: changing an assumption bumps the
+revision of the plans using it, and a projection records the revision it
+was computed for. A write-back only lands if the plan's revision is
+unchanged, so a plan re-saved or affected again mid-run is never marked
+fresh with outdated results.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from pydantic import ValidationError
+
+from api.models.plans import (
+    DEFAULT_PLAN_CHUNK,
+    PLAN_MODELS,
+    ReprojectionResult,
+    SavedPlan,
+    SavePlanRequest,
+)
+from api.services.money_journey import calculate_money_journey_summaries
+from api.services.sip_calculator import calculate_sip_summaries
+from api.services.summaries import summary_outcomes
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+
+# Database file of the plan store, created on first use
+PLAN_DB_PATH = Path(os.environ.get("FINCAL_PLAN_DB", DATA_DIR / "plans.sqlite3"))
+
+# Plan kind -> columnar summary function
+SUMMARIES = {
+    "sip": calculate_sip_summaries,
+    "money_journey": calculate_money_journey_summaries,
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS assumptions (
+    name TEXT PRIMARY KEY,
+    value REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS plans (
+    plan_id TEXT PRIMARY KEY,
+    name TEXT,
+    kind TEXT NOT NULL,
+    inputs TEXT NOT NULL,
+    assumptions TEXT NOT NULL,
+    revision INTEGER NOT NULL DEFAULT 0,
+    projected_revision INTEGER,
+    results TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    projected_at REAL
+);
+CREATE TABLE IF NOT EXISTS plan_assumptions (
+    plan_id TEXT NOT NULL REFERENCES plans(plan_id) ON DELETE CASCADE,
+    assumption TEXT NOT NULL,
+    PRIMARY KEY (assumption, plan_id)
+);
+"""
+
+STALE = "(projected_revision IS NULL OR projected_revision < revision)"
+
+PLAN_COLUMNS = "plan_id, name, kind, inputs, assumptions, results, error, created_at, projected_at, " + STALE
+
+
+def _error_message(error: Exception) -> str:
+    if isinstance(error, ValidationError):
+        first = error.errors()[0]
+        location = ".".join(str(x) for x in first["loc"])
+        return f"{location}: {first['msg']}" if location else first["msg"]
+    return str(error)
+
+
+def project_plans(
+    plans: Sequence[Tuple[str, dict, Dict[str, str]]],
+    values: Dict[str, float],
+) -> List[Tuple[Optional[dict], Optional[str]]]:
+    """
+    Summary results of stored plans under the given assumption values.
+
+    Plans are grouped by kind and each group is calculated in one vectorized
+    call. A group that fails as a whole (e.g. one plan overflowing exact
+    arithmetic) is retried in halves by summary_outcomes, so only the
+    culprit fails.
+
+    Args:
+        plans: (kind, inputs, assumptions) of each plan
+        values: House assumption values
+
+    Returns:
+        (results, error) per plan, in order; exactly one of the two is set
+    """
+    outcomes: List[Tuple[Optional[dict], Optional[str]]] = [(None, None)] * len(plans)
+    valid: Dict[str, List[Tuple[int, object]]] = {kind: [] for kind in PLAN_MODELS}
+    for index, (kind, inputs, assumptions) in enumerate(plans):
+        missing = sorted(set(assumptions.values()) - set(values))
+        if missing:
+            outcomes[index] = (None, f"unknown house assumptions: {missing}")
+            continue
+        resolved = {**inputs, **{field: values[name] for field, name in assumptions.items()}}
+        try:
+            valid[kind].append((index, PLAN_MODELS[kind](**resolved)))
+        except ValueError as e:
+            outcomes[index] = (None, _error_message(e))
+
+    for kind, entries in valid.items():
+        if entries:
+            requests = [request for _, request in entries]
+            for (index, _), outcome in zip(entries, summary_outcomes(SUMMARIES[kind], requests)):
+                outcomes[index] = outcome
+    return outcomes
+
+
+class PlanStore:
+    """
+    Saved plans and house assumptions in one SQLite database.
+
+    Every operation opens its own connection, so the store can be shared by
+    request handlers and background jobs on different threads; SQLite's
+    write-ahead log lets readers proceed while a re-projection writes.
+    """
+
+    def __init__(self, path=PLAN_DB_PATH):
+        self.path = Path(path)
+        self._initialized = False
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        with self._lock:
+            if not self._initialized:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                with sqlite3.connect(self.path) as db:
+                    db.execute("PRAGMA journal_mode=WAL")
+                    db.executescript(SCHEMA)
+                self._initialized = True
+        db = sqlite3.connect(self.path, timeout=30)
+        db.execute("PRAGMA foreign_keys=ON")
+        # With the write-ahead log, NORMAL stays consistent after a crash and skips an fsync per commit
+        db.execute("PRAGMA synchronous=NORMAL")
+        return db
+
+    def assumptions(self) -> Dict[str, float]:
+        """Current house assumption values"""
+        db = self._connect()
+        try:
+            return dict(db.execute("SELECT name, value FROM assumptions ORDER BY name"))
+        finally:
+            db.close()
+
+    def save(self, plan: SavePlanRequest) -> SavedPlan:
+        """
+        Save (or replace) a plan and project it under the current assumptions.
+
+        Raises:
+            ValueError: If the plan uses an unknown assumption or its inputs are
+                invalid (pydantic's ValidationError is a ValueError)
+        """
+        plan_id = plan.plan_id or uuid.uuid4().hex
+        db = self._connect()
+        try:
+            with db:
+                # Hold the write lock from reading the assumptions, so a concurrent change cannot slip between
+                db.execute("BEGIN IMMEDIATE")
+                values = dict(db.execute("SELECT name, value FROM assumptions"))
+                missing = sorted(set(plan.assumptions.values()) - set(values))
+                if missing:
+                    raise ValueError(f"unknown house assumptions: {missing}")
+                resolved = {
+                    **plan.inputs,
+                    **{field: values[name] for field, name in plan.assumptions.items()},
+                }
+                request = PLAN_MODELS[plan.kind](**resolved)
+                results = {name: column[0] for name, column in SUMMARIES[plan.kind]([request]).items()}
+
+                now = time.time()
+                previous = db.execute("SELECT revision FROM plans WHERE plan_id = ?", (plan_id,)).fetchone()
+                revision = previous[0] + 1 if previous else 0
+                db.execute(
+                    "INSERT INTO plans (plan_id, name, kind, inputs, assumptions, revision, projected_revision,"
+                    " results, error, created_at, projected_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, NULL, ?, ?)"
+                    " ON CONFLICT(plan_id) DO UPDATE SET name = excluded.name, kind = excluded.kind,"
+                    " inputs = excluded.inputs, assumptions = excluded.assumptions, revision = excluded.revision,"
+                    " projected_revision = excluded.projected_revision, results = excluded.results, error = NULL,"
+                    " projected_at = excluded.projected_at",
+                    (
+                        plan_id, plan.name, plan.kind, json.dumps(plan.inputs), json.dumps(plan.assumptions),
+                        revision, revision, json.dumps(results), now, now,
+                    ),
+                )
+                db.execute("DELETE FROM plan_assumptions WHERE plan_id = ?", (plan_id,))
+                db.executemany(
+                    "INSERT INTO plan_assumptions (plan_id, assumption) VALUES (?, ?)",
+                    [(plan_id, name) for name in set(plan.assumptions.values())],
+                )
+        finally:
+            db.close()
+        return self.get(plan_id)
+
+    def get(self, plan_id: str) -> Optional[SavedPlan]:
+        """A stored plan, or None"""
+        db = self._connect()
+        try:
+            row = db.execute(f"SELECT {PLAN_COLUMNS} FROM plans WHERE plan_id = ?", (plan_id,)).fetchone()
+        finally:
+            db.close()
+        return None if row is None else _saved_plan(row)
+
+    def list(
+        self,
+        limit: int = 100,
+        offset: int = 0,
+        assumption: Optional[str] = None,
+        stale: Optional[bool] = None,
+    ) -> Tuple[int, List[SavedPlan]]:
+        """
+        A page of stored plans in the order they were first saved.
+
+        Args:
+            limit: Page size
+            offset: Plans to skip
+            assumption: Only plans using this house assumption
+            stale: Only stale (True) or only fresh (False) plans
+
+        Returns:
+            Tuple of (number of matching plans, plans on the page)
+        """
+        conditions, parameters = [], []
+        if assumption is not None:
+            conditions.append("plan_id IN (SELECT plan_id FROM plan_assumptions WHERE assumption = ?)")
+            parameters.append(assumption)
+        if stale is not None:
+            conditions.append(STALE if stale else f"NOT {STALE}")
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        db = self._connect()
+        try:
+            total = db.execute(f"SELECT COUNT(*) FROM plans {where}", parameters).fetchone()[0]
+            rows = db.execute(
+                f"SELECT {PLAN_COLUMNS} FROM plans {where} ORDER BY rowid LIMIT ? OFFSET ?",
+                parameters + [limit, offset],
+            ).fetchall()
+        finally:
+            db.close()
+        return total, [_saved_plan(row) for row in rows]
+
+    def set_assumptions(self, values: Dict[str, float]) -> List[str]:
+        """
+        Set house assumptions and mark the plans using a changed one stale.
+
+        Returns:
+            Names of the assumptions whose value changed (new ones included)
+        """
+        db = self._connect()
+        try:
+            with db:
+                db.execute("BEGIN IMMEDIATE")
+                current = dict(db.execute("SELECT name, value FROM assumptions"))
+                changed = sorted(name for name, value in values.items() if current.get(name) != value)
+                now = time.time()
+                db.executemany(
+                    "INSERT INTO assumptions (name, value, updated_at) VALUES (?, ?, ?)"
+                    " ON CONFLICT(name) DO UPDATE SET value = excluded.value, updated_at = excluded.updated_at",
+                    [(name, values[name], now) for name in changed],
+                )
+                db.executemany(
+                    "UPDATE plans SET revision = revision + 1"
+                    " WHERE plan_id IN (SELECT plan_id FROM plan_assumptions WHERE assumption = ?)",
+                    [(name,) for name in changed],
+                )
+        finally:
+            db.close()
+        return changed
+
+    def reproject(
+        self,
+        chunk_size: int = DEFAULT_PLAN_CHUNK,
+        progress: Optional[Callable[[float, dict], None]] = None,
+    ) -> Tuple[int, int]:
+        """
+        Project every stale plan and write its summary results back.
+
+        Stale plans are read in rowid order, chunk_size at a time, so memory
+        stays bounded however many plans there are. Each chunk is projected
+        under the assumption values current when it is read and written back
+        in one transaction. Plans that become stale behind the scan are left
+        for the next run.
+
+        Args:
+            chunk_size: Plans per read, projection and write-back
+            progress: Called after every chunk with the share of stale plans
+                done and {"reprojected", "failed", "total"} counts, e.g.
+                Job.report (whose cancellation then stops the run between chunks)
+
+        Returns:
+            Tuple of (plans projected, plans whose projection failed)
+        """
+        db = self._connect()
+        try:
+            total = db.execute(f"SELECT COUNT(*) FROM plans WHERE {STALE}").fetchone()[0]
+            done = failed = 0
+            after = 0
+            while True:
+                values = dict(db.execute("SELECT name, value FROM assumptions"))
+                rows = db.execute(
+                    f"SELECT rowid, plan_id, kind, inputs, assumptions, revision FROM plans"
+                    f" WHERE {STALE} AND rowid > ? ORDER BY rowid LIMIT ?",
+                    (after, chunk_size),
+                ).fetchall()
+                if not rows:
+                    break
+                after = rows[-1][0]
+                outcomes = project_plans(
+                    [(kind, json.loads(inputs), json.loads(assumptions)) for _, _, kind, inputs, assumptions, _ in rows],
+                    values,
+                )
+                now = time.time()
+                with db:
+                    db.executemany(
+                        "UPDATE plans SET results = ?, error = ?, projected_revision = ?, projected_at = ?"
+                        " WHERE plan_id = ? AND revision = ?",
+                        [
+                            (None if results is None else json.dumps(results), error, revision, now, plan_id, revision)
+                            for (_, plan_id, _, _, _, revision), (results, error) in zip(rows, outcomes)
+                        ],
+                    )
+                done += len(rows)
+                failed += sum(error is not None for _, error in outcomes)
+                if progress is not None:
+                    progress(done / max(total, done), {"reprojected": done, "failed": failed, "total": total})
+        finally:
+            db.close()
+        return done, failed
+
+    def update_assumptions(
+        self,
+        values: Dict[str, float],
+        chunk_size: int = DEFAULT_PLAN_CHUNK,
+        progress: Optional[Callable[[float, dict], None]] = None,
+    ) -> ReprojectionResult:
+        """Set house assumptions, then re-project every stale plan (see reproject)"""
+        changed = self.set_assumptions(values)
+        reprojected, failed = self.reproject(chunk_size, progress)
+        return ReprojectionResult(changed_assumptions=changed, reprojected=reprojected, failed=failed)
+
+
+def _saved_plan(row) -> SavedPlan:
+    plan_id, name, kind, inputs, assumptions, results, error, created_at, projected_at, stale = row
+    return SavedPlan(
+        plan_id=plan_id,
+        name=name,
+        kind=kind,
+        inputs=json.loads(inputs),
+        assumptions=json.loads(assumptions),
+        results=None if results is None else json.loads(results),
+        error=error,
+        stale=bool(stale),
+        created_at=created_at,
+        projected_at=projected_at,
+    )
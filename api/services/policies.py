@@ -0,0 +1,146 @@
+"""
+State-dependent withdrawal policies evaluated across many paths at once
+"""
+from typing import NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from api.models.money_journey import MoneyJourneyRequest
+from api.services.events import EventArrays
+from api.services.kernels import MONTHS_PER_YEAR, drawdown, to_periods
+
+# Policy type -> integer code used for masked selection; 0 is the fixed schedule
+POLICY_CODES = {
+    "percent_of_portfolio": 1,
+    "floor_ceiling": 2,
+    "guardrails": 3,
+}
+
+
+class PolicyArrays(NamedTuple):
+    """Per-path policy parameters, each of shape (N,); rates as decimals, amounts annual"""
+    kind: np.ndarray
+    rate: np.ndarray
+    floor: np.ndarray
+    ceiling: np.ndarray
+    band: np.ndarray
+    adjustment: np.ndarray
+
+
+def policy_arrays(requests: Sequence[MoneyJourneyRequest]) -> PolicyArrays:
+    """Gather each request's withdrawal policy into arrays (fixed schedule where None)"""
+    policies = [r.withdrawal_policy for r in requests]
+    return PolicyArrays(
+        kind=np.array([0 if p is None else POLICY_CODES[p.type] for p in policies]),
+        rate=np.array([0.0 if p is None or p.rate is None else p.rate / 100 for p in policies]),
+        floor=np.array([0.0 if p is None or p.floor is None else p.floor * MONTHS_PER_YEAR for p in policies]),
+        ceiling=np.array([np.inf if p is None or p.ceiling is None else p.ceiling * MONTHS_PER_YEAR for p in policies]),
+        band=np.array([0.0 if p is None else p.band / 100 for p in policies]),
+        adjustment=np.array([0.0 if p is None else p.adjustment / 100 for p in policies]),
+    )
+
+
+def policy_drawdown(
+    corpus: np.ndarray,
+    scheduled_monthly: np.ndarray,
+    policy: PolicyArrays,
+    step_up_rate: np.ndarray,
+    step_up_cap: np.ndarray,
+    growth: np.ndarray,
+    periods_per_year: int,
+    periods: np.ndarray,
+    events: Optional[EventArrays] = None,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Withdrawal phase where each year's withdrawal depends on the path's balance.
+
+    The only Python loop is over years. Each year the rule of every path is
+    applied together with masked selection (np.select / np.where), and the
+    year's periods are then resolved by the closed-form drawdown kernel, so
+    thousands of simulated or historical paths cost the same number of
+    array operations as one.
+
+    Args:
+        corpus: Balance at the start of the withdrawal phase, shape (N,)
+        scheduled_monthly: Fixed-schedule monthly withdrawal per year, shape (N, years);
+            used by paths without a policy and as the guardrails starting amount
+        policy: Per-path policy parameters
+        step_up_rate: Annual withdrawal step-up as a decimal, shape (N,)
+        step_up_cap: Maximum monthly withdrawal, np.inf for none, shape (N,)
+        growth: Growth factor per period, shape (N, years * periods_per_year)
+        periods_per_year: Withdrawal periods per year (1 or 12)
+        periods: Active periods per path, shape (N,), for batches padded to a common length
+        events: Optional withdrawal-phase event arrays covering years * 12 months
+
+    Returns:
+        Tuple of (chosen_monthly, balances, paid, depletion_period):
+        - chosen_monthly: Monthly withdrawal the rule chose for each year, (N, years)
+        - balances: Balance at the end of each period, (N, years * periods_per_year)
+        - paid: Amount actually withdrawn each period, (N, years * periods_per_year)
+        - depletion_period: Period index of depletion, -1 if never, (N,)
+    """
+    count, years = scheduled_monthly.shape
+    months_per_period = MONTHS_PER_YEAR // periods_per_year
+    kind = policy.kind
+
+    balances = np.zeros((count, years * periods_per_year))
+    paid = np.zeros_like(balances)
+    chosen_monthly = np.zeros((count, years))
+    depletion_period = np.full(count, -1)
+
+    balance = np.asarray(corpus, dtype=float)
+    first_annual = scheduled_monthly[:, 0] * MONTHS_PER_YEAR
+    with np.errstate(divide="ignore", invalid="ignore"):
+        initial_rate = np.where(balance > 0, first_annual / balance, np.inf)
+    previous = first_annual
+    last_return = np.zeros(count)
+
+    for year in range(years):
+        columns = slice(year * periods_per_year, (year + 1) * periods_per_year)
+        percent = policy.rate * balance
+
+        # Guyton-Klinger: inflation rule, then the capital-preservation and prosperity guardrails
+        with np.errstate(divide="ignore", invalid="ignore"):
+            above_initial = previous / balance > initial_rate
+            stepped = np.minimum(previous * (1 + step_up_rate), step_up_cap * MONTHS_PER_YEAR)
+            guarded = np.where((last_return < 0) & above_initial, previous, stepped)
+            guarded = guarded if year else first_annual
+            current_rate = guarded / balance
+        guarded = np.where(
+            current_rate > initial_rate * (1 + policy.band),
+            guarded * (1 - policy.adjustment),
+            np.where(current_rate < initial_rate * (1 - policy.band), guarded * (1 + policy.adjustment), guarded),
+        )
+
+        annual = np.select(
+            [kind == 1, kind == 2, kind == 3],
+            [percent, np.clip(percent, policy.floor, policy.ceiling), guarded],
+            default=scheduled_monthly[:, year] * MONTHS_PER_YEAR,
+        )
+        monthly = annual / MONTHS_PER_YEAR
+
+        deposits = None
+        if events is None:
+            withdrawals = np.repeat((monthly * months_per_period)[:, None], periods_per_year, axis=-1)
+        else:
+            months = slice(year * MONTHS_PER_YEAR, (year + 1) * MONTHS_PER_YEAR)
+            scheduled = monthly[:, None] * events.active[:, months] + events.withdrawals[:, months]
+            withdrawals = to_periods(scheduled, periods_per_year)
+            deposits = to_periods(events.lump_sums[:, months], periods_per_year)
+
+        active_periods = np.clip(periods - year * periods_per_year, 0, periods_per_year)
+        year_balances, year_paid, year_depletion = drawdown(
+            balance, withdrawals, growth[:, columns], active_periods, deposits=deposits
+        )
+
+        newly_depleted = (year_depletion >= 0) & (depletion_period < 0)
+        depletion_period = np.where(newly_depleted, year * periods_per_year + year_depletion, depletion_period)
+        balances[:, columns] = year_balances
+        paid[:, columns] = year_paid
+        chosen_monthly[:, year] = monthly
+
+        balance = year_balances[:, -1]
+        previous = annual
+        last_return = growth[:, columns].prod(axis=-1) - 1
+
+    return chosen_monthly, balances, paid, depletion_period
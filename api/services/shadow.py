@@ -0,0 +1,140 @@
+"""
+Shadow execution: run a candidate engine on sampled live requests, off the request thread
+"""
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict
+
+from api.services.engine_diff import diff_responses
+
+
+class ShadowMetrics:
+    """Thread-safe counters and latency totals for shadow comparisons"""
+
+    def __init__(self, recent_mismatches: int = 20):
+        self._lock = threading.Lock()
+        self._endpoints: Dict[str, dict] = {}
+        self._recent = deque(maxlen=recent_mismatches)
+        self.dropped = 0
+
+    def _endpoint(self, endpoint: str) -> dict:
+        if endpoint not in self._endpoints:
+            self._endpoints[endpoint] = {
+                "compared": 0,
+                "mismatched": 0,
+                "errors": 0,
+                "live_ms_total": 0.0,
+                "candidate_ms_total": 0.0,
+                "candidate_ms_max": 0.0,
+            }
+        return self._endpoints[endpoint]
+
+    def record_drop(self):
+        with self._lock:
+            self.dropped += 1
+
+    def record_error(self, endpoint: str, message: str):
+        with self._lock:
+            self._endpoint(endpoint)["errors"] += 1
+            self._recent.append({"endpoint": endpoint, "error": message})
+
+    def record_comparison(self, endpoint: str, live_ms: float, candidate_ms: float, diffs: list):
+        with self._lock:
+            stats = self._endpoint(endpoint)
+            stats["compared"] += 1
+            stats["live_ms_total"] += live_ms
+            stats["candidate_ms_total"] += candidate_ms
+            stats["candidate_ms_max"] = max(stats["candidate_ms_max"], candidate_ms)
+            if diffs:
+                stats["mismatched"] += 1
+                self._recent.append({"endpoint": endpoint, "diffs": diffs[:10]})
+
+    def snapshot(self) -> dict:
+        """Return a JSON-serializable copy of the metrics"""
+        with self._lock:
+            endpoints = {}
+            for endpoint, stats in self._endpoints.items():
+                compared = stats["compared"]
+                endpoints[endpoint] = {
+                    "compared": compared,
+                    "mismatched": stats["mismatched"],
+                    "errors": stats["errors"],
+                    "live_ms_mean": stats["live_ms_total"] / compared if compared else None,
+                    "candidate_ms_mean": stats["candidate_ms_total"] / compared if compared else None,
+                    "candidate_ms_max": stats["candidate_ms_max"],
+                }
+            return {
+                "dropped": self.dropped,
+                "endpoints": endpoints,
+                "recent_mismatches": list(self._recent),
+            }
+
+
+class ShadowRunner:
+    """
+    Compare a candidate engine against live responses on a background pool.
+
+    submit() never blocks: requests outside the sample, or arriving while
+    `max_pending` comparisons are already queued, are skipped (the latter
+    counted as dropped) so the live response is never delayed.
+    """
+
+    def __init__(
+        self,
+        candidate: Dict[str, Callable],
+        sample_rate: float = 0.05,
+        max_workers: int = 1,
+        max_pending: int = 16,
+        tolerance: float = 0.01,
+    ):
+        self.candidate = candidate
+        self.sample_rate = sample_rate
+        self.tolerance = tolerance
+        self.metrics = ShadowMetrics()
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="shadow")
+
+    def submit(self, endpoint: str, request, live_response, live_ms: float) -> bool:
+        """
+        Schedule a shadow comparison for a sampled live request.
+
+        Args:
+            endpoint: Endpoint path the request was served on
+            request: Validated request model passed to the live service
+            live_response: Response model returned by the live service
+            live_ms: Live calculation latency in milliseconds
+
+        Returns:
+            True if a comparison was scheduled
+        """
+        if endpoint not in self.candidate or random.random() >= self.sample_rate:
+            return False
+        if not self._slots.acquire(blocking=False):
+            self.metrics.record_drop()
+            return False
+
+        future = self._executor.submit(self._compare, endpoint, request, live_response, live_ms)
+        future.add_done_callback(lambda _: self._slots.release())
+        return True
+
+    def _compare(self, endpoint: str, request, live_response, live_ms: float):
+        try:
+            start = time.perf_counter()
+            candidate_response = self.candidate[endpoint](request)
+            candidate_ms = (time.perf_counter() - start) * 1000
+            diffs = diff_responses(
+                live_response.model_dump(),
+                candidate_response.model_dump(),
+                self.tolerance,
+            )
+        except Exception as e:
+            self.metrics.record_error(endpoint, f"{type(e).__name__}: {e}")
+            return
+        self.metrics.record_comparison(endpoint, live_ms, candidate_ms, diffs)
+
+    def shutdown(self, wait: bool = True):
+        """Stop accepting work and optionally wait for queued comparisons"""
+        self._executor.shutdown(wait=wait)
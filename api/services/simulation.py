@@ -0,0 +1,351 @@
+"""
+Monte Carlo simulation of a plan invested in a correlated, rebalanced multi-asset portfolio
+"""
+import warnings
+from typing import Callable, Iterator, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+try:  # only Sobol sampling needs scipy, so slimmed installs without it keep the other samplers
+    from scipy.special import ndtri
+    from scipy.stats import qmc
+except ImportError:
+    qmc = None
+
+from api.models.simulation import (
+    Allocation,
+    Percentiles,
+    SimulationRequest,
+    SimulationResponse,
+    SimulationResults,
+    SimulationScenarioResult,
+    SimulationYear,
+)
+from api.services.kernels import MONTHS_PER_YEAR
+from api.services.paths import PathOutcomes, plan_years, project_paths
+
+PERCENTILES = (5, 25, 50, 75, 95)
+
+# Independently scrambled Sobol sequences; their spread gives the standard error
+SOBOL_REPLICATES = 8
+
+# Most paths whose year-end balances are kept for the yearly bands
+YEARLY_BAND_PATHS = 5_000
+
+# Most floats a chunk of paths may hold while it is projected (about 80 MB)
+SIMULATION_ELEMENT_BUDGET = 10_000_000
+
+
+class AssetModel(NamedTuple):
+    """Lognormal annual growth of each asset and the target weights per plan year"""
+    mu: np.ndarray  # (assets,) mean of log growth
+    sigma: np.ndarray  # (assets,) standard deviation of log growth
+    cholesky: np.ndarray  # (assets, assets) lower factor of the correlation matrix
+    weights: np.ndarray  # (years, assets) target weights as fractions
+
+
+def asset_model(allocation: Allocation, years: int) -> AssetModel:
+    """
+    Lognormal parameters, correlation factor and weight glide of an allocation.
+
+    Each asset's growth factor is lognormal with the requested arithmetic
+    mean and standard deviation of annual return. Weights move linearly
+    from `weight` in the first plan year to `end_weight` in the last.
+
+    Raises:
+        ValueError: If the correlation matrix is not positive semi-definite
+    """
+    assets = allocation.assets
+    mean = 1 + np.array([a.expected_return for a in assets]) / 100
+    volatility = np.array([a.volatility for a in assets]) / 100
+    variance = np.log1p((volatility / mean) ** 2)
+    mu = np.log(mean) - variance / 2
+
+    count = len(assets)
+    correlation = np.eye(count) if allocation.correlation is None else np.array(allocation.correlation, dtype=float)
+    try:
+        cholesky = np.linalg.cholesky(correlation)
+    except np.linalg.LinAlgError:
+        # Perfect correlations are singular; a tiny ridge keeps them factorizable
+        try:
+            cholesky = np.linalg.cholesky(correlation + 1e-10 * np.eye(count))
+        except np.linalg.LinAlgError:
+            raise ValueError("correlation matrix must be positive semi-definite") from None
+
+    start = np.array([a.weight for a in assets]) / 100
+    end = start if assets[0].end_weight is None else np.array([a.end_weight for a in assets]) / 100
+    glide = np.linspace(0, 1, years)[:, None] if years > 1 else np.zeros((1, 1))
+    weights = start + (end - start) * glide
+
+    return AssetModel(mu=mu, sigma=np.sqrt(variance), cholesky=cholesky, weights=weights)
+
+
+def draw_shocks(rng: np.random.Generator, paths: int, years: int, cholesky: np.ndarray) -> np.ndarray:
+    """Correlated standard-normal shocks of shape (paths, years, assets)"""
+    return rng.standard_normal((paths, years, len(cholesky))) @ cholesky.T
+
+
+def _sobol_sizes(paths: int) -> np.ndarray:
+    """Paths drawn from each Sobol replicate"""
+    return np.array([len(part) for part in np.array_split(np.arange(paths), SOBOL_REPLICATES)])
+
+
+def standard_normals(
+    sampling: str, paths: int, years: int, assets: int, chunk_size: int, seed=None
+) -> Iterator[np.ndarray]:
+    """
+    Yield uncorrelated standard normals of shape (count, years, assets), chunk by chunk.
+
+    - pseudo_random: independent draws from one generator stream
+    - antithetic: each draw is followed by its mirror image -z, so paths
+      come in negatively correlated pairs
+    - sobol: SOBOL_REPLICATES independently scrambled Sobol sequences of
+      dimension years * assets, mapped through the inverse normal CDF
+
+    Every sampler fills paths in a fixed order, so a seeded simulation
+    gives the same paths whatever the chunk size.
+
+    Raises:
+        ValueError: If sobol sampling is requested without scipy installed
+    """
+    if sampling == "sobol":
+        if qmc is None:
+            raise ValueError("sobol sampling requires scipy; install it with 'pip install scipy'")
+        dimension = years * assets
+        for sequence_seed, size in zip(np.random.SeedSequence(seed).spawn(SOBOL_REPLICATES), _sobol_sizes(paths)):
+            sequence = qmc.Sobol(dimension, scramble=True, seed=np.random.default_rng(sequence_seed))
+            for start in range(0, size, chunk_size):
+                with warnings.catch_warnings():
+                    # Balance is best at powers of two, but any count is a valid sample
+                    warnings.simplefilter("ignore", UserWarning)
+                    points = sequence.random(min(chunk_size, size - start))
+                yield ndtri(np.clip(points, 1e-12, 1 - 1e-12)).reshape(-1, years, assets)
+        return
+
+    rng = np.random.default_rng(seed)
+    if sampling == "antithetic":
+        chunk_size += chunk_size % 2  # keep pairs within a chunk
+    for start in range(0, paths, chunk_size):
+        count = min(chunk_size, paths - start)
+        if sampling == "antithetic":
+            draws = rng.standard_normal(((count + 1) // 2, years, assets))
+            yield np.stack([draws, -draws], axis=1).reshape(-1, years, assets)[:count]
+        else:
+            yield rng.standard_normal((count, years, assets))
+
+
+def sample_groups(sampling: str, paths: int) -> np.ndarray:
+    """
+    Independent group of every path, for standard errors.
+
+    Paths are independent under pseudo_random sampling; antithetic pairs
+    and Sobol replicates are the independent units of the other samplers.
+    """
+    if sampling == "antithetic":
+        return np.arange(paths) // 2
+    if sampling == "sobol":
+        return np.repeat(np.arange(SOBOL_REPLICATES), _sobol_sizes(paths))
+    return np.arange(paths)
+
+
+def estimate(values: np.ndarray, groups: np.ndarray) -> Tuple[float, Optional[float]]:
+    """
+    Mean of per-path values and its standard error over independent groups.
+
+    Returns:
+        Tuple of (mean, standard_error); the error is None with fewer than two groups
+    """
+    counts = np.bincount(groups)
+    used = counts > 0
+    group_means = np.bincount(groups, weights=values)[used] / counts[used]
+    mean = float(values.mean())
+    if len(group_means) < 2:
+        return mean, None
+    return mean, float(group_means.std(ddof=1) / np.sqrt(len(group_means)))
+
+
+def portfolio_growth(model: AssetModel, shocks: np.ndarray) -> np.ndarray:
+    """
+    Annual growth of the portfolio rebalanced to its target weights each year.
+
+    Rebalancing at the start of every year makes the portfolio's growth the
+    weight-averaged growth of its assets for that year.
+
+    Args:
+        model: Asset parameters and weights
+        shocks: Correlated shocks, shape (paths, years, assets)
+
+    Returns:
+        Growth factor per path and year, shape (paths, years)
+    """
+    asset_growth = np.exp(model.mu + model.sigma * shocks)
+    return np.einsum("pya,ya->py", asset_growth, model.weights)
+
+
+def simulate_growth(
+    model: AssetModel, paths: int, chunk_size: int, seed=None, sampling: str = "pseudo_random"
+) -> Iterator[np.ndarray]:
+    """Yield portfolio growth paths, shape (count, years), in chunks of at most chunk_size"""
+    years, assets = model.weights.shape
+    for normals in standard_normals(sampling, paths, years, assets, chunk_size, seed):
+        yield portfolio_growth(model, normals @ model.cholesky.T)
+
+
+def chunk_paths(chunk_size: int, years: int, assets: int) -> int:
+    """
+    Paths to generate at a time: chunk_size, or fewer if they would exceed SIMULATION_ELEMENT_BUDGET.
+
+    A path holds about one float per month of its projection and four per
+    asset and year for its shocks and growth, so a path count alone does
+    not bound memory.
+    """
+    per_path = years * (MONTHS_PER_YEAR + 4 * assets)
+    return max(1, min(chunk_size, SIMULATION_ELEMENT_BUDGET // per_path))
+
+
+def _percentiles(values: np.ndarray) -> Percentiles:
+    """Percentile summary of a 1-D array, rounded to cents"""
+    points = np.percentile(values, PERCENTILES).tolist()
+    return Percentiles(**{f"p{p}": round(v, 2) for p, v in zip(PERCENTILES, points)})
+
+
+def _summarize(
+    plan, corpus: np.ndarray, final_balance: np.ndarray, depletion_period: np.ndarray,
+    periods_per_year: int, groups: np.ndarray,
+) -> SimulationResults:
+    """Summary of one plan's per-path outcomes"""
+    depleted = depletion_period >= 0
+    accumulation_years = plan_years(plan) - getattr(plan, "withdrawal_years", 0)
+    median_depletion_year = None
+    if depleted.any():
+        depletion_years = accumulation_years + depletion_period[depleted] // periods_per_year + 1
+        median_depletion_year = float(np.median(depletion_years))
+
+    success_rate, success_error = estimate((~depleted) * 100.0, groups)
+    mean_final, mean_final_error = estimate(final_balance, groups)
+    return SimulationResults(
+        paths=len(corpus),
+        success_rate=round(success_rate, 2),
+        success_rate_standard_error=None if success_error is None else round(success_error, 4),
+        mean_final_balance=round(mean_final, 2),
+        mean_final_balance_standard_error=None if mean_final_error is None else round(mean_final_error, 2),
+        corpus_at_retirement=_percentiles(corpus),
+        final_balance=_percentiles(final_balance),
+        median_depletion_year=median_depletion_year,
+    )
+
+
+def run_simulation(
+    request: SimulationRequest,
+    progress: Optional[Callable[[float, dict], None]] = None,
+) -> SimulationResponse:
+    """
+    Simulate a plan, and any scenarios of it, over random portfolio return paths.
+
+    Paths are generated chunk by chunk and each chunk is projected through
+    project_paths with every path's own yearly growth. A chunk holds at most
+    chunk_size paths and at most SIMULATION_ELEMENT_BUDGET path elements
+    (see chunk_paths), so the projection's memory does not grow with the
+    horizon or the number of assets. Only a few numbers per
+    path and plan are kept for the percentiles and standard errors; the
+    yearly bands come from an evenly strided sample of at most
+    YEARLY_BAND_PATHS paths, which is every path for smaller runs. Scenarios
+    reuse the plan's growth paths (common random numbers), so their
+    differences from the plan have much smaller standard errors than two
+    independent simulations would.
+
+    Args:
+        request: SimulationRequest with the plan, allocation, sampling and path count
+        progress: Optional callback given the share of paths done and interim
+            results for the plan after every chunk
+
+    Returns:
+        SimulationResponse with percentile summaries, standard errors and yearly bands
+
+    Raises:
+        ValueError: If the correlation matrix is not positive semi-definite,
+            or sobol sampling is requested without scipy
+    """
+    plan = request.plan
+    plans = [plan] + request.scenario_plans
+    years = plan_years(plan)
+    model = asset_model(request.allocation, years)
+
+    paths = request.paths
+    corpus = np.empty((len(plans), paths))
+    final_balance = np.empty((len(plans), paths))
+    depletion_period = np.empty((len(plans), paths), dtype=np.int64)
+    stride = -(-paths // YEARLY_BAND_PATHS)
+    year_end_balances = np.empty((len(range(0, paths, stride)), years))
+    periods_per_year = [1] * len(plans)
+
+    start = 0
+    chunk_size = chunk_paths(request.chunk_size, years, len(request.allocation.assets))
+    chunks = simulate_growth(model, paths, chunk_size, request.seed, request.sampling)
+    for growth in chunks:
+        rows = slice(start, start + len(growth))
+        for index, variant in enumerate(plans):
+            outcomes: PathOutcomes = project_paths(variant, growth)
+            corpus[index, rows] = outcomes.corpus
+            final_balance[index, rows] = outcomes.final_balance
+            depletion_period[index, rows] = outcomes.depletion_period
+            periods_per_year[index] = outcomes.periods_per_year
+            if index == 0:
+                first = -start % stride
+                sampled = outcomes.year_end_balances[first::stride]
+                offset = (start + first) // stride
+                year_end_balances[offset:offset + len(sampled)] = sampled
+        start = rows.stop
+        if progress is not None:
+            progress(start / paths, {
+                "paths_done": start,
+                "success_rate": round(float((depletion_period[0, :start] < 0).mean()) * 100, 2),
+                "final_balance": _percentiles(final_balance[0, :start]).model_dump(),
+            })
+
+    groups = sample_groups(request.sampling, paths)
+    summaries = [
+        _summarize(variant, corpus[i], final_balance[i], depletion_period[i], periods_per_year[i], groups)
+        for i, variant in enumerate(plans)
+    ]
+
+    # Paired differences: per-path outcome of the scenario minus the plan's on the same path
+    base_success = (depletion_period[0] < 0) * 100.0
+    scenario_results = []
+    for index, scenario in enumerate(request.scenarios, start=1):
+        success_difference, success_error = estimate((depletion_period[index] < 0) * 100.0 - base_success, groups)
+        final_difference, final_error = estimate(final_balance[index] - final_balance[0], groups)
+        scenario_results.append(SimulationScenarioResult(
+            label=scenario.label,
+            results=summaries[index],
+            success_rate_difference=round(success_difference, 2),
+            success_rate_difference_standard_error=None if success_error is None else round(success_error, 4),
+            mean_final_balance_difference=round(final_difference, 2),
+            mean_final_balance_difference_standard_error=None if final_error is None else round(final_error, 2),
+        ))
+
+    bands = np.percentile(year_end_balances, PERCENTILES, axis=0).T.tolist()
+    yearly = [
+        SimulationYear(
+            year=year + 1,
+            balance=Percentiles(**{f"p{p}": round(v, 2) for p, v in zip(PERCENTILES, band)}),
+        )
+        for year, band in enumerate(bands)
+    ]
+
+    inputs_dict = {
+        "plan": plan.model_dump(),
+        "allocation": request.allocation.model_dump(),
+        "paths": paths,
+        "seed": request.seed,
+        "sampling": request.sampling,
+        "scenarios": [scenario.model_dump() for scenario in request.scenarios],
+    }
+
+    return SimulationResponse(
+        status="success",
+        inputs=inputs_dict,
+        results=summaries[0],
+        yearly_percentiles=yearly,
+        scenarios=scenario_results,
+    )
@@ -1,124 +1,624 @@
 """
-SIP Calculator service with annual compounding logic
+SIP Calculator service with annual, quarterly or monthly compounding
 """
-from typing import List, Dict
+import math
+from typing import Callable, Dict, Hashable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from api.models.grid import Approximation
 from api.models.sip import (
+    ContributionVintages,
     SIPCalculationRequest,
     SIPCalculationResponse,
     SIPCalculationResults,
+    SIPSensitivities,
     YearlyBreakdown
 )
+from api.services.events import event_arrays
+from api.services.fixed_point import (
+    accumulate_units,
+    from_units,
+    rate_columns,
+    run_rows,
+    step_up_columns,
+    to_units,
+)
+from api.services.grid import load_grid
+from api.services.kernels import (
+    MONTHS_PER_YEAR,
+    PERIODS_PER_YEAR,
+    accumulate_factors,
+    growth_over_months,
+    schedule_growth,
+    step_up_schedule,
+    step_up_sensitivities,
+    to_periods,
+)
 
+# Negative balances smaller than this are float noise, not an overdrawn withdrawal
+OVERDRAFT_TOLERANCE = 1e-6
 
-def calculate_sip_with_annual_compounding(request: SIPCalculationRequest) -> SIPCalculationResponse:
+# Most plan-months projected together by the batch functions
+BATCH_ELEMENT_BUDGET = 1_000_000
+
+
+def group_indices(items: Sequence, key: Callable) -> Dict[Hashable, List[int]]:
+    """Group item positions by key, preserving input order within each group"""
+    groups: Dict[Hashable, List[int]] = {}
+    for index, item in enumerate(items):
+        groups.setdefault(key(item), []).append(index)
+    return groups
+
+
+def batch_groups(
+    items: Sequence, key: Callable, horizon: Callable[..., int]
+) -> Iterator[Tuple[Hashable, List[int]]]:
     """
-    Calculate SIP returns with annual compounding.
+    Group item positions for vectorized projection, in slices of bounded size.
 
-    This uses a month-by-month accurate calculation where:
-    - Each monthly investment is tracked separately
-    - Interest is compounded annually at year-end
-    - Each investment grows based on how many complete years it stays invested
+    Rows of a group are padded to its longest horizon, so besides the key,
+    items are grouped by horizon band (1, 2-3, 4-7, ... years): padding at
+    most doubles a plan's work, however the horizons in a batch are mixed.
+    Each slice holds at most BATCH_ELEMENT_BUDGET plan-months.
 
     Args:
-        request: SIPCalculationRequest with monthly_investment, time_period_years, annual_return_rate
+        items: Requests to group
+        key: Grouping key of a request, e.g. its compounding frequency
+        horizon: Years a request's rows are projected over
+
+    Yields:
+        (key, positions) per slice, positions in input order within a slice
+    """
+    groups = group_indices(items, lambda item: (key(item), horizon(item).bit_length()))
+    for (group_key, band), indices in groups.items():
+        size = max(1, BATCH_ELEMENT_BUDGET // ((2 ** band - 1) * MONTHS_PER_YEAR))
+        for start in range(0, len(indices), size):
+            yield group_key, indices[start:start + size]
+
+
+class SIPProjection(NamedTuple):
+    """Projected per-year arrays for a group of SIP requests, each of shape (N, max_years)"""
+    monthly_contributions: np.ndarray
+    invested_per_year: np.ndarray
+    withdrawn_per_year: np.ndarray
+    year_end_balances: np.ndarray
+    # Input name -> derivative of each row's final balance, shape (N,); see project_sip
+    sensitivities: Optional[Dict[str, np.ndarray]] = None
+    # Each year's contributions discounted by the growth factors, and the factors at year ends; see project_sip
+    discounted_contributions: Optional[np.ndarray] = None
+    year_end_factors: Optional[np.ndarray] = None
+
+
+def project_sip(
+    requests: Sequence[SIPCalculationRequest],
+    growth: Optional[np.ndarray] = None,
+    sensitivities: bool = False,
+    vintages: bool = False,
+) -> SIPProjection:
+    """
+    Project contributions and year-end balances for requests sharing a compounding frequency.
+
+    Contributions are tracked month by month:
+    - Each month's contribution is credited at the end of that month
+    - Interest is credited at the end of each compounding period on the balance
+      held at the start of the period, so contributions made during a period
+      start compounding at the next period boundary
+    - With annual compounding this is exactly the original model where a year's
+      contributions only grow from the following year onwards
+
+    Cash-flow events are applied to the monthly flows before they are summed
+    into periods: lump sums and withdrawals are scattered in, pauses zero the
+    regular contribution. A withdrawal larger than the balance is cut back to
+    the balance by adding the shortfall's grown value to later periods; all
+    shortfalls are found in one pass over the discounted balances, so no
+    event triggers a re-simulation.
+
+    Growth comes from cached prefix-product tables of each request's rate
+    schedule (constant or per-year), so requests with the same schedule share
+    one table. Rows are padded to the longest horizon; values past a request's
+    own horizon are meaningless and must be ignored by the caller.
+
+    With `sensitivities`, the derivatives of each row's final balance are
+    carried along (see sip_sensitivities). With `vintages`, the projection
+    also keeps each year's flows divided by their cumulative growth factors,
+    D_c, and the factors at year ends, F_v, so the value at the end of year v
+    of year c's contributions is the outer product entry D_c * F_v (v >= c).
+
+    Args:
+        requests: SIP requests, all with the same compounding_frequency
+        growth: Optional growth factor per compounding period, shape
+            (N, max_years * periods per year), used instead of the requests'
+            rates, e.g. realized historical returns which may be negative
+        sensitivities: Also compute the derivatives of the final balances
+        vintages: Also keep the terms of the contribution-vintage matrix
 
     Returns:
-        SIPCalculationResponse with results and yearly breakdown
+        SIPProjection
     """
-    monthly_investment = request.monthly_investment
-    time_period_years = request.time_period_years
-    annual_rate = request.annual_return_rate / 100  # Convert percentage to decimal
-    initial_investment = request.initial_investment
-    annual_step_up_rate = request.annual_step_up_rate / 100  # Convert percentage to decimal
-    step_up_cap = request.step_up_cap
+    count = len(requests)
+    years = max(r.time_period_years for r in requests)
+    compounding_frequency = requests[0].compounding_frequency
+    periods_per_year = PERIODS_PER_YEAR[compounding_frequency]
 
-    # Initialize tracking variables
-    yearly_breakdown = []
-    total_invested = initial_investment
-    monthly_contributions = []  # Track per-year monthly contribution amounts
+    monthly_investment = np.array([r.monthly_investment for r in requests])
+    initial_investment = np.array([r.initial_investment for r in requests])
+    step_up_rate = np.array([r.annual_step_up_rate for r in requests]) / 100
+    step_up_cap = np.array([np.inf if r.step_up_cap is None else r.step_up_cap for r in requests])
 
-    # Calculate month-by-month for accuracy
-    # Each monthly investment will compound based on complete years invested
-    for year in range(1, time_period_years + 1):
-        # Determine current monthly contribution with step-up
-        if year == 1:
-            current_monthly = monthly_investment
-        else:
-            current_monthly = monthly_contributions[-1] * (1 + annual_step_up_rate)
-            if step_up_cap is not None:
-                current_monthly = min(current_monthly, step_up_cap)
+    # Monthly contribution for each year, with step-up and cap applied
+    monthly_contributions = step_up_schedule(monthly_investment, step_up_rate, step_up_cap, years)
+    monthly_flows = np.repeat(monthly_contributions, MONTHS_PER_YEAR, axis=-1)
+    invested_per_year = monthly_contributions * MONTHS_PER_YEAR
+    period_withdrawn = np.zeros((count, years * periods_per_year))
 
-        monthly_contributions.append(current_monthly)
+    events = event_arrays([r.events for r in requests], years * MONTHS_PER_YEAR)
+    if events is not None:
+        deposits = monthly_flows * events.active + events.lump_sums
+        invested_per_year = deposits.reshape(count, years, MONTHS_PER_YEAR).sum(axis=-1)
+        monthly_flows = deposits - events.withdrawals
+        period_withdrawn = to_periods(events.withdrawals, periods_per_year)
 
-        # Amount invested this year (12 monthly investments + initial in year 1)
-        invested_this_year = current_monthly * 12
-        if year == 1:
-            invested_this_year += initial_investment
-        total_invested += current_monthly * 12
+    if growth is None:
+        # Cached prefix products per rate schedule, shared by requests with equal schedules
+        growth, factors = schedule_growth(
+            [r.return_rates() for r in requests],
+            [compounding_frequency] * count,
+            MONTHS_PER_YEAR // periods_per_year,
+            years * periods_per_year,
+        )
+    else:
+        factors = np.cumprod(growth, axis=-1)
+
+    # Period-end balances; the initial investment compounds from the first period
+    period_flows = to_periods(monthly_flows, periods_per_year)
+    balances = accumulate_factors(initial_investment, period_flows, factors)
+
+    # Cut back overdrawing withdrawals in one pass. In units of the cumulative factor a
+    # shortfall topped up at period s adds -B_s / F_s to every later period, so the total
+    # top-up is the running maximum of the overdrafts seen so far
+    if events is not None:
+        overdraft = np.where(balances < -OVERDRAFT_TOLERANCE, -balances / factors, 0.0)
+        topped_up = np.maximum.accumulate(overdraft, axis=-1)
+        period_withdrawn -= np.diff(topped_up, axis=-1, prepend=0.0) * factors
+        balances = np.maximum(balances + topped_up * factors, 0.0)
+
+    withdrawn_per_year = period_withdrawn.reshape(count, years, periods_per_year).sum(axis=-1)
+    discounted_contributions = year_end_factors = None
+    if vintages:
+        discounted_contributions = (period_flows / factors).reshape(count, years, periods_per_year).sum(axis=-1)
+        discounted_contributions[:, 0] += initial_investment
+        year_end_factors = factors[:, periods_per_year - 1::periods_per_year]
+    derivatives = None
+    if sensitivities:
+        derivatives = sip_sensitivities(requests, monthly_contributions, events, growth, factors, balances)
+    return SIPProjection(
+        monthly_contributions,
+        invested_per_year,
+        withdrawn_per_year,
+        balances[:, periods_per_year - 1::periods_per_year],
+        derivatives,
+        discounted_contributions,
+        year_end_factors,
+    )
+
+
+def sip_sensitivities(
+    requests: Sequence[SIPCalculationRequest],
+    monthly_contributions: np.ndarray,
+    events,
+    growth: np.ndarray,
+    factors: np.ndarray,
+    balances: np.ndarray,
+) -> Dict[str, np.ndarray]:
+    """
+    Derivatives of each plan's final balance, from the arrays of its projection.
+
+    The balance recurrence B_t = B_{t-1} * g_t + f_t is differentiated in
+    forward mode: dB_t = dB_{t-1} * g_t + (B_{t-1} * dg_t + df_t), another
+    recurrence of the same form, so each derivative path is one more
+    accumulate_factors call over the same growth factors. The horizon is
+    discrete, so its entry is the forward difference of investing one more
+    year at the last year's rate and the next stepped-up contribution.
+
+    Returns:
+        Dict of SIPSensitivities field name -> derivative per plan, shape (N,)
+    """
+    count, length = balances.shape
+    periods_per_year = PERIODS_PER_YEAR[requests[0].compounding_frequency]
+    months_per_period = MONTHS_PER_YEAR // periods_per_year
+    years = length // periods_per_year
+    rows = np.arange(count)
+    last = np.array([r.time_period_years for r in requests]) * periods_per_year - 1
+
+    monthly_investment = np.array([r.monthly_investment for r in requests])
+    step_up_rate = np.array([r.annual_step_up_rate for r in requests]) / 100
+    step_up_cap = np.array([np.inf if r.step_up_cap is None else r.step_up_cap for r in requests])
+    d_start, d_step_up = step_up_sensitivities(monthly_investment, step_up_rate, step_up_cap, years)
+    active = 1.0 if events is None else events.active
+
+    def flow_derivative(per_year):
+        return to_periods(np.repeat(per_year, MONTHS_PER_YEAR, axis=-1) * active, periods_per_year)
+
+    # With the period equal to the compounding period, g_t = 1 + r_t / periods_per_year
+    previous = np.concatenate([np.array([r.initial_investment for r in requests])[:, None], balances[:, :-1]], axis=-1)
+    paths = {
+        "annual_return_rate": accumulate_factors(0.0, previous / (100 * periods_per_year), factors),
+        "annual_step_up_rate": accumulate_factors(0.0, flow_derivative(d_step_up / 100), factors),
+        "monthly_investment": accumulate_factors(0.0, flow_derivative(d_start), factors),
+    }
+    derivatives = {name: path[rows, last] for name, path in paths.items()}
+
+    last_growth = growth[rows, last]
+    next_contribution = np.minimum(
+        monthly_contributions[rows, last // periods_per_year] * (1 + step_up_rate), step_up_cap
+    )
+    in_year_growth = sum(last_growth ** k for k in range(periods_per_year))
+    derivatives["time_period_years"] = (
+        balances[rows, last] * (last_growth ** periods_per_year - 1)
+        + next_contribution * months_per_period * in_year_growth
+    )
+    return derivatives
+
+
+def project_sip_exact(requests: Sequence[SIPCalculationRequest]) -> SIPProjection:
+    """
+    project_sip in integer minor units, for requests sharing a compounding frequency and exact settings.
+
+    Follows the same cash-flow model, with amounts converted to minor units
+    and stepped up by the exact settings' amount rounding, and the interest
+    of every compounding period rounded by its interest rounding (see
+    api/services/fixed_point.py). Withdrawal events larger than the balance
+    are cut back in the period they fall in.
+
+    Returns:
+        SIPProjection of int64 arrays in minor units
+    """
+    count = len(requests)
+    years = max(r.time_period_years for r in requests)
+    periods_per_year = PERIODS_PER_YEAR[requests[0].compounding_frequency]
+    months_per_period = MONTHS_PER_YEAR // periods_per_year
+    exact = requests[0].exact
+    minor_units, amount_rounding = exact.minor_units, exact.amount_rounding
+
+    def units(amount):
+        return to_units(amount, minor_units, amount_rounding)
+
+    monthly_contributions = step_up_columns(
+        [units(r.monthly_investment) for r in requests],
+        [r.annual_step_up_rate for r in requests],
+        [None if r.step_up_cap is None else units(r.step_up_cap) for r in requests],
+        years,
+        amount_rounding,
+    )
+    initial_investment = np.array([units(r.initial_investment) for r in requests], dtype=np.int64)
+
+    events = event_arrays([r.events for r in requests], years * MONTHS_PER_YEAR, units=units)
+    if events is None:
+        invested_per_year = monthly_contributions * MONTHS_PER_YEAR
+        deposits = np.repeat(monthly_contributions * months_per_period, periods_per_year, axis=-1)
+        withdrawals = np.zeros_like(deposits)
+    else:
+        monthly_deposits = np.repeat(monthly_contributions, MONTHS_PER_YEAR, axis=-1) * events.active + events.lump_sums
+        invested_per_year = monthly_deposits.reshape(count, years, MONTHS_PER_YEAR).sum(axis=-1)
+        deposits = to_periods(monthly_deposits, periods_per_year)
+        withdrawals = to_periods(events.withdrawals, periods_per_year)
+
+    rates = rate_columns(
+        [r.return_rates() for r in requests],
+        [r.compounding_frequency for r in requests],
+        months_per_period,
+        years * periods_per_year,
+    )
+    year_end_balances, withdrawn_per_year = run_rows(
+        accumulate_units,
+        [initial_investment],
+        [deposits, withdrawals, rates],
+        periods_per_year=periods_per_year,
+        rounding=exact.interest_rounding,
+    )
+    return SIPProjection(monthly_contributions, invested_per_year, withdrawn_per_year, year_end_balances)
+
+
+def _inputs(request: SIPCalculationRequest) -> dict:
+    """Input parameters echoed in the response"""
+    return {
+        "monthly_investment": request.monthly_investment,
+        "time_period_years": request.time_period_years,
+        "annual_return_rate": request.annual_return_rate,
+        "initial_investment": request.initial_investment,
+        "annual_step_up_rate": request.annual_step_up_rate,
+        "step_up_cap": request.step_up_cap,
+        "compounding_frequency": request.compounding_frequency,
+        "annual_return_rates": request.annual_return_rates,
+        "events": [e.model_dump() for e in request.events] if request.events else None,
+        "exact": request.exact.model_dump() if request.exact else None,
+    }
 
-        # Calculate future value at end of this year
-        # We need to consider all investments made up to this year
-        future_value = 0
 
-        # Initial investment compounds for the full period
-        if initial_investment > 0:
-            future_value += initial_investment * ((1 + annual_rate) ** year)
+def _exact_totals(request: SIPCalculationRequest, projection: SIPProjection, row: int) -> dict:
+    """Headline results of one row of an exact projection, totalled in minor units"""
+    years = request.time_period_years
+    minor_units = request.exact.minor_units
+    future_value = int(projection.year_end_balances[row, years - 1])
+    total_invested = int(projection.invested_per_year[row, :years].sum()) + to_units(
+        request.initial_investment, minor_units, request.exact.amount_rounding
+    )
+    total_withdrawn = int(projection.withdrawn_per_year[row, :years].sum())
+    total_returns = future_value + total_withdrawn - total_invested
+    return {
+        "future_value": from_units(future_value, minor_units),
+        "total_invested": from_units(total_invested, minor_units),
+        "total_withdrawn": from_units(total_withdrawn, minor_units),
+        "total_returns": from_units(total_returns, minor_units),
+        "returns_percentage": round(total_returns / total_invested * 100, 2) if total_invested > 0 else 0,
+    }
+
+
+def _build_exact_response(
+    request: SIPCalculationRequest, projection: SIPProjection, row: int
+) -> SIPCalculationResponse:
+    """Assemble the API response from one row of an exact projection; amounts are exact to the minor unit"""
+    years = request.time_period_years
+    minor_units = request.exact.minor_units
+    initial_investment = to_units(request.initial_investment, minor_units, request.exact.amount_rounding)
+
+    invested = projection.invested_per_year[row, :years].tolist()
+    invested[0] += initial_investment
+    cumulative = np.cumsum(invested).tolist()
+    balances = projection.year_end_balances[row, :years].tolist()
+    contributions = projection.monthly_contributions[row, :years].tolist()
+
+    yearly_breakdown = [
+        YearlyBreakdown(
+            year=year + 1,
+            invested_this_year=from_units(invested[year], minor_units),
+            cumulative_invested=from_units(cumulative[year], minor_units),
+            future_value=from_units(balances[year], minor_units),
+            monthly_contribution=from_units(contributions[year], minor_units),
+        )
+        for year in range(years)
+    ]
+    return SIPCalculationResponse(
+        status="success",
+        inputs=_inputs(request),
+        results=SIPCalculationResults(**_exact_totals(request, projection, row)),
+        yearly_breakdown=yearly_breakdown
+    )
 
-        # Go through each year and calculate the future value of those investments
-        for inv_year in range(1, year + 1):
-            # 12 monthly investments in inv_year (using that year's contribution)
-            year_investment = monthly_contributions[inv_year - 1] * 12
 
-            # How many complete years will this investment compound?
-            years_to_compound = year - inv_year
+def _build_response(request: SIPCalculationRequest, projection: SIPProjection, row: int) -> SIPCalculationResponse:
+    """Assemble the API response from one request's row of a projection"""
+    time_period_years = request.time_period_years
+    initial_investment = request.initial_investment
 
-            # Future value of this year's investments
-            if years_to_compound > 0:
-                fv = year_investment * ((1 + annual_rate) ** years_to_compound)
-            else:
-                # Investments made in the current year don't compound yet
-                fv = year_investment
+    invested = projection.invested_per_year[row, :time_period_years]
+    cumulative = initial_investment + np.cumsum(invested)
+    total_invested = float(cumulative[-1])
+    total_withdrawn = float(projection.withdrawn_per_year[row, :time_period_years].sum())
 
-            future_value += fv
+    # Plain Python floats are much cheaper to round than numpy scalars
+    invested_per_year = invested.tolist()
+    cumulative_invested = cumulative.tolist()
+    balances = projection.year_end_balances[row, :time_period_years].tolist()
+    contributions = projection.monthly_contributions[row, :time_period_years].tolist()
+
+    yearly_breakdown = []
+    for year in range(1, time_period_years + 1):
+        invested_this_year = invested_per_year[year - 1]
+        if year == 1:
+            invested_this_year += initial_investment
 
-        # Add this year to breakdown
         yearly_breakdown.append(YearlyBreakdown(
             year=year,
             invested_this_year=round(invested_this_year, 2),
-            cumulative_invested=round(total_invested, 2),
-            future_value=round(future_value, 2),
-            monthly_contribution=round(current_monthly, 2)
+            cumulative_invested=round(cumulative_invested[year - 1], 2),
+            future_value=round(balances[year - 1], 2),
+            monthly_contribution=round(contributions[year - 1], 2)
         ))
 
-    # Final calculations
+    # Final calculations; money taken out by withdrawal events still counts as returned
     final_future_value = yearly_breakdown[-1].future_value
-    total_returns = final_future_value - total_invested
+    total_returns = final_future_value + total_withdrawn - total_invested
     returns_percentage = (total_returns / total_invested) * 100 if total_invested > 0 else 0
 
     # Build response
     results = SIPCalculationResults(
         future_value=round(final_future_value, 2),
         total_invested=round(total_invested, 2),
+        total_withdrawn=round(total_withdrawn, 2),
         total_returns=round(total_returns, 2),
         returns_percentage=round(returns_percentage, 2)
     )
 
-    inputs_dict = {
-        "monthly_investment": monthly_investment,
-        "time_period_years": time_period_years,
-        "annual_return_rate": request.annual_return_rate,
-        "initial_investment": initial_investment,
-        "annual_step_up_rate": request.annual_step_up_rate,
-        "step_up_cap": step_up_cap,
-        "compounding_frequency": "annually"
-    }
+    sensitivities = None
+    if request.sensitivities:
+        sensitivities = SIPSensitivities(**{
+            name: round(float(values[row]), 2) for name, values in projection.sensitivities.items()
+        })
+
+    vintages = None
+    if request.vintages:
+        # Outer product of discounted contributions and year-end factors, upper triangle only
+        upper = np.triu_indices(time_period_years)
+        matrix = np.multiply.outer(
+            projection.discounted_contributions[row, :time_period_years],
+            projection.year_end_factors[row, :time_period_years],
+        )
+        vintages = ContributionVintages(years=time_period_years, values=matrix[upper].round(2).tolist())
 
     return SIPCalculationResponse(
         status="success",
-        inputs=inputs_dict,
+        inputs=_inputs(request),
         results=results,
-        yearly_breakdown=yearly_breakdown
+        yearly_breakdown=yearly_breakdown,
+        sensitivities=sensitivities,
+        vintages=vintages,
+    )
+
+
+def approximation(error_bound: float, relative_error_bound: float) -> Approximation:
+    """Approximation details, with the absolute bound rounded up to whole cents"""
+    return Approximation(
+        error_bound=math.ceil(error_bound * 100) / 100,
+        relative_error_bound=relative_error_bound,
+    )
+
+
+def approximate_sip(request: SIPCalculationRequest) -> Optional[SIPCalculationResponse]:
+    """
+    Answer a SIP request from the scenario grid, without running the projection.
+
+    Plans with a constant rate and no step-up cap or events are linear in
+    their amounts: the year-end balances are the grid's interpolated
+    balances for investing 1 a month, times monthly_investment, plus the
+    initial investment grown at the plan's rate. Contributions are
+    calculated exactly.
+
+    Returns:
+        Response with `approximation` set, or None if there is no grid or
+        the plan is not on it
+    """
+    grid = load_grid()
+    if (
+        grid is None or request.annual_return_rates is not None or request.step_up_cap is not None
+        or request.events or request.sensitivities or request.vintages
+    ):
+        return None
+    years = request.time_period_years
+    lookup = grid.lookup(
+        f"sip/{request.compounding_frequency}", request.annual_return_rate, request.annual_step_up_rate, years
+    )
+    if lookup is None:
+        return None
+
+    monthly_contributions = step_up_schedule(request.monthly_investment, request.annual_step_up_rate / 100, None, years)
+    contributions_value = request.monthly_investment * lookup.values
+    initial_value = request.initial_investment * growth_over_months(
+        request.annual_return_rate / 100, request.compounding_frequency, MONTHS_PER_YEAR * np.arange(1, years + 1)
     )
+    projection = SIPProjection(
+        monthly_contributions[None],
+        monthly_contributions[None] * MONTHS_PER_YEAR,
+        np.zeros((1, years)),
+        (contributions_value + initial_value)[None],
+    )
+    response = _build_response(request, projection, 0)
+    response.approximation = approximation(
+        float(contributions_value[-1] * lookup.relative_error[-1]), float(lookup.relative_error[-1])
+    )
+    return response
+
+
+def calculate_sip_with_annual_compounding(request: SIPCalculationRequest) -> SIPCalculationResponse:
+    """
+    Calculate SIP returns with annual (default), quarterly or monthly compounding.
+
+    The balance follows a period-level linear recurrence solved by the
+    vectorized kernel (see project_sip), so cost is linear in the number of months.
+
+    Args:
+        request: SIPCalculationRequest with monthly_investment, time_period_years, annual_return_rate
+
+    Returns:
+        SIPCalculationResponse with results and yearly breakdown
+    """
+    if request.approximate:
+        response = approximate_sip(request)
+        if response is not None:
+            return response
+    if request.exact is not None:
+        return _build_exact_response(request, project_sip_exact([request]), 0)
+    projection = project_sip([request], sensitivities=request.sensitivities, vintages=request.vintages)
+    return _build_response(request, projection, 0)
+
+
+def calculate_sip_batch(requests: Sequence[SIPCalculationRequest]) -> List[SIPCalculationResponse]:
+    """
+    Calculate many SIP requests, vectorized across requests with the same compounding frequency.
+
+    Requests with exact arithmetic are grouped by their exact settings too
+    and run through project_sip_exact. Groups are also split by horizon
+    band and size (see batch_groups), so one long plan does not pad a batch
+    of short ones. Batches are always calculated in
+    full: across many plans the vectorized projection costs about as much
+    as interpolating the scenario grid plan by plan.
+
+    Args:
+        requests: SIP requests in any mix of horizons and frequencies
+
+    Returns:
+        Responses in the same order as the requests
+    """
+    responses: List[SIPCalculationResponse] = [None] * len(requests)
+    groups = batch_groups(requests, lambda r: (r.compounding_frequency, r.exact), lambda r: r.time_period_years)
+    for (_, exact), indices in groups:
+        group = [requests[i] for i in indices]
+        if exact is not None:
+            projection = project_sip_exact(group)
+            build = _build_exact_response
+        else:
+            projection = project_sip(
+                group,
+                sensitivities=any(r.sensitivities for r in group),
+                vintages=any(r.vintages for r in group),
+            )
+            build = _build_response
+        for row, index in enumerate(indices):
+            responses[index] = build(requests[index], projection, row)
+    return responses
+
+
+def calculate_sip_summaries(requests: Sequence[SIPCalculationRequest]) -> Dict[str, list]:
+    """
+    Headline results of many SIP requests, without yearly breakdowns.
+
+    Returns the same rounded values as the `results` of calculate_sip_batch,
+    but as columns, and skips building per-year response models, which
+    dominates the cost of a batch. Meant for bulk scoring.
+
+    Args:
+        requests: SIP requests in any mix of horizons and frequencies
+
+    Returns:
+        Dict of SIPCalculationResults field name -> list of values in request order
+    """
+    future_value = np.empty(len(requests))
+    total_invested = np.empty(len(requests))
+    total_withdrawn = np.empty(len(requests))
+    exact_totals = {}
+    groups = batch_groups(requests, lambda r: (r.compounding_frequency, r.exact), lambda r: r.time_period_years)
+    for (_, exact), indices in groups:
+        group = [requests[i] for i in indices]
+        if exact is not None:
+            projection = project_sip_exact(group)
+            for row, index in enumerate(indices):
+                exact_totals[index] = _exact_totals(requests[index], projection, row)
+            continue
+        projection = project_sip(group)
+        rows = np.arange(len(group))
+        last = np.array([r.time_period_years for r in group]) - 1
+        initial_investment = np.array([r.initial_investment for r in group])
+        # Running sums, so totals add up in the same order as the single-plan path
+        future_value[indices] = projection.year_end_balances[rows, last]
+        total_invested[indices] = initial_investment + np.cumsum(projection.invested_per_year, axis=-1)[rows, last]
+        total_withdrawn[indices] = np.cumsum(projection.withdrawn_per_year, axis=-1)[rows, last]
+
+    columns = {name: [] for name in SIPCalculationResults.model_fields}
+    rows = zip(future_value.tolist(), total_invested.tolist(), total_withdrawn.tolist())
+    for index, (value, invested, withdrawn) in enumerate(rows):
+        if index in exact_totals:
+            for name, total in exact_totals[index].items():
+                columns[name].append(total)
+            continue
+        value = round(value, 2)
+        total_returns = value + withdrawn - invested
+        columns["future_value"].append(value)
+        columns["total_invested"].append(round(invested, 2))
+        columns["total_withdrawn"].append(round(withdrawn, 2))
+        columns["total_returns"].append(round(total_returns, 2))
+        columns["returns_percentage"].append(round(total_returns / invested * 100 if invested > 0 else 0, 2))
+    return columns
 
 
 def format_currency(amount: float) -> str:
@@ -0,0 +1,63 @@
+"""
+Newline-delimited JSON (NDJSON) streaming of large batch and comparison outputs
+"""
+import json
+from itertools import chain
+from typing import Callable, Iterable, Iterator, List, Sequence
+
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+# Plans calculated per chunk when streaming a batch; bounds memory and time to first byte
+STREAM_CHUNK = 500
+
+
+def batch_chunks(
+    requests: Sequence,
+    calculate: Callable[[Sequence], List],
+    chunk_size: int = STREAM_CHUNK,
+) -> Iterator[List]:
+    """Lazily calculate a batch one chunk at a time with a vectorized batch function"""
+    for start in range(0, len(requests), chunk_size):
+        yield calculate(requests[start:start + chunk_size])
+
+
+def ndjson_stream(chunks: Iterable[Sequence]) -> Iterator[bytes]:
+    """
+    Encode chunks of models (or JSON-serializable dicts) as NDJSON, one line per item.
+
+    Each chunk is encoded and released before the next is calculated, so
+    memory holds a single chunk and the first bytes leave as soon as the
+    first chunk is done. Writing once per chunk rather than per line keeps
+    the per-write overhead of the streaming response out of the hot path.
+    If a later chunk fails after the response has started, the stream ends
+    with an error line in the same shape as error responses.
+    """
+    try:
+        for chunk in chunks:
+            yield "".join(
+                (item.model_dump_json() if isinstance(item, BaseModel) else json.dumps(item)) + "\n"
+                for item in chunk
+            ).encode()
+    except ValueError as e:
+        yield (json.dumps({"status": "error", "message": str(e), "errors": []}) + "\n").encode()
+    except Exception as e:
+        yield (json.dumps({
+            "status": "error",
+            "message": f"Internal server error: {str(e)}",
+            "errors": []
+        }) + "\n").encode()
+
+
+def ndjson_response(chunks: Iterator[Sequence]) -> StreamingResponse:
+    """
+    Stream chunks as NDJSON, calculating the first chunk before responding.
+
+    Errors in the first chunk therefore still raise, and the endpoint
+    reports them with the usual status codes; only failures in later
+    chunks become a trailing error line.
+    """
+    first = next(chunks, [])
+    return StreamingResponse(ndjson_stream(chain([first], chunks)), media_type=NDJSON_MEDIA_TYPE)
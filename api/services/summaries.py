@@ -0,0 +1,33 @@
+"""
+Failure isolation for columnar summary functions over chunks of plans
+"""
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+
+def summary_outcomes(
+    summarize: Callable[[Sequence], Dict[str, list]],
+    requests: Sequence,
+) -> List[Tuple[Optional[dict], Optional[str]]]:
+    """
+    (results, error) per request from a columnar summary function.
+
+    If the vectorized call raises a ValueError (e.g. one plan too large for
+    exact arithmetic), the requests are split in halves and retried, so only
+    the failing plans lose their results, at a cost logarithmic in the chunk
+    per failing plan.
+
+    Args:
+        summarize: Summary function such as calculate_sip_summaries
+        requests: Validated requests
+
+    Returns:
+        (results, error) per request, in order; exactly one of the two is set
+    """
+    try:
+        columns = summarize(requests)
+    except ValueError as e:
+        if len(requests) == 1:
+            return [(None, str(e))]
+        middle = len(requests) // 2
+        return summary_outcomes(summarize, requests[:middle]) + summary_outcomes(summarize, requests[middle:])
+    return [({name: column[row] for name, column in columns.items()}, None) for row in range(len(requests))]
@@ -0,0 +1,193 @@
+"""
+XIRR and CAGR for many dated cash-flow series at once
+"""
+from datetime import date
+from itertools import chain
+from typing import List, NamedTuple, Sequence, Tuple
+
+import numpy as np
+
+from api.models.xirr import CashFlowSeries, XIRRResult
+
+DAYS_PER_YEAR = 365.0
+
+# Search range for the annual rate: -99.99% to +10,000%
+MIN_RATE = -0.9999
+MAX_RATE = 100.0
+
+
+class XIRRSolution(NamedTuple):
+    """Per-series solver output, each of shape (N,)"""
+    rates: np.ndarray
+    converged: np.ndarray
+    iterations: np.ndarray
+
+
+def pack_series(series: Sequence[CashFlowSeries]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Pad cash-flow series into dense (N, K) amount and time arrays.
+
+    Times are in years from each series' earliest date. Padding entries have
+    zero amount, so they drop out of every sum.
+
+    Returns:
+        Tuple of (amounts, years), each of shape (N, max flows per series)
+    """
+    lengths = np.array([len(s.amounts) for s in series])
+    ordinals = np.fromiter(map(date.toordinal, chain.from_iterable(s.dates for s in series)), float)
+    flat_amounts = np.fromiter(chain.from_iterable(s.amounts for s in series), float)
+
+    rows = np.repeat(np.arange(len(series)), lengths)
+    starts = np.cumsum(lengths) - lengths
+    columns = np.arange(len(ordinals)) - np.repeat(starts, lengths)
+
+    amounts = np.zeros((len(series), lengths.max()))
+    years = np.zeros_like(amounts)
+    amounts[rows, columns] = flat_amounts
+    first = np.minimum.reduceat(ordinals, starts)
+    years[rows, columns] = (ordinals - np.repeat(first, lengths)) / DAYS_PER_YEAR
+    return amounts, years
+
+
+def cagr(amounts: np.ndarray, years: np.ndarray) -> np.ndarray:
+    """
+    Annualized growth of everything received over everything invested.
+
+    Treats all invested money as if it went in on the first date and all
+    received money as if it came out on the last, so it ignores timing
+    inside the span; XIRR is the timing-aware measure.
+
+    Args:
+        amounts: Cash flows, negative invested and positive received, shape (N, K)
+        years: Time of each flow in years from the series start, shape (N, K)
+
+    Returns:
+        Annual rates as decimals, shape (N,); inf where the rate overflows,
+        as when a large gain is annualized over a span of days
+    """
+    invested = -np.where(amounts < 0, amounts, 0.0).sum(axis=-1)
+    received = np.where(amounts > 0, amounts, 0.0).sum(axis=-1)
+    span = years.max(axis=-1)
+    with np.errstate(over="ignore"):
+        return (received / invested) ** (1 / span) - 1
+
+
+def _npv(amounts: np.ndarray, years: np.ndarray, x: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Scaled NPV and its derivative in x = log(1 + rate).
+
+    NPV(x) = sum(a * exp(-t * x)). Both values are multiplied by the same
+    positive factor, exp(t_max * x) when x < 0, so every exponent is <= 0
+    and nothing overflows; signs and the Newton ratio are unaffected.
+    """
+    shift = np.where(x < 0, years.max(axis=-1), 0.0)[:, None]
+    discounted = amounts * np.exp(-(years - shift) * x[:, None])
+    return discounted.sum(axis=-1), -(discounted * years).sum(axis=-1)
+
+
+def xirr(
+    amounts: np.ndarray,
+    years: np.ndarray,
+    guess=None,
+    tol: float = 1e-10,
+    max_iter: int = 100,
+) -> XIRRSolution:
+    """
+    Solve NPV(rate) = 0 for every series with a safeguarded Newton iteration.
+
+    Each series keeps a bracket [lo, hi] with a sign change of the NPV. A
+    Newton step is taken when it stays inside the bracket and at least halves
+    the step from two iterations earlier; otherwise the bracket is bisected.
+    Every series therefore converges whenever a root is bracketed, and
+    Newton's quadratic rate applies near the root. All series are
+    updated together; converged series drop out of later iterations.
+
+    Args:
+        amounts: Cash flows, negative invested and positive received, shape (N, K)
+        years: Time of each flow in years from the series start, shape (N, K)
+        guess: Optional starting rates as decimals, shape (N,)
+        tol: Convergence tolerance on the step in log(1 + rate)
+        max_iter: Iteration limit per series
+
+    Returns:
+        XIRRSolution; rates are NaN where no root lies in [MIN_RATE, MAX_RATE]
+        or the solver did not converge
+    """
+    count = amounts.shape[0]
+    lo = np.full(count, np.log1p(MIN_RATE))
+    hi = np.full(count, np.log1p(MAX_RATE))
+    f_lo, _ = _npv(amounts, years, lo)
+    f_hi, _ = _npv(amounts, years, hi)
+
+    # Orient each bracket so the NPV is negative at `lo` and positive at `hi`
+    flip = f_lo > 0
+    lo, hi = np.where(flip, hi, lo), np.where(flip, lo, hi)
+    bracketed = np.sign(f_lo) * np.sign(f_hi) < 0
+
+    x = (lo + hi) / 2 if guess is None else np.log1p(np.clip(np.nan_to_num(guess), MIN_RATE, MAX_RATE))
+    x = np.where((x - lo) * (x - hi) < 0, x, (lo + hi) / 2)
+
+    converged = np.zeros(count, dtype=bool)
+    iterations = np.zeros(count, dtype=np.int64)
+    previous_step = np.abs(hi - lo)
+    last_step = previous_step.copy()
+    active = np.flatnonzero(bracketed)
+    for _ in range(max_iter):
+        if active.size == 0:
+            break
+        xa = x[active]
+        f, df = _npv(amounts[active], years[active], xa)
+        lo[active] = np.where(f < 0, xa, lo[active])
+        hi[active] = np.where(f > 0, xa, hi[active])
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            newton = xa - f / df
+        inside = np.isfinite(newton) & ((newton - lo[active]) * (newton - hi[active]) < 0)
+        fast = np.abs(newton - xa) <= previous_step[active] / 2
+        step = np.where(inside & fast, newton, (lo[active] + hi[active]) / 2)
+
+        previous_step[active] = last_step[active]
+        last_step[active] = np.abs(step - xa)
+        done = (f == 0) | (last_step[active] < tol * (1 + np.abs(xa))) | (np.abs(hi[active] - lo[active]) < tol)
+        x[active] = np.where(f == 0, xa, step)
+        iterations[active] += 1
+        converged[active[done]] = True
+        active = active[~done]
+
+    rates = np.where(converged, np.expm1(x), np.nan)
+    return XIRRSolution(rates, converged, iterations)
+
+
+def calculate_xirr_batch(series: Sequence[CashFlowSeries]) -> List[XIRRResult]:
+    """
+    Calculate XIRR and CAGR for many cash-flow series, vectorized across series.
+
+    CAGR is computed first and used as each series' starting guess. It is
+    reported as None where it overflows a float.
+
+    Args:
+        series: Cash-flow series in any order of dates
+
+    Returns:
+        Results in the same order as the series, rates in percent
+    """
+    amounts, years = pack_series(series)
+    growth = cagr(amounts, years)
+    solution = xirr(amounts, years, guess=growth)
+
+    rates = np.round(solution.rates * 100, 4).tolist()
+    finite = np.isfinite(growth).tolist()
+    growth = np.round(growth * 100, 4).tolist()
+    converged = solution.converged.tolist()
+    iterations = solution.iterations.tolist()
+
+    return [
+        XIRRResult(
+            id=s.id,
+            xirr=rates[i] if converged[i] else None,
+            cagr=growth[i] if finite[i] else None,
+            converged=converged[i],
+            iterations=iterations[i],
+        )
+        for i, s in enumerate(series)
+    ]
@@ -1,8 +1,11 @@
 import { Controller } from 'react-hook-form';
 import { formatInputValue, parseInputValue } from '../../utils/formatters';
+import useLimits from '../../hooks/useLimits';
 import './AccumulationForm.css';
 
 const AccumulationForm = ({ register, control, errors }) => {
+  const { max_horizon_years: maxYears } = useLimits();
+
   return (
     <fieldset className="accumulation-form">
       <legend>Accumulation Phase</legend>
@@ -118,7 +121,7 @@ const AccumulationForm = ({ register, control, errors }) => {
           {...register('accumulation_years', {
             required: 'Accumulation period is required',
             min: { value: 1, message: 'Must be at least 1 year' },
-            max: { value: 50, message: 'Must be 50 years or less' },
+            max: { value: maxYears, message: `Must be ${maxYears} years or less` },
           })}
           className={errors.accumulation_years ? 'error' : ''}
         />
@@ -1,8 +1,11 @@
 import { Controller } from 'react-hook-form';
 import { formatInputValue, parseInputValue } from '../../utils/formatters';
+import useLimits from '../../hooks/useLimits';
 import './WithdrawalForm.css';
 
 const WithdrawalForm = ({ register, control, errors, accumulationReturnRate }) => {
+  const { max_horizon_years: maxYears } = useLimits();
+
   return (
     <fieldset className="withdrawal-form">
       <legend>Withdrawal Phase</legend>
@@ -92,7 +95,7 @@ const WithdrawalForm = ({ register, control, errors, accumulationReturnRate }) =
           {...register('withdrawal_years', {
             required: 'Withdrawal period is required',
             min: { value: 1, message: 'Must be at least 1 year' },
-            max: { value: 50, message: 'Must be 50 years or less' },
+            max: { value: maxYears, message: `Must be ${maxYears} years or less` },
           })}
           className={errors.withdrawal_years ? 'error' : ''}
         />
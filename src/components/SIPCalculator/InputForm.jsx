@@ -1,8 +1,10 @@
 import { useForm, Controller } from 'react-hook-form';
 import { formatInputValue, parseInputValue } from '../../utils/formatters';
+import useLimits from '../../hooks/useLimits';
 import './InputForm.css';
 
 const InputForm = ({ onCalculate, isLoading }) => {
+  const { max_horizon_years: maxYears } = useLimits();
   const {
     register,
     handleSubmit,
@@ -152,7 +154,7 @@ const InputForm = ({ onCalculate, isLoading }) => {
           {...register('time_period_years', {
             required: 'Time period is required',
             min: { value: 1, message: 'Must be at least 1 year' },
-            max: { value: 50, message: 'Must be 50 years or less' },
+            max: { value: maxYears, message: `Must be ${maxYears} years or less` },
           })}
           className={errors.time_period_years ? 'error' : ''}
         />
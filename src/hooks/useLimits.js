@@ -0,0 +1,36 @@
+import { useEffect, useState } from 'react';
+import { getLimits } from '../services/api';
+
+// Used until the server's limits arrive, and if they cannot be fetched
+export const DEFAULT_LIMITS = {
+  max_horizon_years: 300,
+};
+
+let limitsPromise = null;
+
+/**
+ * Deployment limits from the API, fetched once and shared by every form
+ * @returns {Object} Limits, e.g. max_horizon_years
+ */
+const useLimits = () => {
+  const [limits, setLimits] = useState(DEFAULT_LIMITS);
+
+  useEffect(() => {
+    let active = true;
+    if (!limitsPromise) {
+      limitsPromise = getLimits().catch(() => DEFAULT_LIMITS);
+    }
+    limitsPromise.then((fetched) => {
+      if (active) {
+        setLimits({ ...DEFAULT_LIMITS, ...fetched });
+      }
+    });
+    return () => {
+      active = false;
+    };
+  }, []);
+
+  return limits;
+};
+
+export default useLimits;
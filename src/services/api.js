@@ -53,3 +53,12 @@ export const calculateSIP = async (data) => {
     }
   }
 };
+
+/**
+ * Fetch the deployment limits the forms validate against
+ * @returns {Promise<Object>} Limits, e.g. { max_horizon_years: 300 }
+ */
+export const getLimits = async () => {
+  const response = await axios.get(`${API_BASE_URL}/limits`);
+  return response.data;
+};
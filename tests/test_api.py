@@ -0,0 +1,313 @@
+"""
+Tests for the FastAPI endpoints
+"""
+import json
+
+import pytest
+from fastapi import WebSocketDisconnect
+from fastapi.testclient import TestClient
+
+from api.main import app
+from api.models.limits import MAX_HORIZON_YEARS
+from api.services.streaming import ndjson_stream
+
+client = TestClient(app)
+
+SIP_BODY = {
+    "monthly_investment": 5000,
+    "time_period_years": 10,
+    "annual_return_rate": 12.0,
+}
+
+JOURNEY_BODY = {
+    "monthly_investment": 5000,
+    "accumulation_years": 10,
+    "accumulation_return_rate": 12.0,
+    "monthly_withdrawal": 20000,
+    "withdrawal_years": 5,
+    "withdrawal_return_rate": 8.0,
+}
+
+
+class TestLimitsEndpoint:
+    """Tests for the limits the UI validates against"""
+
+    def test_horizon_limit(self):
+        assert client.get("/api/limits").json() == {"max_horizon_years": MAX_HORIZON_YEARS}
+
+
+class TestBatchEndpoints:
+    """Tests for the batch calculation endpoints"""
+
+    def test_sip_batch(self):
+        single = client.post("/api/calculate-sip", json=SIP_BODY).json()
+        response = client.post("/api/calculate-sip/batch", json={
+            "requests": [SIP_BODY, dict(SIP_BODY, compounding_frequency="monthly")],
+        })
+
+        assert response.status_code == 200
+        results = response.json()["results"]
+        assert len(results) == 2
+        assert results[0] == single
+
+    def test_money_journey_batch(self):
+        single = client.post("/api/calculate-money-journey", json=JOURNEY_BODY).json()
+        response = client.post("/api/calculate-money-journey/batch", json={
+            "requests": [JOURNEY_BODY, dict(JOURNEY_BODY, withdrawal_frequency="monthly")],
+        })
+
+        assert response.status_code == 200
+        results = response.json()["results"]
+        assert results[0] == single
+        assert results[1]["inputs"]["withdrawal_frequency"] == "monthly"
+
+    def test_empty_batch_rejected(self):
+        response = client.post("/api/calculate-sip/batch", json={"requests": []})
+        assert response.status_code == 422
+
+
+class TestExactOverflow:
+    """Plans too large for exact arithmetic are client errors, not server errors"""
+
+    def test_balance_overflow_is_400(self):
+        body = dict(SIP_BODY, time_period_years=100, annual_return_rate=30, exact={})
+        for response in (
+            client.post("/api/calculate-sip", json=body),
+            client.post("/api/calculate-sip/batch", json={"requests": [body]}),
+            client.post("/api/calculate-money-journey", json=dict(JOURNEY_BODY, accumulation_years=100,
+                                                                   accumulation_return_rate=30, exact={})),
+        ):
+            assert response.status_code == 400
+            assert "too large for exact arithmetic" in response.json()["detail"]["message"]
+
+    def test_oversized_amount_rejected_at_validation(self):
+        response = client.post("/api/calculate-sip", json=dict(SIP_BODY, monthly_investment=1e14, exact={}))
+
+        assert response.status_code == 422
+        assert "monthly_investment" in response.text
+
+
+class TestXIRREndpoint:
+    """Tests for the bulk XIRR endpoint"""
+
+    def test_calculate_xirr(self):
+        response = client.post("/api/calculate-xirr", json={"series": [
+            {"id": "p1", "dates": ["2021-01-01", "2022-01-01"], "amounts": [-1000, 1100]},
+        ]})
+
+        assert response.status_code == 200
+        result = response.json()["results"][0]
+        assert result["id"] == "p1"
+        assert result["converged"] is True
+        assert abs(result["xirr"] - 10.0) < 1e-4
+
+    def test_single_flow_rejected(self):
+        response = client.post("/api/calculate-xirr", json={"series": [
+            {"dates": ["2021-01-01"], "amounts": [-1000]},
+        ]})
+        assert response.status_code == 422
+
+
+class TestPlannerEndpoint:
+    """Tests for the multi-goal planner endpoint"""
+
+    def test_calculate_goals(self):
+        response = client.post("/api/calculate-goals", json={"goals": [
+            {"name": "Retirement", "money_journey": JOURNEY_BODY},
+            {"name": "Car", "start_year": 2, "sip": dict(SIP_BODY, time_period_years=3)},
+        ]})
+
+        assert response.status_code == 200
+        body = response.json()
+        assert body["results"]["total_monthly_outlay"] == 5000
+        assert body["yearly_breakdown"][1]["monthly_outlay"] == 10000
+        assert body["goals"][1]["sip"]["inputs"]["time_period_years"] == 3
+
+
+class TestComparisonEndpoint:
+    """Tests for the scenario comparison endpoint"""
+
+    def test_compare_money_journeys(self):
+        single = client.post("/api/calculate-money-journey", json=JOURNEY_BODY).json()
+        response = client.post("/api/compare-money-journeys", json={
+            "base": JOURNEY_BODY,
+            "scenarios": [{"label": "Spend more", "overrides": {"monthly_withdrawal": 30000}}],
+        })
+
+        assert response.status_code == 200
+        body = response.json()
+        assert body["scenarios"][0]["results"] == single["results"]
+        assert body["scenarios"][1]["deltas"]["corpus_at_retirement"] == 0
+
+    def test_mixed_phases_rejected(self):
+        response = client.post("/api/compare-money-journeys", json={
+            "base": JOURNEY_BODY,
+            "scenarios": [{"label": "Mixed", "overrides": {"monthly_investment": 1, "monthly_withdrawal": 1}}],
+        })
+        assert response.status_code == 422
+
+
+class TestBacktestEndpoint:
+    """Tests for the historical backtest endpoint"""
+
+    def test_backtest(self):
+        response = client.post("/api/backtest-money-journey", json={"plan": JOURNEY_BODY})
+
+        assert response.status_code == 200
+        body = response.json()
+        assert body["results"]["windows_tested"] == len(body["windows"]) == 96 - 15 + 1
+        assert body["windows"][0]["start_year"] == 1928
+
+    def test_plan_longer_than_dataset_rejected(self):
+        response = client.post("/api/backtest-money-journey", json={
+            "plan": dict(JOURNEY_BODY, accumulation_years=90, withdrawal_years=10),
+        })
+        assert response.status_code == 400
+
+
+class TestSimulationEndpoint:
+    """Tests for the portfolio simulation endpoint"""
+
+    ALLOCATION = {
+        "assets": [
+            {"name": "equity", "expected_return": 11, "volatility": 18, "weight": 70},
+            {"name": "debt", "expected_return": 7, "volatility": 5, "weight": 30},
+        ],
+        "correlation": [[1, 0.1], [0.1, 1]],
+    }
+
+    def test_simulate(self):
+        response = client.post("/api/simulate-portfolio", json={
+            "money_journey": JOURNEY_BODY, "allocation": self.ALLOCATION, "paths": 200, "seed": 1,
+        })
+
+        assert response.status_code == 200
+        body = response.json()
+        assert body["results"]["paths"] == 200
+        assert 0 <= body["results"]["success_rate"] <= 100
+        assert len(body["yearly_percentiles"]) == JOURNEY_BODY["accumulation_years"] + JOURNEY_BODY["withdrawal_years"]
+
+    def test_indefinite_correlation_rejected(self):
+        allocation = {
+            "assets": self.ALLOCATION["assets"] + [
+                {"name": "cash", "expected_return": 4, "volatility": 1, "weight": 0},
+            ],
+            "correlation": [[1, 0.9, -0.9], [0.9, 1, 0.9], [-0.9, 0.9, 1]],
+        }
+        response = client.post("/api/simulate-portfolio", json={
+            "money_journey": JOURNEY_BODY, "allocation": allocation, "paths": 10,
+        })
+        assert response.status_code == 400
+
+
+class TestStreamingResponses:
+    """Tests for NDJSON streaming of batch and comparison outputs"""
+
+    @staticmethod
+    def _lines(response):
+        return [json.loads(line) for line in response.text.splitlines()]
+
+    def test_sip_batch_stream(self):
+        body = {"requests": [dict(SIP_BODY, monthly_investment=1000 + i) for i in range(1203)]}
+        streamed = client.post("/api/calculate-sip/batch?stream=true", json=body)
+
+        assert streamed.status_code == 200
+        assert streamed.headers["content-type"] == "application/x-ndjson"
+        assert self._lines(streamed) == client.post("/api/calculate-sip/batch", json=body).json()["results"]
+
+    def test_money_journey_batch_stream(self):
+        body = {"requests": [JOURNEY_BODY, dict(JOURNEY_BODY, monthly_withdrawal=50000)]}
+        streamed = client.post("/api/calculate-money-journey/batch?stream=true", json=body)
+
+        assert self._lines(streamed) == client.post("/api/calculate-money-journey/batch", json=body).json()["results"]
+
+    def test_comparison_stream(self):
+        body = {
+            "base": JOURNEY_BODY,
+            "scenarios": [{"label": "Spend more", "overrides": {"monthly_withdrawal": 30000}}],
+        }
+        header, *scenarios = self._lines(client.post("/api/compare-money-journeys?stream=true", json=body))
+        full = client.post("/api/compare-money-journeys", json=body).json()
+
+        assert header == {"status": "success", "shared_phase": full["shared_phase"], "years": full["years"]}
+        assert scenarios == full["scenarios"]
+
+    def test_late_failure_ends_with_error_line(self):
+        def chunks():
+            yield [{"row": 1}]
+            raise RuntimeError("boom")
+
+        lines = [json.loads(line) for line in b"".join(ndjson_stream(chunks())).splitlines()]
+        assert lines[0] == {"row": 1}
+        assert lines[-1]["status"] == "error"
+        assert "boom" in lines[-1]["message"]
+
+
+class TestCacheableGetEndpoints:
+    """Tests for the GET calculation endpoints"""
+
+    def test_get_matches_post(self):
+        for path, body in (("/api/calculate-sip", SIP_BODY), ("/api/calculate-money-journey", JOURNEY_BODY)):
+            response = client.get(path, params=body)
+            assert response.status_code == 200
+            assert response.json() == client.post(path, json=body).json()
+            assert response.headers["etag"].startswith('"')
+            assert "s-maxage" in response.headers["cache-control"]
+
+    def test_if_none_match_returns_304(self):
+        response = client.get("/api/calculate-sip", params=SIP_BODY)
+        etag = response.headers["etag"]
+        # Same inputs spelled differently share the ETag
+        again = client.get(
+            "/api/calculate-sip",
+            params={"annual_return_rate": "12", "time_period_years": "10", "monthly_investment": "5000.0"},
+            headers={"If-None-Match": etag},
+        )
+        assert again.status_code == 304
+        assert again.content == b""
+        assert again.headers["etag"] == etag
+
+    def test_canonical_url_in_content_location(self):
+        response = client.get("/api/calculate-sip", params={**SIP_BODY, "annual_return_rates": "[10, 11, 12, 12, 12, 12, 12, 12, 12, 12]"})
+        assert response.status_code == 200
+        location = response.headers["content-location"]
+        assert location.startswith("/api/calculate-sip?annual_return_rate=12.0&annual_return_rates=")
+        assert client.get(location).headers["etag"] == response.headers["etag"]
+
+    def test_invalid_query(self):
+        response = client.get("/api/calculate-sip", params={"monthly_investment": 5000})
+        assert response.status_code == 400
+        response = client.get("/api/calculate-sip", params={**SIP_BODY, "annual_return_rates": "[1,"})
+        assert response.status_code == 400
+
+
+class TestCoalescing:
+    """Tests for coalescing identical requests"""
+
+    def test_metrics_count_calculations(self):
+        before = client.get("/api/metrics").json()["coalescing"]
+        assert client.post("/api/calculate-sip", json=SIP_BODY).status_code == 200
+        assert client.get("/api/calculate-sip", params=SIP_BODY).status_code == 200
+        after = client.get("/api/metrics").json()["coalescing"]
+        assert after["calls"] == before["calls"] + 2
+        assert after["in_flight"] == 0
+
+
+class TestLiveEndpoint:
+    """Tests for the live recalculation WebSocket"""
+
+    def test_updates_push_results(self):
+        with client.websocket_connect("/api/live/sip") as websocket:
+            websocket.send_json({"params": SIP_BODY})
+            message = websocket.receive_json()
+            assert message["type"] == "result"
+            assert message["response"] == client.post("/api/calculate-sip", json=SIP_BODY).json()
+            websocket.send_json({"params": {"time_period_years": 15}})
+            message = websocket.receive_json()
+            assert message["version"] == 2
+            assert message["response"]["inputs"]["time_period_years"] == 15
+
+    def test_unknown_kind_rejected(self):
+        with pytest.raises(WebSocketDisconnect):
+            with client.websocket_connect("/api/live/xirr") as websocket:
+                websocket.receive_json()
@@ -0,0 +1,124 @@
+"""
+Unit tests for historical backtests and the bundled returns datasets
+"""
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from api.models.backtest import BacktestRequest
+from api.models.money_journey import MoneyJourneyRequest
+from api.services.backtest import run_backtest
+from api.services.historical import DATA_DIR, load_returns, read_csv_returns, write_returns
+from api.services.money_journey import calculate_money_journey
+
+PLAN = {
+    "monthly_investment": 20000,
+    "accumulation_years": 20,
+    "accumulation_return_rate": 12.0,
+    "monthly_withdrawal": 100000,
+    "withdrawal_years": 30,
+    "withdrawal_return_rate": 8.0,
+}
+
+
+def _loop_window(returns, plan):
+    """Year-by-year reference for one window with annual contributions and withdrawals"""
+    balance = plan.initial_investment
+    for rate in returns[:plan.accumulation_years]:
+        balance = balance * (1 + rate) + plan.monthly_investment * 12
+    for year, rate in enumerate(returns[plan.accumulation_years:]):
+        if balance < plan.monthly_withdrawal * 12:
+            return 0.0, year
+        balance = (balance - plan.monthly_withdrawal * 12) * (1 + rate)
+    return balance, None
+
+
+class TestReturnsDataset:
+    """Tests for the bundled binary dataset"""
+
+    def test_binary_matches_csv_source(self):
+        first_year, returns = read_csv_returns(DATA_DIR / "sp500_total_returns.csv")
+        dataset = load_returns("sp500")
+
+        assert isinstance(dataset.returns, np.memmap)
+        assert dataset.first_year == first_year == 1928
+        assert np.allclose(dataset.returns, returns, atol=1e-7)
+
+    def test_write_round_trip(self, tmp_path, monkeypatch):
+        from api.services import historical
+
+        write_returns(tmp_path / "test.bin", 2000, [0.1, -0.05, 0.2])
+        monkeypatch.setattr(historical, "DATA_DIR", Path(tmp_path))
+        monkeypatch.setitem(historical.DATASETS, "test", "test.bin")
+        load_returns.cache_clear()
+        try:
+            dataset = load_returns("test")
+        finally:
+            load_returns.cache_clear()
+
+        assert dataset.first_year == 2000
+        assert dataset.last_year == 2002
+        assert np.allclose(dataset.returns, [0.1, -0.05, 0.2])
+
+    def test_unknown_dataset(self):
+        with pytest.raises(ValueError):
+            load_returns("nikkei")
+
+
+class TestBacktest:
+    """Tests for rolling-window backtests"""
+
+    def test_every_window_matches_loop(self):
+        request = BacktestRequest(plan=PLAN)
+        result = run_backtest(request)
+        returns = load_returns("sp500").returns.astype(float)
+
+        assert result.results.windows_tested == 96 - 50 + 1
+        for row, window in enumerate(result.windows):
+            final_balance, depleted_after = _loop_window(returns[row:row + 50], request.plan)
+            assert window.start_year == 1928 + row
+            assert window.final_balance == pytest.approx(final_balance, abs=0.01)
+            assert window.depleted == (depleted_after is not None)
+            if depleted_after is not None:
+                assert window.depletion_year == 20 + depleted_after + 1
+
+    def test_summary(self):
+        backtest = run_backtest(BacktestRequest(plan=PLAN))
+        result, windows = backtest.results, backtest.windows
+
+        assert result.successful_windows == sum(not w.depleted for w in windows)
+        assert result.success_rate == pytest.approx(result.successful_windows / result.windows_tested * 100, abs=0.01)
+        assert result.best_window.final_balance == max(w.final_balance for w in windows)
+        assert result.worst_window.depleted
+        assert result.worst_window.depletion_year == min(w.depletion_year for w in windows if w.depleted)
+
+    def test_constant_returns_match_live_engine(self, monkeypatch):
+        """With a flat history every window equals the regular calculation"""
+        from api.services import backtest
+        from api.services.historical import ReturnsDataset
+
+        flat = ReturnsDataset(1900, np.full(60, 0.08))
+        monkeypatch.setattr(backtest, "load_returns", lambda name: flat)
+        plan = dict(PLAN, accumulation_return_rate=8.0, withdrawal_frequency="monthly",
+                    withdrawal_compounding_frequency="annually")
+
+        result = run_backtest(BacktestRequest(plan=plan))
+        live = calculate_money_journey(MoneyJourneyRequest(**plan)).results
+
+        assert result.results.windows_tested == 11
+        assert result.windows[0].final_balance == pytest.approx(live.final_balance, abs=0.05)
+        assert result.windows[0].depleted == live.depleted
+
+    def test_progress_between_chunks(self):
+        """Windows are projected in chunks with a report after each; results do not change"""
+        reports = []
+        result = run_backtest(BacktestRequest(plan=PLAN), progress=lambda fraction, partial: reports.append(partial))
+
+        assert [r["windows_done"] for r in reports] == [16, 32, 47]
+        assert reports[-1]["successful_windows"] == result.results.successful_windows
+        assert result == run_backtest(BacktestRequest(plan=PLAN))
+
+    def test_plan_longer_than_dataset(self):
+        with pytest.raises(ValueError):
+            run_backtest(BacktestRequest(plan=dict(PLAN, accumulation_years=60, withdrawal_years=40)))
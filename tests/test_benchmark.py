@@ -0,0 +1,25 @@
+"""
+Latency budget and linear-scaling checks at the horizon limit
+"""
+import os
+
+import pytest
+
+from api.benchmark import run_benchmark
+from api.models.limits import MAX_HORIZON_YEARS
+
+
+class TestHorizonBudget:
+    """The engines must stay within budget and scale linearly at the maximum horizon"""
+
+    # Wall-clock budgets depend on the machine, so they only run when asked for
+    @pytest.mark.skipif(not os.environ.get("FINCAL_CHECK_LATENCY"), reason="set FINCAL_CHECK_LATENCY=1 to run")
+    def test_within_latency_budget(self):
+        for row in run_benchmark(MAX_HORIZON_YEARS, repeat=5):
+            assert row["within_budget"], row
+
+    def test_response_size_linear(self):
+        half = {r["engine"]: r["response_bytes"] for r in run_benchmark(MAX_HORIZON_YEARS // 2, repeat=1)}
+        full = {r["engine"]: r["response_bytes"] for r in run_benchmark(MAX_HORIZON_YEARS, repeat=1)}
+        for engine, size in full.items():
+            assert 1.8 < size / half[engine] < 2.3
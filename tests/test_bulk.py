@@ -0,0 +1,204 @@
+"""
+Unit tests for offline bulk scoring of plan files
+"""
+import csv
+import json
+
+import pytest
+
+from api.bulk import detect_kind, main, score_file, score_rows
+from api.models.money_journey import MoneyJourneyRequest
+from api.models.sip import SIPCalculationRequest
+from api.services.money_journey import calculate_money_journey_batch, calculate_money_journey_summaries
+from api.services.sip_calculator import calculate_sip_batch, calculate_sip_summaries
+from api.services.summaries import summary_outcomes
+
+SIP_PLANS = [
+    SIPCalculationRequest(monthly_investment=5000, time_period_years=10, annual_return_rate=12.0),
+    SIPCalculationRequest(
+        monthly_investment=2500.5, time_period_years=25, annual_return_rate=8.25, initial_investment=10000,
+        annual_step_up_rate=10, step_up_cap=6000, compounding_frequency="monthly",
+    ),
+    SIPCalculationRequest(
+        monthly_investment=1000, time_period_years=5, annual_return_rate=7.0, compounding_frequency="quarterly",
+        events=[{"year": 3, "type": "withdrawal", "amount": 100000}],
+    ),
+]
+
+JOURNEY_PLANS = [
+    MoneyJourneyRequest(
+        monthly_investment=5000, accumulation_years=10, accumulation_return_rate=12.0,
+        monthly_withdrawal=20000, withdrawal_years=5, withdrawal_return_rate=8.0,
+    ),
+    MoneyJourneyRequest(
+        monthly_investment=20000, accumulation_years=20, accumulation_return_rate=10.0,
+        monthly_withdrawal=150000, withdrawal_years=30, withdrawal_return_rate=7.0,
+        withdrawal_frequency="monthly", withdrawal_step_up_rate=5,
+    ),
+    MoneyJourneyRequest(
+        monthly_investment=10000, accumulation_years=15, accumulation_return_rate=11.0,
+        monthly_withdrawal=60000, withdrawal_years=25, withdrawal_return_rate=6.0,
+        withdrawal_policy={"type": "guardrails"},
+    ),
+]
+
+
+def _rows(columns):
+    return [dict(zip(columns, values)) for values in zip(*columns.values())]
+
+
+def _write_csv(path, rows):
+    with open(path, "w", newline="") as handle:
+        writer = csv.DictWriter(handle, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def _read_csv(path):
+    with open(path, newline="") as handle:
+        return list(csv.DictReader(handle))
+
+
+class TestSummaries:
+    """Columnar summaries match the full batch results"""
+
+    def test_sip_summaries(self):
+        expected = [r.results.model_dump() for r in calculate_sip_batch(SIP_PLANS)]
+        assert _rows(calculate_sip_summaries(SIP_PLANS)) == expected
+
+    def test_money_journey_summaries(self):
+        expected = [r.results.model_dump() for r in calculate_money_journey_batch(JOURNEY_PLANS)]
+        assert _rows(calculate_money_journey_summaries(JOURNEY_PLANS)) == expected
+
+    def test_many_distinct_schedules(self):
+        """Large batches of distinct rates take the uncached table path with the same results"""
+        plans = [
+            SIPCalculationRequest(monthly_investment=1000, time_period_years=5 + i % 20, annual_return_rate=i / 50)
+            for i in range(400)
+        ]
+        expected = [r.results.model_dump() for r in calculate_sip_batch(plans)]
+        assert _rows(calculate_sip_summaries(plans)) == expected
+
+
+class TestScoreRows:
+    """Tests for row validation, pass-through columns and errors"""
+
+    def test_passthrough_and_results(self):
+        rows = [{"plan_id": "A", "monthly_investment": "5000", "time_period_years": "10", "annual_return_rate": "12"}]
+        out = score_rows("sip", rows)[0]
+
+        assert out["plan_id"] == "A"
+        assert "monthly_investment" not in out
+        assert out["future_value"] == calculate_sip_batch(SIP_PLANS[:1])[0].results.future_value
+        assert out["error"] is None
+
+    def test_invalid_row_reports_error(self):
+        rows = [
+            {"monthly_investment": "-1", "time_period_years": "10", "annual_return_rate": "12"},
+            {"monthly_investment": "5000", "time_period_years": "10", "annual_return_rate": "12"},
+        ]
+        bad, good = score_rows("sip", rows)
+
+        assert bad["error"].startswith("monthly_investment:")
+        assert bad["future_value"] is None
+        assert good["error"] is None
+
+    def test_calculation_error_fails_only_its_row(self):
+        """A plan that fails in the engine gets an error; the rest of the chunk is still scored"""
+        good = {"monthly_investment": "5000", "time_period_years": "10", "annual_return_rate": "12"}
+        overflowing = dict(good, time_period_years="100", annual_return_rate="30", exact="{}")
+        out = score_rows("sip", [good, overflowing, good, good])
+
+        assert "too large for exact arithmetic" in out[1]["error"]
+        assert out[1]["future_value"] is None
+        assert [row["error"] for row in out[::2]] == [None, None]
+        assert out[3]["future_value"] == out[0]["future_value"] > 0
+
+    def test_failures_isolated_in_halves(self):
+        """A failing chunk is bisected: calls grow with the log of the chunk, not its length"""
+        calls = []
+
+        def summarize(requests):
+            calls.append(len(requests))
+            if "bad" in requests:
+                raise ValueError("bad plan")
+            return {"value": list(requests)}
+
+        outcomes = summary_outcomes(summarize, ["a"] * 20 + ["bad"] + ["b"] * 43)
+
+        assert outcomes[20] == (None, "bad plan")
+        assert outcomes[0] == ({"value": "a"}, None)
+        assert outcomes[-1] == ({"value": "b"}, None)
+        assert len(calls) <= 2 * 7
+
+    def test_json_cells_and_blank_defaults(self):
+        rows = [{
+            "monthly_investment": "1000", "time_period_years": "3", "annual_return_rate": "10",
+            "initial_investment": "", "annual_return_rates": json.dumps([10.0, 0.0, 20.0]),
+        }]
+        assert score_rows("sip", rows)[0]["future_value"] == 40800.0
+
+    def test_malformed_json_cell(self):
+        rows = [{"monthly_investment": "1000", "time_period_years": "3", "annual_return_rate": "10",
+                 "annual_return_rates": "[10, "}]
+        assert score_rows("sip", rows)[0]["error"].startswith("invalid JSON cell")
+
+    def test_detect_kind(self):
+        assert detect_kind(["accumulation_years", "monthly_investment"]) == "money_journey"
+        assert detect_kind(["time_period_years"]) == "sip"
+        with pytest.raises(ValueError):
+            detect_kind(["id"])
+
+
+class TestScoreFile:
+    """Tests for streaming files through the engine"""
+
+    JOURNEY_ROWS = [
+        {
+            "plan_id": f"P{i}", "monthly_investment": 5000 + i, "accumulation_years": 10 + i % 7,
+            "accumulation_return_rate": 12.0, "monthly_withdrawal": 20000 + 500 * i, "withdrawal_years": 5 + i % 11,
+            "withdrawal_return_rate": 8.0, "withdrawal_frequency": ["annually", "monthly"][i % 2],
+        }
+        for i in range(57)
+    ]
+
+    def _expected(self):
+        plans = [MoneyJourneyRequest(**{k: v for k, v in row.items() if k != "plan_id"}) for row in self.JOURNEY_ROWS]
+        return calculate_money_journey_summaries(plans)
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_csv_round_trip(self, tmp_path, workers):
+        _write_csv(tmp_path / "plans.csv", self.JOURNEY_ROWS)
+        reports = []
+        totals = score_file(
+            str(tmp_path / "plans.csv"), str(tmp_path / "out.csv"),
+            workers=workers, chunk_size=10, progress=reports.append,
+        )
+        out = _read_csv(tmp_path / "out.csv")
+
+        assert totals == {"rows": 57, "errors": 0}
+        assert [r["rows"] for r in reports] == [10, 20, 30, 40, 50, 57]
+        assert [row["plan_id"] for row in out] == [row["plan_id"] for row in self.JOURNEY_ROWS]
+        assert [float(row["final_balance"]) for row in out] == self._expected()["final_balance"]
+
+    def test_parquet_round_trip(self, tmp_path):
+        pa = pytest.importorskip("pyarrow")
+        import pyarrow.parquet as pq
+
+        pq.write_table(pa.Table.from_pylist(self.JOURNEY_ROWS), tmp_path / "plans.parquet")
+        score_file(str(tmp_path / "plans.parquet"), str(tmp_path / "out.parquet"), chunk_size=10)
+        table = pq.read_table(tmp_path / "out.parquet")
+
+        assert table.column("final_balance").to_pylist() == self._expected()["final_balance"]
+        assert table.schema.field("depletion_year").type == pa.int64()
+        assert table.schema.field("error").type == pa.string()
+
+    def test_main_exit_code(self, tmp_path):
+        _write_csv(tmp_path / "plans.csv", [
+            {"monthly_investment": 5000, "time_period_years": 10, "annual_return_rate": 12},
+            {"monthly_investment": 5000, "time_period_years": 0, "annual_return_rate": 12},
+        ])
+        args = [str(tmp_path / "plans.csv"), str(tmp_path / "out.csv"), "--workers", "1", "--quiet"]
+
+        assert main(args) == 1
+        assert _read_csv(tmp_path / "out.csv")[1]["error"].startswith("time_period_years")
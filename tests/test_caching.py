@@ -0,0 +1,75 @@
+"""
+Tests for canonical query strings and ETags of cacheable calculations
+"""
+from urllib.parse import parse_qsl
+
+import pytest
+
+from api.models.money_journey import MoneyJourneyRequest
+from api.models.sip import SIPCalculationRequest
+from api.services.caching import canonical_query, etag_for, etag_matches, parse_query
+
+
+class TestCanonicalQuery:
+    """Tests for canonical_query and parse_query"""
+
+    def test_equivalent_inputs_share_one_query(self):
+        a = SIPCalculationRequest(monthly_investment=5000, time_period_years=10, annual_return_rate=12)
+        b = SIPCalculationRequest(annual_return_rate="12.0", time_period_years="10", monthly_investment="5000.00")
+        assert canonical_query(a) == canonical_query(b)
+        assert canonical_query(a) == "annual_return_rate=12.0&monthly_investment=5000.0&time_period_years=10"
+
+    def test_defaults_are_dropped(self):
+        plain = SIPCalculationRequest(monthly_investment=5000, time_period_years=10, annual_return_rate=12)
+        explicit = SIPCalculationRequest(
+            monthly_investment=5000, time_period_years=10, annual_return_rate=12, annual_step_up=0
+        )
+        assert canonical_query(plain) == canonical_query(explicit)
+
+    def test_round_trip(self):
+        request = SIPCalculationRequest(
+            monthly_investment=5000,
+            time_period_years=3,
+            annual_return_rate=12,
+            annual_return_rates=[10, 11, 12],
+        )
+        parsed = SIPCalculationRequest(**parse_query(parse_qsl(canonical_query(request))))
+        assert parsed == request
+
+    def test_repeated_parameter_rejected(self):
+        with pytest.raises(ValueError, match="more than once"):
+            parse_query([("monthly_investment", "1"), ("monthly_investment", "2")])
+
+    def test_invalid_json_rejected(self):
+        with pytest.raises(ValueError, match="not valid JSON"):
+            parse_query([("annual_return_rates", "[10, 11")])
+
+
+class TestETags:
+    """Tests for etag_for and etag_matches"""
+
+    def test_etag_depends_on_inputs_and_endpoint(self):
+        sip = SIPCalculationRequest(monthly_investment=5000, time_period_years=10, annual_return_rate=12)
+        other = SIPCalculationRequest(monthly_investment=5000, time_period_years=10, annual_return_rate=11)
+        journey = MoneyJourneyRequest(
+            monthly_investment=5000,
+            accumulation_years=10,
+            accumulation_return_rate=12,
+            monthly_withdrawal=20000,
+            withdrawal_years=5,
+            withdrawal_return_rate=8,
+        )
+        etag = etag_for("/api/calculate-sip", sip)
+        assert etag.startswith('"') and etag.endswith('"')
+        assert etag == etag_for("/api/calculate-sip", sip)
+        assert etag != etag_for("/api/calculate-sip", other)
+        assert etag != etag_for("/api/calculate-money-journey", sip)
+        assert etag_for("/api/calculate-money-journey", journey) != etag
+
+    def test_if_none_match(self):
+        etag = '"abc"'
+        assert etag_matches('"abc"', etag)
+        assert etag_matches('"x", W/"abc"', etag)
+        assert etag_matches("*", etag)
+        assert not etag_matches('"abcd"', etag)
+        assert not etag_matches(None, etag)
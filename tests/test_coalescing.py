@@ -0,0 +1,70 @@
+"""
+Tests for single-flight coalescing of identical calculations
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from api.services.coalescing import SingleFlight
+
+
+def wait_for(condition, timeout=5.0):
+    event = threading.Event()
+    for _ in range(int(timeout / 0.01)):
+        if condition():
+            return
+        event.wait(0.01)
+    raise AssertionError("condition not met")
+
+
+class TestSingleFlight:
+    """Tests for SingleFlight"""
+
+    def test_concurrent_duplicates_share_one_computation(self):
+        flight = SingleFlight()
+        release = threading.Event()
+        runs = []
+
+        def compute():
+            runs.append(1)
+            release.wait(5)
+            return b'{"value": 1}'
+
+        with ThreadPoolExecutor(max_workers=5) as pool:
+            futures = [pool.submit(flight.run, "key", compute) for _ in range(5)]
+            wait_for(lambda: flight.snapshot()["coalesced"] == 4)
+            release.set()
+            outcomes = [f.result() for f in futures]
+
+        assert len(runs) == 1
+        assert all(value == b'{"value": 1}' for value, _ in outcomes)
+        assert sorted(shared for _, shared in outcomes) == [False, True, True, True, True]
+        assert flight.snapshot() == {
+            "calls": 5, "computations": 1, "coalesced": 4, "in_flight": 0, "peak_waiters": 4
+        }
+
+    def test_different_keys_run_separately(self):
+        flight = SingleFlight()
+        assert flight.run("a", lambda: 1) == (1, False)
+        assert flight.run("b", lambda: 2) == (2, False)
+        # Finished computations are not cached
+        assert flight.run("a", lambda: 3) == (3, False)
+        assert flight.snapshot()["computations"] == 3
+
+    def test_errors_reach_every_waiter(self):
+        flight = SingleFlight()
+        release = threading.Event()
+
+        def compute():
+            release.wait(5)
+            raise ValueError("bad plan")
+
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            futures = [pool.submit(flight.run, "key", compute) for _ in range(3)]
+            wait_for(lambda: flight.snapshot()["coalesced"] == 2)
+            release.set()
+            for future in futures:
+                with pytest.raises(ValueError, match="bad plan"):
+                    future.result()
+        assert flight.snapshot()["in_flight"] == 0
@@ -0,0 +1,89 @@
+"""
+Unit tests for Money Journey scenario comparison
+"""
+from unittest import mock
+
+import pytest
+
+from api.models.comparison import ScenarioComparisonRequest
+from api.models.money_journey import MoneyJourneyRequest
+from api.services import comparison
+from api.services.comparison import compare_scenarios
+from api.services.money_journey import calculate_money_journey
+
+BASE = {
+    "monthly_investment": 10000,
+    "accumulation_years": 10,
+    "accumulation_return_rate": 12.0,
+    "monthly_withdrawal": 40000,
+    "withdrawal_years": 10,
+    "withdrawal_return_rate": 8.0,
+}
+
+
+def _compare(*scenarios):
+    return compare_scenarios(ScenarioComparisonRequest(
+        base=BASE,
+        scenarios=[{"label": label, "overrides": overrides} for label, overrides in scenarios],
+    ))
+
+
+class TestScenarioComparison:
+    """Tests for comparing scenarios that share one phase"""
+
+    def test_withdrawal_variants_match_full_journeys(self):
+        result = _compare(
+            ("Spend less", {"monthly_withdrawal": 30000}),
+            ("Monthly", {"withdrawal_frequency": "monthly", "withdrawal_step_up_rate": 5}),
+        )
+
+        assert result.shared_phase == "accumulation"
+        assert [s.label for s in result.scenarios] == ["Base", "Spend less", "Monthly"]
+        for scenario in result.scenarios:
+            expected = calculate_money_journey(MoneyJourneyRequest(**{**BASE, **scenario.overrides}))
+            assert scenario.results == expected.results
+
+    def test_shared_accumulation_calculated_once(self):
+        with mock.patch.object(
+            comparison, "calculate_sip_with_annual_compounding",
+            wraps=comparison.calculate_sip_with_annual_compounding,
+        ) as single, mock.patch.object(comparison, "calculate_sip_batch") as batch:
+            _compare(("A", {"monthly_withdrawal": 30000}), ("B", {"monthly_withdrawal": 50000}))
+
+        assert single.call_count == 1
+        batch.assert_not_called()
+
+    def test_accumulation_variants_share_withdrawal(self):
+        overrides = {"monthly_investment": 15000, "accumulation_years": 12}
+        result = _compare(("Save more", overrides))
+
+        assert result.shared_phase == "withdrawal"
+        expected = calculate_money_journey(MoneyJourneyRequest(**{**BASE, **overrides}))
+        assert result.scenarios[1].results == expected.results
+
+    def test_aligned_series_and_deltas(self):
+        result = _compare(("Longer", {"withdrawal_years": 15}), ("Spend less", {"monthly_withdrawal": 30000}))
+        base, longer, spend_less = result.scenarios
+
+        assert result.years == list(range(1, 26))
+        assert all(len(s.balances) == 25 for s in result.scenarios)
+        assert base.balances[20:] == [None] * 5
+        assert base.phases[19] == "withdrawal" and base.phases[20] is None
+        assert longer.deltas.balances[20] is None
+        assert base.deltas.final_balance == 0
+        assert spend_less.deltas.total_withdrawals == pytest.approx(
+            spend_less.results.total_withdrawals - base.results.total_withdrawals, abs=0.01
+        )
+        assert spend_less.deltas.balances[15] == pytest.approx(spend_less.balances[15] - base.balances[15], abs=0.01)
+
+    def test_mixed_phases_rejected(self):
+        with pytest.raises(Exception):
+            _compare(("Mixed", {"monthly_investment": 15000, "monthly_withdrawal": 30000}))
+
+    def test_unknown_override_rejected(self):
+        with pytest.raises(Exception):
+            _compare(("Events", {"events": []}))
+
+    def test_invalid_override_rejected(self):
+        with pytest.raises(Exception):
+            _compare(("Negative", {"monthly_withdrawal": -1}))
@@ -0,0 +1,97 @@
+"""
+Tests for the integer fixed-point kernels behind exact arithmetic
+"""
+import random
+from decimal import Decimal
+
+import numpy as np
+import pytest
+
+from api.services import fixed_point
+from api.services.fixed_point import (
+    DECIMAL_ROUNDING,
+    MAX_UNITS,
+    RATE_SCALE,
+    accumulate_units,
+    divide,
+    fixed_rate,
+    fixed_step,
+    run_rows,
+    scale,
+    to_units,
+)
+
+MODES = list(DECIMAL_ROUNDING)
+
+
+def decimal_scale(value, rate, mode):
+    return int((Decimal(value) * rate / RATE_SCALE).quantize(Decimal(1), DECIMAL_ROUNDING[mode]))
+
+
+class TestRounding:
+    """Tests for the rounding helpers"""
+
+    @pytest.mark.parametrize("mode", MODES)
+    def test_scale_matches_decimal_on_ints_and_arrays(self, mode):
+        rng = random.Random(7)
+        values = [rng.randrange(MAX_UNITS) for _ in range(500)] + [5, 15, 25, 2500000000]
+        rates = [rng.randrange(RATE_SCALE) for _ in range(500)] + [RATE_SCALE // 10] * 3 + [1]
+        expected = [decimal_scale(v, r, mode) for v, r in zip(values, rates)]
+
+        assert [scale(v, r, mode) for v, r in zip(values, rates)] == expected
+        assert scale(np.array(values), np.array(rates), mode).tolist() == expected
+
+    @pytest.mark.parametrize("mode, expected", [
+        ("half_even", [2, 2]), ("half_up", [3, 3]), ("half_down", [2, 2]), ("up", [3, 3]), ("down", [2, 2]),
+    ])
+    def test_ties(self, mode, expected):
+        # 25 * 0.1 = 2.5 and 5 / 2 = 2.5
+        assert [scale(25, RATE_SCALE // 10, mode), divide(5, 2, mode)] == expected
+
+    def test_to_units_reads_shortest_decimal(self):
+        assert to_units(0.1, 2, "down") == 10
+        assert to_units(1.005, 2, "half_up") == 101
+        assert to_units(1.005, 2, "half_even") == 100
+        assert to_units(12345.6, 0, "half_even") == 12346
+
+    def test_to_units_rejects_huge_amounts(self):
+        with pytest.raises(ValueError, match="too large"):
+            to_units(1e14, 2, "half_up")
+
+    def test_fixed_rates(self):
+        assert fixed_rate(12.0, "monthly", 1) == 10_000_000
+        assert fixed_rate(12.0, "monthly", 12) == 126_825_030
+        assert fixed_rate(12.0, "annually", 12) == 120_000_000
+        assert fixed_step(-2.5) == -25_000_000
+
+
+class TestRunRows:
+    """Tests for the scalar and vector paths of run_rows"""
+
+    def test_paths_agree(self, monkeypatch):
+        rng = np.random.default_rng(3)
+        count, years, periods_per_year = 20, 5, 12
+        opening = rng.integers(0, 10 ** 8, count)
+        deposits = rng.integers(0, 10 ** 6, (count, years * periods_per_year))
+        withdrawals = rng.integers(0, 10 ** 7, (count, years * periods_per_year)) * (rng.random((count, 60)) < 0.1)
+        rates = rng.integers(0, 20_000_000, (count, years * periods_per_year))
+        args = ([opening], [deposits, withdrawals, rates])
+        options = dict(periods_per_year=periods_per_year, rounding="half_even")
+
+        vector = run_rows(accumulate_units, *args, **options)
+        monkeypatch.setattr(fixed_point, "SCALAR_ROWS", count)
+        scalar = run_rows(accumulate_units, *args, **options)
+
+        assert vector[0].shape == (count, years)
+        for a, b in zip(vector, scalar):
+            np.testing.assert_array_equal(a, b)
+
+    def test_overflow_is_an_error(self):
+        with pytest.raises(ValueError, match="too large for exact arithmetic"):
+            run_rows(
+                accumulate_units,
+                [np.array([MAX_UNITS // 2])],
+                [np.zeros((1, 2), dtype=np.int64), np.zeros((1, 2), dtype=np.int64), np.full((1, 2), RATE_SCALE)],
+                periods_per_year=1,
+                rounding="down",
+            )
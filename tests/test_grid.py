@@ -0,0 +1,204 @@
+"""
+Tests for the precomputed scenario grid and approximate answers
+"""
+import numpy as np
+import pytest
+
+from api.models.money_journey import MoneyJourneyRequest
+from api.models.sip import SIPCalculationRequest
+from api.services import grid
+from api.services.caching import etag_for
+from api.services.grid import Lattice, ScenarioGrid, build_grid, load_grid, main, sip_growth, withdrawal_cover
+from api.services.money_journey import calculate_money_journey
+from api.services.sip_calculator import calculate_sip_with_annual_compounding
+
+LATTICE = Lattice(0.0, 0.25, 61, 0.0, 0.5, 21, 40)
+
+
+@pytest.fixture(scope="module")
+def grid_file(tmp_path_factory):
+    path = tmp_path_factory.mktemp("grid") / "grid.bin"
+    build_grid(path, LATTICE)
+    return path
+
+
+@pytest.fixture
+def use_grid(grid_file, monkeypatch):
+    monkeypatch.setattr(grid, "GRID_PATH", grid_file)
+    load_grid.cache_clear()
+    yield
+    load_grid.cache_clear()
+
+
+class TestScenarioGrid:
+    """Tests for building, mapping and interpolating grid files"""
+
+    def test_lattice_points_are_exact(self, grid_file):
+        lookup = ScenarioGrid(grid_file).lookup("sip/monthly", 7.0, 4.0, 30)
+        expected = sip_growth(np.array([7.0]), np.array([4.0]), "monthly", 30)[0]
+
+        np.testing.assert_allclose(lookup.values, expected, rtol=1e-12)
+
+    @pytest.mark.parametrize("table", ["sip/quarterly", "withdrawal/monthly/annually", "withdrawal/annually/monthly"])
+    def test_error_bounds_hold(self, grid_file, table):
+        rng = np.random.default_rng(11)
+        scenario_grid = ScenarioGrid(grid_file)
+        kind, *frequencies = table.split("/")
+        for rate, step_up in zip(rng.uniform(0, 15, 50), rng.uniform(0, 10, 50)):
+            lookup = scenario_grid.lookup(table, rate, step_up, 40)
+            if kind == "sip":
+                expected = sip_growth(np.array([rate]), np.array([step_up]), frequencies[0], 40)[0]
+            else:
+                expected = withdrawal_cover(np.array([rate]), np.array([step_up]), *frequencies, 40)[0]
+            assert np.all(np.abs(lookup.values / expected - 1) <= lookup.relative_error)
+
+    def test_off_grid(self, grid_file):
+        scenario_grid = ScenarioGrid(grid_file)
+
+        assert scenario_grid.lookup("sip/annually", 15.5, 0.0, 10) is None
+        assert scenario_grid.lookup("sip/annually", 5.0, 10.5, 10) is None
+        assert scenario_grid.lookup("sip/annually", 5.0, 0.0, 41) is None
+        assert scenario_grid.lookup("sip/annually", 15.0, 10.0, 40) is not None
+
+    def test_not_a_grid(self, tmp_path):
+        path = tmp_path / "other.bin"
+        path.write_bytes(b"\0" * 64)
+        with pytest.raises(ValueError, match="not a scenario grid"):
+            ScenarioGrid(path)
+
+    def test_cli(self, tmp_path, capsys):
+        path = tmp_path / "cli.bin"
+
+        assert main([str(path), "--rates", "0:4:2", "--step-ups", "0:5:5", "--years", "3"]) == 0
+        assert ScenarioGrid(path).lattice == Lattice(0.0, 2.0, 3, 0.0, 5.0, 2, 3)
+        assert "3 rates x 2 step-ups x 3 years" in capsys.readouterr().out
+
+
+class TestApproximateSIP:
+    """Tests for approximate SIP answers"""
+
+    def test_within_bound(self, use_grid):
+        inputs = dict(
+            monthly_investment=12345.0,
+            time_period_years=35,
+            annual_return_rate=11.3,
+            annual_step_up_rate=6.7,
+            initial_investment=250000,
+            compounding_frequency="monthly",
+        )
+        full = calculate_sip_with_annual_compounding(SIPCalculationRequest(**inputs))
+        approximate = calculate_sip_with_annual_compounding(SIPCalculationRequest(**inputs, approximate=True))
+
+        assert full.approximation is None
+        assert approximate.approximation.error_bound > 0
+        assert abs(approximate.results.future_value - full.results.future_value) <= approximate.approximation.error_bound
+        assert approximate.results.total_invested == full.results.total_invested
+
+    def test_unsupported_plans_are_calculated_in_full(self, use_grid):
+        request = SIPCalculationRequest(
+            monthly_investment=5000,
+            time_period_years=10,
+            annual_return_rate=12.0,
+            events=[{"type": "lump_sum", "year": 2, "amount": 10000}],
+            approximate=True,
+        )
+        response = calculate_sip_with_annual_compounding(request)
+
+        assert response.approximation is None
+        assert response == calculate_sip_with_annual_compounding(request.model_copy(update={"approximate": False}))
+
+    def test_without_grid(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(grid, "GRID_PATH", tmp_path / "missing.bin")
+        load_grid.cache_clear()
+        request = SIPCalculationRequest(monthly_investment=5000, time_period_years=10, annual_return_rate=12.0, approximate=True)
+
+        assert calculate_sip_with_annual_compounding(request).approximation is None
+        load_grid.cache_clear()
+
+    def test_cache_key_depends_on_grid(self, grid_file, tmp_path, monkeypatch):
+        """Approximate requests get a different ETag for each grid (or none); exact ones do not"""
+        approximate = SIPCalculationRequest(
+            monthly_investment=5000, time_period_years=10, annual_return_rate=12.0, approximate=True
+        )
+        full = approximate.model_copy(update={"approximate": False})
+        other_grid = tmp_path / "other.bin"
+        build_grid(other_grid, LATTICE._replace(years=30))
+
+        etags = []
+        for path in (grid_file, other_grid, tmp_path / "missing.bin"):
+            monkeypatch.setattr(grid, "GRID_PATH", path)
+            load_grid.cache_clear()
+            etags.append((etag_for("/api/calculate-sip", approximate), etag_for("/api/calculate-sip", full)))
+        load_grid.cache_clear()
+
+        assert len({approximate_etag for approximate_etag, _ in etags}) == 3
+        assert len({full_etag for _, full_etag in etags}) == 1
+
+    def test_not_with_exact(self):
+        with pytest.raises(ValueError, match="approximate"):
+            SIPCalculationRequest(
+                monthly_investment=5000, time_period_years=10, annual_return_rate=12.0, approximate=True, exact={}
+            )
+
+
+class TestApproximateMoneyJourney:
+    """Tests for approximate Money Journey answers"""
+
+    @pytest.mark.parametrize("monthly_withdrawal, frequency", [
+        (30000, "monthly"), (60000, "monthly"), (90000, "monthly"), (90000, "annually"),
+    ])
+    def test_matches_full_calculation(self, use_grid, monthly_withdrawal, frequency):
+        inputs = dict(
+            monthly_investment=8000,
+            accumulation_years=22,
+            accumulation_return_rate=10.4,
+            annual_step_up_rate=5.0,
+            monthly_withdrawal=monthly_withdrawal,
+            withdrawal_years=30,
+            withdrawal_return_rate=6.6,
+            withdrawal_step_up_rate=5.5,
+            withdrawal_frequency=frequency,
+        )
+        full = calculate_money_journey(MoneyJourneyRequest(**inputs)).results
+        response = calculate_money_journey(MoneyJourneyRequest(**inputs, approximate=True))
+        approximate, bound = response.results, response.approximation.error_bound
+
+        assert (approximate.depleted, approximate.depletion_year, approximate.depletion_month) == (
+            full.depleted, full.depletion_year, full.depletion_month
+        )
+        assert abs(approximate.final_balance - full.final_balance) <= bound
+        assert abs(approximate.total_withdrawals - full.total_withdrawals) <= bound
+        assert abs(approximate.corpus_at_retirement - full.corpus_at_retirement) <= bound
+
+    def test_depletion_in_doubt_is_calculated_in_full(self, use_grid):
+        """The balance misses a withdrawal by less than the error bound, so the month is uncertain"""
+        request = MoneyJourneyRequest(
+            monthly_investment=8000,
+            accumulation_years=22,
+            accumulation_return_rate=10.4,
+            annual_step_up_rate=5.0,
+            monthly_withdrawal=40000,
+            withdrawal_years=30,
+            withdrawal_return_rate=6.6,
+            withdrawal_step_up_rate=5.5,
+            withdrawal_frequency="monthly",
+            approximate=True,
+        )
+        response = calculate_money_journey(request)
+
+        assert response.approximation is None
+        assert response == calculate_money_journey(request.model_copy(update={"approximate": False}))
+
+    def test_policy_is_calculated_in_full(self, use_grid):
+        request = MoneyJourneyRequest(
+            monthly_investment=5000,
+            accumulation_years=10,
+            accumulation_return_rate=12.0,
+            monthly_withdrawal=50000,
+            withdrawal_years=5,
+            withdrawal_return_rate=8.0,
+            withdrawal_policy={"type": "percent_of_portfolio", "rate": 4},
+            approximate=True,
+        )
+
+        assert calculate_money_journey(request).approximation is None
@@ -0,0 +1,207 @@
+"""
+Unit tests for background calculation jobs
+"""
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from api.main import app
+from api.services.jobs import JobCancelled, JobManager, JobQueueFull, run_in_chunks
+
+client = TestClient(app)
+
+SIMULATION_BODY = {
+    "money_journey": {
+        "monthly_investment": 5000,
+        "accumulation_years": 10,
+        "accumulation_return_rate": 12.0,
+        "monthly_withdrawal": 20000,
+        "withdrawal_years": 5,
+        "withdrawal_return_rate": 8.0,
+    },
+    "allocation": {"assets": [{"name": "equity", "expected_return": 10, "volatility": 15, "weight": 100}]},
+    "paths": 400,
+    "chunk_size": 100,
+    "seed": 3,
+}
+
+
+def _wait(job, timeout=5.0):
+    deadline = time.time() + timeout
+    while not job.finished and time.time() < deadline:
+        time.sleep(0.01)
+    return job
+
+
+class TestJobManager:
+    """Tests for JobManager execution, cancellation, back-pressure and expiry"""
+
+    def test_success(self):
+        manager = JobManager(max_workers=1)
+        job = _wait(manager.submit("test", lambda job: {"answer": 42}))
+
+        assert job.status == "succeeded"
+        assert job.progress == 1.0
+        assert manager.get(job.id).snapshot()["result"] == {"answer": 42}
+
+    def test_value_error_fails_with_message(self):
+        def invalid(job):
+            raise ValueError("bad plan")
+
+        job = _wait(JobManager().submit("test", invalid))
+        assert job.status == "failed"
+        assert job.error == "bad plan"
+
+    def test_cancel_running_job(self):
+        started = threading.Event()
+
+        def forever(job):
+            started.set()
+            while True:
+                job.report(0.5, {"step": 1})
+                time.sleep(0.005)
+
+        manager = JobManager(max_workers=1)
+        job = manager.submit("test", forever)
+        assert started.wait(2)
+        job.cancel()
+
+        assert _wait(job).status == "cancelled"
+        assert job.partial == {"step": 1}
+
+    def test_cancel_queued_job_never_runs(self):
+        release = threading.Event()
+        ran = []
+        manager = JobManager(max_workers=1)
+        blocker = manager.submit("test", lambda job: release.wait(2))
+        queued = manager.submit("test", lambda job: ran.append(True))
+
+        queued.cancel()
+        release.set()
+        _wait(blocker)
+        manager.shutdown()
+
+        assert queued.status == "cancelled"
+        assert ran == []
+
+    def test_queue_full(self):
+        release = threading.Event()
+        manager = JobManager(max_workers=1, max_pending=1)
+        manager.submit("test", lambda job: release.wait(2))
+
+        with pytest.raises(JobQueueFull):
+            manager.submit("test", lambda job: None)
+        assert manager.snapshot()["rejected"] == 1
+        release.set()
+
+    def test_finished_jobs_expire(self):
+        manager = JobManager(ttl_seconds=0.05)
+        job = _wait(manager.submit("test", lambda job: {}))
+
+        assert manager.get(job.id) is job
+        time.sleep(0.1)
+        assert manager.get(job.id) is None
+
+    def test_run_in_chunks_reports_progress(self):
+        manager = JobManager()
+        reports = []
+
+        def calculate(job):
+            original = job.report
+            job.report = lambda fraction, partial=None: (reports.append(fraction), original(fraction, partial))
+            return {"results": run_in_chunks(list(range(10)), lambda items: [i * 2 for i in items], job, 4)}
+
+        job = _wait(manager.submit("test", calculate))
+        assert job.result == {"results": [i * 2 for i in range(10)]}
+        assert reports == [0.4, 0.8, 1.0]
+
+    def test_report_after_cancel_raises(self):
+        job = JobManager().submit("test", lambda job: None)
+        _wait(job)
+        job.cancel()
+        with pytest.raises(JobCancelled):
+            job.report(0.1)
+
+
+class TestJobEndpoints:
+    """Tests for the job API"""
+
+    def test_simulation_job(self):
+        response = client.post("/api/jobs/simulate-portfolio", json=SIMULATION_BODY)
+        assert response.status_code == 202
+        submission = response.json()
+
+        deadline = time.time() + 10
+        while time.time() < deadline:
+            status = client.get(submission["status_url"]).json()
+            if status["status"] not in ("queued", "running"):
+                break
+            time.sleep(0.02)
+
+        assert status["status"] == "succeeded"
+        assert status["partial"]["paths_done"] == 400
+        direct = client.post("/api/simulate-portfolio", json=SIMULATION_BODY).json()
+        assert status["result"]["results"] == direct["results"]
+
+    def test_backtest_job_reports_progress(self):
+        body = {"plan": SIMULATION_BODY["money_journey"]}
+        job_id = client.post("/api/jobs/backtest-money-journey", json=body).json()["job_id"]
+
+        with client.stream("GET", f"/api/jobs/{job_id}/events") as response:
+            text = "".join(response.iter_text())
+
+        assert "event: succeeded" in text
+        status = client.get(f"/api/jobs/{job_id}").json()
+        assert status["partial"]["windows_done"] == status["result"]["results"]["windows_tested"]
+
+    def test_batch_job(self):
+        body = {"requests": [{"monthly_investment": 5000, "time_period_years": 10, "annual_return_rate": 12.0}] * 3}
+        job_id = client.post("/api/jobs/calculate-sip/batch", json=body).json()["job_id"]
+
+        with client.stream("GET", f"/api/jobs/{job_id}/events") as response:
+            assert response.headers["content-type"].startswith("text/event-stream")
+            text = "".join(response.iter_text())
+
+        events = [line.split(": ", 1)[1] for line in text.splitlines() if line.startswith("event: ")]
+        assert events[-1] == "succeeded"
+        assert len(client.get(f"/api/jobs/{job_id}").json()["result"]["results"]) == 3
+
+    def test_failed_job(self):
+        body = dict(SIMULATION_BODY, allocation={
+            "assets": [
+                {"name": "a", "expected_return": 10, "volatility": 15, "weight": 50},
+                {"name": "b", "expected_return": 5, "volatility": 5, "weight": 50},
+                {"name": "c", "expected_return": 3, "volatility": 1, "weight": 0},
+            ],
+            "correlation": [[1, 0.9, -0.9], [0.9, 1, 0.9], [-0.9, 0.9, 1]],
+        })
+        job_id = client.post("/api/jobs/simulate-portfolio", json=body).json()["job_id"]
+
+        with client.stream("GET", f"/api/jobs/{job_id}/events") as response:
+            text = "".join(response.iter_text())
+        assert "event: failed" in text
+        assert "positive semi-definite" in client.get(f"/api/jobs/{job_id}").json()["error"]
+
+    def test_invalid_request_rejected_at_submission(self):
+        response = client.post("/api/jobs/simulate-portfolio", json=dict(SIMULATION_BODY, paths=0))
+        assert response.status_code == 422
+
+    def test_cancel(self):
+        job_id = client.post("/api/jobs/simulate-portfolio", json=dict(SIMULATION_BODY, paths=50000)).json()["job_id"]
+        response = client.delete(f"/api/jobs/{job_id}")
+
+        assert response.status_code == 200
+        deadline = time.time() + 10
+        while client.get(f"/api/jobs/{job_id}").json()["status"] in ("queued", "running") and time.time() < deadline:
+            time.sleep(0.02)
+        assert client.get(f"/api/jobs/{job_id}").json()["status"] == "cancelled"
+
+    def test_unknown_job(self):
+        assert client.get("/api/jobs/missing").status_code == 404
+        assert client.delete("/api/jobs/missing").status_code == 404
+        assert client.get("/api/jobs/missing/events").status_code == 404
+
+    def test_metrics(self):
+        assert "succeeded" in client.get("/api/metrics").json()["jobs"]["jobs"]
@@ -0,0 +1,118 @@
+"""
+Tests for live recalculation sessions
+"""
+import asyncio
+import json
+import time
+
+from api.models.money_journey import MoneyJourneyRequest
+from api.services.live import LiveMetrics, LiveSession, serve_live_session
+from api.services.money_journey import calculate_money_journey
+
+JOURNEY = {
+    "monthly_investment": 5000,
+    "accumulation_years": 10,
+    "accumulation_return_rate": 12.0,
+    "monthly_withdrawal": 20000,
+    "withdrawal_years": 5,
+    "withdrawal_return_rate": 8.0,
+}
+
+
+class Disconnected(Exception):
+    pass
+
+
+class FakeClient:
+    """In-memory transport: scripted messages in, pushed messages recorded"""
+
+    def __init__(self):
+        self.inbox = asyncio.Queue()
+        self.sent = []
+
+    async def receive(self):
+        message = await self.inbox.get()
+        if message is None:
+            raise Disconnected()
+        return json.dumps(message)
+
+    async def send(self, message):
+        self.sent.append(message)
+
+
+def run_session(session, script, **timing):
+    """Play `script`, a list of messages or pauses in seconds, then disconnect"""
+    client = FakeClient()
+
+    async def play():
+        for step in script:
+            if isinstance(step, (int, float)):
+                await asyncio.sleep(step)
+            else:
+                client.inbox.put_nowait(step)
+        client.inbox.put_nowait(None)
+
+    async def main():
+        player = asyncio.create_task(play())
+        try:
+            await serve_live_session(session, client.receive, client.send, **timing)
+        except Disconnected:
+            pass
+        await player
+
+    asyncio.run(main())
+    return client.sent
+
+
+class TestLiveSession:
+    """Tests for LiveSession and serve_live_session"""
+
+    def test_burst_is_debounced_to_latest_result(self):
+        session = LiveSession("money_journey")
+        script = [{"params": JOURNEY}] + [{"params": {"monthly_withdrawal": w}} for w in (21000, 22000, 23000)]
+        sent = run_session(session, script + [0.3])
+        assert len(sent) == 1
+        assert sent[0]["type"] == "result"
+        assert sent[0]["version"] == 4
+        expected = calculate_money_journey(MoneyJourneyRequest(**{**JOURNEY, "monthly_withdrawal": 23000}))
+        assert sent[0]["response"] == expected.model_dump(mode="json")
+
+    def test_withdrawal_change_reuses_accumulation(self):
+        metrics = LiveMetrics()
+        session = LiveSession("money_journey", metrics)
+        script = [{"params": JOURNEY}, 0.2, {"params": {"withdrawal_return_rate": 6}}, 0.2]
+        sent = run_session(session, script)
+        assert [m["version"] for m in sent] == [1, 2]
+        assert metrics.phase_reuse == 1
+        expected = calculate_money_journey(MoneyJourneyRequest(**{**JOURNEY, "withdrawal_return_rate": 6}))
+        assert sent[1]["response"] == expected.model_dump(mode="json")
+
+    def test_superseded_result_is_dropped(self):
+        class SlowSession(LiveSession):
+            def calculate(self, params):
+                time.sleep(0.2)
+                return super().calculate(params)
+
+        session = SlowSession("money_journey")
+        script = [{"params": JOURNEY}, 0.1, {"params": {"monthly_withdrawal": 25000}}, 0.6]
+        sent = run_session(session, script, debounce_seconds=0.02)
+        assert [m["version"] for m in sent] == [2]
+        assert session.metrics.superseded == 1
+        assert session.metrics.open_sessions == 0
+
+    def test_invalid_plan_and_message(self):
+        session = LiveSession("sip")
+        sent = run_session(session, [{"params": {"monthly_investment": 5000}}, 0.2, {"oops": 1}, 0.05])
+        assert sent[0]["type"] == "error"
+        assert sent[0]["version"] == 1
+        assert {e["field"] for e in sent[0]["errors"]} >= {"time_period_years", "annual_return_rate"}
+        assert sent[1]["type"] == "error" and sent[1]["version"] is None
+
+    def test_null_resets_and_replace(self):
+        session = LiveSession("sip")
+        session.update({"params": {"monthly_investment": 5000, "annual_step_up_rate": 10}})
+        session.update({"params": {"annual_step_up_rate": None}})
+        assert session.params == {"monthly_investment": 5000}
+        session.update({"params": {"time_period_years": 5}, "replace": True})
+        assert session.params == {"time_period_years": 5}
+        assert session.version == 3
@@ -2,8 +2,9 @@
 Unit tests for Money Journey calculator
 """
 import pytest
+from api.models.limits import MAX_HORIZON_YEARS
 from api.models.money_journey import MoneyJourneyRequest
-from api.services.money_journey import calculate_money_journey
+from api.services.money_journey import calculate_money_journey, calculate_money_journey_batch
 
 
 class TestMoneyJourneyAccumulation:
@@ -332,7 +333,7 @@ class TestMoneyJourneyValidation:
         with pytest.raises(Exception):
             MoneyJourneyRequest(
                 monthly_investment=5000,
-                accumulation_years=51,
+                accumulation_years=MAX_HORIZON_YEARS + 1,
                 accumulation_return_rate=12.0,
                 monthly_withdrawal=50000,
                 withdrawal_years=20,
@@ -361,3 +362,500 @@ class TestMoneyJourneyValidation:
                 withdrawal_years=20,
                 withdrawal_return_rate=8.0,
             )
+
+
+class TestMonthlyWithdrawal:
+    """Tests for month-granular withdrawals"""
+
+    def _request(self, **overrides):
+        params = dict(
+            monthly_investment=0.01,
+            accumulation_years=1,
+            accumulation_return_rate=0.0,
+            initial_investment=1000000,
+            monthly_withdrawal=100000,
+            withdrawal_years=3,
+            withdrawal_return_rate=0.0,
+            withdrawal_frequency="monthly",
+        )
+        params.update(overrides)
+        return MoneyJourneyRequest(**params)
+
+    def test_depletion_month(self):
+        """Corpus of ~1,000,000 at 100,000/month lasts 10 full months"""
+        result = calculate_money_journey(self._request())
+
+        assert result.results.depleted is True
+        assert result.results.depletion_year == 2
+        assert result.results.depletion_month == 11
+        assert abs(result.results.total_withdrawals - 1000000.12) < 0.01
+
+        first_year = [e for e in result.yearly_breakdown if e.phase == "withdrawal"][0]
+        assert abs(first_year.annual_amount - 1000000.12) < 0.01
+        assert first_year.balance == 0
+
+    def test_annual_mode_depletion_month_is_first(self):
+        result = calculate_money_journey(self._request(withdrawal_frequency="annually"))
+        assert result.results.depletion_year == 2
+        assert result.results.depletion_month == 1
+
+    def test_not_depleted_has_no_month(self):
+        result = calculate_money_journey(self._request(monthly_withdrawal=1000))
+        assert result.results.depleted is False
+        assert result.results.depletion_month is None
+
+    def test_monthly_compounding_known_value(self):
+        """One month: withdraw at start, remainder grows by r/12"""
+        result = calculate_money_journey(self._request(
+            monthly_withdrawal=10000,
+            withdrawal_years=1,
+            withdrawal_return_rate=12.0,
+            withdrawal_compounding_frequency="monthly",
+        ))
+
+        balance = 1000000.12
+        for _ in range(12):
+            balance = (balance - 10000) * 1.01
+        assert abs(result.results.final_balance - balance) < 0.01
+
+    def test_annual_compounding_full_year_growth(self):
+        """With annual compounding and no withdrawal, a year grows by exactly the annual rate"""
+        result = calculate_money_journey(self._request(
+            monthly_withdrawal=0,
+            withdrawal_years=1,
+            withdrawal_return_rate=8.0,
+        ))
+        assert abs(result.results.final_balance - 1000000.12 * 1.08) < 0.01
+
+    def test_monthly_less_pessimistic_than_annual(self):
+        """Drawing monthly leaves more invested than drawing the year up front"""
+        params = dict(withdrawal_return_rate=8.0, monthly_withdrawal=5000, withdrawal_years=20)
+        monthly = calculate_money_journey(self._request(**params))
+        annual = calculate_money_journey(self._request(withdrawal_frequency="annually", **params))
+        assert monthly.results.final_balance > annual.results.final_balance
+
+    def test_breakdown_totals(self):
+        result = calculate_money_journey(self._request(
+            monthly_withdrawal=4000,
+            withdrawal_years=30,
+            withdrawal_return_rate=5.0,
+            withdrawal_step_up_rate=6,
+        ))
+        withdrawal_entries = [e for e in result.yearly_breakdown if e.phase == "withdrawal"]
+        assert len(withdrawal_entries) == 30
+        assert abs(result.results.total_withdrawals - sum(e.annual_amount for e in withdrawal_entries)) < 1
+        assert withdrawal_entries[0].monthly_amount == 4000
+        assert withdrawal_entries[1].monthly_amount == 4240
+
+    def test_matches_month_by_month_loop(self):
+        """Vectorized path matches a straightforward month-by-month simulation"""
+        request = self._request(
+            initial_investment=2500000,
+            monthly_withdrawal=15000,
+            withdrawal_years=25,
+            withdrawal_return_rate=7.0,
+            withdrawal_step_up_rate=5,
+            withdrawal_compounding_frequency="monthly",
+        )
+        result = calculate_money_journey(request)
+
+        balance = result.results.corpus_at_retirement
+        monthly = 15000
+        depletion = None
+        for year in range(25):
+            if year > 0:
+                monthly *= 1.05
+            for month in range(12):
+                if balance < monthly:
+                    depletion = (year, month)
+                    break
+                balance = (balance - monthly) * (1 + 0.07 / 12)
+            if depletion:
+                break
+
+        assert depletion is not None
+        assert result.results.depletion_year == 1 + depletion[0] + 1
+        assert result.results.depletion_month == depletion[1] + 1
+
+
+class TestMoneyJourneyBatch:
+    """Tests for the vectorized batch path"""
+
+    def test_batch_matches_single(self):
+        requests = [
+            MoneyJourneyRequest(
+                monthly_investment=5000,
+                accumulation_years=10 + i,
+                accumulation_return_rate=12.0,
+                monthly_withdrawal=20000 + 5000 * i,
+                withdrawal_years=5 + 3 * i,
+                withdrawal_return_rate=8.0,
+                withdrawal_frequency="monthly" if i % 2 else "annually",
+            )
+            for i in range(6)
+        ]
+        batch = calculate_money_journey_batch(requests)
+
+        assert len(batch) == len(requests)
+        for request, response in zip(requests, batch):
+            assert response.model_dump() == calculate_money_journey(request).model_dump()
+
+
+class TestReturnSchedules:
+    """Tests for per-year accumulation and withdrawal rate schedules"""
+
+    def test_accumulation_schedule_matches_sip(self):
+        from api.models.sip import SIPCalculationRequest
+        from api.services.sip_calculator import calculate_sip_with_annual_compounding
+
+        rates = [12.0, 10.0, 8.0, 6.0]
+        request = MoneyJourneyRequest(
+            monthly_investment=5000,
+            accumulation_years=4,
+            accumulation_return_rate=12.0,
+            accumulation_return_rates=rates,
+            monthly_withdrawal=1000,
+            withdrawal_years=2,
+            withdrawal_return_rate=5.0,
+        )
+        sip = calculate_sip_with_annual_compounding(SIPCalculationRequest(
+            monthly_investment=5000,
+            time_period_years=4,
+            annual_return_rate=12.0,
+            annual_return_rates=rates,
+        ))
+
+        assert calculate_money_journey(request).results.corpus_at_retirement == sip.results.future_value
+
+    def test_withdrawal_schedule_matches_loop(self):
+        rates = [8.0, 6.0, 4.0, 2.0, 0.0]
+        request = MoneyJourneyRequest(
+            monthly_investment=0.01,
+            accumulation_years=1,
+            accumulation_return_rate=0.0,
+            initial_investment=1000000,
+            monthly_withdrawal=10000,
+            withdrawal_years=5,
+            withdrawal_return_rate=8.0,
+            withdrawal_return_rates=rates,
+        )
+
+        result = calculate_money_journey(request)
+
+        balance = result.results.corpus_at_retirement
+        for rate in rates:
+            balance = (balance - 120000) * (1 + rate / 100)
+        assert abs(result.results.final_balance - balance) < 0.01
+
+    def test_withdrawal_schedule_length_validated(self):
+        with pytest.raises(Exception):
+            MoneyJourneyRequest(
+                monthly_investment=5000,
+                accumulation_years=10,
+                accumulation_return_rate=12.0,
+                monthly_withdrawal=50000,
+                withdrawal_years=3,
+                withdrawal_return_rate=8.0,
+                withdrawal_return_rates=[8.0, 7.0],
+            )
+
+
+class TestCashFlowEvents:
+    """Tests for events spanning the accumulation and withdrawal phases"""
+
+    def _request(self, events, **overrides):
+        params = dict(
+            monthly_investment=10000,
+            accumulation_years=5,
+            accumulation_return_rate=0.0,
+            monthly_withdrawal=5000,
+            withdrawal_years=5,
+            withdrawal_return_rate=0.0,
+            events=events,
+        )
+        params.update(overrides)
+        return MoneyJourneyRequest(**params)
+
+    def test_accumulation_lump_sum_raises_corpus(self):
+        result = calculate_money_journey(self._request([{"type": "lump_sum", "year": 3, "amount": 50000}]))
+        assert result.results.corpus_at_retirement == 650000
+        assert result.results.total_contributions == 650000
+
+    def test_house_purchase_causes_depletion(self):
+        """A large withdrawal in the second retirement year runs the plan dry"""
+        result = calculate_money_journey(self._request([{"type": "withdrawal", "year": 7, "amount": 500000}]))
+
+        assert result.results.depleted is True
+        assert result.results.depletion_year == 7
+        assert result.results.total_withdrawals == 600000
+        assert len(result.yearly_breakdown) == 10
+
+    def test_withdrawal_pause_and_lump_sum(self):
+        result = calculate_money_journey(self._request(
+            [
+                {"type": "pause", "year": 6, "months": 12},
+                {"type": "lump_sum", "year": 8, "amount": 30000},
+            ],
+            withdrawal_frequency="monthly",
+        ))
+
+        withdrawal = [y for y in result.yearly_breakdown if y.phase == "withdrawal"]
+        assert withdrawal[0].annual_amount == 0
+        assert withdrawal[0].balance == 600000
+        # 600000 - 4 * 60000 + 30000
+        assert result.results.final_balance == 390000
+        assert result.results.total_withdrawals == 240000
+
+    def test_events_echoed_in_inputs(self):
+        result = calculate_money_journey(self._request([{"type": "lump_sum", "year": 2, "amount": 1000}]))
+        assert result.inputs["events"][0]["amount"] == 1000
+
+    def test_event_beyond_journey_rejected(self):
+        with pytest.raises(Exception):
+            self._request([{"type": "lump_sum", "year": 11, "amount": 1000}])
+
+
+class TestWithdrawalPolicies:
+    """Tests for balance-dependent withdrawal rules"""
+
+    BASE = dict(
+        monthly_investment=0.01,
+        accumulation_years=1,
+        accumulation_return_rate=0.0,
+        initial_investment=1000000,
+        monthly_withdrawal=5000,
+        withdrawal_years=5,
+        withdrawal_return_rate=0.0,
+    )
+
+    def _journey(self, policy, **overrides):
+        return calculate_money_journey(MoneyJourneyRequest(**{**self.BASE, **overrides, "withdrawal_policy": policy}))
+
+    def test_percent_of_portfolio_known_values(self):
+        result = self._journey({"type": "percent_of_portfolio", "rate": 10})
+
+        withdrawal = [y for y in result.yearly_breakdown if y.phase == "withdrawal"]
+        corpus = result.results.corpus_at_retirement
+        assert [y.annual_amount for y in withdrawal] == pytest.approx([corpus * 0.1 * 0.9 ** k for k in range(5)], abs=0.01)
+        assert result.results.final_balance == pytest.approx(corpus * 0.9 ** 5, abs=0.01)
+        assert result.results.depleted is False
+
+    def test_floor_and_ceiling(self):
+        result = self._journey(
+            {"type": "floor_ceiling", "rate": 50, "floor": 10000, "ceiling": 20000},
+            withdrawal_years=8,
+        )
+
+        annual = [y.annual_amount for y in result.yearly_breakdown if y.phase == "withdrawal"]
+        # Half the balance, capped at 240k and floored at 120k a year; year 6 pays out what is left
+        assert annual == pytest.approx([240000, 240000, 240000, 140000, 120000, 20000, 0, 0], abs=0.1)
+        assert result.results.depleted is True
+        assert result.results.depletion_year == 7
+
+    def test_guardrails_match_reference_loop(self):
+        import numpy as np
+        from api.services.money_journey import project_withdrawals
+
+        request = MoneyJourneyRequest(**{
+            **self.BASE, "withdrawal_years": 10, "monthly_withdrawal": 4000,
+            "withdrawal_step_up_rate": 3, "withdrawal_policy": {"type": "guardrails"},
+        })
+        rates = [0.06, -0.10, -0.05, 0.12, 0.20, -0.15, 0.02, 0.08, 0.25, -0.02]
+        _, _, balances, _ = project_withdrawals([request], np.array([1000000.0]), growth=1 + np.array([rates]))
+
+        balance, previous, last_return = 1000000.0, 48000.0, 0.0
+        initial_rate = previous / balance
+        expected = []
+        for year, rate in enumerate(rates):
+            withdrawal = previous
+            if year:
+                if not (last_return < 0 and previous / balance > initial_rate):
+                    withdrawal = previous * 1.03
+                if withdrawal / balance > initial_rate * 1.2:
+                    withdrawal *= 0.9
+                elif withdrawal / balance < initial_rate * 0.8:
+                    withdrawal *= 1.1
+            balance = (balance - withdrawal) * (1 + rate)
+            previous, last_return = withdrawal, rate
+            expected.append(balance)
+
+        assert balances[0] == pytest.approx(expected)
+
+    def test_fixed_rows_unchanged_in_mixed_batch(self):
+        plain = MoneyJourneyRequest(**{**self.BASE, "withdrawal_frequency": "monthly", "withdrawal_step_up_rate": 5})
+        dynamic = MoneyJourneyRequest(**{
+            **self.BASE, "withdrawal_frequency": "monthly",
+            "withdrawal_policy": {"type": "percent_of_portfolio", "rate": 4},
+        })
+
+        batch = calculate_money_journey_batch([plain, dynamic])
+
+        assert batch[0] == calculate_money_journey(plain)
+        assert batch[1].inputs["withdrawal_policy"]["type"] == "percent_of_portfolio"
+
+    def test_policy_with_events(self):
+        result = self._journey(
+            {"type": "percent_of_portfolio", "rate": 10},
+            events=[{"type": "pause", "year": 2, "months": 12}],
+        )
+        assert result.yearly_breakdown[1].annual_amount == 0
+
+    def test_policy_validation(self):
+        with pytest.raises(Exception):
+            MoneyJourneyRequest(**{**self.BASE, "withdrawal_policy": {"type": "percent_of_portfolio"}})
+        with pytest.raises(Exception):
+            MoneyJourneyRequest(**{**self.BASE, "withdrawal_policy": {
+                "type": "floor_ceiling", "rate": 4, "floor": 5000, "ceiling": 1000,
+            }})
+
+
+class TestExactArithmetic:
+    """Tests for exact minor-unit arithmetic in Money Journey"""
+
+    def test_withdrawals_reconcile(self):
+        """Total withdrawals are the exact sum of the yearly withdrawals"""
+        request = MoneyJourneyRequest(
+            monthly_investment=7000.01,
+            accumulation_years=12,
+            accumulation_return_rate=10.7,
+            monthly_withdrawal=60000.99,
+            withdrawal_years=25,
+            withdrawal_return_rate=7.1,
+            withdrawal_step_up_rate=5.0,
+            withdrawal_frequency="monthly",
+            exact={},
+        )
+        result = calculate_money_journey(request)
+        withdrawals = [y.annual_amount for y in result.yearly_breakdown if y.phase == "withdrawal"]
+
+        assert round(result.results.total_withdrawals * 100) == sum(round(w * 100) for w in withdrawals)
+        floating = calculate_money_journey(request.model_copy(update={"exact": None}))
+        assert result.results.depletion_year == floating.results.depletion_year
+
+    def test_batch_matches_single(self):
+        """Batched exact plans match their single calculations"""
+        requests = [
+            MoneyJourneyRequest(
+                monthly_investment=3000 + 101 * i,
+                accumulation_years=5 + i,
+                accumulation_return_rate=8 + i / 3,
+                monthly_withdrawal=20000 + 2500 * i,
+                withdrawal_years=10 + i,
+                withdrawal_return_rate=6,
+                withdrawal_frequency=("annually", "monthly")[i % 2],
+                exact={"interest_rounding": ("half_even", "down", "up")[i % 3]},
+            )
+            for i in range(10)
+        ]
+        batch = calculate_money_journey_batch(requests)
+
+        for request, response in zip(requests, batch):
+            assert response == calculate_money_journey(request)
+
+    def test_policy_not_supported(self):
+        """Withdrawal policies cannot be combined with exact arithmetic"""
+        with pytest.raises(ValueError, match="exact"):
+            MoneyJourneyRequest(
+                monthly_investment=5000,
+                accumulation_years=10,
+                accumulation_return_rate=12.0,
+                monthly_withdrawal=50000,
+                withdrawal_years=5,
+                withdrawal_return_rate=8.0,
+                withdrawal_policy={"type": "percent_of_portfolio", "rate": 4},
+                exact={},
+            )
+
+
+def _depletion_time(request: MoneyJourneyRequest) -> float:
+    """Depletion time in withdrawal-phase years, interpolated within the period that runs dry"""
+    response = calculate_money_journey(request)
+    periods_per_year = 12 if request.withdrawal_frequency == "monthly" else 1
+    months = 12 // periods_per_year
+    growth = (1 + request.withdrawal_return_rate / 100) ** (months / 12)
+    balance = previous = response.results.corpus_at_retirement
+    withdrawal = request.monthly_withdrawal
+    for year in range(request.withdrawal_years):
+        if year:
+            withdrawal *= 1 + request.withdrawal_step_up_rate / 100
+        for period in range(periods_per_year):
+            margin = balance - withdrawal * months
+            if margin < 0:
+                return (year * periods_per_year + period - 1 + previous / (previous - margin)) / periods_per_year
+            previous, balance = margin, margin * growth
+    raise AssertionError("plan does not deplete")
+
+
+class TestSensitivities:
+    """Tests for analytic sensitivities of the final balance and depletion year"""
+
+    BASE = dict(
+        monthly_investment=20000,
+        accumulation_years=20,
+        accumulation_return_rate=11.0,
+        annual_step_up_rate=6.0,
+        monthly_withdrawal=60000,
+        withdrawal_years=30,
+        withdrawal_return_rate=7.0,
+        withdrawal_step_up_rate=5.0,
+        withdrawal_compounding_frequency="annually",
+    )
+    BUMPS = {
+        "monthly_investment": 1e-2,
+        "accumulation_return_rate": 1e-5,
+        "annual_step_up_rate": 1e-5,
+        "monthly_withdrawal": 1e-2,
+        "withdrawal_return_rate": 1e-5,
+        "withdrawal_step_up_rate": 1e-5,
+    }
+
+    @pytest.mark.parametrize("frequency", ["annually", "monthly"])
+    def test_final_balance(self, frequency):
+        """Final balance derivatives match small bumps of each input"""
+        inputs = {**self.BASE, "withdrawal_frequency": frequency}
+        result = calculate_money_journey(MoneyJourneyRequest(**inputs, sensitivities=True))
+
+        assert not result.results.depleted
+        assert result.sensitivities.depletion_year is None
+        for name, bump in self.BUMPS.items():
+            bumped = calculate_money_journey(MoneyJourneyRequest(**{**inputs, name: inputs[name] + bump}))
+            numeric = (bumped.results.final_balance - result.results.final_balance) / bump
+            assert getattr(result.sensitivities.final_balance, name) == pytest.approx(numeric, rel=1e-2)
+
+        longer = calculate_money_journey(MoneyJourneyRequest(**{**inputs, "withdrawal_years": 31}))
+        assert result.sensitivities.final_balance.withdrawal_years == pytest.approx(
+            longer.results.final_balance - result.results.final_balance, abs=0.02
+        )
+
+    @pytest.mark.parametrize("frequency", ["annually", "monthly"])
+    def test_depletion_year(self, frequency):
+        """A depleted plan's final balance is flat and its depletion time moves with each input"""
+        inputs = {**self.BASE, "monthly_withdrawal": 150000, "withdrawal_frequency": frequency}
+        result = calculate_money_journey(MoneyJourneyRequest(**inputs, sensitivities=True))
+        depletion = _depletion_time(MoneyJourneyRequest(**inputs))
+
+        assert result.results.depleted
+        assert result.sensitivities.final_balance.monthly_withdrawal == 0
+        for name, bump in self.BUMPS.items():
+            bumped = _depletion_time(MoneyJourneyRequest(**{**inputs, name: inputs[name] + bump}))
+            assert getattr(result.sensitivities.depletion_year, name) == pytest.approx(
+                (bumped - depletion) / bump, rel=1e-2, abs=1e-4
+            )
+
+    def test_batch_matches_single(self):
+        """Batched plans carry sensitivities only when they ask, matching single calculations"""
+        requests = [
+            MoneyJourneyRequest(**self.BASE, sensitivities=True),
+            MoneyJourneyRequest(**self.BASE),
+            MoneyJourneyRequest(**{**self.BASE, "monthly_withdrawal": 150000}, sensitivities=True),
+        ]
+        batch = calculate_money_journey_batch(requests)
+
+        assert batch[0] == calculate_money_journey(requests[0])
+        assert batch[1].sensitivities is None
+        assert batch[2] == calculate_money_journey(requests[2])
+
+    def test_policy_not_supported(self):
+        """Sensitivities cannot be combined with a withdrawal policy"""
+        with pytest.raises(ValueError, match="sensitivities"):
+            MoneyJourneyRequest(**self.BASE, sensitivities=True, withdrawal_policy={"type": "percent_of_portfolio", "rate": 4})
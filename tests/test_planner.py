@@ -0,0 +1,94 @@
+"""
+Unit tests for the multi-goal planner
+"""
+import pytest
+
+from api.models.money_journey import MoneyJourneyRequest
+from api.models.planner import PlannerRequest
+from api.models.sip import SIPCalculationRequest
+from api.services.money_journey import calculate_money_journey
+from api.services.planner import calculate_plan
+from api.services.sip_calculator import calculate_sip_with_annual_compounding
+
+RETIREMENT = {
+    "monthly_investment": 20000,
+    "accumulation_years": 5,
+    "accumulation_return_rate": 12.0,
+    "monthly_withdrawal": 30000,
+    "withdrawal_years": 3,
+    "withdrawal_return_rate": 8.0,
+}
+
+EDUCATION = {
+    "monthly_investment": 10000,
+    "time_period_years": 4,
+    "annual_return_rate": 10.0,
+}
+
+HOUSE = {
+    "monthly_investment": 5000,
+    "time_period_years": 3,
+    "annual_return_rate": 9.0,
+    "annual_step_up_rate": 10,
+}
+
+
+def _plan():
+    return calculate_plan(PlannerRequest(goals=[
+        {"name": "Retirement", "money_journey": RETIREMENT},
+        {"name": "Education", "sip": EDUCATION},
+        {"name": "House", "start_year": 3, "sip": HOUSE},
+    ]))
+
+
+class TestPlanner:
+    """Tests for combining goals on one timeline"""
+
+    def test_goal_results_match_single_endpoints(self):
+        plan = _plan()
+        assert plan.goals[0].money_journey == calculate_money_journey(MoneyJourneyRequest(**RETIREMENT))
+        assert plan.goals[1].sip == calculate_sip_with_annual_compounding(SIPCalculationRequest(**EDUCATION))
+        assert [g.end_year for g in plan.goals] == [8, 4, 5]
+
+    def test_timeline_alignment(self):
+        plan = _plan()
+        house = plan.goals[2].sip.yearly_breakdown
+
+        assert plan.results.horizon_years == 8
+        assert len(plan.yearly_breakdown) == 8
+        assert [y.active_goals for y in plan.yearly_breakdown] == [2, 2, 3, 3, 2, 1, 1, 1]
+        # Year 3 is the house goal's first year
+        assert plan.yearly_breakdown[2].monthly_outlay == 20000 + 10000 + house[0].monthly_contribution
+
+    def test_monthly_outlay(self):
+        plan = _plan()
+        assert plan.results.total_monthly_outlay == 30000
+        assert plan.results.peak_monthly_outlay == pytest.approx(20000 + 10000 + 5500)
+        assert plan.results.peak_outlay_year == 4
+        # Retirement withdrawals start in year 6, when no goal is contributing
+        assert plan.yearly_breakdown[5].monthly_outlay == 0
+
+    def test_totals_are_sums_of_goals(self):
+        plan = _plan()
+        journey = plan.goals[0].money_journey.results
+        education = plan.goals[1].sip.results
+        house = plan.goals[2].sip.results
+
+        assert plan.results.total_contributions == pytest.approx(
+            journey.total_contributions + education.total_invested + house.total_invested
+        )
+        assert plan.results.total_withdrawals == pytest.approx(journey.total_withdrawals)
+        assert plan.results.final_value == pytest.approx(
+            journey.final_balance + education.future_value + house.future_value
+        )
+        assert sum(y.withdrawals for y in plan.yearly_breakdown) == pytest.approx(journey.total_withdrawals)
+
+    def test_goal_needs_exactly_one_plan(self):
+        with pytest.raises(Exception):
+            PlannerRequest(goals=[{"name": "Both", "sip": EDUCATION, "money_journey": RETIREMENT}])
+        with pytest.raises(Exception):
+            PlannerRequest(goals=[{"name": "Neither"}])
+
+    def test_goal_names_unique(self):
+        with pytest.raises(Exception):
+            PlannerRequest(goals=[{"name": "A", "sip": EDUCATION}, {"name": "A", "sip": HOUSE}])
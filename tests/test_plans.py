@@ -0,0 +1,174 @@
+"""
+Unit tests for the saved-plan store and bulk re-projection
+"""
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from api import main
+from api.models.money_journey import MoneyJourneyRequest
+from api.models.plans import SavePlanRequest
+from api.services.money_journey import calculate_money_journey
+from api.services.plans import PlanStore
+
+client = TestClient(main.app)
+
+JOURNEY = {
+    "monthly_investment": 10000,
+    "accumulation_years": 20,
+    "monthly_withdrawal": 50000,
+    "withdrawal_years": 25,
+}
+USES_HOUSE_RATES = {"accumulation_return_rate": "equity_return", "withdrawal_return_rate": "balanced_return"}
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = PlanStore(tmp_path / "plans.sqlite3")
+    store.set_assumptions({"equity_return": 12.0, "balanced_return": 7.0})
+    return store
+
+
+def _journey(plan_id: str, **inputs) -> SavePlanRequest:
+    return SavePlanRequest(
+        plan_id=plan_id, kind="money_journey", inputs={**JOURNEY, **inputs}, assumptions=USES_HOUSE_RATES
+    )
+
+
+class TestPlanStore:
+    """Tests for saving, listing and re-projecting plans"""
+
+    def test_save_projects_with_house_assumptions(self, store):
+        """A saved plan's results match the calculator run with the assumption values"""
+        plan = store.save(_journey("client-1"))
+        expected = calculate_money_journey(MoneyJourneyRequest(
+            **JOURNEY, accumulation_return_rate=12.0, withdrawal_return_rate=7.0
+        )).results
+
+        assert plan.results == expected.model_dump()
+        assert not plan.stale
+        assert store.get("client-1") == plan
+        assert store.get("missing") is None
+
+    def test_save_replaces(self, store):
+        """Saving under an existing id replaces the plan and keeps its place in the list and creation time"""
+        first = store.save(_journey("a"))
+        store.save(_journey("b"))
+        store.save(_journey("a", monthly_investment=20000))
+
+        total, plans = store.list()
+        assert total == 2
+        assert [p.plan_id for p in plans] == ["a", "b"]
+        assert plans[0].inputs["monthly_investment"] == 20000
+        assert plans[0].created_at == first.created_at
+        assert plans[0].projected_at >= first.projected_at
+
+    def test_invalid_plans_are_rejected(self, store):
+        """Unknown assumptions and invalid inputs are ValueErrors and nothing is stored"""
+        with pytest.raises(ValueError, match="unknown house assumptions"):
+            store.save(SavePlanRequest(
+                kind="sip",
+                inputs={"monthly_investment": 1000, "time_period_years": 10},
+                assumptions={"annual_return_rate": "bond_return"},
+            ))
+        with pytest.raises(ValueError):
+            store.save(SavePlanRequest(kind="sip", inputs={"monthly_investment": 1000}))
+        with pytest.raises(ValueError, match="unknown sip fields"):
+            SavePlanRequest(kind="sip", inputs={}, assumptions={"withdrawal_return_rate": "x"})
+        assert store.list()[0] == 0
+
+    def test_only_affected_plans_are_reprojected(self, store):
+        """Changing an assumption re-projects just the plans that use it, chunk by chunk"""
+        for i in range(7):
+            store.save(_journey(f"j{i}", monthly_investment=5000 + 1000 * i))
+        store.save(SavePlanRequest(
+            plan_id="fixed",
+            kind="sip",
+            inputs={"monthly_investment": 1000, "time_period_years": 10, "annual_return_rate": 8.0},
+        ))
+        fixed = store.get("fixed")
+
+        reports = []
+        result = store.update_assumptions(
+            {"equity_return": 10.0, "balanced_return": 7.0},
+            chunk_size=3,
+            progress=lambda fraction, counts: reports.append((fraction, counts)),
+        )
+
+        assert result.changed_assumptions == ["equity_return"]
+        assert (result.reprojected, result.failed) == (7, 0)
+        assert [counts["reprojected"] for _, counts in reports] == [3, 6, 7]
+        assert reports[-1][0] == 1.0
+        assert store.get("fixed") == fixed
+        plan = store.get("j2")
+        expected = calculate_money_journey(MoneyJourneyRequest(
+            **{**JOURNEY, "monthly_investment": 7000}, accumulation_return_rate=10.0, withdrawal_return_rate=7.0
+        )).results
+        assert plan.results == expected.model_dump()
+        assert not plan.stale
+
+        assert store.update_assumptions({"equity_return": 10.0}).reprojected == 0
+
+    def test_stale_until_reprojected(self, store):
+        """set_assumptions marks users stale; invalid resolved inputs become per-plan errors"""
+        store.save(_journey("a"))
+        store.set_assumptions({"balanced_return": 150.0})
+
+        assert store.get("a").stale
+        assert store.list(stale=True)[0] == 1
+        assert store.list(assumption="balanced_return")[0] == 1
+        assert store.list(assumption="other")[0] == 0
+
+        assert store.reproject() == (1, 1)
+        plan = store.get("a")
+        assert not plan.stale
+        assert plan.results is None
+        assert plan.error.startswith("withdrawal_return_rate")
+
+
+class TestPlanEndpoints:
+    """Tests for the plan store API"""
+
+    @pytest.fixture(autouse=True)
+    def use_store(self, store, monkeypatch):
+        monkeypatch.setattr(main, "plan_store", store)
+
+    def test_save_list_and_fetch(self):
+        response = client.post("/api/plans", json={
+            "plan_id": "client-42", "kind": "money_journey", "inputs": JOURNEY, "assumptions": USES_HOUSE_RATES,
+        })
+        assert response.status_code == 201
+        assert response.json()["results"]["corpus_at_retirement"] > 0
+
+        listing = client.get("/api/plans", params={"assumption": "equity_return"}).json()
+        assert listing["total"] == 1
+        assert client.get("/api/plans/client-42").json() == response.json()
+        assert client.get("/api/plans/missing").status_code == 404
+        assert client.get("/api/assumptions").json() == {
+            "assumptions": {"balanced_return": 7.0, "equity_return": 12.0}
+        }
+
+    def test_invalid_plan(self):
+        response = client.post("/api/plans", json={
+            "kind": "money_journey", "inputs": JOURNEY, "assumptions": {"accumulation_return_rate": "unknown"},
+        })
+        assert response.status_code == 400
+        assert "unknown house assumptions" in response.json()["detail"]["message"]
+
+    def test_reprojection_job(self):
+        client.post("/api/plans", json={
+            "plan_id": "a", "kind": "money_journey", "inputs": JOURNEY, "assumptions": USES_HOUSE_RATES,
+        })
+        before = client.get("/api/plans/a").json()["results"]
+        job_id = client.post("/api/jobs/plans/reproject", json={"assumptions": {"equity_return": 9.0}}).json()["job_id"]
+
+        deadline = time.time() + 10
+        while client.get(f"/api/jobs/{job_id}").json()["status"] in ("queued", "running") and time.time() < deadline:
+            time.sleep(0.02)
+        status = client.get(f"/api/jobs/{job_id}").json()
+
+        assert status["status"] == "succeeded"
+        assert status["result"] == {"changed_assumptions": ["equity_return"], "reprojected": 1, "failed": 0}
+        assert status["partial"] == {"reprojected": 1, "failed": 0, "total": 1}
+        assert client.get("/api/plans/a").json()["results"]["corpus_at_retirement"] < before["corpus_at_retirement"]
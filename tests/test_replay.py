@@ -0,0 +1,193 @@
+"""
+Unit tests for request capture and replay
+"""
+import json
+import sys
+import types
+
+import pytest
+from fastapi.testclient import TestClient
+
+from api.main import app
+from api.replay import read_captures, replay, summarize
+from api.services.capture import CaptureWriter, RequestCaptureMiddleware, anonymize_payload
+from api.services.engine_diff import (
+    MONEY_JOURNEY_ENDPOINT,
+    SIP_ENDPOINT,
+    diff_responses,
+    load_engine,
+)
+
+SIP_BODY = {
+    "monthly_investment": 5123.45,
+    "time_period_years": 10,
+    "annual_return_rate": 12.0,
+}
+
+JOURNEY_BODY = {
+    "monthly_investment": 5000,
+    "accumulation_years": 10,
+    "accumulation_return_rate": 12.0,
+    "monthly_withdrawal": 20000,
+    "withdrawal_years": 5,
+    "withdrawal_return_rate": 8.0,
+}
+
+
+class TestAnonymize:
+    """Tests for capture anonymization"""
+
+    def test_unknown_fields_dropped(self):
+        payload = dict(SIP_BODY, client_name="Jane", email="jane@example.com")
+        anonymized = anonymize_payload(SIP_ENDPOINT, payload)
+        assert set(anonymized) == set(SIP_BODY)
+
+    def test_money_fields_coarsened(self):
+        anonymized = anonymize_payload(SIP_ENDPOINT, SIP_BODY)
+        assert anonymized["monthly_investment"] == 5120
+        # Rates and horizons are kept exactly
+        assert anonymized["annual_return_rate"] == 12.0
+        assert anonymized["time_period_years"] == 10
+
+
+    def test_event_amounts_coarsened(self):
+        payload = dict(SIP_BODY, events=[
+            {"type": "withdrawal", "year": 2, "amount": 987654.32},
+            {"type": "pause", "year": 3, "months": 6},
+        ])
+        anonymized = anonymize_payload(SIP_ENDPOINT, payload)
+        assert anonymized["events"] == [
+            {"type": "withdrawal", "year": 2, "amount": 988000},
+            {"type": "pause", "year": 3, "months": 6},
+        ]
+        assert payload["events"][0]["amount"] == 987654.32
+
+
+    def test_policy_amounts_coarsened(self):
+        payload = dict(JOURNEY_BODY, withdrawal_policy={
+            "type": "floor_ceiling", "rate": 4.5, "floor": 43210.12, "ceiling": 98765.43,
+        })
+        anonymized = anonymize_payload(MONEY_JOURNEY_ENDPOINT, payload)
+        assert anonymized["withdrawal_policy"] == {
+            "type": "floor_ceiling", "rate": 4.5, "floor": 43200, "ceiling": 98800,
+        }
+        assert anonymized["monthly_withdrawal"] == 20000
+
+
+class TestCapture:
+    """Tests for the capture writer and middleware"""
+
+    def test_writer_rotates(self, tmp_path):
+        writer = CaptureWriter(str(tmp_path), max_bytes=500, backup_count=2)
+        try:
+            for _ in range(20):
+                writer.record(SIP_ENDPOINT, json.dumps(SIP_BODY).encode(), 200)
+        finally:
+            writer.close()
+        files = sorted(p.name for p in tmp_path.iterdir())
+        assert files == ["requests.jsonl", "requests.jsonl.1", "requests.jsonl.2"]
+
+    def test_writer_skips_non_json(self, tmp_path):
+        writer = CaptureWriter(str(tmp_path))
+        try:
+            writer.record(SIP_ENDPOINT, b"not json", 400)
+        finally:
+            writer.close()
+        assert (tmp_path / "requests.jsonl").read_text() == ""
+
+    def test_middleware_captures_both_endpoints(self, tmp_path):
+        middleware = RequestCaptureMiddleware(app, directory=str(tmp_path), sample_rate=1.0)
+        try:
+            client = TestClient(middleware)
+            assert client.post(SIP_ENDPOINT, json=SIP_BODY).status_code == 200
+            assert client.post(MONEY_JOURNEY_ENDPOINT, json=JOURNEY_BODY).status_code == 200
+            assert client.get("/health").status_code == 200
+        finally:
+            middleware.writer.close()
+
+        records = read_captures([str(tmp_path / "requests.jsonl")])
+        assert [r["endpoint"] for r in records] == [SIP_ENDPOINT, MONEY_JOURNEY_ENDPOINT]
+        assert records[0]["status"] == 200
+        assert records[0]["body"]["monthly_investment"] == 5120
+
+    def test_middleware_zero_sample_rate(self, tmp_path):
+        middleware = RequestCaptureMiddleware(app, directory=str(tmp_path), sample_rate=0.0)
+        try:
+            TestClient(middleware).post(SIP_ENDPOINT, json=SIP_BODY)
+        finally:
+            middleware.writer.close()
+        assert (tmp_path / "requests.jsonl").read_text() == ""
+
+
+class TestDiffResponses:
+    """Tests for response diffing"""
+
+    def test_identical_responses(self):
+        response = {"results": {"a": 1.0, "b": True}, "yearly_breakdown": [{"year": 1, "v": 2.0}]}
+        assert diff_responses(response, response) == []
+
+    def test_within_tolerance(self):
+        baseline = {"results": {"a": 1.0}, "yearly_breakdown": []}
+        candidate = {"results": {"a": 1.005}, "yearly_breakdown": []}
+        assert diff_responses(baseline, candidate, tolerance=0.01) == []
+
+    def test_reports_breakdown_and_length(self):
+        baseline = {"results": {}, "yearly_breakdown": [{"v": 1.0}, {"v": 2.0}]}
+        candidate = {"results": {}, "yearly_breakdown": [{"v": 1.5}]}
+        paths = [d["path"] for d in diff_responses(baseline, candidate)]
+        assert paths == ["yearly_breakdown.length", "yearly_breakdown[0].v"]
+
+    def test_bool_compared_exactly(self):
+        baseline = {"results": {"depleted": False}, "yearly_breakdown": []}
+        candidate = {"results": {"depleted": True}, "yearly_breakdown": []}
+        assert diff_responses(baseline, candidate)[0]["delta"] is None
+
+
+class TestReplay:
+    """Tests for the replay driver"""
+
+    @pytest.fixture
+    def skewed_engine(self, monkeypatch):
+        """A candidate engine whose SIP future value is off by 1"""
+        current = load_engine("current")
+
+        def calculate_sip_with_annual_compounding(request):
+            response = current[SIP_ENDPOINT](request)
+            response.results.future_value += 1
+            return response
+
+        module = types.ModuleType("skewed_engine")
+        module.calculate_sip_with_annual_compounding = calculate_sip_with_annual_compounding
+        module.calculate_money_journey = current[MONEY_JOURNEY_ENDPOINT]
+        monkeypatch.setitem(sys.modules, "skewed_engine", module)
+        return load_engine("skewed_engine")
+
+    def test_replay_current_against_itself(self):
+        records = [
+            {"endpoint": SIP_ENDPOINT, "body": SIP_BODY},
+            {"endpoint": MONEY_JOURNEY_ENDPOINT, "body": JOURNEY_BODY},
+        ]
+        engine = load_engine("current")
+        reports = replay(records, engine, engine)
+        assert all(r["diffs"] == [] for r in reports)
+        assert all(r["baseline_ms"] >= 0 for r in reports)
+        assert summarize(reports)["mismatched"] == 0
+
+    def test_replay_detects_mismatch(self, skewed_engine):
+        records = [{"endpoint": SIP_ENDPOINT, "body": SIP_BODY}]
+        reports = replay(records, load_engine("current"), skewed_engine)
+        assert [d["path"] for d in reports[0]["diffs"]] == ["results.future_value"]
+
+    def test_replay_reports_invalid_records(self):
+        records = [
+            {"endpoint": "/api/unknown", "body": {}},
+            {"endpoint": SIP_ENDPOINT, "body": {"monthly_investment": -1}},
+        ]
+        engine = load_engine("current")
+        summary = summarize(replay(records, engine, engine))
+        assert summary["errors"] == 2
+
+    def test_load_engine_missing_function(self, monkeypatch):
+        monkeypatch.setitem(sys.modules, "empty_engine", types.ModuleType("empty_engine"))
+        with pytest.raises(ValueError):
+            load_engine("empty_engine")
@@ -0,0 +1,105 @@
+"""
+Unit tests for shadow execution
+"""
+import threading
+
+from fastapi.testclient import TestClient
+
+import api.main
+from api.models.sip import SIPCalculationRequest
+from api.services.engine_diff import MONEY_JOURNEY_ENDPOINT, SIP_ENDPOINT, load_engine
+from api.services.shadow import ShadowRunner
+
+
+def _sip_request():
+    return SIPCalculationRequest(monthly_investment=5000, time_period_years=10, annual_return_rate=12.0)
+
+
+class TestShadowRunner:
+    """Tests for ShadowRunner sampling, comparison and back-pressure"""
+
+    def test_matching_candidate(self):
+        engine = load_engine("current")
+        runner = ShadowRunner(engine, sample_rate=1.0)
+        request = _sip_request()
+        live = engine[SIP_ENDPOINT](request)
+
+        assert runner.submit(SIP_ENDPOINT, request, live, 0.5) is True
+        runner.shutdown()
+
+        stats = runner.metrics.snapshot()["endpoints"][SIP_ENDPOINT]
+        assert stats["compared"] == 1
+        assert stats["mismatched"] == 0
+        assert stats["live_ms_mean"] == 0.5
+
+    def test_mismatch_recorded(self):
+        engine = load_engine("current")
+
+        def skewed(request):
+            response = engine[SIP_ENDPOINT](request)
+            response.results.total_returns += 5
+            return response
+
+        runner = ShadowRunner({SIP_ENDPOINT: skewed}, sample_rate=1.0)
+        request = _sip_request()
+        runner.submit(SIP_ENDPOINT, request, engine[SIP_ENDPOINT](request), 1.0)
+        runner.shutdown()
+
+        snapshot = runner.metrics.snapshot()
+        assert snapshot["endpoints"][SIP_ENDPOINT]["mismatched"] == 1
+        assert snapshot["recent_mismatches"][0]["diffs"][0]["path"] == "results.total_returns"
+
+    def test_candidate_error_recorded(self):
+        def broken(request):
+            raise RuntimeError("boom")
+
+        runner = ShadowRunner({SIP_ENDPOINT: broken}, sample_rate=1.0)
+        runner.submit(SIP_ENDPOINT, _sip_request(), None, 1.0)
+        runner.shutdown()
+
+        assert runner.metrics.snapshot()["endpoints"][SIP_ENDPOINT]["errors"] == 1
+
+    def test_not_sampled(self):
+        runner = ShadowRunner(load_engine("current"), sample_rate=0.0)
+        assert runner.submit(SIP_ENDPOINT, _sip_request(), None, 1.0) is False
+        runner.shutdown()
+
+    def test_drops_when_saturated(self):
+        release = threading.Event()
+
+        def slow(request):
+            release.wait(timeout=5)
+            raise RuntimeError("released")
+
+        runner = ShadowRunner({SIP_ENDPOINT: slow}, sample_rate=1.0, max_pending=1)
+        assert runner.submit(SIP_ENDPOINT, _sip_request(), None, 1.0) is True
+        assert runner.submit(SIP_ENDPOINT, _sip_request(), None, 1.0) is False
+        release.set()
+        runner.shutdown()
+
+        assert runner.metrics.snapshot()["dropped"] == 1
+
+
+class TestShadowEndpoints:
+    """Tests for shadow wiring in the FastAPI app"""
+
+    def test_live_requests_shadowed(self, monkeypatch):
+        runner = ShadowRunner(load_engine("current"), sample_rate=1.0)
+        monkeypatch.setattr(api.main, "shadow_runner", runner)
+        client = TestClient(api.main.app)
+
+        client.post(SIP_ENDPOINT, json={
+            "monthly_investment": 5000, "time_period_years": 10, "annual_return_rate": 12.0,
+        })
+        client.post(MONEY_JOURNEY_ENDPOINT, json={
+            "monthly_investment": 5000, "accumulation_years": 10, "accumulation_return_rate": 12.0,
+            "monthly_withdrawal": 20000, "withdrawal_years": 5, "withdrawal_return_rate": 8.0,
+        })
+        runner.shutdown()
+
+        shadow = client.get("/api/metrics").json()["shadow"]
+        assert shadow["endpoints"][SIP_ENDPOINT]["compared"] == 1
+        assert shadow["endpoints"][MONEY_JOURNEY_ENDPOINT]["compared"] == 1
+
+    def test_metrics_without_shadow(self):
+        assert TestClient(api.main.app).get("/api/metrics").json()["shadow"] is None
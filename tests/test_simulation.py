@@ -0,0 +1,283 @@
+"""
+Unit tests for Monte Carlo multi-asset portfolio simulation
+"""
+import tracemalloc
+
+import numpy as np
+import pytest
+from pydantic import ValidationError
+
+from api.models.limits import MAX_HORIZON_YEARS
+from api.models.money_journey import MoneyJourneyRequest
+from api.models.simulation import Allocation, SimulationRequest
+from api.models.sip import SIPCalculationRequest
+from api.services.money_journey import calculate_money_journey
+from api.services import simulation
+from api.services.simulation import (
+    asset_model,
+    chunk_paths,
+    draw_shocks,
+    estimate,
+    portfolio_growth,
+    run_simulation,
+    sample_groups,
+    standard_normals,
+)
+from api.services.sip_calculator import calculate_sip_with_annual_compounding
+
+PLAN = {
+    "monthly_investment": 20000,
+    "accumulation_years": 20,
+    "accumulation_return_rate": 10.0,
+    "monthly_withdrawal": 100000,
+    "withdrawal_years": 25,
+    "withdrawal_return_rate": 7.0,
+    "compounding_frequency": "annually",
+    "withdrawal_frequency": "annually",
+}
+
+ASSETS = [
+    {"name": "equity", "expected_return": 11, "volatility": 18, "weight": 60},
+    {"name": "debt", "expected_return": 7, "volatility": 5, "weight": 40},
+]
+
+
+def _request(**overrides):
+    body = {"money_journey": PLAN, "allocation": {"assets": ASSETS}, "paths": 500, "seed": 7}
+    body.update(overrides)
+    return SimulationRequest(**body)
+
+
+class TestAssetModel:
+    """Tests for the lognormal parameters, correlation factor and weight glide"""
+
+    def test_lognormal_moments(self):
+        model = asset_model(Allocation(assets=ASSETS), 1)
+        shocks = draw_shocks(np.random.default_rng(1), 200_000, 1, model.cholesky)
+        growth = np.exp(model.mu + model.sigma * shocks)[:, 0, :]
+
+        assert growth.mean(axis=0) == pytest.approx([1.11, 1.07], rel=2e-3)
+        assert growth.std(axis=0) == pytest.approx([0.18, 0.05], rel=1e-2)
+
+    def test_correlated_shocks(self):
+        allocation = Allocation(assets=ASSETS, correlation=[[1, -0.6], [-0.6, 1]])
+        model = asset_model(allocation, 1)
+        shocks = draw_shocks(np.random.default_rng(2), 100_000, 1, model.cholesky)[:, 0, :]
+
+        assert np.corrcoef(shocks.T)[0, 1] == pytest.approx(-0.6, abs=0.01)
+
+    def test_perfect_correlation_allowed(self):
+        model = asset_model(Allocation(assets=ASSETS, correlation=[[1, 1], [1, 1]]), 1)
+        shocks = draw_shocks(np.random.default_rng(3), 1000, 1, model.cholesky)
+        assert np.allclose(shocks[..., 0], shocks[..., 1], atol=1e-4)
+
+    def test_indefinite_correlation_rejected(self):
+        assets = ASSETS + [{"name": "cash", "expected_return": 4, "volatility": 1, "weight": 0}]
+        correlation = [[1, 0.9, -0.9], [0.9, 1, 0.9], [-0.9, 0.9, 1]]
+        with pytest.raises(ValueError, match="positive semi-definite"):
+            asset_model(Allocation(assets=assets, correlation=correlation), 1)
+
+    def test_glide_weights(self):
+        assets = [dict(ASSETS[0], end_weight=20), dict(ASSETS[1], end_weight=80)]
+        weights = asset_model(Allocation(assets=assets), 5).weights
+
+        assert weights[0] == pytest.approx([0.6, 0.4])
+        assert weights[2] == pytest.approx([0.4, 0.6])
+        assert weights[-1] == pytest.approx([0.2, 0.8])
+        assert weights.sum(axis=1) == pytest.approx(np.ones(5))
+
+    def test_rebalanced_growth_is_weighted_average(self):
+        model = asset_model(Allocation(assets=ASSETS), 3)
+        shocks = draw_shocks(np.random.default_rng(4), 10, 3, model.cholesky)
+        asset_growth = np.exp(model.mu + model.sigma * shocks)
+
+        assert np.allclose(portfolio_growth(model, shocks), asset_growth @ np.array([0.6, 0.4]))
+
+
+class TestAllocationValidation:
+    """Tests for allocation validation"""
+
+    def test_weights_must_sum_to_100(self):
+        with pytest.raises(ValidationError, match="sum to 100"):
+            Allocation(assets=[dict(ASSETS[0], weight=50), ASSETS[1]])
+
+    def test_end_weights_all_or_none(self):
+        with pytest.raises(ValidationError, match="every asset"):
+            Allocation(assets=[dict(ASSETS[0], end_weight=100), ASSETS[1]])
+
+    def test_correlation_shape(self):
+        with pytest.raises(ValidationError, match="2x2"):
+            Allocation(assets=ASSETS, correlation=[[1]])
+
+    def test_correlation_symmetric(self):
+        with pytest.raises(ValidationError, match="symmetric"):
+            Allocation(assets=ASSETS, correlation=[[1, 0.2], [0.3, 1]])
+
+    def test_exactly_one_plan(self):
+        with pytest.raises(ValidationError, match="exactly one"):
+            SimulationRequest(allocation={"assets": ASSETS})
+
+    def test_antithetic_needs_even_paths(self):
+        with pytest.raises(ValidationError, match="even number"):
+            _request(sampling="antithetic", paths=101)
+
+    def test_scenario_must_keep_plan_length(self):
+        with pytest.raises(ValidationError, match="total length"):
+            _request(scenarios=[{"label": "Longer", "overrides": {"withdrawal_years": 30}}])
+
+    def test_scenario_labels_unique(self):
+        scenario = {"label": "Spend less", "overrides": {"monthly_withdrawal": 80000}}
+        with pytest.raises(ValidationError, match="unique"):
+            _request(scenarios=[scenario, scenario])
+
+
+class TestRunSimulation:
+    """Tests for run_simulation"""
+
+    def test_zero_volatility_matches_deterministic_journey(self):
+        plan = dict(PLAN, accumulation_return_rate=8.0, withdrawal_return_rate=8.0)
+        assets = [{"name": "bond", "expected_return": 8, "volatility": 0, "weight": 100}]
+        response = run_simulation(_request(money_journey=plan, allocation={"assets": assets}, paths=3))
+        expected = calculate_money_journey(MoneyJourneyRequest(**plan)).results
+
+        assert response.results.corpus_at_retirement.p50 == pytest.approx(expected.corpus_at_retirement, abs=0.01)
+        assert response.results.final_balance.p5 == pytest.approx(expected.final_balance, abs=0.01)
+        assert response.results.success_rate == (0.0 if expected.depleted else 100.0)
+        assert response.results.median_depletion_year == expected.depletion_year
+
+    def test_zero_volatility_sip(self):
+        sip = {"monthly_investment": 10000, "annual_return_rate": 9.0, "time_period_years": 15}
+        assets = [{"name": "bond", "expected_return": 9, "volatility": 0, "weight": 100}]
+        response = run_simulation(SimulationRequest(sip=sip, allocation={"assets": assets}, paths=2))
+        expected = calculate_sip_with_annual_compounding(SIPCalculationRequest(**sip))
+
+        assert response.results.final_balance.p95 == pytest.approx(expected.results.future_value, abs=0.01)
+        assert len(response.yearly_percentiles) == 15
+
+    def test_seeded_and_chunk_size_invariant(self):
+        whole = run_simulation(_request())
+        chunked = run_simulation(_request(chunk_size=37))
+
+        assert whole.results == chunked.results
+        assert whole.yearly_percentiles == chunked.yearly_percentiles
+
+    def test_yearly_bands_ordered(self):
+        response = run_simulation(_request())
+
+        assert len(response.yearly_percentiles) == 45
+        for year in response.yearly_percentiles:
+            band = year.balance
+            assert band.p5 <= band.p25 <= band.p50 <= band.p75 <= band.p95
+        assert response.yearly_percentiles[19].balance == response.results.corpus_at_retirement
+
+    def test_yearly_bands_from_bounded_sample(self, monkeypatch):
+        """Above YEARLY_BAND_PATHS the bands use every stride-th path, whatever the chunk size"""
+        full = run_simulation(_request())
+        monkeypatch.setattr(simulation, "YEARLY_BAND_PATHS", 100)
+        whole = run_simulation(_request())
+        chunked = run_simulation(_request(chunk_size=37))
+
+        assert whole.results == full.results
+        assert whole.yearly_percentiles == chunked.yearly_percentiles
+        sampled = whole.yearly_percentiles[-1].balance.p50
+        assert sampled == pytest.approx(full.yearly_percentiles[-1].balance.p50, rel=0.5)
+
+    def test_chunks_fit_element_budget(self):
+        """chunk_size is only an upper limit; long horizons and many assets get smaller chunks"""
+        assert chunk_paths(10_000, 10, 2) == 10_000
+        assert chunk_paths(100_000, 600, 4) == simulation.SIMULATION_ELEMENT_BUDGET // (600 * 28)
+        assert chunk_paths(100_000, 10**9, 1) == 1
+
+    def test_peak_memory_bounded_at_max_horizon(self):
+        """Memory at the longest allowed horizon stays near the element budget, not paths x years"""
+        request = _request(
+            money_journey=dict(PLAN, accumulation_years=MAX_HORIZON_YEARS, withdrawal_years=MAX_HORIZON_YEARS),
+            paths=3000,
+            chunk_size=100_000,
+        )
+        tracemalloc.start()
+        try:
+            run_simulation(request)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+        assert peak < 12 * simulation.SIMULATION_ELEMENT_BUDGET
+
+    def test_riskier_allocation_widens_outcomes(self):
+        cautious = run_simulation(_request())
+        aggressive = run_simulation(_request(allocation={"assets": [
+            dict(ASSETS[0], weight=100), dict(ASSETS[1], weight=0),
+        ]}))
+
+        def spread(p):
+            return p.p95 - p.p5
+
+        assert spread(aggressive.results.corpus_at_retirement) > spread(cautious.results.corpus_at_retirement)
+
+
+class TestVarianceReduction:
+    """Tests for antithetic and Sobol sampling, standard errors and common random numbers"""
+
+    def test_antithetic_pairs_mirror(self):
+        normals = np.concatenate(list(standard_normals("antithetic", 10, 3, 2, 3, seed=5)))
+
+        assert normals.shape == (10, 3, 2)
+        assert np.array_equal(normals[1::2], -normals[0::2])
+
+    def test_antithetic_chunk_size_invariant(self):
+        whole = run_simulation(_request(sampling="antithetic"))
+        chunked = run_simulation(_request(sampling="antithetic", chunk_size=49))
+        assert whole.results == chunked.results
+
+    def test_estimate_independent_paths(self):
+        values = np.array([1.0, 2.0, 3.0, 4.0])
+        mean, error = estimate(values, sample_groups("pseudo_random", 4))
+
+        assert mean == 2.5
+        assert error == pytest.approx(values.std(ddof=1) / 2)
+
+    def test_estimate_antithetic_pairs(self):
+        values = np.array([1.0, 3.0, 5.0, 5.0])
+        mean, error = estimate(values, sample_groups("antithetic", 4))
+
+        assert mean == 3.5
+        assert error == pytest.approx(np.std([2.0, 5.0], ddof=1) / np.sqrt(2))
+
+    def test_estimate_single_group(self):
+        assert estimate(np.array([7.0]), sample_groups("pseudo_random", 1)) == (7.0, None)
+
+    def test_sobol_chunk_size_invariant(self):
+        pytest.importorskip("scipy")
+        whole = run_simulation(_request(sampling="sobol", paths=256))
+        chunked = run_simulation(_request(sampling="sobol", paths=256, chunk_size=10))
+        assert whole.results == chunked.results
+
+    def test_sobol_reduces_standard_error(self):
+        pytest.importorskip("scipy")
+        pseudo = run_simulation(_request(paths=4096)).results
+        sobol = run_simulation(_request(sampling="sobol", paths=4096)).results
+
+        assert sobol.mean_final_balance_standard_error < pseudo.mean_final_balance_standard_error / 1.5
+
+    def test_sobol_without_scipy_rejected(self, monkeypatch):
+        from api.services import simulation
+
+        monkeypatch.setattr(simulation, "qmc", None)
+        with pytest.raises(ValueError, match="requires scipy"):
+            run_simulation(_request(sampling="sobol"))
+
+    def test_common_random_numbers(self):
+        scenario = {"label": "Spend less", "overrides": {"monthly_withdrawal": 90000}}
+        response = run_simulation(_request(paths=2000, scenarios=[scenario]))
+        alone = run_simulation(_request(paths=2000, money_journey=dict(PLAN, monthly_withdrawal=90000)))
+        result = response.scenarios[0]
+
+        # The scenario sees exactly the plan's paths
+        assert result.results == alone.results
+        assert result.success_rate_difference == pytest.approx(
+            result.results.success_rate - response.results.success_rate, abs=0.01
+        )
+        # Pairing on shared paths beats comparing two independent runs
+        independent = np.hypot(result.results.success_rate_standard_error, response.results.success_rate_standard_error)
+        assert result.success_rate_difference_standard_error < independent
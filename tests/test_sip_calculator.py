@@ -1,9 +1,18 @@
 """
 Unit tests for SIP calculator
 """
+import tracemalloc
+
 import pytest
+from api.models.limits import MAX_HORIZON_YEARS
 from api.models.sip import SIPCalculationRequest
+import numpy as np
+
+from api.services import kernels
+from api.services.kernels import schedule_growth, schedule_growth_table
 from api.services.sip_calculator import (
+    batch_groups,
+    calculate_sip_batch,
     calculate_sip_with_annual_compounding,
     calculate_simple_future_value,
     format_currency
@@ -151,14 +160,28 @@ class TestSIPCalculator:
             )
 
     def test_validation_years_too_high(self):
-        """Test validation rejects years > 50"""
+        """Test validation rejects years > MAX_HORIZON_YEARS"""
         with pytest.raises(Exception):
             SIPCalculationRequest(
                 monthly_investment=5000,
-                time_period_years=51,
+                time_period_years=MAX_HORIZON_YEARS + 1,
                 annual_return_rate=12.0
             )
 
+    def test_long_horizon(self):
+        """Test multi-generational horizons up to the limit"""
+        request = SIPCalculationRequest(
+            monthly_investment=5000,
+            time_period_years=MAX_HORIZON_YEARS,
+            annual_return_rate=12.0,
+            compounding_frequency="monthly"
+        )
+
+        result = calculate_sip_with_annual_compounding(request)
+
+        assert len(result.yearly_breakdown) == MAX_HORIZON_YEARS
+        assert result.results.total_invested == 5000 * 12 * MAX_HORIZON_YEARS
+
     def test_validation_negative_return_rate(self):
         """Test validation rejects negative return rate"""
         with pytest.raises(Exception):
@@ -388,3 +411,576 @@ class TestSIPCalculator:
         # Verify returns percentage
         calculated_percentage = (calculated_returns / result.results.total_invested) * 100
         assert abs(result.results.returns_percentage - calculated_percentage) < 0.01
+
+
+class TestCompoundingFrequency:
+    """Tests for monthly and quarterly compounding"""
+
+    def test_default_is_annual(self):
+        request = SIPCalculationRequest(
+            monthly_investment=1000,
+            time_period_years=1,
+            annual_return_rate=12.0
+        )
+        assert request.compounding_frequency == "annually"
+
+    def test_monthly_compounding_single_year(self):
+        """Monthly contributions compound from the month after they are made"""
+        request = SIPCalculationRequest(
+            monthly_investment=1000,
+            time_period_years=1,
+            annual_return_rate=12.0,
+            compounding_frequency="monthly"
+        )
+
+        result = calculate_sip_with_annual_compounding(request)
+
+        # Ordinary annuity at 1% per month: 1000 * (1.01^12 - 1) / 0.01
+        expected = 1000 * (1.01 ** 12 - 1) / 0.01
+        assert abs(result.results.future_value - expected) < 0.01
+        assert result.inputs["compounding_frequency"] == "monthly"
+
+    def test_quarterly_compounding_single_year(self):
+        """Contributions within a quarter start compounding at the next quarter"""
+        request = SIPCalculationRequest(
+            monthly_investment=1000,
+            time_period_years=1,
+            annual_return_rate=12.0,
+            compounding_frequency="quarterly"
+        )
+
+        result = calculate_sip_with_annual_compounding(request)
+
+        # Four quarterly deposits of 3000 at 3% per quarter
+        expected = 3000 * (1.03 ** 4 - 1) / 0.03
+        assert abs(result.results.future_value - expected) < 0.01
+
+    def test_frequency_ordering(self):
+        """More frequent compounding yields a higher future value"""
+        values = {}
+        for frequency in ("annually", "quarterly", "monthly"):
+            request = SIPCalculationRequest(
+                monthly_investment=5000,
+                time_period_years=20,
+                annual_return_rate=10.0,
+                initial_investment=10000,
+                compounding_frequency=frequency
+            )
+            values[frequency] = calculate_sip_with_annual_compounding(request).results.future_value
+
+        assert values["annually"] < values["quarterly"] < values["monthly"]
+
+    def test_monthly_breakdown_matches_invested(self):
+        """Compounding frequency does not change the contribution schedule"""
+        request = SIPCalculationRequest(
+            monthly_investment=5000,
+            time_period_years=3,
+            annual_return_rate=10.0,
+            annual_step_up_rate=10,
+            compounding_frequency="monthly"
+        )
+
+        result = calculate_sip_with_annual_compounding(request)
+
+        assert [y.monthly_contribution for y in result.yearly_breakdown] == [5000, 5500, 6050]
+        assert result.results.total_invested == 198600
+
+    def test_zero_rate_monthly(self):
+        request = SIPCalculationRequest(
+            monthly_investment=1000,
+            time_period_years=5,
+            annual_return_rate=0.0,
+            compounding_frequency="monthly"
+        )
+
+        result = calculate_sip_with_annual_compounding(request)
+
+        assert result.results.future_value == 60000
+
+    def test_annual_matches_contribution_by_contribution_sum(self):
+        """Annual mode matches summing each year's contributions grown separately"""
+        request = SIPCalculationRequest(
+            monthly_investment=2500,
+            time_period_years=30,
+            annual_return_rate=11.0,
+            initial_investment=50000,
+            annual_step_up_rate=8,
+            step_up_cap=9000
+        )
+
+        result = calculate_sip_with_annual_compounding(request)
+
+        monthly = 2500
+        expected = 50000 * 1.11 ** 30
+        for year in range(1, 31):
+            if year > 1:
+                monthly = min(monthly * 1.08, 9000)
+            expected += monthly * 12 * 1.11 ** (30 - year)
+        assert abs(result.results.future_value - expected) < 0.01
+
+    def test_validation_unknown_frequency(self):
+        with pytest.raises(Exception):
+            SIPCalculationRequest(
+                monthly_investment=1000,
+                time_period_years=5,
+                annual_return_rate=10.0,
+                compounding_frequency="daily"
+            )
+
+
+class TestSIPBatch:
+    """Tests for the vectorized batch path"""
+
+    def test_batch_matches_single(self):
+        requests = [
+            SIPCalculationRequest(
+                monthly_investment=1000 * (i + 1),
+                time_period_years=5 * (i + 1),
+                annual_return_rate=8.0 + i,
+                annual_step_up_rate=5 * (i % 2),
+                step_up_cap=4000 if i == 3 else None,
+                compounding_frequency=("annually", "monthly", "quarterly")[i % 3]
+            )
+            for i in range(6)
+        ]
+
+        batch = calculate_sip_batch(requests)
+
+        assert len(batch) == len(requests)
+        for request, response in zip(requests, batch):
+            assert response.model_dump() == calculate_sip_with_annual_compounding(request).model_dump()
+
+
+    def test_groups_split_by_horizon_band_and_size(self, monkeypatch):
+        from api.services import sip_calculator
+
+        monkeypatch.setattr(sip_calculator, "BATCH_ELEMENT_BUDGET", 12 * 7 * 2)
+        horizons = [1, 300, 2, 3, 5, 7, 4, 6, 1]
+        groups = list(batch_groups(horizons, lambda years: "monthly", lambda years: years))
+
+        assert groups == [("monthly", [0, 8]), ("monthly", [1]), ("monthly", [2, 3]),
+                          ("monthly", [4, 5]), ("monthly", [6, 7])]
+
+    def test_long_plan_does_not_pad_short_ones(self):
+        """One plan at the longest horizon among thousands of one-year plans stays small and exact"""
+        def plan(years):
+            return SIPCalculationRequest(
+                monthly_investment=1000, time_period_years=years, annual_return_rate=8.0,
+                compounding_frequency="monthly",
+            )
+
+        requests = [plan(MAX_HORIZON_YEARS)] + [plan(1)] * 3000
+        tracemalloc.start()
+        try:
+            batch = calculate_sip_batch(requests)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+        assert peak < 100_000_000
+        assert batch[0].model_dump() == calculate_sip_with_annual_compounding(requests[0]).model_dump()
+        assert batch[-1].model_dump() == calculate_sip_with_annual_compounding(requests[-1]).model_dump()
+
+
+class TestReturnSchedule:
+    """Tests for per-year return rate schedules (glide paths)"""
+
+    def test_schedule_known_values(self):
+        """Each year's rate applies to the balance carried into that year"""
+        request = SIPCalculationRequest(
+            monthly_investment=1000,
+            time_period_years=3,
+            annual_return_rate=10.0,
+            initial_investment=1000,
+            annual_return_rates=[10.0, 0.0, 20.0]
+        )
+
+        result = calculate_sip_with_annual_compounding(request)
+
+        # Year 1: 1000 * 1.1 + 12000 = 13100
+        # Year 2: 13100 * 1.0 + 12000 = 25100
+        # Year 3: 25100 * 1.2 + 12000 = 42120
+        assert [y.future_value for y in result.yearly_breakdown] == [13100, 25100, 42120]
+
+    def test_constant_schedule_matches_scalar(self):
+        scalar = SIPCalculationRequest(
+            monthly_investment=5000,
+            time_period_years=20,
+            annual_return_rate=9.5,
+            compounding_frequency="quarterly"
+        )
+        schedule = SIPCalculationRequest(
+            monthly_investment=5000,
+            time_period_years=20,
+            annual_return_rate=9.5,
+            compounding_frequency="quarterly",
+            annual_return_rates=[9.5] * 20
+        )
+
+        assert (
+            calculate_sip_with_annual_compounding(scalar).results
+            == calculate_sip_with_annual_compounding(schedule).results
+        )
+
+    def test_tapering_glide_path_between_bounds(self):
+        """A schedule tapering from 12% to 6% lands between the two constant-rate plans"""
+        def future_value(**overrides):
+            params = dict(monthly_investment=5000, time_period_years=30, annual_return_rate=12.0)
+            params.update(overrides)
+            return calculate_sip_with_annual_compounding(SIPCalculationRequest(**params)).results.future_value
+
+        glide = [12 - 6 * i / 29 for i in range(30)]
+        assert future_value(annual_return_rate=6.0) < future_value(annual_return_rates=glide) < future_value()
+
+    def test_schedule_length_validated(self):
+        with pytest.raises(Exception):
+            SIPCalculationRequest(
+                monthly_investment=1000,
+                time_period_years=3,
+                annual_return_rate=10.0,
+                annual_return_rates=[10.0, 10.0]
+            )
+
+    def test_schedule_rate_bounds_validated(self):
+        with pytest.raises(Exception):
+            SIPCalculationRequest(
+                monthly_investment=1000,
+                time_period_years=2,
+                annual_return_rate=10.0,
+                annual_return_rates=[10.0, 101.0]
+            )
+
+    def test_shared_schedule_shares_growth_table(self):
+        """Growth tables are cached per schedule so batch callers reuse prefix products"""
+        rates = (12.0, 11.0, 10.0)
+        assert schedule_growth_table(rates, "annually", 12) is schedule_growth_table(rates, "annually", 12)
+
+    def test_growth_table_lookups(self):
+        table = schedule_growth_table((10.0, 0.0, 20.0), "annually", 12)
+        assert abs(table.between(0, 3) - 1.32) < 1e-12
+        # 100 credited at the end of year 1 is worth 100 * 1.0 * 1.2 at the end of year 3
+        assert abs(table.terminal_value(100, 0) - 120) < 1e-9
+
+    def test_uncached_schedules_match_cached(self, monkeypatch):
+        """Batches of many distinct schedules skip the cache with bit-identical growth"""
+        schedules = [tuple(float(r) for r in np.linspace(2, 2 + i / 10, 1 + i % 9)) for i in range(40)]
+        frequencies = ["monthly", "quarterly", "annually", "annually"] * 10
+        cached = schedule_growth(schedules, frequencies, 1, 9 * 12)
+        monkeypatch.setattr(kernels, "CACHED_SCHEDULES_LIMIT", 0)
+        uncached = schedule_growth(schedules, frequencies, 1, 9 * 12)
+
+        assert np.array_equal(cached[0], uncached[0])
+        assert np.array_equal(cached[1], uncached[1])
+
+
+class TestCashFlowEvents:
+    """Tests for lump sums, one-off withdrawals and contribution pauses"""
+
+    def test_lump_sum_known_value(self):
+        """A lump sum credited in year 1 compounds like a year-1 contribution"""
+        request = SIPCalculationRequest(
+            monthly_investment=1000,
+            time_period_years=3,
+            annual_return_rate=10.0,
+            events=[{"type": "lump_sum", "year": 1, "month": 6, "amount": 5000}]
+        )
+
+        result = calculate_sip_with_annual_compounding(request)
+
+        # Year 1: 12000 + 5000 = 17000; year 2: 17000 * 1.1 + 12000 = 30700
+        # Year 3: 30700 * 1.1 + 12000 = 45770
+        assert [y.future_value for y in result.yearly_breakdown] == [17000, 30700, 45770]
+        assert result.results.total_invested == 41000
+        assert result.yearly_breakdown[0].invested_this_year == 17000
+
+    def test_pause_reduces_invested(self):
+        request = SIPCalculationRequest(
+            monthly_investment=1000,
+            time_period_years=2,
+            annual_return_rate=0.0,
+            events=[{"type": "pause", "year": 1, "month": 7, "months": 9}]
+        )
+
+        result = calculate_sip_with_annual_compounding(request)
+
+        assert [y.invested_this_year for y in result.yearly_breakdown] == [6000, 9000]
+        assert result.results.future_value == 15000
+        assert len(result.yearly_breakdown) == 2
+
+    def test_pause_clipped_to_horizon(self):
+        request = SIPCalculationRequest(
+            monthly_investment=1000,
+            time_period_years=2,
+            annual_return_rate=0.0,
+            events=[{"type": "pause", "year": 2, "months": 60}]
+        )
+
+        assert calculate_sip_with_annual_compounding(request).results.total_invested == 12000
+
+    def test_withdrawal_counts_towards_returns(self):
+        request = SIPCalculationRequest(
+            monthly_investment=1000,
+            time_period_years=3,
+            annual_return_rate=10.0,
+            events=[{"type": "withdrawal", "year": 2, "month": 12, "amount": 10000}]
+        )
+
+        result = calculate_sip_with_annual_compounding(request)
+
+        # Year 2: 12000 * 1.1 + 12000 - 10000 = 15200; year 3: 15200 * 1.1 + 12000 = 28720
+        assert result.yearly_breakdown[1].future_value == 15200
+        assert result.results.future_value == 28720
+        assert result.results.total_withdrawn == 10000
+        assert result.results.total_returns == 28720 + 10000 - 36000
+
+    def test_overdrawing_withdrawal_is_clamped(self):
+        """A withdrawal larger than the balance takes out only what is there"""
+        request = SIPCalculationRequest(
+            monthly_investment=1000,
+            time_period_years=3,
+            annual_return_rate=10.0,
+            events=[{"type": "withdrawal", "year": 2, "month": 12, "amount": 1000000}]
+        )
+
+        result = calculate_sip_with_annual_compounding(request)
+
+        assert result.yearly_breakdown[1].future_value == 0
+        assert result.results.total_withdrawn == 25200
+        assert result.results.future_value == 12000
+
+    def test_many_overdrawing_withdrawals_match_month_by_month(self):
+        """Every overdrawn withdrawal is cut back, as a month-by-month simulation would"""
+        events = [{"type": "withdrawal", "year": year, "month": month, "amount": 7000}
+                  for year in range(1, 11) for month in (3, 6, 9, 12)]
+        request = SIPCalculationRequest(
+            monthly_investment=2000, time_period_years=10, annual_return_rate=12.0,
+            compounding_frequency="monthly", events=events,
+        )
+
+        balance, withdrawn, year_ends = 0.0, 0.0, []
+        for month in range(120):
+            balance = balance * 1.01 + 2000
+            if month % 3 == 2:
+                taken = min(7000, balance)
+                balance -= taken
+                withdrawn += taken
+            if month % 12 == 11:
+                year_ends.append(balance)
+
+        result = calculate_sip_with_annual_compounding(request)
+
+        assert [y.future_value for y in result.yearly_breakdown] == pytest.approx(year_ends, abs=0.01)
+        assert result.results.total_withdrawn == pytest.approx(withdrawn, abs=0.01)
+
+    def test_no_events_unchanged(self):
+        params = dict(monthly_investment=5000, time_period_years=15, annual_return_rate=11.0)
+        plain = calculate_sip_with_annual_compounding(SIPCalculationRequest(**params))
+        empty = calculate_sip_with_annual_compounding(SIPCalculationRequest(events=[], **params))
+        assert plain.results == empty.results
+
+    def test_event_beyond_horizon_rejected(self):
+        with pytest.raises(Exception):
+            SIPCalculationRequest(
+                monthly_investment=1000,
+                time_period_years=3,
+                annual_return_rate=10.0,
+                events=[{"type": "lump_sum", "year": 4, "amount": 5000}]
+            )
+
+    def test_event_missing_amount_rejected(self):
+        with pytest.raises(Exception):
+            SIPCalculationRequest(
+                monthly_investment=1000,
+                time_period_years=3,
+                annual_return_rate=10.0,
+                events=[{"type": "withdrawal", "year": 1}]
+            )
+
+
+class TestExactArithmetic:
+    """Tests for exact minor-unit arithmetic"""
+
+    def test_close_to_float_engine_and_reconciles(self):
+        """Exact results stay near the float engine and totals reconcile to the cent"""
+        inputs = dict(
+            monthly_investment=5000.37,
+            time_period_years=15,
+            annual_return_rate=11.3,
+            annual_step_up_rate=7.5,
+            compounding_frequency="monthly",
+            events=[{"type": "withdrawal", "year": 9, "amount": 125000.55}],
+        )
+        floating = calculate_sip_with_annual_compounding(SIPCalculationRequest(**inputs)).results
+        result = calculate_sip_with_annual_compounding(SIPCalculationRequest(**inputs, exact={}))
+
+        assert result.results.future_value == pytest.approx(floating.future_value, rel=1e-5)
+        cents = lambda amount: round(amount * 100)
+        totals = result.results
+        assert cents(totals.total_invested) == sum(cents(y.invested_this_year) for y in result.yearly_breakdown)
+        assert cents(totals.future_value) - cents(totals.total_invested) + cents(totals.total_withdrawn) \
+            == cents(totals.total_returns)
+        assert result.inputs["exact"]["interest_rounding"] == "half_even"
+
+    def test_whole_units(self):
+        """minor_units 0 reports whole amounts"""
+        request = SIPCalculationRequest(
+            monthly_investment=999.5,
+            time_period_years=5,
+            annual_return_rate=9.0,
+            exact={"minor_units": 0, "amount_rounding": "up", "interest_rounding": "down"},
+        )
+        result = calculate_sip_with_annual_compounding(request)
+
+        assert result.yearly_breakdown[0].monthly_contribution == 1000
+        assert all(float(y.future_value).is_integer() for y in result.yearly_breakdown)
+
+    def test_batch_matches_single(self):
+        """Exact and float plans can share a batch, each matching its single calculation"""
+        requests = [
+            SIPCalculationRequest(
+                monthly_investment=1000 + 17.31 * i,
+                time_period_years=1 + i % 7,
+                annual_return_rate=4 + i,
+                compounding_frequency=("annually", "quarterly", "monthly")[i % 3],
+                exact={} if i % 2 else None,
+            )
+            for i in range(12)
+        ]
+        batch = calculate_sip_batch(requests)
+
+        for request, response in zip(requests, batch):
+            assert response == calculate_sip_with_annual_compounding(request)
+
+    def test_too_large_is_rejected(self):
+        """Balances beyond the exact range are a ValueError"""
+        request = SIPCalculationRequest(
+            monthly_investment=1e9,
+            time_period_years=60,
+            annual_return_rate=30.0,
+            exact={},
+        )
+        with pytest.raises(ValueError, match="too large for exact arithmetic"):
+            calculate_sip_with_annual_compounding(request)
+
+
+class TestSensitivities:
+    """Tests for analytic sensitivities of the future value"""
+
+    BASE = dict(
+        monthly_investment=5000,
+        time_period_years=20,
+        annual_return_rate=11.0,
+        annual_step_up_rate=6.0,
+        initial_investment=100000,
+    )
+
+    @pytest.mark.parametrize("extra", [
+        {},
+        {"compounding_frequency": "monthly"},
+        {"compounding_frequency": "quarterly", "step_up_cap": 12000},
+        {"events": [{"type": "pause", "year": 3, "months": 6}, {"type": "lump_sum", "year": 5, "amount": 50000}]},
+    ])
+    def test_match_finite_differences(self, extra):
+        """Each derivative matches a small bump of its input"""
+        inputs = {**self.BASE, **extra}
+        result = calculate_sip_with_annual_compounding(SIPCalculationRequest(**inputs, sensitivities=True))
+        future_value = result.results.future_value
+
+        for name, bump in (("annual_return_rate", 1e-4), ("annual_step_up_rate", 1e-4), ("monthly_investment", 1e-2)):
+            bumped = calculate_sip_with_annual_compounding(
+                SIPCalculationRequest(**{**inputs, name: inputs[name] + bump})
+            )
+            numeric = (bumped.results.future_value - future_value) / bump
+            assert getattr(result.sensitivities, name) == pytest.approx(numeric, rel=1e-3)
+
+    def test_one_more_year(self):
+        """time_period_years is the change from one more year"""
+        result = calculate_sip_with_annual_compounding(SIPCalculationRequest(**self.BASE, sensitivities=True))
+        longer = calculate_sip_with_annual_compounding(
+            SIPCalculationRequest(**{**self.BASE, "time_period_years": 21})
+        )
+
+        assert result.sensitivities.time_period_years == pytest.approx(
+            longer.results.future_value - result.results.future_value, abs=0.02
+        )
+
+    def test_only_when_requested(self):
+        """Batched plans carry sensitivities only when they ask, matching single calculations"""
+        requests = [SIPCalculationRequest(**self.BASE, sensitivities=True), SIPCalculationRequest(**self.BASE)]
+        batch = calculate_sip_batch(requests)
+
+        assert batch[0] == calculate_sip_with_annual_compounding(requests[0])
+        assert batch[1].sensitivities is None
+
+    def test_exact_not_supported(self):
+        """Sensitivities cannot be combined with exact arithmetic"""
+        with pytest.raises(ValueError, match="sensitivities"):
+            SIPCalculationRequest(**self.BASE, sensitivities=True, exact={})
+
+
+class TestContributionVintages:
+    """Tests for the contribution-vintage matrix"""
+
+    def test_columns_sum_to_balances(self):
+        """Each valuation year's vintages add up to that year's future value"""
+        request = SIPCalculationRequest(
+            monthly_investment=5000,
+            time_period_years=20,
+            annual_return_rate=11.0,
+            annual_step_up_rate=6.0,
+            initial_investment=100000,
+            compounding_frequency="monthly",
+            events=[{"type": "pause", "year": 3, "months": 6}, {"type": "lump_sum", "year": 5, "amount": 50000}],
+            vintages=True,
+        )
+        result = calculate_sip_with_annual_compounding(request)
+        vintages = result.vintages
+
+        assert vintages.years == 20
+        assert len(vintages.values) == 20 * 21 // 2
+        for entry in result.yearly_breakdown:
+            total = sum(vintages.value(year, entry.year) for year in range(1, 21))
+            assert total == pytest.approx(entry.future_value, abs=0.05)
+
+    def test_vintages_grow_at_the_plan_rate(self):
+        """With annual compounding a year's contributions are worth their sum, then compound yearly"""
+        request = SIPCalculationRequest(
+            monthly_investment=1000,
+            time_period_years=10,
+            annual_return_rate=10.0,
+            annual_step_up_rate=10.0,
+            vintages=True,
+        )
+        result = calculate_sip_with_annual_compounding(request)
+        vintages = result.vintages
+
+        for entry in result.yearly_breakdown:
+            assert vintages.value(entry.year, entry.year) == pytest.approx(entry.invested_this_year)
+            assert vintages.value(entry.year, 10) == pytest.approx(
+                entry.invested_this_year * 1.1 ** (10 - entry.year), abs=0.01
+            )
+        assert vintages.value(5, 4) == 0
+
+    def test_only_when_requested(self):
+        """Batched plans carry vintages only when they ask, matching single calculations"""
+        requests = [
+            SIPCalculationRequest(monthly_investment=5000, time_period_years=years, annual_return_rate=12.0,
+                                  vintages=years % 2 == 0)
+            for years in (5, 8, 13)
+        ]
+        batch = calculate_sip_batch(requests)
+
+        assert batch[0].vintages is None
+        assert batch[1] == calculate_sip_with_annual_compounding(requests[1])
+        assert len(batch[1].vintages.values) == 36
+
+    def test_withdrawal_events_not_supported(self):
+        """Vintages cannot be combined with withdrawal events"""
+        with pytest.raises(ValueError, match="vintages"):
+            SIPCalculationRequest(
+                monthly_investment=5000,
+                time_period_years=10,
+                annual_return_rate=12.0,
+                events=[{"type": "withdrawal", "year": 5, "amount": 10000}],
+                vintages=True,
+            )
@@ -0,0 +1,98 @@
+"""
+Unit tests for the bulk XIRR / CAGR solver
+"""
+import warnings
+
+import numpy as np
+import pytest
+
+from api.models.xirr import CashFlowSeries
+from api.services.xirr import calculate_xirr_batch, cagr, pack_series, xirr
+
+
+def _series(*flows, id=None):
+    return CashFlowSeries(id=id, dates=[d for d, _ in flows], amounts=[a for _, a in flows])
+
+
+class TestXIRR:
+    """Tests for XIRR and CAGR on dated cash flows"""
+
+    def test_single_period_known_value(self):
+        """-1000 then +1100 exactly 365 days later is a 10% return"""
+        result = calculate_xirr_batch([_series(("2021-01-01", -1000), ("2022-01-01", 1100))])[0]
+        assert result.converged is True
+        assert result.xirr == pytest.approx(10.0, abs=1e-4)
+        assert result.cagr == pytest.approx(10.0, abs=1e-4)
+
+    def test_npv_is_zero_at_solution(self):
+        series = _series(
+            ("2020-01-01", -10000), ("2020-07-15", -5000), ("2021-03-01", 2000), ("2023-01-01", 16000)
+        )
+        result = calculate_xirr_batch([series])[0]
+
+        amounts, years = pack_series([series])
+        solution = xirr(amounts, years)
+        assert result.xirr == round(solution.rates[0] * 100, 4)
+        assert abs((amounts * (1 + solution.rates[0]) ** -years).sum()) < 1e-6
+
+    def test_flow_order_does_not_matter(self):
+        flows = [("2020-01-01", -10000), ("2021-01-01", -10000), ("2023-01-01", 25000)]
+        forward = calculate_xirr_batch([_series(*flows)])[0]
+        backward = calculate_xirr_batch([_series(*reversed(flows))])[0]
+        assert forward.xirr == backward.xirr
+
+    def test_timing_separates_xirr_from_cagr(self):
+        """A later contribution earns for less time, so XIRR exceeds CAGR"""
+        result = calculate_xirr_batch([
+            _series(("2020-01-01", -10000), ("2021-01-01", -10000), ("2023-01-01", 25000))
+        ])[0]
+        assert result.xirr > result.cagr
+
+    def test_batch_matches_single_and_keeps_order(self):
+        series = [
+            _series(("2020-01-01", -1000), ("2021-01-01", 900), id="loss"),
+            _series(("2019-05-01", -500), ("2019-11-01", -500), ("2024-05-01", 2000), id="gain"),
+        ]
+        batch = calculate_xirr_batch(series)
+        assert [r.id for r in batch] == ["loss", "gain"]
+        assert batch[1] == calculate_xirr_batch([series[1]])[0]
+        assert batch[0].xirr < 0 < batch[1].xirr
+
+    def test_unbracketed_root_not_converged(self):
+        """A near-total loss within days needs a rate below the search range"""
+        result = calculate_xirr_batch([_series(("2020-01-01", -10000), ("2020-01-10", 1))])[0]
+        assert result.converged is False
+        assert result.xirr is None
+
+    def test_cagr_overflow_is_none(self):
+        """A large gain over a day annualizes beyond a float, without a RuntimeWarning"""
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            result = calculate_xirr_batch([_series(("2020-01-01", -1), ("2020-01-02", 1e6))])[0]
+        assert result.cagr is None
+        assert result.xirr is None
+
+    def test_vectorized_solver_converges_on_random_histories(self):
+        rng = np.random.default_rng(7)
+        amounts = -rng.uniform(100, 1000, (2000, 24))
+        amounts[:, -1] = -amounts[:, :-1].sum(axis=1) * rng.uniform(0.5, 3, 2000)
+        years = np.sort(rng.uniform(0, 20, (2000, 24)), axis=1)
+        years[:, 0] = 0
+
+        solution = xirr(amounts, years, guess=cagr(amounts, years))
+
+        assert solution.converged.all()
+        npv = (amounts * (1 + solution.rates[:, None]) ** -years).sum(axis=1)
+        assert np.abs(npv / np.abs(amounts).sum(axis=1)).max() < 1e-8
+
+    def test_series_needs_both_signs(self):
+        with pytest.raises(Exception):
+            _series(("2020-01-01", -1000), ("2021-01-01", -100))
+
+    def test_series_lengths_must_match(self):
+        with pytest.raises(Exception):
+            CashFlowSeries(dates=["2020-01-01", "2021-01-01"], amounts=[-1000, 500, 700])
+
+    def test_series_needs_more_than_one_day(self):
+        with pytest.raises(Exception):
+            _series(("2020-01-01", -1000), ("2020-01-01", 1100))